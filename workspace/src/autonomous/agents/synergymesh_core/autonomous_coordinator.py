@@ -17,10 +17,11 @@ Core Capabilities:
 
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Callable, Awaitable
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
+import itertools
 import uuid
 import heapq
 
@@ -73,10 +74,11 @@ class AutonomousTask:
     max_retries: int = 3
     result: Any = None
     error: Optional[str] = None
+    sequence: int = 0  # Enqueue order, keeps FIFO within a priority
     
     def __lt__(self, other: 'AutonomousTask') -> bool:
         """For priority queue comparison"""
-        return self.priority.value < other.priority.value
+        return (self.priority.value, self.sequence) < (other.priority.value, other.sequence)
 
 
 @dataclass
@@ -127,6 +129,7 @@ class AutonomousCoordinator:
     RECOVERY_CHECK_INTERVAL_SECONDS = 10
     HIGH_QUEUE_THRESHOLD = 50
     MAX_WORKERS = 8
+    RETRY_BASE_DELAY_SECONDS = 0.5  # Doubled on each retry
     
     def __init__(self, worker_count: int = 4):
         """
@@ -136,7 +139,11 @@ class AutonomousCoordinator:
             worker_count: Number of worker tasks for parallel execution
         """
         self.worker_count = worker_count
+        # Ready tasks (heap by priority) and delayed/retrying tasks (heap by due time)
         self.task_queue: List[AutonomousTask] = []
+        self.delayed_queue: List[Tuple[datetime, int, AutonomousTask]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
         self.running_tasks: Dict[str, AutonomousTask] = {}
         self.completed_tasks: List[AutonomousTask] = []
         self.failed_tasks: List[AutonomousTask] = []
@@ -234,7 +241,7 @@ class AutonomousCoordinator:
             status=TaskStatus.SCHEDULED if scheduled_time else TaskStatus.PENDING
         )
         
-        heapq.heappush(self.task_queue, task)
+        self._enqueue(task, scheduled_time)
         logger.info(f"Task scheduled: {task_id} - {name} (priority: {priority.name})")
         
         return task_id
@@ -250,6 +257,9 @@ class AutonomousCoordinator:
             return
         
         self.is_running = True
+        self._wakeup = asyncio.Event()
+        if self.task_queue or self.delayed_queue:
+            self._wakeup.set()
         logger.info("Starting Autonomous Coordinator...")
         
         # Start worker tasks
@@ -300,10 +310,7 @@ class AutonomousCoordinator:
         while self.is_running:
             try:
                 task = await self._get_next_task()
-                if task:
-                    await self._execute_task(task, worker_id)
-                else:
-                    await asyncio.sleep(0.1)  # Brief pause if no tasks
+                await self._execute_task(task, worker_id)
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -312,23 +319,56 @@ class AutonomousCoordinator:
         
         logger.info(f"Worker {worker_id} stopped")
     
-    async def _get_next_task(self) -> Optional[AutonomousTask]:
-        """Get the next task from the queue"""
+    def _enqueue(self, task: AutonomousTask, due: Optional[datetime] = None) -> None:
+        """
+        Put a task on the ready heap, or on the delayed heap if it is due later,
+        and wake idle workers
+        """
+        task.sequence = next(self._sequence)
+        if due and due > datetime.now():
+            heapq.heappush(self.delayed_queue, (due, task.sequence, task))
+        else:
+            heapq.heappush(self.task_queue, task)
+        if self._wakeup:
+            self._wakeup.set()
+    
+    def _promote_due_tasks(self) -> None:
+        """Move delayed tasks that are now due onto the ready heap"""
+        now = datetime.now()
+        while self.delayed_queue and self.delayed_queue[0][0] <= now:
+            _, _, task = heapq.heappop(self.delayed_queue)
+            heapq.heappush(self.task_queue, task)
+    
+    def _pop_ready_task(self) -> Optional[AutonomousTask]:
+        """Pop the highest-priority ready task, skipping cancelled ones"""
+        self._promote_due_tasks()
         while self.task_queue:
             task = heapq.heappop(self.task_queue)
+            if task.status != TaskStatus.CANCELLED:
+                return task
+        return None
+    
+    async def _get_next_task(self) -> AutonomousTask:
+        """
+        Wait for the next task
+        
+        Sleeps until a task is enqueued or the earliest delayed task is due;
+        delayed tasks never block ready ones.
+        """
+        while True:
+            task = self._pop_ready_task()
+            if task:
+                return task
             
-            # Check if task is scheduled for later
-            if task.scheduled_time and task.scheduled_time > datetime.now():
-                heapq.heappush(self.task_queue, task)
-                return None
-            
-            # Check if task is not cancelled
-            if task.status == TaskStatus.CANCELLED:
-                continue
+            timeout = None
+            if self.delayed_queue:
+                timeout = max((self.delayed_queue[0][0] - datetime.now()).total_seconds(), 0)
             
-            return task
-        
-        return None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
     
     async def _execute_task(self, task: AutonomousTask, worker_id: int) -> None:
         """
@@ -364,7 +404,8 @@ class AutonomousCoordinator:
             
             if task.retry_count < task.max_retries:
                 task.status = TaskStatus.RETRYING
-                heapq.heappush(self.task_queue, task)
+                delay = self.RETRY_BASE_DELAY_SECONDS * (2 ** (task.retry_count - 1))
+                self._enqueue(task, datetime.now() + timedelta(seconds=delay))
                 logger.warning(
                     f"Task {task.task_id} failed, retrying ({task.retry_count}/{task.max_retries}): {e}"
                 )
@@ -476,6 +517,7 @@ class AutonomousCoordinator:
             message=message,
             metrics={
                 "queue_size": queue_size,
+                "delayed_tasks": len(self.delayed_queue),
                 "running_tasks": running_count,
                 "failed_ratio": failed_ratio,
                 "tasks_processed": self.stats["tasks_processed"]
@@ -527,7 +569,7 @@ class AutonomousCoordinator:
             self.running_tasks.pop(task.task_id, None)
             
             if task.retry_count < task.max_retries:
-                heapq.heappush(self.task_queue, task)
+                self._enqueue(task)
                 action.success = True
                 action.result_message = "Task reset and requeued"
             else:
@@ -590,6 +632,11 @@ class AutonomousCoordinator:
             if task.task_id == task_id:
                 return self._task_to_dict(task)
         
+        # Check delayed / retrying tasks
+        for _, _, task in self.delayed_queue:
+            if task.task_id == task_id:
+                return self._task_to_dict(task)
+        
         return None
     
     def _task_to_dict(self, task: AutonomousTask) -> Dict[str, Any]:
@@ -622,6 +669,7 @@ class AutonomousCoordinator:
             "uptime_seconds": uptime.total_seconds(),
             "worker_count": len(self.workers),
             "queue_size": len(self.task_queue),
+            "delayed_tasks": len(self.delayed_queue),
             "running_tasks": len(self.running_tasks),
             "completed_tasks": len(self.completed_tasks),
             "failed_tasks": len(self.failed_tasks),
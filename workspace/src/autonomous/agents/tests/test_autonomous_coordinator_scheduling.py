@@ -0,0 +1,123 @@
+"""
+Tests for AutonomousCoordinator scheduling - ready/delayed queue separation,
+wake-on-enqueue workers and retry backoff
+測試自主協調器調度
+"""
+
+import pytest
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the agents directory to path for imports
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_parent_dir = os.path.dirname(_current_dir)
+if _parent_dir not in sys.path:
+    sys.path.insert(0, _parent_dir)
+
+from synergymesh_core.autonomous_coordinator import (
+    AutonomousCoordinator,
+    TaskPriority,
+)
+
+
+@pytest.fixture
+def coordinator():
+    return AutonomousCoordinator(worker_count=2)
+
+
+class TestQueueSeparation:
+    """Delayed tasks never block ready ones"""
+
+    def test_future_tasks_go_to_delayed_queue(self, coordinator):
+        later = datetime.now() + timedelta(hours=1)
+        task_id = coordinator.schedule_task("later", "", "noop", {}, scheduled_time=later)
+        coordinator.schedule_task("now", "", "noop", {})
+
+        assert len(coordinator.task_queue) == 1
+        assert len(coordinator.delayed_queue) == 1
+        assert coordinator.get_task_status(task_id)["status"] == "scheduled"
+        assert coordinator.get_statistics()["delayed_tasks"] == 1
+
+    def test_fifo_within_priority(self, coordinator):
+        ids = [coordinator.schedule_task(f"t{i}", "", "noop", {}, TaskPriority.MEDIUM) for i in range(5)]
+        urgent = coordinator.schedule_task("urgent", "", "noop", {}, TaskPriority.CRITICAL)
+
+        order = [coordinator._pop_ready_task().task_id for _ in range(6)]
+
+        assert order == [urgent] + ids
+
+    @pytest.mark.asyncio
+    async def test_ready_task_not_blocked_by_many_delayed(self, coordinator):
+        later = datetime.now() + timedelta(hours=1)
+        for i in range(20000):
+            coordinator.schedule_task(
+                f"later-{i}", "", "noop", {}, TaskPriority.CRITICAL, scheduled_time=later
+            )
+
+        done = asyncio.Event()
+
+        async def handler(**kwargs):
+            done.set()
+
+        coordinator.register_task_handler("run", handler)
+        await coordinator.start()
+        try:
+            start = time.perf_counter()
+            coordinator.schedule_task("ready", "", "run", {}, TaskPriority.BACKGROUND)
+            await asyncio.wait_for(done.wait(), timeout=1.0)
+            assert time.perf_counter() - start < 0.5
+        finally:
+            await coordinator.stop()
+
+
+class TestWakeups:
+    """Workers sleep until enqueue or the next due time"""
+
+    @pytest.mark.asyncio
+    async def test_delayed_task_runs_when_due(self, coordinator):
+        ran_at = []
+
+        async def handler(**kwargs):
+            ran_at.append(datetime.now())
+
+        coordinator.register_task_handler("run", handler)
+        await coordinator.start()
+        try:
+            due = datetime.now() + timedelta(milliseconds=100)
+            coordinator.schedule_task("delayed", "", "run", {}, scheduled_time=due)
+            await asyncio.sleep(0.05)
+            assert ran_at == []
+            await asyncio.sleep(0.15)
+            assert len(ran_at) == 1
+            assert ran_at[0] >= due
+        finally:
+            await coordinator.stop()
+
+    @pytest.mark.asyncio
+    async def test_retry_is_delayed_with_backoff(self, coordinator):
+        coordinator.RETRY_BASE_DELAY_SECONDS = 0.05
+        attempts = []
+
+        async def flaky(**kwargs):
+            attempts.append(time.perf_counter())
+            if len(attempts) < 3:
+                raise RuntimeError("transient")
+            return "ok"
+
+        coordinator.register_task_handler("flaky", flaky)
+        await coordinator.start()
+        try:
+            task_id = coordinator.schedule_task("flaky", "", "flaky", {})
+            for _ in range(50):
+                await asyncio.sleep(0.02)
+                if coordinator.get_task_status(task_id)["status"] == "completed":
+                    break
+
+            assert coordinator.get_task_status(task_id)["status"] == "completed"
+            assert attempts[1] - attempts[0] >= 0.05
+            assert attempts[2] - attempts[1] >= 0.1
+        finally:
+            await coordinator.stop()
@@ -23,10 +23,11 @@ Design Principles:
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 logger = logging.getLogger(__name__)
@@ -166,6 +167,50 @@ class ProcessorConfig:
     processing_timeout_seconds: int = 30
     auto_decision_threshold: float = 0.85
     require_approval_threshold: float = 0.6
+    # Default deadline for each detector, evaluator and action handler call
+    hook_timeout_seconds: float = 5.0
+    # Micro-batching for queued signals
+    max_batch_size: int = 64
+    batch_linger_ms: float = 2.0
+
+
+@dataclass
+class HookRegistration:
+    """A registered detector, evaluator or handler"""
+    func: Callable
+    timeout_seconds: Optional[float] = None  # None: the layer default
+    batch: bool = False                      # Called once with all signals of a batch
+
+
+async def _call_hook(
+    func: Callable,
+    args: Tuple,
+    timeout: Optional[float],
+    join_on_timeout: bool = False
+) -> Any:
+    """
+    Call a sync or async hook under a deadline
+    
+    Async hooks are cancelled at the deadline (asyncio.TimeoutError). Sync
+    hooks run in a worker thread so they cannot stall the event loop; at
+    the deadline the caller stops waiting, but the thread runs to completion.
+    With join_on_timeout the TimeoutError is raised only after that thread
+    has finished, so its side effects cannot land after the caller reacts.
+    """
+    if asyncio.iscoroutinefunction(func):
+        return await asyncio.wait_for(func(*args), timeout)
+    if not join_on_timeout:
+        return await asyncio.wait_for(asyncio.to_thread(func, *args), timeout)
+    
+    worker = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.wait_for(asyncio.shield(worker), timeout)
+    except asyncio.TimeoutError:
+        # The thread cannot be interrupted; wait for it before reporting
+        await asyncio.wait([worker])
+        if not worker.cancelled():
+            worker.exception()
+        raise
 
 
 class PerceptionLayer:
@@ -178,17 +223,19 @@ class PerceptionLayer:
     - 時序漂移識別 (Time series drift detection)
     """
     
-    def __init__(self):
+    def __init__(self, hook_timeout: Optional[float] = None):
         """Initialize perception layer"""
-        self._anomaly_detectors: List[Callable] = []
-        self._drift_detectors: List[Callable] = []
+        self._anomaly_detectors: List[HookRegistration] = []
+        self._drift_detectors: List[HookRegistration] = []
         self._baselines: Dict[str, Any] = {}
+        self._hook_timeout = hook_timeout
         
         # Statistics
         self._stats = {
             'signals_processed': 0,
             'anomalies_detected': 0,
-            'drifts_detected': 0
+            'drifts_detected': 0,
+            'detector_timeouts': 0
         }
         
         logger.debug("PerceptionLayer initialized - 感知層已初始化")
@@ -208,101 +255,183 @@ class PerceptionLayer:
         Returns:
             List of generated signals (may include anomaly/drift signals)
         """
-        self._stats['signals_processed'] += 1
-        output_signals = [signal]
-        
-        # Anomaly detection
-        anomalies = await self._detect_anomalies(signal, context)
-        if anomalies:
-            self._stats['anomalies_detected'] += len(anomalies)
-            output_signals.extend(anomalies)
-        
-        # Drift detection
-        drifts = await self._detect_drifts(signal, context)
-        if drifts:
-            self._stats['drifts_detected'] += len(drifts)
-            output_signals.extend(drifts)
-        
-        return output_signals
+        return (await self.process_batch([signal], context))[0]
     
-    async def _detect_anomalies(
+    async def process_batch(
         self,
-        signal: CognitiveSignal,
+        signals: List[CognitiveSignal],
         context: CognitiveContext
-    ) -> List[CognitiveSignal]:
-        """Detect anomalies in the signal"""
-        anomalies = []
+    ) -> List[List[CognitiveSignal]]:
+        """
+        Process a micro-batch of signals through the perception layer
         
-        for detector in self._anomaly_detectors:
-            try:
-                if asyncio.iscoroutinefunction(detector):
-                    result = await detector(signal, context)
-                else:
-                    result = detector(signal, context)
-                
-                if result:
-                    anomaly_signal = CognitiveSignal(
-                        signal_id=f"anomaly-{uuid4().hex[:8]}",
-                        signal_type=SignalType.ANOMALY,
-                        layer=CognitiveLayer.L1_PERCEPTION,
-                        source='perception-layer',
-                        payload={
-                            'original_signal': signal.signal_id,
-                            'anomaly_type': result.get('type', 'unknown'),
-                            'severity': result.get('severity', 'medium'),
-                            'details': result.get('details', {})
-                        },
-                        confidence=result.get('confidence', 0.7)
-                    )
-                    anomalies.append(anomaly_signal)
-            except Exception as e:
-                logger.warning(f"Anomaly detector error: {e}")
+        All anomaly and drift detectors run concurrently, each under its
+        deadline. Per-signal detectors are called once per signal; batch
+        detectors once with the whole batch.
+        
+        Returns:
+            Output signals per input signal, in input order
+        """
+        self._stats['signals_processed'] += len(signals)
+        
+        anomaly_results, drift_results = await asyncio.gather(
+            self._run_detectors(self._anomaly_detectors, signals, (context,), 'Anomaly'),
+            self._run_detectors(
+                self._drift_detectors, signals, (context, self._baselines), 'Drift', ordered=True
+            )
+        )
         
-        return anomalies
+        outputs = []
+        for signal, anomalies, drifts in zip(signals, anomaly_results, drift_results):
+            output_signals = [signal]
+            for results, build, kind, stat in (
+                (anomalies, self._anomaly_signal, 'Anomaly', 'anomalies_detected'),
+                (drifts, self._drift_signal, 'Drift', 'drifts_detected')
+            ):
+                for result in results:
+                    try:
+                        output_signals.append(build(signal, result))
+                    except Exception as e:
+                        logger.warning(f"{kind} detector returned an invalid result: {e!r}")
+                        continue
+                    self._stats[stat] += 1
+            outputs.append(output_signals)
+        
+        return outputs
     
-    async def _detect_drifts(
+    async def _run_detectors(
         self,
-        signal: CognitiveSignal,
-        context: CognitiveContext
-    ) -> List[CognitiveSignal]:
-        """Detect drifts in the signal"""
-        drifts = []
+        detectors: List[HookRegistration],
+        signals: List[CognitiveSignal],
+        extra_args: Tuple,
+        kind: str,
+        ordered: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run detectors; results per signal in registration order
         
-        for detector in self._drift_detectors:
-            try:
-                if asyncio.iscoroutinefunction(detector):
-                    result = await detector(signal, context, self._baselines)
+        Detectors run concurrently unless ordered is set. Drift detectors
+        share the baselines, so they are called one at a time: per-signal
+        detectors signal by signal in batch order, then batch detectors
+        with the whole ordered batch.
+        """
+        calls = []  # (signal index, or None for a batch call; thunk returning a coroutine)
+        if ordered:
+            for index, signal in enumerate(signals):
+                for detector in detectors:
+                    if not detector.batch:
+                        calls.append((index, self._detector_call(detector, signal, extra_args)))
+            for detector in detectors:
+                if detector.batch:
+                    calls.append((None, self._detector_call(detector, signals, extra_args)))
+        else:
+            for detector in detectors:
+                if detector.batch:
+                    calls.append((None, self._detector_call(detector, signals, extra_args)))
                 else:
-                    result = detector(signal, context, self._baselines)
-                
-                if result:
-                    drift_signal = CognitiveSignal(
-                        signal_id=f"drift-{uuid4().hex[:8]}",
-                        signal_type=SignalType.DRIFT,
-                        layer=CognitiveLayer.L1_PERCEPTION,
-                        source='perception-layer',
-                        payload={
-                            'original_signal': signal.signal_id,
-                            'drift_type': result.get('type', 'unknown'),
-                            'magnitude': result.get('magnitude', 0.0),
-                            'baseline': result.get('baseline'),
-                            'current': result.get('current')
-                        },
-                        confidence=result.get('confidence', 0.6)
-                    )
-                    drifts.append(drift_signal)
-            except Exception as e:
-                logger.warning(f"Drift detector error: {e}")
-        
-        return drifts
+                    for index, signal in enumerate(signals):
+                        calls.append((index, self._detector_call(detector, signal, extra_args)))
+        
+        if ordered:
+            results = []
+            for _, call in calls:
+                try:
+                    results.append(await call())
+                except Exception as e:
+                    results.append(e)
+        else:
+            results = await asyncio.gather(*(call() for _, call in calls), return_exceptions=True)
+        
+        per_signal: List[List[Dict[str, Any]]] = [[] for _ in signals]
+        for (index, _), result in zip(calls, results):
+            if isinstance(result, asyncio.TimeoutError):
+                self._stats['detector_timeouts'] += 1
+                logger.warning(f"{kind} detector timed out")
+            elif isinstance(result, asyncio.CancelledError):
+                logger.warning(f"{kind} detector was cancelled")
+            elif isinstance(result, Exception):
+                logger.warning(f"{kind} detector error: {result}")
+            elif index is None:
+                for i, item in enumerate((result or [])[:len(signals)]):
+                    if item:
+                        per_signal[i].append(item)
+            elif result:
+                per_signal[index].append(result)
+        
+        return per_signal
+    
+    def _detector_call(
+        self,
+        detector: HookRegistration,
+        subject: Any,
+        extra_args: Tuple
+    ) -> Callable[[], Awaitable[Any]]:
+        timeout = self._timeout_for(detector)
+        return lambda: _call_hook(detector.func, (subject, *extra_args), timeout)
+    
+    def _timeout_for(self, detector: HookRegistration) -> Optional[float]:
+        if detector.timeout_seconds is not None:
+            return detector.timeout_seconds
+        return self._hook_timeout
     
-    def add_anomaly_detector(self, detector: Callable) -> None:
-        """Add an anomaly detector"""
-        self._anomaly_detectors.append(detector)
+    def _anomaly_signal(self, signal: CognitiveSignal, result: Dict[str, Any]) -> CognitiveSignal:
+        return CognitiveSignal(
+            signal_id=f"anomaly-{uuid4().hex[:8]}",
+            signal_type=SignalType.ANOMALY,
+            layer=CognitiveLayer.L1_PERCEPTION,
+            source='perception-layer',
+            payload={
+                'original_signal': signal.signal_id,
+                'anomaly_type': result.get('type', 'unknown'),
+                'severity': result.get('severity', 'medium'),
+                'details': result.get('details', {})
+            },
+            confidence=result.get('confidence', 0.7)
+        )
+    
+    def _drift_signal(self, signal: CognitiveSignal, result: Dict[str, Any]) -> CognitiveSignal:
+        return CognitiveSignal(
+            signal_id=f"drift-{uuid4().hex[:8]}",
+            signal_type=SignalType.DRIFT,
+            layer=CognitiveLayer.L1_PERCEPTION,
+            source='perception-layer',
+            payload={
+                'original_signal': signal.signal_id,
+                'drift_type': result.get('type', 'unknown'),
+                'magnitude': result.get('magnitude', 0.0),
+                'baseline': result.get('baseline'),
+                'current': result.get('current')
+            },
+            confidence=result.get('confidence', 0.6)
+        )
     
-    def add_drift_detector(self, detector: Callable) -> None:
-        """Add a drift detector"""
-        self._drift_detectors.append(detector)
+    def add_anomaly_detector(
+        self,
+        detector: Callable,
+        timeout_seconds: Optional[float] = None,
+        batch: bool = False
+    ) -> None:
+        """
+        Add an anomaly detector
+        
+        Called as detector(signal, context) -> result dict or None, or with
+        batch=True as detector(signals, context) -> one result per signal.
+        """
+        self._anomaly_detectors.append(HookRegistration(detector, timeout_seconds, batch))
+    
+    def add_drift_detector(
+        self,
+        detector: Callable,
+        timeout_seconds: Optional[float] = None,
+        batch: bool = False
+    ) -> None:
+        """
+        Add a drift detector
+        
+        Called as detector(signal, context, baselines), or with batch=True
+        as detector(signals, context, baselines) -> one result per signal.
+        """
+        self._drift_detectors.append(HookRegistration(detector, timeout_seconds, batch))
     
     def set_baseline(self, key: str, value: Any) -> None:
         """Set a baseline value for drift detection"""
@@ -323,17 +452,19 @@ class ReasoningLayer:
     - 策略選擇 (Strategy selection)
     """
     
-    def __init__(self):
+    def __init__(self, hook_timeout: Optional[float] = None):
         """Initialize reasoning layer"""
-        self._strategy_evaluators: List[Callable] = []
+        self._strategy_evaluators: List[HookRegistration] = []
         self._risk_factors: Dict[str, float] = {}
         self._causal_relationships: Dict[str, List[str]] = {}
+        self._hook_timeout = hook_timeout
         
         # Statistics
         self._stats = {
             'signals_processed': 0,
             'decisions_made': 0,
-            'risk_assessments': 0
+            'risk_assessments': 0,
+            'evaluator_timeouts': 0
         }
         
         logger.debug("ReasoningLayer initialized - 推理層已初始化")
@@ -355,31 +486,32 @@ class ReasoningLayer:
         """
         self._stats['signals_processed'] += len(signals)
         
-        decisions = []
-        output_signals = []
-        
-        # Analyze signals and generate decisions
+        # Assess risk for every signal
+        pending = []
         for signal in signals:
-            # Perform risk assessment
             risk = await self._assess_risk(signal, context)
             self._stats['risk_assessments'] += 1
-            
-            # Generate decision if needed
             if self._requires_decision(signal, risk):
-                decision = await self._make_decision(signal, risk, context)
-                decisions.append(decision)
-                self._stats['decisions_made'] += 1
-                
-                # Generate decision signal
-                decision_signal = CognitiveSignal(
-                    signal_id=f"decision-{decision.decision_id}",
-                    signal_type=SignalType.DECISION,
-                    layer=CognitiveLayer.L2_REASONING,
-                    source='reasoning-layer',
-                    payload=decision.to_dict(),
-                    confidence=decision.confidence_score
-                )
-                output_signals.append(decision_signal)
+                pending.append((signal, risk))
+        
+        # Decisions are independent of each other; evaluate them concurrently
+        decisions = list(await asyncio.gather(*(
+            self._make_decision(signal, risk, context) for signal, risk in pending
+        )))
+        self._stats['decisions_made'] += len(decisions)
+        
+        # Generate decision signals
+        output_signals = [
+            CognitiveSignal(
+                signal_id=f"decision-{decision.decision_id}",
+                signal_type=SignalType.DECISION,
+                layer=CognitiveLayer.L2_REASONING,
+                source='reasoning-layer',
+                payload=decision.to_dict(),
+                confidence=decision.confidence_score
+            )
+            for decision in decisions
+        ]
         
         return decisions, output_signals
     
@@ -485,13 +617,25 @@ class ReasoningLayer:
         confidence_score = 0.5
         alternatives = []
         
-        for evaluator in self._strategy_evaluators:
+        # Evaluators run concurrently; results are folded in registration order
+        results = await asyncio.gather(*(
+            _call_hook(
+                evaluator.func,
+                (signal, risk, context),
+                evaluator.timeout_seconds if evaluator.timeout_seconds is not None else self._hook_timeout
+            )
+            for evaluator in self._strategy_evaluators
+        ), return_exceptions=True)
+        
+        for result in results:
+            if isinstance(result, asyncio.TimeoutError):
+                self._stats['evaluator_timeouts'] += 1
+                logger.warning("Strategy evaluator timed out")
+                continue
+            if isinstance(result, BaseException):
+                logger.warning(f"Strategy evaluator error: {result!r}")
+                continue
             try:
-                if asyncio.iscoroutinefunction(evaluator):
-                    result = await evaluator(signal, risk, context)
-                else:
-                    result = evaluator(signal, risk, context)
-                
                 if result and result.get('score', 0) > confidence_score:
                     alternatives.append({
                         'action': best_action,
@@ -575,9 +719,13 @@ class ReasoningLayer:
         
         return mitigations
     
-    def add_strategy_evaluator(self, evaluator: Callable) -> None:
+    def add_strategy_evaluator(
+        self,
+        evaluator: Callable,
+        timeout_seconds: Optional[float] = None
+    ) -> None:
         """Add a strategy evaluator"""
-        self._strategy_evaluators.append(evaluator)
+        self._strategy_evaluators.append(HookRegistration(evaluator, timeout_seconds))
     
     def set_risk_factor(self, name: str, weight: float) -> None:
         """Set a risk factor weight"""
@@ -602,9 +750,10 @@ class ExecutionLayer:
     - 回滾點生成 (Rollback point generation)
     """
     
-    def __init__(self):
+    def __init__(self, hook_timeout: Optional[float] = None):
         """Initialize execution layer"""
-        self._action_handlers: Dict[str, Callable] = {}
+        self._action_handlers: Dict[str, HookRegistration] = {}
+        self._hook_timeout = hook_timeout
         self._rollback_handlers: Dict[str, Callable] = {}
         self._rollback_points: List[Dict[str, Any]] = []
         
@@ -612,7 +761,8 @@ class ExecutionLayer:
         self._stats = {
             'actions_executed': 0,
             'rollbacks_performed': 0,
-            'rollback_points_created': 0
+            'rollback_points_created': 0,
+            'action_timeouts': 0
         }
         
         logger.debug("ExecutionLayer initialized - 執行層已初始化")
@@ -625,6 +775,9 @@ class ExecutionLayer:
         """
         Execute decisions through the execution layer
         
+        Auto-executable decisions run concurrently, each behind its own
+        rollback point; the call returns once all of them have finished.
+        
         Args:
             decisions: Decisions to execute
             context: Processing context
@@ -632,48 +785,60 @@ class ExecutionLayer:
         Returns:
             List of action signals
         """
-        action_signals = []
-        
+        runnable = []
         for decision in decisions:
             if not decision.auto_execute:
                 # Skip decisions requiring approval
                 logger.info(f"Decision {decision.decision_id} requires approval, skipping auto-execute")
                 continue
+            runnable.append(decision)
+        
+        results = await asyncio.gather(*(
+            self._execute_decision(decision, context) for decision in runnable
+        ))
+        
+        return [signal for signal in results if signal]
+    
+    async def _execute_decision(
+        self,
+        decision: Decision,
+        context: CognitiveContext
+    ) -> Optional[CognitiveSignal]:
+        """Execute one decision behind a rollback point"""
+        # Create rollback point
+        rollback_point = await self._create_rollback_point(decision, context)
+        self._stats['rollback_points_created'] += 1
+        
+        # Execute action
+        try:
+            result = await self._execute_action(decision, context)
+            self._stats['actions_executed'] += 1
             
-            # Create rollback point
-            rollback_point = await self._create_rollback_point(decision, context)
-            self._stats['rollback_points_created'] += 1
+            # Generate action signal
+            return CognitiveSignal(
+                signal_id=f"action-{uuid4().hex[:8]}",
+                signal_type=SignalType.ACTION,
+                layer=CognitiveLayer.L3_EXECUTION,
+                source='execution-layer',
+                payload={
+                    'decision_id': decision.decision_id,
+                    'action': decision.action,
+                    'result': result,
+                    'rollback_point_id': rollback_point['id']
+                },
+                confidence=1.0 if result.get('success', False) else 0.5
+            )
             
-            # Execute action
-            try:
-                result = await self._execute_action(decision, context)
-                self._stats['actions_executed'] += 1
-                
-                # Generate action signal
-                action_signal = CognitiveSignal(
-                    signal_id=f"action-{uuid4().hex[:8]}",
-                    signal_type=SignalType.ACTION,
-                    layer=CognitiveLayer.L3_EXECUTION,
-                    source='execution-layer',
-                    payload={
-                        'decision_id': decision.decision_id,
-                        'action': decision.action,
-                        'result': result,
-                        'rollback_point_id': rollback_point['id']
-                    },
-                    confidence=1.0 if result.get('success', False) else 0.5
-                )
-                action_signals.append(action_signal)
-                
-            except Exception as e:
-                logger.error(f"Action execution failed: {e}")
-                
-                # Attempt rollback
-                if rollback_point:
-                    await self._rollback(rollback_point)
-                    self._stats['rollbacks_performed'] += 1
-        
-        return action_signals
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self._stats['action_timeouts'] += 1
+            logger.error(f"Action execution failed: {e!r}")
+            
+            # Attempt rollback
+            if rollback_point:
+                await self._rollback(rollback_point)
+                self._stats['rollbacks_performed'] += 1
+            return None
     
     async def _create_rollback_point(
         self,
@@ -706,10 +871,9 @@ class ExecutionLayer:
         handler = self._action_handlers.get(decision.action)
         
         if handler:
-            if asyncio.iscoroutinefunction(handler):
-                return await handler(decision, context)
-            else:
-                return handler(decision, context)
+            timeout = handler.timeout_seconds if handler.timeout_seconds is not None else self._hook_timeout
+            # A timed-out sync action is rolled back only once its thread is done
+            return await _call_hook(handler.func, (decision, context), timeout, join_on_timeout=True)
         else:
             # Default handler - log and return success
             logger.info(f"Executing action: {decision.action} (no custom handler)")
@@ -735,9 +899,19 @@ class ExecutionLayer:
             logger.warning(f"No rollback handler for action: {action}")
             return False
     
-    def register_action_handler(self, action: str, handler: Callable) -> None:
-        """Register an action handler"""
-        self._action_handlers[action] = handler
+    def register_action_handler(
+        self,
+        action: str,
+        handler: Callable,
+        timeout_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Register an action handler; a timed-out action is rolled back
+        
+        A sync handler cannot be interrupted: on timeout the rollback waits
+        until its worker thread has finished.
+        """
+        self._action_handlers[action] = HookRegistration(handler, timeout_seconds)
     
     def register_rollback_handler(self, action: str, handler: Callable) -> None:
         """Register a rollback handler"""
@@ -932,9 +1106,10 @@ class EnhancedCognitiveProcessor:
         self.config = config or ProcessorConfig()
         
         # Initialize layers
-        self.perception = PerceptionLayer()
-        self.reasoning = ReasoningLayer()
-        self.execution = ExecutionLayer()
+        hook_timeout = self.config.hook_timeout_seconds
+        self.perception = PerceptionLayer(hook_timeout)
+        self.reasoning = ReasoningLayer(hook_timeout)
+        self.execution = ExecutionLayer(hook_timeout)
         self.proof = ProofLayer()
         
         # Processing state
@@ -949,7 +1124,8 @@ class EnhancedCognitiveProcessor:
         self._stats = {
             'signals_received': 0,
             'signals_processed': 0,
-            'processing_errors': 0
+            'processing_errors': 0,
+            'batches_processed': 0
         }
         
         logger.info("EnhancedCognitiveProcessor initialized - 增強認知處理器已初始化")
@@ -994,25 +1170,55 @@ class EnhancedCognitiveProcessor:
         Returns:
             Processing result
         """
-        self._stats['signals_received'] += 1
+        return (await self.process_batch([signal], session_id))[0]
+    
+    async def process_batch(
+        self,
+        signals: List[CognitiveSignal],
+        session_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process a micro-batch of signals through all cognitive layers
+        
+        批量處理信號
+        
+        The batch shares one context. Batch detectors see all signals at
+        once; per-signal detectors, evaluators and actions for different
+        signals run concurrently. A failure while processing one signal
+        fails only that signal's result.
+        
+        Args:
+            signals: Signals to process
+            session_id: Optional session ID for context tracking
+            
+        Returns:
+            Processing result per signal, in input order
+        """
+        self._stats['signals_received'] += len(signals)
         
         # Get or create context
         session_id = session_id or str(uuid4())
         context = self._get_or_create_context(session_id)
-        context.signals.append(signal)
+        context.signals.extend(signals)
         
         try:
-            result = await self._process_through_layers(signal, context)
-            self._stats['signals_processed'] += 1
-            return result
+            results = await self._process_batch_through_layers(signals, context)
+            failed = sum(1 for result in results if not result['success'])
+            self._stats['signals_processed'] += len(signals) - failed
+            self._stats['processing_errors'] += failed
+            self._stats['batches_processed'] += 1
+            return results
         except Exception as e:
-            self._stats['processing_errors'] += 1
+            self._stats['processing_errors'] += len(signals)
             logger.error(f"Signal processing error: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'signal_id': signal.signal_id
-            }
+            return [
+                {
+                    'success': False,
+                    'error': str(e),
+                    'signal_id': signal.signal_id
+                }
+                for signal in signals
+            ]
     
     async def submit_signal(self, signal: CognitiveSignal) -> bool:
         """Submit a signal for asynchronous processing"""
@@ -1029,69 +1235,117 @@ class EnhancedCognitiveProcessor:
         context: CognitiveContext
     ) -> Dict[str, Any]:
         """Process signal through all enabled layers"""
-        result = {
-            'signal_id': signal.signal_id,
-            'success': True,
-            'layers_processed': [],
-            'signals': [],
-            'decisions': [],
-            'evidence': []
-        }
+        return (await self._process_batch_through_layers([signal], context))[0]
+    
+    async def _process_batch_through_layers(
+        self,
+        signals: List[CognitiveSignal],
+        context: CognitiveContext
+    ) -> List[Dict[str, Any]]:
+        """
+        Process a batch through all enabled layers, one stage at a time
+        
+        A signal whose reasoning, execution or proof step raises is marked
+        failed and skips the remaining stages; the other signals continue.
+        """
+        results = [
+            {
+                'signal_id': signal.signal_id,
+                'success': True,
+                'layers_processed': [],
+                'signals': [],
+                'decisions': [],
+                'evidence': []
+            }
+            for signal in signals
+        ]
+        
+        def fail(result: Dict[str, Any], layer: str, error: BaseException) -> None:
+            logger.error(f"Signal {result['signal_id']} failed in {layer}: {error!r}")
+            result['success'] = False
+            result['error'] = str(error) or repr(error)
         
         # L1: Perception
         if self.config.enable_perception:
-            perception_signals = await self.perception.process(signal, context)
-            result['layers_processed'].append('perception')
-            result['signals'].extend([s.to_dict() for s in perception_signals])
+            perception_signals = await self.perception.process_batch(signals, context)
+            for result, outputs in zip(results, perception_signals):
+                result['layers_processed'].append('perception')
+                result['signals'].extend([s.to_dict() for s in outputs])
         else:
-            perception_signals = [signal]
+            perception_signals = [[signal] for signal in signals]
         
         # L2: Reasoning
-        if self.config.enable_reasoning:
-            decisions, reasoning_signals = await self.reasoning.process(perception_signals, context)
-            result['layers_processed'].append('reasoning')
-            result['decisions'].extend([d.to_dict() for d in decisions])
-            result['signals'].extend([s.to_dict() for s in reasoning_signals])
-            context.decisions.extend(decisions)
-        else:
-            decisions = []
-            reasoning_signals = []
+        async def reason(outputs: List[CognitiveSignal]) -> Tuple[List[Decision], List[CognitiveSignal]]:
+            if self.config.enable_reasoning:
+                return await self.reasoning.process(outputs, context)
+            return [], []
+        
+        reasoned = await asyncio.gather(*(
+            reason(outputs) for outputs in perception_signals
+        ), return_exceptions=True)
+        for index, (result, outcome) in enumerate(zip(results, reasoned)):
+            if isinstance(outcome, BaseException):
+                fail(result, 'reasoning', outcome)
+                reasoned[index] = ([], [])
+            elif self.config.enable_reasoning:
+                decisions, reasoning_signals = outcome
+                result['layers_processed'].append('reasoning')
+                result['decisions'].extend([d.to_dict() for d in decisions])
+                result['signals'].extend([s.to_dict() for s in reasoning_signals])
+                context.decisions.extend(decisions)
         
         # L3: Execution
-        if self.config.enable_execution and decisions:
-            action_signals = await self.execution.execute(decisions, context)
-            result['layers_processed'].append('execution')
-            result['signals'].extend([s.to_dict() for s in action_signals])
-        else:
-            action_signals = []
-        
-        # L4: Proof
-        if self.config.enable_proof:
-            all_signals = perception_signals + reasoning_signals + action_signals
-            evidence_signals = await self.proof.generate_evidence(
-                all_signals, decisions, context
-            )
-            result['layers_processed'].append('proof')
-            result['evidence'].extend([s.to_dict() for s in evidence_signals])
-        
-        # Update context history
-        context.history.append({
-            'signal_id': signal.signal_id,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'decisions_made': len(decisions)
-        })
-        
-        return result
+        async def execute(result: Dict[str, Any], decisions: List[Decision]) -> List[CognitiveSignal]:
+            if result['success'] and self.config.enable_execution and decisions:
+                return await self.execution.execute(decisions, context)
+            return []
+        
+        executed = await asyncio.gather(*(
+            execute(result, decisions) for result, (decisions, _) in zip(results, reasoned)
+        ), return_exceptions=True)
+        for index, (result, (decisions, _), outcome) in enumerate(zip(results, reasoned, executed)):
+            if isinstance(outcome, BaseException):
+                fail(result, 'execution', outcome)
+                executed[index] = []
+            elif result['success'] and self.config.enable_execution and decisions:
+                result['layers_processed'].append('execution')
+                result['signals'].extend([s.to_dict() for s in outcome])
+        
+        # L4: Proof (one audit entry per signal, in input order)
+        for result, signal, outputs, (decisions, reasoning_signals), action_signals in zip(
+            results, signals, perception_signals, reasoned, executed
+        ):
+            if result['success'] and self.config.enable_proof:
+                all_signals = outputs + reasoning_signals + action_signals
+                try:
+                    evidence_signals = await self.proof.generate_evidence(
+                        all_signals, decisions, context
+                    )
+                except Exception as e:
+                    fail(result, 'proof', e)
+                else:
+                    result['layers_processed'].append('proof')
+                    result['evidence'].extend([s.to_dict() for s in evidence_signals])
+            
+            # Update context history
+            context.history.append({
+                'signal_id': signal.signal_id,
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'decisions_made': len(decisions)
+            })
+        
+        return results
     
     async def _processing_loop(self) -> None:
-        """Background processing loop"""
+        """Background processing loop, draining the queue in micro-batches"""
         while self._is_running:
             try:
-                signal = await asyncio.wait_for(
+                batch = [await asyncio.wait_for(
                     self._signal_queue.get(),
                     timeout=1.0
-                )
-                await self.process_signal(signal)
+                )]
+                await self._fill_batch(batch)
+                await self.process_batch(batch)
             except asyncio.TimeoutError:
                 continue
             except asyncio.CancelledError:
@@ -1099,6 +1353,23 @@ class EnhancedCognitiveProcessor:
             except Exception as e:
                 logger.error(f"Processing loop error: {e}")
     
+    async def _fill_batch(self, batch: List[CognitiveSignal]) -> None:
+        """Add queued signals to a batch, waiting up to batch_linger_ms for more"""
+        deadline = time.monotonic() + self.config.batch_linger_ms / 1000
+        while len(batch) < self.config.max_batch_size:
+            try:
+                batch.append(self._signal_queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                batch.append(await asyncio.wait_for(self._signal_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                return
+    
     def _get_or_create_context(self, session_id: str) -> CognitiveContext:
         """Get or create a processing context"""
         if session_id not in self._contexts:
@@ -1126,6 +1397,107 @@ class EnhancedCognitiveProcessor:
         }
 
 
+async def benchmark_throughput(
+    signals: int = 2000,
+    batch_size: int = 64,
+    detectors: int = 4,
+    detector_latency_ms: float = 2.0
+) -> Dict[str, Any]:
+    """
+    Measure end-to-end signals per second on a synthetic telemetry stream
+    
+    測量合成信號流的端到端吞吐量
+    
+    Each I/O-bound detector and evaluator sleeps detector_latency_ms; one
+    vectorised anomaly detector and the drift detector score a whole
+    batch per call. The sequential
+    figure awaits the same hooks one after another, signal by signal, as
+    the pipeline did before concurrent evaluation.
+    """
+    latency = detector_latency_ms / 1000
+    
+    async def slow_detector(signal, context):
+        await asyncio.sleep(latency)
+        return None
+    
+    async def batch_drift(batch, context, baselines):
+        await asyncio.sleep(latency)
+        return [
+            {'type': 'value', 'magnitude': s.payload.get('value', 0), 'confidence': 0.5}
+            if abs(s.payload.get('value', 0) - baselines.get('value', 0)) > 90 else None
+            for s in batch
+        ]
+    
+    async def vector_detector(batch, context):
+        await asyncio.sleep(latency)
+        return [
+            {'type': 'spike', 'severity': 'high', 'confidence': 0.9}
+            if s.payload.get('value', 0) > 95 else None
+            for s in batch
+        ]
+    
+    async def evaluator(signal, risk, context):
+        await asyncio.sleep(latency)
+        return {'action': 'scale_out', 'score': 0.9, 'reasoning': ['spike']}
+    
+    def make_processor(lock: Optional[asyncio.Lock] = None) -> EnhancedCognitiveProcessor:
+        def hook(func: Callable) -> Callable:
+            if lock is None:
+                return func
+            
+            async def serialized(*args):
+                async with lock:
+                    return await func(*args)
+            return serialized
+        
+        processor = EnhancedCognitiveProcessor(ProcessorConfig(max_batch_size=batch_size))
+        for _ in range(detectors):
+            processor.perception.add_anomaly_detector(hook(slow_detector))
+        processor.perception.add_drift_detector(hook(batch_drift), batch=True)
+        processor.perception.add_anomaly_detector(hook(vector_detector), batch=True)
+        processor.perception.set_baseline('value', 50)
+        processor.reasoning.add_strategy_evaluator(hook(evaluator))
+        processor.reasoning.add_strategy_evaluator(hook(evaluator))
+        return processor
+    
+    stream = [
+        CognitiveSignal(
+            signal_id=f"sig-{i}",
+            signal_type=SignalType.TELEMETRY,
+            layer=CognitiveLayer.L1_PERCEPTION,
+            source='benchmark',
+            payload={'value': (i * 37) % 100}
+        )
+        for i in range(signals)
+    ]
+    
+    processor = make_processor()
+    start = time.perf_counter()
+    for offset in range(0, signals, batch_size):
+        await processor.process_batch(stream[offset:offset + batch_size], session_id='benchmark')
+    batched = time.perf_counter() - start
+    
+    # Sequential baseline on a sample: one signal at a time, hooks serialized
+    sample = stream[:min(signals, 100)]
+    sequential_processor = make_processor(asyncio.Lock())
+    start = time.perf_counter()
+    for signal in sample:
+        await sequential_processor.process_signal(signal, session_id='benchmark')
+    sequential = time.perf_counter() - start
+    
+    batched_rate = signals / batched
+    sequential_rate = len(sample) / sequential
+    return {
+        'signals': signals,
+        'batch_size': batch_size,
+        'signals_per_second': batched_rate,
+        'sequential_signals_per_second': sequential_rate,
+        'speedup': batched_rate / sequential_rate,
+        'anomalies_detected': processor.perception.get_stats()['anomalies_detected'],
+        'decisions_made': processor.reasoning.get_stats()['decisions_made']
+    }
+
+
 # Factory function
 def create_cognitive_processor(
     config: Optional[ProcessorConfig] = None
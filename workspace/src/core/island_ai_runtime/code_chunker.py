@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Code Chunker - 代碼分塊
+Syntax-aware Chunking and Reference Extraction
+
+將源文件切分為語法感知的代碼塊，並提取導入與調用關係
+"""
+
+import ast
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+
+
+@dataclass
+class CodeChunk:
+    """代碼塊"""
+
+    path: str
+    name: str
+    kind: str  # module, class, function, method, block
+    start_line: int
+    end_line: int
+    content: str
+    calls: list[str] = field(default_factory=list)
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha256(self.content.encode()).hexdigest()
+
+
+@dataclass
+class ParsedFile:
+    """分塊結果"""
+
+    path: str
+    chunks: list[CodeChunk] = field(default_factory=list)
+    # 每個導入的候選模組名稱（依優先順序），例如 from a import b -> ["a.b", "a"]
+    imports: list[list[str]] = field(default_factory=list)
+
+
+class CodeChunker:
+    """
+    代碼分塊器
+
+    Python 文件按頂層函數、類頭部和方法切分，其餘模組級代碼
+    合併為模組塊；其他文件按空行分段並打包。
+    塊名稱在內容變化時保持穩定，以便增量索引比較內容雜湊。
+    """
+
+    # 平均每 N 個段落出現一個分組邊界
+    GROUP_BOUNDARY_MODULUS = 4
+
+    def __init__(self, max_chunk_lines: int = 120):
+        self.max_chunk_lines = max_chunk_lines
+
+    def parse(self, path: str, content: str) -> ParsedFile:
+        """切分文件"""
+        if path.endswith(".py"):
+            try:
+                tree = ast.parse(content)
+            except (SyntaxError, ValueError):
+                pass
+            else:
+                return self._parse_python(path, content, tree)
+        return ParsedFile(path=path, chunks=self._split_blocks(path, content.splitlines(True)))
+
+    # ------------------------------------------------------------------
+    # Python
+    # ------------------------------------------------------------------
+
+    def _parse_python(self, path: str, content: str, tree: ast.Module) -> ParsedFile:
+        lines = content.splitlines(True)
+        chunks: list[CodeChunk] = []
+        covered: set[int] = set()
+
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                start, end = self._span(node)
+                covered.update(range(start, end + 1))
+                chunks.extend(self._window(path, node.name, "function", lines, start, end, node))
+
+            elif isinstance(node, ast.ClassDef):
+                start, end = self._span(node)
+                covered.update(range(start, end + 1))
+                method_lines: set[int] = set()
+
+                for child in node.body:
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        m_start, m_end = self._span(child)
+                        method_lines.update(range(m_start, m_end + 1))
+                        chunks.extend(
+                            self._window(
+                                path, f"{node.name}.{child.name}", "method", lines, m_start, m_end, child
+                            )
+                        )
+
+                header = [n for n in range(start, end + 1) if n not in method_lines]
+                chunks.append(
+                    CodeChunk(
+                        path=path,
+                        name=node.name,
+                        kind="class",
+                        start_line=start,
+                        end_line=end,
+                        content="".join(lines[n - 1] for n in header),
+                    )
+                )
+
+        # 其餘模組級代碼按連續區段打包
+        remainder = [n for n in range(1, len(lines) + 1) if n not in covered]
+        module_chunks = self._pack_lines(path, lines, remainder, "module")
+
+        # 重名定義（如 property setter）加序號區分
+        seen: dict[str, int] = {}
+        for chunk in chunks:
+            seen[chunk.name] = seen.get(chunk.name, 0) + 1
+            if seen[chunk.name] > 1:
+                chunk.name = f"{chunk.name}~{seen[chunk.name]}"
+
+        return ParsedFile(
+            path=path,
+            chunks=module_chunks + chunks,
+            imports=self._imports(path, tree),
+        )
+
+    def _window(
+        self,
+        path: str,
+        name: str,
+        kind: str,
+        lines: list[str],
+        start: int,
+        end: int,
+        node: ast.AST,
+    ) -> list[CodeChunk]:
+        """超長的函數按 max_chunk_lines 切分，調用歸屬第一段"""
+        calls = self._calls(node)
+        parts = []
+        for index, first in enumerate(range(start, end + 1, self.max_chunk_lines)):
+            last = min(first + self.max_chunk_lines - 1, end)
+            parts.append(
+                CodeChunk(
+                    path=path,
+                    name=name if index == 0 else f"{name}#{index}",
+                    kind=kind,
+                    start_line=first,
+                    end_line=last,
+                    content="".join(lines[first - 1 : last]),
+                    calls=calls if index == 0 else [],
+                )
+            )
+        return parts
+
+    @staticmethod
+    def _span(node: ast.AST) -> tuple[int, int]:
+        decorators = getattr(node, "decorator_list", [])
+        start = min([node.lineno] + [d.lineno for d in decorators])
+        return start, node.end_lineno or node.lineno
+
+    @staticmethod
+    def _calls(node: ast.AST) -> list[str]:
+        names = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                if isinstance(child.func, ast.Name):
+                    names.add(child.func.id)
+                elif isinstance(child.func, ast.Attribute):
+                    names.add(child.func.attr)
+        return sorted(names)
+
+    @staticmethod
+    def _imports(path: str, tree: ast.Module) -> list[list[str]]:
+        package = list(PurePosixPath(path).parent.parts)
+        imports = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.extend([alias.name] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    parent = package[: len(package) - (node.level - 1)] if node.level > 1 else package
+                    base = ".".join([*parent, base] if base else parent)
+                for alias in node.names:
+                    if alias.name == "*":
+                        imports.append([base])
+                    else:
+                        imports.append([f"{base}.{alias.name}" if base else alias.name, base])
+        return imports
+
+    # ------------------------------------------------------------------
+    # Text
+    # ------------------------------------------------------------------
+
+    def _split_blocks(self, path: str, lines: list[str]) -> list[CodeChunk]:
+        """按空行分段後打包，塊名稱取自內容雜湊"""
+        return self._pack_lines(path, lines, list(range(1, len(lines) + 1)), "block")
+
+    def _pack_lines(
+        self, path: str, lines: list[str], numbers: list[int], kind: str
+    ) -> list[CodeChunk]:
+        # 切成段落：行號不連續或遇到空行即斷開
+        paragraphs: list[list[int]] = []
+        current: list[int] = []
+        for n in numbers:
+            blank = not lines[n - 1].strip()
+            if current and (n != current[-1] + 1 or blank):
+                paragraphs.append(current)
+                current = []
+            if not blank:
+                current.append(n)
+        if current:
+            paragraphs.append(current)
+
+        # 段落打包到 max_chunk_lines；分組邊界由段落內容決定，
+        # 單處修改只影響所在分組，不會使後續分組整體錯位
+        groups: list[list[int]] = []
+        closed = True
+        for paragraph in paragraphs:
+            if not closed and len(groups[-1]) + len(paragraph) <= self.max_chunk_lines:
+                groups[-1].extend(paragraph)
+            else:
+                groups.extend(
+                    paragraph[i : i + self.max_chunk_lines]
+                    for i in range(0, len(paragraph), self.max_chunk_lines)
+                )
+            text = "".join(lines[n - 1] for n in paragraph)
+            closed = hashlib.sha256(text.encode()).digest()[0] % self.GROUP_BOUNDARY_MODULUS == 0
+
+        chunks = []
+        seen: dict[str, int] = {}
+        for group in groups:
+            content = "".join(lines[n - 1] for n in group)
+            digest = hashlib.sha256(content.encode()).hexdigest()[:12]
+            seen[digest] = seen.get(digest, 0) + 1
+            suffix = f"~{seen[digest]}" if seen[digest] > 1 else ""
+            chunks.append(
+                CodeChunk(
+                    path=path,
+                    name=f"<{kind}:{digest}{suffix}>",
+                    kind=kind,
+                    start_line=group[0],
+                    end_line=group[-1],
+                    content=content,
+                )
+            )
+        return chunks
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Gateway Cache - 閘道快取
+Response Cache and Request Coalescing
+
+為確定性模型請求提供回應快取（TTL + LRU，可選磁碟持久化），
+並合併同時進行的相同請求
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class ResponseCache:
+    """
+    回應快取
+
+    記憶體層為有大小上限的 LRU，每個條目帶有過期時間；
+    指定 directory 時，條目同時寫入 SQLite 文件，記憶體未命中時回讀，
+    因此重啟後快取仍然有效。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        directory: str | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        if directory:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(Path(directory) / "responses.db"), check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, body TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """讀取快取條目，過期視為未命中"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        if self._conn is not None:
+            row = await asyncio.to_thread(self._read, key, now)
+            if row is not None:
+                expires_at, value = row
+                self._remember(key, expires_at, value)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        """寫入快取條目"""
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, expires_at, value)
+        if self._conn is not None:
+            await asyncio.to_thread(self._write, key, expires_at, value)
+
+    def clear(self) -> None:
+        """清空快取"""
+        self._entries.clear()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """關閉磁碟快取"""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """獲取統計"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "persistent": self._conn is not None,
+        }
+
+    def _remember(self, key: str, expires_at: float, value: dict[str, Any]) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: str, now: float) -> tuple[float, dict[str, Any]] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, body FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def _write(self, key: str, expires_at: float, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, expires_at, body) VALUES (?, ?, ?)",
+                (key, expires_at, json.dumps(value)),
+            )
+            # 定期清理過期條目
+            self._writes += 1
+            if self._writes % self.max_entries == 0:
+                self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+
+class SingleFlight:
+    """
+    請求合併
+
+    同一個 key 同時只執行一次；其他呼叫者等待並共享結果。
+    執行放在獨立任務中，單個呼叫者取消不會影響其他等待者。
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """執行或加入進行中的相同請求"""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+
+            def finished(done: asyncio.Task) -> None:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+                # 所有等待者都已取消時，避免 "exception was never retrieved"
+                if not done.cancelled():
+                    done.exception()
+
+            task.add_done_callback(finished)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
@@ -6,11 +6,21 @@ Repository Graph, Embeddings, and Vector Search
 提供代碼庫理解和語義搜索能力
 """
 
+import asyncio
 import hashlib
+import json
+import os
+from collections.abc import AsyncIterable, Iterable
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from .code_chunker import CodeChunk, CodeChunker, ParsedFile
+from .vector_index import IVFIndex, normalize_rows, select_top_k
+
 
 class NodeType(Enum):
     """節點類型"""
@@ -22,6 +32,7 @@ class NodeType(Enum):
     VARIABLE = "variable"
     IMPORT = "import"
     COMMENT = "comment"
+    CHUNK = "chunk"  # 模組級代碼或文本塊
 
 
 class EdgeType(Enum):
@@ -76,7 +87,14 @@ class RepoGraph:
 
     def __init__(self):
         self.nodes: dict[str, GraphNode] = {}
-        self.edges: list[GraphEdge] = []
+        # 鄰接索引：出邊按源節點分組，入邊記錄源節點集合
+        self._outgoing: dict[str, list[GraphEdge]] = {}
+        self._incoming: dict[str, set[str]] = {}
+
+    @property
+    def edges(self) -> list[GraphEdge]:
+        """所有邊"""
+        return [edge for edges in self._outgoing.values() for edge in edges]
 
     def add_node(self, node: GraphNode) -> None:
         """添加節點"""
@@ -84,7 +102,31 @@ class RepoGraph:
 
     def add_edge(self, edge: GraphEdge) -> None:
         """添加邊"""
-        self.edges.append(edge)
+        self._outgoing.setdefault(edge.source_id, []).append(edge)
+        self._incoming.setdefault(edge.target_id, set()).add(edge.source_id)
+
+    def remove_node(self, node_id: str) -> None:
+        """刪除節點及其所有出入邊"""
+        self.nodes.pop(node_id, None)
+        self.remove_edges(node_id)
+        for source_id in self._incoming.pop(node_id, set()):
+            edges = self._outgoing.get(source_id, [])
+            self._outgoing[source_id] = [e for e in edges if e.target_id != node_id]
+
+    def remove_edges(self, source_id: str, edge_types: set[EdgeType] | None = None) -> None:
+        """刪除源節點的出邊（可按類型過濾）"""
+        kept = []
+        for edge in self._outgoing.pop(source_id, []):
+            if edge_types is None or edge.edge_type in edge_types:
+                targets = self._incoming.get(edge.target_id)
+                if targets is not None:
+                    targets.discard(source_id)
+            else:
+                kept.append(edge)
+        if kept:
+            self._outgoing[source_id] = kept
+            for edge in kept:
+                self._incoming.setdefault(edge.target_id, set()).add(source_id)
 
     def get_node(self, node_id: str) -> GraphNode | None:
         """獲取節點"""
@@ -93,12 +135,11 @@ class RepoGraph:
     def get_neighbors(self, node_id: str, edge_type: EdgeType | None = None) -> list[GraphNode]:
         """獲取鄰居節點"""
         neighbors = []
-        for edge in self.edges:
-            if edge.source_id == node_id:
-                if edge_type is None or edge.edge_type == edge_type:
-                    neighbor = self.nodes.get(edge.target_id)
-                    if neighbor:
-                        neighbors.append(neighbor)
+        for edge in self._outgoing.get(node_id, []):
+            if edge_type is None or edge.edge_type == edge_type:
+                neighbor = self.nodes.get(edge.target_id)
+                if neighbor:
+                    neighbors.append(neighbor)
         return neighbors
 
     def to_dict(self) -> dict[str, Any]:
@@ -138,22 +179,27 @@ class EmbeddingProvider:
 
     async def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """批量生成嵌入"""
-        return [self._mock_embedding(text) for text in texts]
+        return self._mock_embeddings(texts).tolist()
+
+    async def embed_matrix(self, texts: list[str]) -> np.ndarray:
+        """批量生成嵌入，返回 (len(texts), dimension) 的 float32 矩陣"""
+        return self._mock_embeddings(texts).astype(np.float32)
 
     def _mock_embedding(self, text: str) -> list[float]:
         """生成模擬嵌入（用於測試）"""
-        # 使用 hash 生成確定性的模擬嵌入
-        hash_bytes = hashlib.sha256(text.encode()).digest()
-        embedding = []
-        for i in range(0, min(len(hash_bytes), self._dimension // 8)):
-            byte_val = hash_bytes[i % len(hash_bytes)]
-            embedding.append((byte_val / 255.0) - 0.5)
+        return self._mock_embeddings([text])[0].tolist()
 
-        # 填充到完整維度
-        while len(embedding) < self._dimension:
-            embedding.append(0.0)
+    def _mock_embeddings(self, texts: list[str]) -> np.ndarray:
+        """批量生成模擬嵌入（用於測試）"""
+        # 使用 hash 生成確定性的模擬嵌入，一次處理整批
+        digests = b"".join(hashlib.sha256(text.encode()).digest() for text in texts)
+        hash_bytes = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), 32)
+        width = min(hash_bytes.shape[1], self._dimension // 8)
 
-        return embedding[: self._dimension]
+        # 其餘維度填充 0
+        embeddings = np.zeros((len(texts), self._dimension), dtype=np.float64)
+        embeddings[:, :width] = hash_bytes[:, :width] / 255.0 - 0.5
+        return embeddings
 
 
 class VectorStore:
@@ -161,47 +207,624 @@ class VectorStore:
     向量存儲
 
     存儲和搜索向量嵌入。
+
+    向量以正規化後的 float32 連續矩陣保存，精確搜索只需一次
+    矩陣向量乘法加 argpartition；語料超過 ann_threshold 且已建立
+    IVF 索引時改走近似搜索。save/load 使用 .npy 文件，
+    載入時以記憶體映射打開，首次寫入才複製到記憶體。
     """
 
-    def __init__(self):
-        self.vectors: dict[str, list[float]] = {}
+    MATRIX_FILE = "vectors.npy"
+    MANIFEST_FILE = "vectors.json"
+    CENTROIDS_FILE = "ivf_centroids.npy"
+    ASSIGNMENTS_FILE = "ivf_assignments.npy"
+
+    def __init__(
+        self,
+        dimension: int | None = None,
+        ann_threshold: int = 50000,
+        index: IVFIndex | None = None,
+    ):
+        self.dimension = dimension
+        self.ann_threshold = ann_threshold
+        self.index = index
         self.metadata: dict[str, dict[str, Any]] = {}
+        self._ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._matrix = np.empty((0, dimension or 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._rows
+
+    def get_vector(self, id: str) -> np.ndarray | None:
+        """獲取已正規化的向量"""
+        row = self._rows.get(id)
+        return None if row is None else self._matrix[row]
 
     def upsert(self, id: str, vector: list[float], metadata: dict[str, Any] | None = None) -> None:
         """插入或更新向量"""
-        self.vectors[id] = vector
-        self.metadata[id] = metadata or {}
+        self.upsert_batch([id], [vector], [metadata or {}])
+
+    def upsert_batch(
+        self,
+        ids: list[str],
+        vectors: list[list[float]] | np.ndarray,
+        metadatas: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """批量插入或更新向量"""
+        if not ids:
+            return
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        if self.dimension is None:
+            self.dimension = matrix.shape[1]
+            self._matrix = np.empty((0, self.dimension), dtype=np.float32)
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(
+                f"Vector dimension {matrix.shape[1]} does not match store dimension {self.dimension}"
+            )
+
+        matrix = normalize_rows(matrix)
+        metadatas = metadatas or [{} for _ in ids]
+
+        # 同一批內重複的 ID 以最後一次為準
+        latest: dict[str, int] = {}
+        for position, id in enumerate(ids):
+            latest[id] = position
+
+        # 新 ID 追加到矩陣末端（連續寫入），已存在的 ID 原地覆寫
+        size = len(self._ids)
+        appended: list[int] = []
+        updated_rows: list[int] = []
+        updated: list[int] = []
+        for id, position in latest.items():
+            row = self._rows.get(id)
+            if row is None:
+                self._rows[id] = len(self._ids)
+                self._ids.append(id)
+                appended.append(position)
+            else:
+                updated_rows.append(row)
+                updated.append(position)
+            self.metadata[id] = metadatas[position] or {}
+
+        self._reserve(size)
+        if appended:
+            self._matrix[size : size + len(appended)] = matrix[appended]
+        if updated:
+            self._matrix[updated_rows] = matrix[updated]
+
+        if self.index is not None and self.index.is_trained:
+            if appended:
+                self.index.set_rows(size, self.index.assign(matrix[appended]))
+            if updated:
+                self.index.assignments[updated_rows] = self.index.assign(matrix[updated])
 
     def delete(self, id: str) -> None:
         """刪除向量"""
-        self.vectors.pop(id, None)
+        row = self._rows.pop(id, None)
         self.metadata.pop(id, None)
-
-    def search(self, query_vector: list[float], top_k: int = 10) -> list[tuple[str, float]]:
+        if row is None:
+            return
+
+        # 以末行填補空位，保持矩陣連續
+        last = len(self._ids) - 1
+        last_id = self._ids.pop()
+        if row != last:
+            self._ensure_writable()
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+            if self.index is not None and self.index.is_trained:
+                self.index.move_row(last, row)
+
+    def search(
+        self, query_vector: list[float] | np.ndarray, top_k: int = 10
+    ) -> list[tuple[str, float]]:
         """搜索最相似的向量"""
-        scores = []
-        for id, vector in self.vectors.items():
-            score = self._cosine_similarity(query_vector, vector)
-            scores.append((id, score))
+        size = len(self._ids)
+        query = np.asarray(query_vector, dtype=np.float32)
+        if size == 0 or top_k <= 0 or query.shape != (self.dimension,):
+            return []
+
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+
+        if self._use_index(size):
+            rows = self.index.candidates(query, size)
+            if len(rows) >= top_k:
+                scores = self._matrix[rows] @ query
+                best = select_top_k(scores, top_k)
+                return [(self._ids[rows[i]], float(scores[i])) for i in best]
+
+        scores = self._matrix[:size] @ query
+        return [(self._ids[i], float(scores[i])) for i in select_top_k(scores, top_k)]
+
+    def build_index(self, n_lists: int | None = None, n_probe: int | None = None) -> IVFIndex:
+        """訓練 IVF 近似索引，預設約 sqrt(N) 個群"""
+        size = len(self._ids)
+        if self.index is None:
+            self.index = IVFIndex(n_lists=n_lists or max(1, int(size**0.5)))
+        elif n_lists:
+            self.index.n_lists = n_lists
+        if n_probe:
+            self.index.n_probe = n_probe
+        self.index.train(self._matrix[:size])
+        return self.index
+
+    def save(self, directory: str) -> None:
+        """保存到目錄（矩陣為 .npy，ID 與元數據為 JSON）"""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        size = len(self._ids)
+
+        self._atomic_save(path / self.MATRIX_FILE, self._matrix[:size])
+        if self.index is not None and self.index.is_trained:
+            self._atomic_save(path / self.CENTROIDS_FILE, self.index.centroids)
+            self._atomic_save(path / self.ASSIGNMENTS_FILE, self.index.assignments[:size])
+
+        manifest = {
+            "dimension": self.dimension,
+            "ann_threshold": self.ann_threshold,
+            "ids": self._ids,
+            "metadata": [self.metadata[id] for id in self._ids],
+            "index": (
+                {"n_lists": self.index.n_lists, "n_probe": self.index.n_probe}
+                if self.index is not None and self.index.is_trained
+                else None
+            ),
+        }
+        tmp = path / f"{self.MANIFEST_FILE}.tmp"
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, path / self.MANIFEST_FILE)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "VectorStore":
+        """從目錄載入，預設以唯讀記憶體映射打開矩陣"""
+        path = Path(directory)
+        manifest = json.loads((path / cls.MANIFEST_FILE).read_text())
+
+        store = cls(dimension=manifest["dimension"], ann_threshold=manifest["ann_threshold"])
+        store._matrix = np.load(path / cls.MATRIX_FILE, mmap_mode="r" if mmap else None)
+        store._ids = manifest["ids"]
+        store._rows = {id: row for row, id in enumerate(store._ids)}
+        store.metadata = dict(zip(store._ids, manifest["metadata"]))
+
+        if manifest.get("index"):
+            index = IVFIndex(**manifest["index"])
+            index.centroids = np.load(path / cls.CENTROIDS_FILE)
+            index.assignments = np.load(path / cls.ASSIGNMENTS_FILE)
+            store.index = index
+        return store
+
+    def _use_index(self, size: int) -> bool:
+        return self.index is not None and self.index.is_trained and size >= self.ann_threshold
+
+    def _ensure_writable(self) -> None:
+        """記憶體映射的矩陣在首次寫入時複製"""
+        if not self._matrix.flags.writeable:
+            self._matrix = np.array(self._matrix)
+
+    def _reserve(self, filled: int) -> None:
+        """確保矩陣容納所有 ID（前 filled 行為有效數據），容量不足時倍增"""
+        size = len(self._ids)
+        if size <= len(self._matrix):
+            self._ensure_writable()
+            return
+        grown = np.empty((max(size, 2 * len(self._matrix), 64), self.dimension), dtype=np.float32)
+        grown[:filled] = self._matrix[:filled]
+        self._matrix = grown
+
+    @staticmethod
+    def _atomic_save(path: Path, array: np.ndarray) -> None:
+        tmp = path.with_name(f"{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp, path)
 
-        # 按分數排序
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:top_k]
+
+@dataclass
+class IndexStats:
+    """索引統計"""
+
+    files_indexed: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    chunks_embedded: int = 0
+    chunks_unchanged: int = 0
+    chunks_removed: int = 0
+    files_linked: int = 0
+
+
+@dataclass
+class _LinkEntry:
+    """單個文件在連結索引中登記的鍵"""
+
+    modules: set[str] = field(default_factory=set)
+    imports: set[str] = field(default_factory=set)
+    calls: set[str] = field(default_factory=set)
+    definitions: set[tuple[str, str]] = field(default_factory=set)
+
+
+class RepoIndexer:
+    """
+    倉庫索引管線
+
+    以流水線方式增量索引文件：
+    - 語法感知分塊（CodeChunker）
+    - 按內容雜湊跳過未變化的文件與代碼塊
+    - 批量嵌入，最多 max_concurrency 批同時進行
+    - 以 ast 提取的導入/調用關係填充 RepoGraph；模組與定義索引按文件
+      差量維護，只重連引用了變化名稱的文件
+
+    索引狀態（內容雜湊、導入、調用）保存在 RepoGraph 節點的
+    metadata 中，因此 save_index/load_index 之後仍可增量更新。
+    """
+
+    _NODE_TYPES = {
+        "class": NodeType.CLASS,
+        "function": NodeType.FUNCTION,
+        "method": NodeType.FUNCTION,
+        "module": NodeType.CHUNK,
+        "block": NodeType.CHUNK,
+    }
+    _DEFINITION_KINDS = {"class", "function", "method"}
+
+    def __init__(
+        self,
+        engine: "KnowledgeEngine",
+        chunker: CodeChunker | None = None,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+    ):
+        self.engine = engine
+        self.chunker = chunker or CodeChunker()
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+
+        # 連結索引，對應 _indexed_graph；圖被替換（如 load_index）時重建
+        self._indexed_graph: RepoGraph | None = None
+        self._entries: dict[str, _LinkEntry] = {}
+        self._modules: dict[str, set[str]] = {}  # 模組名後綴 -> 文件
+        self._definitions: dict[str, set[str]] = {}  # 簡單名稱 -> 定義代碼塊
+        self._importers: dict[str, set[str]] = {}  # 模組名候選 -> 導入它的文件
+        self._callers: dict[str, set[str]] = {}  # 被調用名稱 -> 調用它的文件
+
+    async def index_files(
+        self,
+        files: Iterable[tuple[str, str]] | AsyncIterable[tuple[str, str]],
+        prune: bool = False,
+    ) -> IndexStats:
+        """
+        增量索引 (path, content) 流
+
+        prune=True 時，刪除本次未出現的已索引文件。
+        """
+        stats = IndexStats()
+        graph = self.engine.repo_graph
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: list[asyncio.Task] = []
+        pending: list[tuple[str, CodeChunk]] = []
+        file_hashes: dict[str, str] = {}
+        seen: set[str] = set()
+        self._ensure_link_index()
+
+        async def submit(batch: list[tuple[str, CodeChunk]]) -> None:
+            # 先取得許可再建立任務，嵌入跟不上時反壓文件讀取
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(self._embed_batch(batch, semaphore, stats)))
+
+        try:
+            async for path, content in self._iterate(files):
+                seen.add(path)
+                file_id = self.engine._generate_id(path)
+                content_hash = hashlib.sha256(content.encode()).hexdigest()
+                file_node = graph.get_node(file_id)
+                if file_node and file_node.metadata.get("content_hash") == content_hash:
+                    stats.files_unchanged += 1
+                    continue
+
+                parsed = self.chunker.parse(path, content)
+                changed = self._apply_file(file_id, parsed, stats)
+                file_hashes[file_id] = content_hash
+                stats.files_indexed += 1
+
+                pending.extend(changed)
+                while len(pending) >= self.batch_size:
+                    await submit(pending[: self.batch_size])
+                    pending = pending[self.batch_size :]
+
+            if pending:
+                await submit(pending)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        # 全部嵌入成功後才記錄文件雜湊，失敗的文件下次重新處理
+        for file_id, content_hash in file_hashes.items():
+            graph.nodes[file_id].metadata["content_hash"] = content_hash
+
+        if prune:
+            for node in list(graph.nodes.values()):
+                if node.node_type == NodeType.FILE and node.path not in seen:
+                    self._remove(node.id, stats)
+                    stats.files_removed += 1
+
+        self._link(file_hashes, stats)
+        return stats
+
+    async def remove_file(self, path: str) -> IndexStats:
+        """從索引刪除文件"""
+        stats = IndexStats()
+        file_id = self.engine._generate_id(path)
+        self._ensure_link_index()
+        if file_id in self.engine.repo_graph.nodes:
+            self._remove(file_id, stats)
+            stats.files_removed = 1
+            self._link([file_id], stats)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
 
     @staticmethod
-    def _cosine_similarity(a: list[float], b: list[float]) -> float:
-        """計算餘弦相似度"""
-        if len(a) != len(b):
-            return 0.0
+    async def _iterate(files):
+        if hasattr(files, "__aiter__"):
+            async for item in files:
+                yield item
+        else:
+            for item in files:
+                yield item
+
+    def _apply_file(
+        self, file_id: str, parsed: ParsedFile, stats: IndexStats
+    ) -> list[tuple[str, CodeChunk]]:
+        """更新文件與代碼塊節點，返回需要嵌入的代碼塊"""
+        graph = self.engine.repo_graph
+        store = self.engine.vector_store
+        path = parsed.path
+
+        existing = {node.id: node for node in graph.get_neighbors(file_id, EdgeType.CONTAINS)}
+
+        file_node = graph.get_node(file_id)
+        if file_node is None:
+            file_node = GraphNode(
+                id=file_id, name=path.split("/")[-1], node_type=NodeType.FILE, path=path
+            )
+            graph.add_node(file_node)
+        file_node.metadata["imports"] = parsed.imports
+        file_node.metadata.pop("content_hash", None)
+        graph.remove_edges(file_id, {EdgeType.CONTAINS})
+
+        changed = []
+        for chunk in parsed.chunks:
+            chunk_id = self.engine._generate_id(f"{path}#{chunk.name}")
+            metadata = {
+                "kind": chunk.kind,
+                "start_line": chunk.start_line,
+                "end_line": chunk.end_line,
+                "calls": chunk.calls,
+            }
+            node = existing.pop(chunk_id, None)
+
+            if node is not None and node.metadata.get("content_hash") == chunk.content_hash:
+                # 內容未變，只更新行號等元數據
+                node.metadata.update(metadata)
+                store.metadata[chunk_id] = self._vector_metadata(chunk)
+                stats.chunks_unchanged += 1
+            else:
+                graph.add_node(
+                    GraphNode(
+                        id=chunk_id,
+                        name=chunk.name,
+                        node_type=self._NODE_TYPES[chunk.kind],
+                        path=path,
+                        content=chunk.content,
+                        metadata=metadata,
+                    )
+                )
+                changed.append((chunk_id, chunk))
+
+            graph.add_edge(GraphEdge(file_id, chunk_id, EdgeType.CONTAINS))
+
+        for chunk_id in existing:
+            graph.remove_node(chunk_id)
+            store.delete(chunk_id)
+            stats.chunks_removed += 1
+
+        return changed
+
+    async def _embed_batch(
+        self,
+        batch: list[tuple[str, CodeChunk]],
+        semaphore: asyncio.Semaphore,
+        stats: IndexStats,
+    ) -> None:
+        try:
+            matrix = await self.engine.embedding_provider.embed_matrix(
+                [chunk.content for _, chunk in batch]
+            )
+            self.engine.vector_store.upsert_batch(
+                [chunk_id for chunk_id, _ in batch],
+                matrix,
+                [self._vector_metadata(chunk) for _, chunk in batch],
+            )
+            for chunk_id, chunk in batch:
+                node = self.engine.repo_graph.get_node(chunk_id)
+                if node is not None:
+                    node.metadata["content_hash"] = chunk.content_hash
+            stats.chunks_embedded += len(batch)
+        finally:
+            semaphore.release()
+
+    def _remove(self, file_id: str, stats: IndexStats) -> None:
+        graph = self.engine.repo_graph
+        for node in graph.get_neighbors(file_id, EdgeType.CONTAINS):
+            graph.remove_node(node.id)
+            self.engine.vector_store.delete(node.id)
+            stats.chunks_removed += 1
+        graph.remove_node(file_id)
+
+    def _ensure_link_index(self) -> None:
+        """圖被替換後（如 load_index），從圖重建連結索引"""
+        graph = self.engine.repo_graph
+        if self._indexed_graph is graph:
+            return
+        self._indexed_graph = graph
+        self._entries = {}
+        self._modules = {}
+        self._definitions = {}
+        self._importers = {}
+        self._callers = {}
+        for node in list(graph.nodes.values()):
+            if node.node_type == NodeType.FILE:
+                self._reindex_file(node.id)
+
+    def _link_entry(self, file_id: str) -> _LinkEntry:
+        """從圖中讀出文件當前應登記的鍵"""
+        graph = self.engine.repo_graph
+        file_node = graph.get_node(file_id)
+        entry = _LinkEntry()
+        if file_node is None:
+            return entry
+
+        # 模組名：登記路徑的所有後綴
+        if file_node.path.endswith(".py"):
+            parts = file_node.path[:-3].split("/")
+            if parts[-1] == "__init__":
+                parts = parts[:-1]
+            entry.modules = {".".join(parts[i:]) for i in range(len(parts))}
+
+        entry.imports = {c for candidates in file_node.metadata.get("imports", []) for c in candidates}
+        for chunk in graph.get_neighbors(file_id, EdgeType.CONTAINS):
+            entry.calls.update(chunk.metadata.get("calls", []))
+            if chunk.metadata.get("kind") in self._DEFINITION_KINDS and "#" not in chunk.name:
+                simple = chunk.name.split("~")[0].rsplit(".", 1)[-1]
+                entry.definitions.add((simple, chunk.id))
+        return entry
+
+    def _reindex_file(self, file_id: str) -> tuple[set[str], set[str]]:
+        """按差量更新文件的索引登記，返回變化的定義名稱與模組名"""
+        old = self._entries.pop(file_id, _LinkEntry())
+        new = self._link_entry(file_id)
+        if self.engine.repo_graph.get_node(file_id) is not None:
+            self._entries[file_id] = new
+
+        for index, old_keys, new_keys in (
+            (self._modules, old.modules, new.modules),
+            (self._importers, old.imports, new.imports),
+            (self._callers, old.calls, new.calls),
+        ):
+            self._diff_index(index, old_keys, new_keys, file_id)
+
+        for name, chunk_id in old.definitions - new.definitions:
+            self._discard(self._definitions, name, chunk_id)
+        for name, chunk_id in new.definitions - old.definitions:
+            self._definitions.setdefault(name, set()).add(chunk_id)
+
+        changed_names = {name for name, _ in old.definitions ^ new.definitions}
+        return changed_names, old.modules ^ new.modules
+
+    def _diff_index(
+        self, index: dict[str, set[str]], old: set[str], new: set[str], value: str
+    ) -> None:
+        for key in old - new:
+            self._discard(index, key, value)
+        for key in new - old:
+            index.setdefault(key, set()).add(value)
 
-        dot_product = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
+    @staticmethod
+    def _discard(index: dict[str, set[str]], key: str, value: str) -> None:
+        values = index.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del index[key]
+
+    def _resolve_module(self, key: str) -> str | None:
+        """後綴只對應一個文件時才可解析"""
+        owners = self._modules.get(key)
+        if owners and len(owners) == 1:
+            return next(iter(owners))
+        return None
+
+    def _link(self, file_ids: Iterable[str], stats: IndexStats) -> None:
+        """
+        更新變化文件的索引登記並重建受影響文件的導入與調用邊
+
+        受影響的文件：變化的文件本身、調用了新增或消失的定義名稱的文件、
+        導入了新增或消失的模組名的文件。
+        """
+        graph = self.engine.repo_graph
+        dirty = set(file_ids)
+        removed = self._entries.keys() - graph.nodes.keys()
+
+        changed_names: set[str] = set()
+        changed_modules: set[str] = set()
+        for file_id in dirty | removed:
+            names, modules = self._reindex_file(file_id)
+            changed_names |= names
+            changed_modules |= modules
+
+        for name in changed_names:
+            dirty |= self._callers.get(name, set())
+        for key in changed_modules:
+            dirty |= self._importers.get(key, set())
+
+        for file_id in dirty:
+            file_node = graph.get_node(file_id)
+            if file_node is None:
+                continue
+            stats.files_linked += 1
+
+            graph.remove_edges(file_id, {EdgeType.IMPORTS})
+            imported: set[str] = set()
+            for candidates in file_node.metadata.get("imports", []):
+                target = next(filter(None, map(self._resolve_module, candidates)), None)
+                if target and target != file_id and target not in imported:
+                    imported.add(target)
+                    graph.add_edge(GraphEdge(file_id, target, EdgeType.IMPORTS))
+
+            imported_paths = {graph.nodes[i].path for i in imported}
+            for chunk in graph.get_neighbors(file_id, EdgeType.CONTAINS):
+                graph.remove_edges(chunk.id, {EdgeType.CALLS})
+                for name in chunk.metadata.get("calls", []):
+                    candidates = [graph.nodes[i] for i in self._definitions.get(name, ())]
+                    callee = self._resolve_call(candidates, chunk.path, imported_paths)
+                    if callee is not None and callee.id != chunk.id:
+                        graph.add_edge(GraphEdge(chunk.id, callee.id, EdgeType.CALLS))
 
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
+    @staticmethod
+    def _resolve_call(
+        candidates: list[GraphNode], path: str, imported_paths: set[str]
+    ) -> GraphNode | None:
+        """依序選擇同文件、已導入文件、全局唯一的定義"""
+        for scope in (
+            [c for c in candidates if c.path == path],
+            [c for c in candidates if c.path in imported_paths],
+            candidates,
+        ):
+            if len(scope) == 1:
+                return scope[0]
+        return None
 
-        return dot_product / (norm_a * norm_b)
+    @staticmethod
+    def _vector_metadata(chunk: CodeChunk) -> dict[str, Any]:
+        return {
+            "path": chunk.path,
+            "type": "chunk",
+            "name": chunk.name,
+            "kind": chunk.kind,
+            "start_line": chunk.start_line,
+            "end_line": chunk.end_line,
+        }
 
 
 class KnowledgeEngine:
@@ -223,33 +846,54 @@ class KnowledgeEngine:
         self.embedding_provider = EmbeddingProvider(
             model=self.config.get("embedding_model", "text-embedding-3-small")
         )
-        self.vector_store = VectorStore()
+        self.vector_store = VectorStore(
+            dimension=self.embedding_provider.dimension,
+            ann_threshold=self.config.get("vector_ann_threshold", 50000),
+        )
+        self.indexer = RepoIndexer(
+            self,
+            chunker=CodeChunker(max_chunk_lines=self.config.get("max_chunk_lines", 120)),
+            batch_size=self.config.get("embedding_batch_size", 64),
+            max_concurrency=self.config.get("embedding_concurrency", 4),
+        )
 
     async def index_file(self, path: str, content: str) -> None:
         """索引文件"""
-        # 創建節點
-        node_id = self._generate_id(path)
-
-        # 生成嵌入
-        embedding = await self.embedding_provider.embed(content)
-
-        # 創建圖節點
-        node = GraphNode(
-            id=node_id,
-            name=path.split("/")[-1],
-            node_type=NodeType.FILE,
-            path=path,
-            content=content,
-            embedding=embedding,
-        )
-
-        # 添加到圖
-        self.repo_graph.add_node(node)
-
-        # 添加到向量存儲
-        self.vector_store.upsert(
-            id=node_id, vector=embedding, metadata={"path": path, "type": "file"}
-        )
+        await self.indexer.index_files([(path, content)])
+
+    async def index_files(
+        self,
+        files: Iterable[tuple[str, str]] | AsyncIterable[tuple[str, str]],
+        prune: bool = False,
+    ) -> IndexStats:
+        """增量索引多個文件，只嵌入內容有變化的代碼塊"""
+        return await self.indexer.index_files(files, prune=prune)
+
+    async def index_directory(
+        self,
+        root: str,
+        extensions: tuple[str, ...] = (".py", ".md", ".yaml", ".yml", ".json", ".ts", ".js"),
+        exclude_dirs: tuple[str, ...] = (".git", "__pycache__", "node_modules", ".venv"),
+    ) -> IndexStats:
+        """增量索引目錄，並移除已不存在的文件"""
+        root_path = Path(root)
+
+        async def read_files():
+            for dirpath, dirnames, filenames in os.walk(root_path):
+                dirnames[:] = sorted(d for d in dirnames if d not in exclude_dirs)
+                for filename in sorted(filenames):
+                    if filename.endswith(extensions):
+                        file_path = Path(dirpath) / filename
+                        content = await asyncio.to_thread(
+                            file_path.read_text, encoding="utf-8", errors="replace"
+                        )
+                        yield file_path.relative_to(root_path).as_posix(), content
+
+        return await self.indexer.index_files(read_files(), prune=True)
+
+    async def remove_file(self, path: str) -> IndexStats:
+        """從索引刪除文件"""
+        return await self.indexer.remove_file(path)
 
     async def search(self, query: str, top_k: int = 10) -> list[SearchResult]:
         """語義搜索"""
@@ -300,6 +944,60 @@ class KnowledgeEngine:
 
         return context
 
+    def save_index(self, directory: str) -> None:
+        """保存向量索引與倉庫圖"""
+        self.vector_store.save(directory)
+        graph = {
+            "nodes": [
+                {
+                    "id": n.id,
+                    "name": n.name,
+                    "type": n.node_type.value,
+                    "path": n.path,
+                    "content": n.content,
+                    "metadata": n.metadata,
+                }
+                for n in self.repo_graph.nodes.values()
+            ],
+            "edges": [
+                {
+                    "source": e.source_id,
+                    "target": e.target_id,
+                    "type": e.edge_type.value,
+                    "metadata": e.metadata,
+                }
+                for e in self.repo_graph.edges
+            ],
+        }
+        (Path(directory) / "graph.json").write_text(json.dumps(graph))
+
+    def load_index(self, directory: str, mmap: bool = True) -> None:
+        """載入 save_index 保存的索引（向量以記憶體映射打開）"""
+        self.vector_store = VectorStore.load(directory, mmap=mmap)
+        graph = json.loads((Path(directory) / "graph.json").read_text())
+
+        self.repo_graph = RepoGraph()
+        for n in graph["nodes"]:
+            self.repo_graph.add_node(
+                GraphNode(
+                    id=n["id"],
+                    name=n["name"],
+                    node_type=NodeType(n["type"]),
+                    path=n["path"],
+                    content=n["content"],
+                    metadata=n["metadata"],
+                )
+            )
+        for e in graph["edges"]:
+            self.repo_graph.add_edge(
+                GraphEdge(
+                    source_id=e["source"],
+                    target_id=e["target"],
+                    edge_type=EdgeType(e["type"]),
+                    metadata=e["metadata"],
+                )
+            )
+
     @staticmethod
     def _generate_id(path: str) -> str:
         """生成節點 ID"""
@@ -6,13 +6,20 @@ LLM Provider Selection and Routing
 支援多種 LLM 提供者：OpenAI, Anthropic, Local, BYOM
 """
 
+import asyncio
+import copy
+import hashlib
+import json
 import os
+import time
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 from enum import Enum
 from typing import Any
 
+from .gateway_cache import ResponseCache, SingleFlight
+
 
 class ModelProvider(Enum):
     """模型提供者枚舉"""
@@ -118,6 +125,115 @@ class AnthropicClient(BaseModelClient):
         yield ""
 
 
+@dataclass
+class ProviderStats:
+    """提供者運行統計（指數加權移動平均）"""
+
+    latency_ewma: float | None = None
+    error_ewma: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    last_failure: float | None = None
+    last_error: str | None = None
+
+    def record(self, latency: float, success: bool, alpha: float) -> None:
+        """記錄一次請求結果"""
+        self.requests += 1
+        self.error_ewma = alpha * (0.0 if success else 1.0) + (1 - alpha) * self.error_ewma
+        if success:
+            self.latency_ewma = (
+                latency
+                if self.latency_ewma is None
+                else alpha * latency + (1 - alpha) * self.latency_ewma
+            )
+        else:
+            self.failures += 1
+            self.last_failure = time.monotonic()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "latency_ewma": self.latency_ewma,
+            "error_ewma": self.error_ewma,
+            "requests": self.requests,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class ProviderRouter:
+    """
+    提供者路由器
+
+    依路由策略為候選提供者排序：
+    - COST_OPTIMIZED: 按成本順序（配置的 cost_order）
+    - PERFORMANCE: 按觀測延遲 EWMA，錯誤率越高懲罰越大
+    - ROUND_ROBIN: 輪流
+
+    錯誤率 EWMA 超過 error_threshold 且仍在冷卻期內的提供者
+    排到最後，只在其他提供者都失敗時作為備援。
+    """
+
+    def __init__(
+        self,
+        strategy: RoutingStrategy = RoutingStrategy.COST_OPTIMIZED,
+        alpha: float = 0.2,
+        error_threshold: float = 0.5,
+        cooldown_seconds: float = 30.0,
+        cost_order: list[ModelProvider] | None = None,
+    ):
+        self.strategy = strategy
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.cost_order = cost_order or []
+        self.stats: dict[ModelProvider, ProviderStats] = {}
+        self._turn = 0
+
+    def record(
+        self, provider: ModelProvider, latency: float, success: bool, error: str | None = None
+    ) -> None:
+        """記錄提供者的請求結果"""
+        stats = self.stats.setdefault(provider, ProviderStats())
+        stats.record(latency, success, self.alpha)
+        if error:
+            stats.last_error = error
+
+    def is_healthy(self, provider: ModelProvider) -> bool:
+        """提供者是否健康（冷卻期過後重新給予機會）"""
+        stats = self.stats.get(provider)
+        if stats is None or stats.error_ewma < self.error_threshold:
+            return True
+        return (
+            stats.last_failure is None
+            or time.monotonic() - stats.last_failure >= self.cooldown_seconds
+        )
+
+    def rank(self, providers: list[ModelProvider]) -> list[ModelProvider]:
+        """按策略排序候選提供者"""
+        if self.strategy == RoutingStrategy.PERFORMANCE:
+            ordered = sorted(providers, key=self._performance_score)
+        elif self.strategy == RoutingStrategy.ROUND_ROBIN:
+            offset = self._turn % len(providers) if providers else 0
+            self._turn += 1
+            ordered = providers[offset:] + providers[:offset]
+        else:
+            ordered = sorted(providers, key=self._cost_rank)
+
+        healthy = [p for p in ordered if self.is_healthy(p)]
+        return healthy + [p for p in ordered if p not in healthy]
+
+    def _performance_score(self, provider: ModelProvider) -> float:
+        stats = self.stats.get(provider)
+        if stats is None or stats.latency_ewma is None:
+            return 0.0  # 尚未觀測的提供者優先探測
+        return stats.latency_ewma * (1.0 + 4.0 * stats.error_ewma)
+
+    def _cost_rank(self, provider: ModelProvider) -> int:
+        if provider in self.cost_order:
+            return self.cost_order.index(provider)
+        return len(self.cost_order)
+
+
 class ModelGateway:
     """
     模型閘道
@@ -130,13 +246,48 @@ class ModelGateway:
     - 模型切換
     - 成本優化
     - 故障轉移
+    - 確定性請求的回應快取與同時請求合併
     """
 
-    def __init__(self, config: dict[str, Any] | None = None):
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        clients: dict[ModelProvider, BaseModelClient] | None = None,
+    ):
         self.config = config or {}
         self.clients: dict[ModelProvider, BaseModelClient] = {}
         self.models: dict[str, ModelConfig] = {}
-        self._initialize_clients()
+        if clients is None:
+            self._initialize_clients()
+        else:
+            self.clients.update(clients)
+
+        routing = self.config.get("routing", {})
+        self.fallback_enabled = routing.get("fallback_enabled", True)
+        self.retry_attempts = routing.get("retry_attempts", 3)
+        self.timeout_seconds = routing.get("timeout_seconds", 60)
+        self.router = ProviderRouter(
+            strategy=RoutingStrategy(routing.get("strategy", RoutingStrategy.COST_OPTIMIZED.value)),
+            alpha=routing.get("ewma_alpha", 0.2),
+            error_threshold=routing.get("error_threshold", 0.5),
+            cooldown_seconds=routing.get("cooldown_seconds", 30.0),
+            cost_order=[
+                ModelProvider(p)
+                for p in routing.get("cost_order", [self.get_default_model()])
+            ],
+        )
+
+        cache = self.config.get("cache", {})
+        self.cache: ResponseCache | None = None
+        if cache.get("enabled", True):
+            self.cache = ResponseCache(
+                max_entries=cache.get("max_entries", 1024),
+                ttl_seconds=cache.get("ttl_seconds", 3600),
+                directory=cache.get("directory"),
+            )
+        # 只有 temperature 不高於此值的請求被視為確定性請求
+        self.cache_max_temperature = cache.get("max_temperature", 0.0)
+        self.single_flight = SingleFlight() if cache.get("coalesce", True) else None
 
     def _initialize_clients(self) -> None:
         """初始化模型客戶端"""
@@ -148,6 +299,10 @@ class ModelGateway:
         if providers.get("anthropic", {}).get("enabled", True):
             self.clients[ModelProvider.ANTHROPIC] = AnthropicClient()
 
+    def register_client(self, provider: ModelProvider, client: BaseModelClient) -> None:
+        """註冊（或替換）提供者客戶端"""
+        self.clients[provider] = client
+
     def get_default_model(self) -> str:
         """獲取預設模型"""
         return self.config.get("default_provider", "openai")
@@ -158,6 +313,12 @@ class ModelGateway:
         """
         執行完成請求
 
+        確定性請求（temperature 不高於 cache.max_temperature，預設為 0）先查快取，
+        未命中時與同時進行的相同請求合併為一次上游調用。
+        CompletionRequest 的預設 temperature 為 0.7，因此只有明確傳入
+        temperature=0（或不高於 max_temperature）的請求才會被快取與合併。
+        每個呼叫者都取得獨立的回應副本。
+
         Args:
             messages: 對話訊息列表
             model: 指定模型 ID
@@ -167,30 +328,128 @@ class ModelGateway:
             CompletionResponse: 完成回應
         """
         request = CompletionRequest(messages=messages, model=model, **kwargs)
-
-        # 根據模型選擇客戶端
-        provider = self._get_provider_for_model(model)
-        client = self.clients.get(provider)
-
-        if not client:
-            raise ValueError(f"Provider not available: {provider}")
-
-        return await client.complete(request)
+        if request.temperature > self.cache_max_temperature:
+            return await self._dispatch(request)
+
+        key = self._cache_key(request)
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return CompletionResponse(**copy.deepcopy(cached))
+
+        async def fetch() -> CompletionResponse:
+            response = await self._dispatch(request)
+            if self.cache is not None:
+                await self.cache.set(key, asdict(response))
+            return response
+
+        if self.single_flight is not None:
+            # 合併的呼叫者共享同一個結果，各自取得副本
+            return copy.deepcopy(await self.single_flight.do(key, fetch))
+        return await fetch()
 
     async def stream(
         self, messages: list[dict[str, str]], model: str | None = None, **kwargs: Any
     ) -> AsyncIterator[str]:
-        """執行串流完成請求"""
+        """執行串流完成請求（首個片段之前失敗時轉移到下一個提供者）"""
         request = CompletionRequest(messages=messages, model=model, stream=True, **kwargs)
 
-        provider = self._get_provider_for_model(model)
-        client = self.clients.get(provider)
-
-        if not client:
-            raise ValueError(f"Provider not available: {provider}")
-
-        async for chunk in client.stream(request):
-            yield chunk
+        last_error: Exception | None = None
+        for provider, provider_model in self._route(request.model):
+            client = self.clients[provider]
+            start = time.monotonic()
+            started = False
+            try:
+                async for chunk in client.stream(replace(request, model=provider_model)):
+                    if not started:
+                        started = True
+                        self.router.record(provider, time.monotonic() - start, True)
+                    yield chunk
+                if not started:
+                    self.router.record(provider, time.monotonic() - start, True)
+                return
+            except Exception as e:
+                if started:
+                    raise
+                self.router.record(provider, time.monotonic() - start, False, repr(e))
+                last_error = e
+
+        raise last_error
+
+    def get_stats(self) -> dict[str, Any]:
+        """獲取快取、合併與提供者統計"""
+        return {
+            "cache": self.cache.get_stats() if self.cache is not None else None,
+            "coalesced": self.single_flight.coalesced if self.single_flight is not None else 0,
+            "in_flight": self.single_flight.in_flight if self.single_flight is not None else 0,
+            "strategy": self.router.strategy.value,
+            "providers": {p.value: s.to_dict() for p, s in self.router.stats.items()},
+        }
+
+    async def _dispatch(self, request: CompletionRequest) -> CompletionResponse:
+        """按路由順序調用提供者，失敗或超時時轉移到下一個"""
+        last_error: Exception | None = None
+        for provider, provider_model in self._route(request.model):
+            client = self.clients[provider]
+            start = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    client.complete(replace(request, model=provider_model)),
+                    timeout=self.timeout_seconds,
+                )
+            except Exception as e:
+                self.router.record(provider, time.monotonic() - start, False, repr(e))
+                last_error = e
+                continue
+
+            self.router.record(provider, time.monotonic() - start, True)
+            return response
+
+        raise last_error
+
+    def _route(self, model: str | None) -> list[tuple[ModelProvider, str | None]]:
+        """返回 (提供者, 模型) 嘗試順序"""
+        available = list(self.clients)
+        if model:
+            primary = self._get_provider_for_model(model)
+            if primary not in self.clients:
+                raise ValueError(f"Provider not available: {primary}")
+            chain = [(primary, model)]
+            if self.fallback_enabled:
+                others = [p for p in self.router.rank(available) if p != primary]
+                chain += [(p, self._default_model_for(p)) for p in others]
+                # 指定模型的提供者不健康時，先嘗試健康的備援
+                if not self.router.is_healthy(primary):
+                    chain = chain[1:] + chain[:1]
+        else:
+            if not available:
+                raise ValueError("No model provider available")
+            ranked = self.router.rank(available)
+            if not self.fallback_enabled:
+                ranked = ranked[:1]
+            chain = [(p, self._default_model_for(p)) for p in ranked]
+
+        return chain[: max(1, self.retry_attempts)]
+
+    def _default_model_for(self, provider: ModelProvider) -> str | None:
+        """提供者的預設模型（未配置時由客戶端決定）"""
+        models = self.config.get("providers", {}).get(provider.value, {}).get("models", [])
+        for entry in models:
+            if entry.get("default"):
+                return entry.get("id")
+        return models[0].get("id") if models else None
+
+    @staticmethod
+    def _cache_key(request: CompletionRequest) -> str:
+        """以原樣的訊息與參數生成快取鍵（空白不同即視為不同提示）"""
+        payload = {
+            "messages": request.messages,
+            "model": request.model,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode()).hexdigest()
 
     def _get_provider_for_model(self, model: str | None) -> ModelProvider:
         """根據模型 ID 獲取提供者"""
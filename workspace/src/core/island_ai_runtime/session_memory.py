@@ -6,12 +6,23 @@ Short-term Memory, Context Management, and Planning
 管理 AI 會話上下文和任務規劃
 """
 
+import math
+import re
 import time
 from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+# 英數詞或單個 CJK 字
+_KEYWORD_PATTERN = re.compile(r"[0-9a-z_]+|[\u3400-\u9fff]")
+
+
+def _keywords(text: str) -> list[str]:
+    """從小寫文本提取關鍵詞"""
+    return _KEYWORD_PATTERN.findall(text)
+
 
 class MemoryType(Enum):
     """記憶類型"""
@@ -76,37 +87,281 @@ class ShortTermMemory:
     短期記憶
 
     管理會話內的即時記憶。
+
+    訊息同時寫入關鍵詞倒排索引：search 先從詞表中找出包含查詢詞的
+    詞彙，只對這些詞彙出現過的訊息做子串比對；retrieve 按關鍵詞
+    命中的 IDF 權重排序。
     """
 
     def __init__(self, max_messages: int = 100):
         self.max_messages = max_messages
         self.messages: deque[Message] = deque(maxlen=max_messages)
+        self._seqs: deque[int] = deque()
+        self._next_seq = 0
+        self._by_seq: dict[int, tuple[Message, str]] = {}
+        self._index: dict[str, set[int]] = {}
 
     def add(self, message: Message) -> None:
         """添加訊息"""
+        if len(self.messages) == self.max_messages:
+            self._unindex(self._seqs.popleft())
+
+        seq = self._next_seq
+        self._next_seq += 1
+        lowered = message.content.lower()
+
         self.messages.append(message)
+        self._seqs.append(seq)
+        self._by_seq[seq] = (message, lowered)
+        for word in set(_keywords(lowered)):
+            self._index.setdefault(word, set()).add(seq)
 
     def get_recent(self, n: int = 10) -> list[Message]:
         """獲取最近的訊息"""
         return list(self.messages)[-n:]
 
     def search(self, query: str) -> list[Message]:
-        """搜索訊息"""
-        results = []
+        """搜索訊息（子串匹配，不區分大小寫）"""
         query_lower = query.lower()
-        for msg in self.messages:
-            if query_lower in msg.content.lower():
-                results.append(msg)
-        return results
+        words = _keywords(query_lower)
+        if not words:
+            return [msg for msg, lowered in self._by_seq.values() if query_lower in lowered]
+
+        # 查詢中的每個詞必然是訊息中某個詞的子串，用最長的詞篩選候選
+        longest = max(words, key=len)
+        candidates: set[int] = set()
+        for word, seqs in self._index.items():
+            if longest in word:
+                candidates |= seqs
+
+        return [
+            self._by_seq[seq][0]
+            for seq in sorted(candidates)
+            if query_lower in self._by_seq[seq][1]
+        ]
+
+    def retrieve(self, query: str, limit: int = 5) -> list[Message]:
+        """關鍵詞檢索：按命中詞的 IDF 權重排序，較新的訊息優先"""
+        total = len(self._by_seq)
+        scores: dict[int, float] = {}
+        for word in set(_keywords(query.lower())):
+            seqs = self._index.get(word)
+            if not seqs:
+                continue
+            weight = math.log(1 + total / len(seqs))
+            for seq in seqs:
+                scores[seq] = scores.get(seq, 0.0) + weight
+
+        ranked = sorted(scores, key=lambda seq: (scores[seq], seq), reverse=True)
+        return [self._by_seq[seq][0] for seq in ranked[:limit]]
 
     def clear(self) -> None:
         """清空記憶"""
         self.messages.clear()
+        self._seqs.clear()
+        self._by_seq.clear()
+        self._index.clear()
 
     def to_messages(self) -> list[dict[str, str]]:
         """轉換為 LLM 訊息格式"""
         return [{"role": msg.role.value, "content": msg.content} for msg in self.messages]
 
+    def _unindex(self, seq: int) -> None:
+        _, lowered = self._by_seq.pop(seq)
+        for word in set(_keywords(lowered)):
+            seqs = self._index.get(word)
+            if seqs is not None:
+                seqs.discard(seq)
+                if not seqs:
+                    del self._index[word]
+
+
+TokenCounter = Callable[[str], int]
+SpanSummarizer = Callable[[list[Message]], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算 token 數（無需分詞器）
+
+    ASCII 約 4 字元一個 token，CJK 等非 ASCII 字元約一字一個 token。
+    """
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return (len(text) - non_ascii + 3) // 4 + non_ascii
+
+
+def summarize_span(messages: list[Message], max_chars: int = 160) -> str:
+    """抽取式摘要：每條訊息保留角色和首句"""
+    lines = []
+    for msg in messages:
+        text = " ".join(msg.content.split())
+        for stop in ("。", ". ", "\n"):
+            if stop in text:
+                text = text[: text.index(stop) + len(stop)].strip()
+                break
+        if len(text) > max_chars:
+            text = text[: max_chars - 1] + "…"
+        if text:
+            lines.append(f"- {msg.role.value}: {text}")
+    return "\n".join(lines)
+
+
+class ContextBuilder:
+    """
+    上下文構建器
+
+    將訊息打包進 token 預算：
+    - 系統訊息固定在最前面
+    - 超出預算時，最舊的一段訊息整段移出窗口並生成摘要
+    - 摘要分層保存，總長超過 summary_tokens 時合併最舊的兩層
+    - 固定前綴（系統訊息 + 摘要）只在摘要或計劃變化時重建，
+      追加訊息只需 O(1) 更新窗口
+    """
+
+    MESSAGE_OVERHEAD_TOKENS = 4
+    SUMMARY_HEADER = "Summary of earlier conversation:"
+    PLAN_HEADER = "Current plan:"
+
+    def __init__(
+        self,
+        max_tokens: int = 124000,
+        summary_tokens: int = 2048,
+        span_tokens: int = 1024,
+        tokenizer: TokenCounter | None = None,
+        summarizer: SpanSummarizer | None = None,
+    ):
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.span_tokens = span_tokens
+        self.tokenizer = tokenizer or estimate_tokens
+        self.summarizer = summarizer or summarize_span
+
+        self.pinned: list[tuple[dict[str, str], int]] = []
+        self.window: deque[tuple[Message, dict[str, str], int]] = deque()
+        self.summaries: list[tuple[str, int]] = []
+        self.window_tokens = 0
+        self.evicted_count = 0
+
+        self._plan_text: str | None = None
+        self._prefix: list[dict[str, str]] | None = None
+        self._prefix_tokens = 0
+        self._reserved_tokens: int | None = None
+
+    @property
+    def total_tokens(self) -> int:
+        """當前上下文 token 數"""
+        self._ensure_prefix()
+        return self._prefix_tokens + self.window_tokens
+
+    def count(self, text: str) -> int:
+        """單條訊息的 token 數（含格式開銷）"""
+        return self.tokenizer(text) + self.MESSAGE_OVERHEAD_TOKENS
+
+    def add(self, message: Message) -> None:
+        """追加訊息；超出預算時移出最舊的一段並摘要"""
+        entry = {"role": message.role.value, "content": message.content}
+        tokens = self.count(message.content)
+
+        if message.role == MessageRole.SYSTEM:
+            self.pinned.append((entry, tokens))
+            self._prefix = None
+            self._reserved_tokens = None
+        else:
+            self.window.append((message, entry, tokens))
+            self.window_tokens += tokens
+
+        if self.window_tokens > self._window_budget():
+            self._evict_span()
+
+    def set_plan(self, plan_text: str | None) -> None:
+        """更新計劃快照（變化時才使前綴失效）"""
+        if plan_text != self._plan_text:
+            self._plan_text = plan_text
+            self._prefix = None
+            self._reserved_tokens = None
+            if self.window_tokens > self._window_budget():
+                self._evict_span()
+
+    def build(self, max_messages: int | None = None) -> list[dict[str, str]]:
+        """返回打包後的上下文"""
+        self._ensure_prefix()
+        window = [entry for _, entry, _ in self.window]
+        if max_messages:
+            window = window[-max_messages:]
+        return self._prefix + window
+
+    def clear(self) -> None:
+        """清空上下文"""
+        self.pinned.clear()
+        self.window.clear()
+        self.summaries.clear()
+        self.window_tokens = 0
+        self.evicted_count = 0
+        self._plan_text = None
+        self._prefix = None
+        self._reserved_tokens = None
+
+    def _window_budget(self) -> int:
+        if self._reserved_tokens is None:
+            # 固定前綴的預留量只在系統訊息或計劃變化時重新計算
+            pinned = sum(tokens for _, tokens in self.pinned)
+            plan = self.count(f"{self.PLAN_HEADER}\n{self._plan_text}") if self._plan_text else 0
+            summary = self.summary_tokens + self.count(self.SUMMARY_HEADER)
+            self._reserved_tokens = pinned + plan + summary
+        return max(0, self.max_tokens - self._reserved_tokens)
+
+    def _evict_span(self) -> None:
+        # 一次移出至少 span_tokens，避免每追加一條訊息就重新摘要
+        budget = self._window_budget()
+        target = max(0, budget - min(self.span_tokens, budget // 4))
+        evicted: list[Message] = []
+        while self.window and self.window_tokens > target:
+            message, _, tokens = self.window.popleft()
+            self.window_tokens -= tokens
+            evicted.append(message)
+
+        if evicted:
+            self.evicted_count += len(evicted)
+            summary = self.summarizer(evicted)
+            if summary:
+                self.summaries.append((summary, self.tokenizer(summary)))
+                self._compact_summaries()
+            self._prefix = None
+
+    def _compact_summaries(self) -> None:
+        """摘要分層：超出預算時合併最舊兩層並截斷"""
+        while sum(t for _, t in self.summaries) > self.summary_tokens:
+            if len(self.summaries) == 1:
+                text = self._truncate(self.summaries[0][0], self.summary_tokens)
+                self.summaries[0] = (text, self.tokenizer(text))
+                break
+            (first, _), (second, _) = self.summaries[0], self.summaries[1]
+            merged = self._truncate(f"{first}\n{second}", self.summary_tokens // 2)
+            self.summaries[:2] = [(merged, self.tokenizer(merged))]
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """按行保留開頭部分，直到 token 預算用完"""
+        kept, used = [], 0
+        for line in text.splitlines():
+            tokens = self.tokenizer(line) + 1
+            if used + tokens > max_tokens:
+                break
+            kept.append(line)
+            used += tokens
+        return "\n".join(kept)
+
+    def _ensure_prefix(self) -> None:
+        if self._prefix is not None:
+            return
+        prefix = [entry for entry, _ in self.pinned]
+        if self._plan_text:
+            prefix.append({"role": "system", "content": f"{self.PLAN_HEADER}\n{self._plan_text}"})
+        if self.summaries:
+            body = "\n".join(text for text, _ in self.summaries)
+            prefix.append({"role": "system", "content": f"{self.SUMMARY_HEADER}\n{body}"})
+        self._prefix = prefix
+        self._prefix_tokens = sum(self.count(entry["content"]) for entry in prefix)
+
 
 class WorkingMemory:
     """
@@ -234,16 +489,29 @@ class SessionMemory:
     功能：
     - Short-term Memory 短期記憶
     - Working Memory 工作記憶
-    - Context Management 上下文管理
+    - Context Management 上下文管理（token 預算打包、分層摘要）
     - Task Planning 任務規劃
     """
 
-    def __init__(self, config: dict[str, Any] | None = None):
+    def __init__(
+        self,
+        config: dict[str, Any] | None = None,
+        tokenizer: TokenCounter | None = None,
+        summarizer: SpanSummarizer | None = None,
+    ):
         self.config = config or {}
         self.short_term = ShortTermMemory(max_messages=self.config.get("max_messages", 100))
         self.working = WorkingMemory()
         self.planner = Planner()
         self.context_window = ContextWindow(max_tokens=self.config.get("max_tokens", 128000))
+        self.context_builder = ContextBuilder(
+            # 預留回應所需的 token
+            max_tokens=self.context_window.max_tokens - self.config.get("reserve_tokens", 4096),
+            summary_tokens=self.config.get("summary_tokens", 2048),
+            span_tokens=self.config.get("summary_span_tokens", 1024),
+            tokenizer=tokenizer,
+            summarizer=summarizer,
+        )
 
     def add_message(
         self, role: str | MessageRole, content: str, metadata: dict[str, Any] | None = None
@@ -256,13 +524,24 @@ class SessionMemory:
 
         self.short_term.add(message)
         self.context_window.messages.append(message)
+        self.context_builder.add(message)
 
     def get_context(self, max_messages: int | None = None) -> list[dict[str, str]]:
-        """獲取上下文"""
-        messages = self.short_term.to_messages()
-        if max_messages:
-            messages = messages[-max_messages:]
-        return messages
+        """
+        獲取上下文
+
+        返回系統訊息、當前計劃、早期對話摘要，以及在 token 預算內的
+        最近訊息。
+        """
+        if self.config.get("include_plan", True):
+            self.context_builder.set_plan(self._plan_snapshot())
+        context = self.context_builder.build(max_messages)
+        self.context_window.current_tokens = self.context_builder.total_tokens
+        return context
+
+    def recall(self, query: str, limit: int = 5) -> list[Message]:
+        """按關鍵詞檢索訊息（包括已移出上下文窗口的訊息）"""
+        return self.short_term.retrieve(query, limit)
 
     def set_working_data(self, key: str, value: Any) -> None:
         """設置工作記憶數據"""
@@ -291,6 +570,12 @@ class SessionMemory:
                 "message_count": len(self.short_term.messages),
                 "recent_topics": self._extract_topics(),
             },
+            "context": {
+                "tokens": self.context_builder.total_tokens,
+                "window_messages": len(self.context_builder.window),
+                "evicted_messages": self.context_builder.evicted_count,
+                "summary_tiers": len(self.context_builder.summaries),
+            },
             "working": {"focus": self.working.focus, "data_keys": list(self.working.data.keys())},
             "planning": {
                 "current_plan": (
@@ -300,6 +585,15 @@ class SessionMemory:
             },
         }
 
+    def _plan_snapshot(self) -> str | None:
+        """當前計劃的文字快照"""
+        plan = self.planner.current_plan
+        if not plan:
+            return None
+        lines = [f"Goal: {plan.goal} ({plan.status})"]
+        lines.extend(f"- [{step.status}] {step.id}: {step.description}" for step in plan.steps)
+        return "\n".join(lines)
+
     def _extract_topics(self) -> list[str]:
         """提取最近話題（簡化版）"""
         topics = []
@@ -318,3 +612,4 @@ class SessionMemory:
         self.planner.plans.clear()
         self.planner.current_plan = None
         self.context_window.messages.clear()
+        self.context_builder.clear()
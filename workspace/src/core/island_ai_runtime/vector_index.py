@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Vector Index - 向量索引
+Approximate Nearest-Neighbor Search (IVF)
+
+為大型語料提供近似最近鄰搜索，避免每次查詢都掃描全部向量
+"""
+
+import numpy as np
+
+
+class IVFIndex:
+    """
+    倒排文件索引 (Inverted File Index)
+
+    以球面 k-means 將已正規化的向量分成 n_lists 個群，
+    查詢時只對最接近的 n_probe 個群內的向量計算相似度。
+
+    索引只保存每一行所屬的群 (assignments)，向量本身仍由
+    VectorStore 的矩陣持有，因此行號必須與 VectorStore 同步。
+    """
+
+    def __init__(
+        self,
+        n_lists: int = 256,
+        n_probe: int = 8,
+        train_iterations: int = 10,
+        max_train_samples: int = 65536,
+        seed: int = 0,
+    ):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_iterations = train_iterations
+        self.max_train_samples = max_train_samples
+        self.seed = seed
+        self.centroids: np.ndarray | None = None
+        self.assignments = np.empty(0, dtype=np.int32)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray) -> None:
+        """以 k-means 訓練群中心並分配所有向量"""
+        n = len(vectors)
+        if n == 0:
+            raise ValueError("Cannot train IVF index on an empty matrix")
+
+        rng = np.random.default_rng(self.seed)
+        n_lists = min(self.n_lists, n)
+
+        sample = vectors
+        if n > self.max_train_samples:
+            sample = vectors[np.sort(rng.choice(n, self.max_train_samples, replace=False))]
+        sample = np.asarray(sample, dtype=np.float32)
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = self._nearest(sample, centroids)
+            counts = np.bincount(labels, minlength=n_lists)
+
+            # 按群排序後分段求和（比 np.add.at 快一個數量級）
+            order = np.argsort(labels, kind="stable")
+            present = np.flatnonzero(counts)
+            sums = np.zeros_like(centroids)
+            sums[present] = np.add.reduceat(sample[order], np.cumsum(counts)[present] - counts[present])
+
+            # 空群以隨機樣本重新播種
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                sums[empty] = sample[rng.choice(len(sample), len(empty))]
+
+            centroids = normalize_rows(sums)
+
+        self.centroids = centroids
+        self.n_lists = n_lists
+        self.assignments = self._nearest(vectors, centroids).astype(np.int32)
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        """計算向量所屬的群"""
+        return self._nearest(vectors, self.centroids).astype(np.int32)
+
+    def set_rows(self, start: int, lists: np.ndarray) -> None:
+        """寫入 start 起各行的群分配，必要時擴充"""
+        end = start + len(lists)
+        if end > len(self.assignments):
+            grown = np.empty(max(end, 2 * len(self.assignments)), dtype=np.int32)
+            grown[: len(self.assignments)] = self.assignments
+            self.assignments = grown
+        self.assignments[start:end] = lists
+
+    def move_row(self, source: int, target: int) -> None:
+        """行號搬移（VectorStore 刪除時以末行填補空位）"""
+        self.assignments[target] = self.assignments[source]
+
+    def candidates(self, query: np.ndarray, size: int) -> np.ndarray:
+        """返回最近 n_probe 個群內的行號"""
+        centroid_scores = self.centroids @ query
+        n_probe = min(self.n_probe, self.n_lists)
+        probes = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        return np.flatnonzero(np.isin(self.assignments[:size], probes))
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 16384) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            block = np.asarray(vectors[start : start + chunk_size], dtype=np.float32)
+            labels[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return labels
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """逐行 L2 正規化，零向量保持為零"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """返回分數最高的 k 個位置（已排序），只部分排序"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        picked = np.argpartition(-scores, k - 1)[:k]
+    else:
+        picked = np.arange(len(scores))
+    return picked[np.argsort(-scores[picked], kind="stable")]
@@ -51,7 +51,8 @@ from .observability_platform import (
     TraceSpan,
     CorrelatedEvent,
     ObservabilityPlatform,
-    CorrelationEngine
+    CorrelationEngine,
+    ServiceStats
 )
 
 __all__ = [
@@ -92,4 +93,5 @@ __all__ = [
     'CorrelatedEvent',
     'ObservabilityPlatform',
     'CorrelationEngine',
+    'ServiceStats',
 ]
@@ -6,12 +6,19 @@ Unified observability with metrics, logs, and traces
 Reference: Uber's uMonitor - AI anomaly detection pinpoints faulty services in real-time [10]
 """
 
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+import math
+import random
+import time
 import uuid
 
+T = TypeVar('T')
+
 
 class LogLevel(Enum):
     """Log levels"""
@@ -81,11 +88,18 @@ class TraceSpan:
     status: TraceStatus = TraceStatus.UNSET
     attributes: Dict[str, Any] = field(default_factory=dict)
     events: List[Dict[str, Any]] = field(default_factory=list)
+    # Called as (span, previous_status, previous_duration_ms) after end()
+    _on_end: Optional[Callable[['TraceSpan', TraceStatus, Optional[float]], None]] = field(
+        default=None, repr=False, compare=False
+    )
     
     def end(self, status: TraceStatus = TraceStatus.OK) -> None:
         """End the span"""
+        previous_status, previous_duration = self.status, self.duration_ms()
         self.end_time = datetime.now()
         self.status = status
+        if self._on_end:
+            self._on_end(self, previous_status, previous_duration)
     
     def duration_ms(self) -> Optional[float]:
         """Get duration in milliseconds"""
@@ -161,6 +175,10 @@ class CorrelationEngine:
         self._time_window = time_window_seconds
         self._events: List[CorrelatedEvent] = []
     
+    @property
+    def time_window_seconds(self) -> int:
+        return self._time_window
+    
     def correlate_by_time(
         self,
         logs: List[LogEntry],
@@ -168,7 +186,11 @@ class CorrelationEngine:
         metric_names: List[str],
         reference_time: datetime
     ) -> CorrelatedEvent:
-        """Correlate events by time proximity"""
+        """Correlate events by time proximity
+        
+        Scans the given lists; ObservabilityPlatform.correlate_by_time
+        passes only the entries inside the window.
+        """
         event = CorrelatedEvent(
             event_type=EventType.INCIDENT,
             title="Time-correlated event",
@@ -229,21 +251,111 @@ class CorrelationEngine:
         return self._events.copy()
 
 
+class _TimeIndex(Generic[T]):
+    """
+    Time-ordered retention buffer
+    
+    Entries are appended in time order and evicted from the head, so
+    range queries are a bisect plus a slice. A timestamp earlier than the
+    last one (clock adjustment) is indexed at the last timestamp to keep
+    the order.
+    """
+    
+    __slots__ = ('_times', '_items', '_head')
+    
+    def __init__(self):
+        self._times: List[datetime] = []
+        self._items: List[T] = []
+        self._head = 0
+    
+    def __len__(self) -> int:
+        return len(self._items) - self._head
+    
+    def append(self, timestamp: datetime, item: T) -> None:
+        if self._times and timestamp < self._times[-1]:
+            timestamp = self._times[-1]
+        self._times.append(timestamp)
+        self._items.append(item)
+    
+    def first(self) -> Optional[Tuple[datetime, T]]:
+        if self._head == len(self._items):
+            return None
+        return self._times[self._head], self._items[self._head]
+    
+    def popleft(self) -> T:
+        item = self._items[self._head]
+        self._items[self._head] = None
+        self._head += 1
+        # Compact once the evicted prefix dominates
+        if self._head > 1024 and self._head * 2 > len(self._items):
+            del self._times[:self._head]
+            del self._items[:self._head]
+            self._head = 0
+        return item
+    
+    def items(self) -> List[T]:
+        return self._items[self._head:]
+    
+    def since(self, start: datetime) -> List[T]:
+        return self._items[bisect_left(self._times, start, self._head):]
+    
+    def window(self, start: datetime, end: datetime) -> List[T]:
+        lo = bisect_left(self._times, start, self._head)
+        hi = bisect_right(self._times, end, lo)
+        return self._items[lo:hi]
+
+
+@dataclass
+class ServiceStats:
+    """Span aggregates for one service, maintained as spans start and end"""
+    traces: int = 0          # Retained traces the service takes part in
+    error_traces: int = 0    # ...whose first span of this service ended in error
+    spans: int = 0
+    ended_spans: int = 0
+    error_spans: int = 0
+    total_duration_ms: float = 0.0
+    
+    @property
+    def avg_duration_ms(self) -> float:
+        return self.total_duration_ms / self.ended_spans if self.ended_spans else 0.0
+
+
 class ObservabilityPlatform:
     """
     Observability Platform (可觀測性平台)
     
     Unified observability with metrics, logs, and traces
     
+    Logs are retained in time order and indexed by service, level,
+    service+level and trace; spans are indexed by start time. Retention
+    keeps the newest max_retention logs and traces (and, with
+    retention_seconds, nothing older). Per-service span aggregates and the
+    slow-root index are updated as spans end, so health, slow-trace and
+    correlation queries cost the size of their result, not of history.
+    
     Reference: Uber's uMonitor for real-time AI anomaly detection [10]
     """
     
-    def __init__(self):
-        self._logs: List[LogEntry] = []
+    def __init__(self, max_retention: int = 10000, retention_seconds: Optional[float] = None):
+        self._max_retention = max_retention  # Max logs / traces to retain
+        self._retention_seconds = retention_seconds
+        
+        # Logs: all, plus one index per (kind, value) key
+        self._logs: _TimeIndex[LogEntry] = _TimeIndex()
+        self._log_indexes: Dict[Tuple, _TimeIndex[LogEntry]] = {}
+        
+        # Traces, oldest first
         self._traces: Dict[str, List[TraceSpan]] = {}  # trace_id -> spans
+        self._trace_seq: Dict[str, int] = {}
+        self._next_trace_seq = 0
+        self._trace_roots: Dict[str, TraceSpan] = {}
+        self._trace_services: Dict[str, Dict[str, TraceSpan]] = {}  # first span per service
+        self._spans: _TimeIndex[Tuple[int, TraceSpan]] = _TimeIndex()
+        self._service_stats: Dict[str, ServiceStats] = {}
+        self._slow_roots: List[Tuple[float, int, str]] = []  # (duration_ms, trace seq, trace_id)
+        
         self._events: List[CorrelatedEvent] = []
         self._correlation_engine = CorrelationEngine()
-        self._max_retention = 10000  # Max entries to retain
     
     @property
     def correlation_engine(self) -> CorrelationEngine:
@@ -271,8 +383,7 @@ class ObservabilityPlatform:
             span_id=span_id,
             attributes=attributes or {}
         )
-        self._logs.append(entry)
-        self._cleanup_logs()
+        self._ingest_log(entry)
         return entry
     
     def log_info(self, message: str, **kwargs) -> LogEntry:
@@ -291,21 +402,60 @@ class ObservabilityPlatform:
         since: Optional[datetime] = None
     ) -> List[LogEntry]:
         """Get logs with optional filters"""
-        logs = self._logs
-        
-        if service:
-            logs = [l for l in logs if l.service == service]
-        if level:
-            logs = [l for l in logs if l.level == level]
-        if since:
-            logs = [l for l in logs if l.timestamp >= since]
+        if service and level:
+            index = self._log_indexes.get(('service_level', service, level))
+        elif service:
+            index = self._log_indexes.get(('service', service))
+        elif level:
+            index = self._log_indexes.get(('level', level))
+        else:
+            index = self._logs
         
-        return logs
+        if index is None:
+            return []
+        return index.since(since) if since else index.items()
+    
+    def _ingest_log(self, entry: LogEntry) -> None:
+        self._logs.append(entry.timestamp, entry)
+        for key in self._log_keys(entry):
+            index = self._log_indexes.get(key)
+            if index is None:
+                index = self._log_indexes[key] = _TimeIndex()
+            index.append(entry.timestamp, entry)
+        self._cleanup_logs()
+    
+    def _log_count(self, service: str, level: LogLevel) -> int:
+        index = self._log_indexes.get(('service_level', service, level))
+        return len(index) if index else 0
+    
+    @staticmethod
+    def _log_keys(entry: LogEntry) -> List[Tuple]:
+        keys: List[Tuple] = [('level', entry.level)]
+        if entry.service:
+            keys.append(('service', entry.service))
+            keys.append(('service_level', entry.service, entry.level))
+        if entry.trace_id:
+            keys.append(('trace', entry.trace_id))
+        return keys
     
     def _cleanup_logs(self) -> None:
-        """Clean up old logs"""
-        if len(self._logs) > self._max_retention:
-            self._logs = self._logs[-self._max_retention:]
+        """Evict logs beyond the retention count or age"""
+        cutoff = self._retention_cutoff()
+        while len(self._logs) > self._max_retention or (
+            cutoff and len(self._logs) and self._logs.first()[0] < cutoff
+        ):
+            entry = self._logs.popleft()
+            # Every index is in the same order, so the entry is at each head
+            for key in self._log_keys(entry):
+                index = self._log_indexes[key]
+                index.popleft()
+                if not len(index):
+                    del self._log_indexes[key]
+    
+    def _retention_cutoff(self) -> Optional[datetime]:
+        if self._retention_seconds is None:
+            return None
+        return datetime.now() - timedelta(seconds=self._retention_seconds)
     
     # === Tracing ===
     
@@ -323,11 +473,7 @@ class ObservabilityPlatform:
             operation=operation,
             attributes=attributes or {}
         )
-        
-        if span.trace_id not in self._traces:
-            self._traces[span.trace_id] = []
-        self._traces[span.trace_id].append(span)
-        
+        self._add_span(span)
         return span
     
     def start_span(
@@ -348,11 +494,7 @@ class ObservabilityPlatform:
             operation=operation,
             attributes=attributes or {}
         )
-        
-        if trace_id not in self._traces:
-            self._traces[trace_id] = []
-        self._traces[trace_id].append(span)
-        
+        self._add_span(span)
         return span
     
     def end_span(self, span: TraceSpan, status: TraceStatus = TraceStatus.OK) -> None:
@@ -365,13 +507,121 @@ class ObservabilityPlatform:
     
     def get_slow_traces(self, threshold_ms: float = 1000) -> List[TraceSpan]:
         """Get traces slower than threshold"""
-        slow = []
-        for trace_id, spans in self._traces.items():
-            # Find root span
-            root = next((s for s in spans if s.parent_span_id is None), None)
-            if root and root.duration_ms() and root.duration_ms() > threshold_ms:
-                slow.append(root)
-        return slow
+        start = bisect_right(self._slow_roots, (threshold_ms, math.inf))
+        # Oldest trace first
+        hits = sorted(self._slow_roots[start:], key=lambda entry: entry[1])
+        return [self._trace_roots[trace_id] for duration, _, trace_id in hits if duration]
+    
+    def get_spans(self, start: datetime, end: datetime) -> List[TraceSpan]:
+        """Get retained spans that started within [start, end]"""
+        return [
+            span for seq, span in self._spans.window(start, end)
+            if self._trace_seq.get(span.trace_id) == seq
+        ]
+    
+    def _add_span(self, span: TraceSpan) -> None:
+        trace_id = span.trace_id
+        spans = self._traces.get(trace_id)
+        if spans is None:
+            spans = self._traces[trace_id] = []
+            self._trace_seq[trace_id] = self._next_trace_seq
+            self._next_trace_seq += 1
+            self._trace_services[trace_id] = {}
+        seq = self._trace_seq[trace_id]
+        spans.append(span)
+        self._spans.append(span.start_time, (seq, span))
+        
+        if span.parent_span_id is None and trace_id not in self._trace_roots:
+            self._trace_roots[trace_id] = span
+        
+        stats = self._service_stats.get(span.service)
+        if stats is None:
+            stats = self._service_stats[span.service] = ServiceStats()
+        stats.spans += 1
+        first_spans = self._trace_services[trace_id]
+        if span.service not in first_spans:
+            first_spans[span.service] = span
+            stats.traces += 1
+        
+        span._on_end = partial(self._on_span_end, seq)
+        self._cleanup_traces()
+    
+    def _on_span_end(
+        self,
+        seq: int,
+        span: TraceSpan,
+        previous_status: TraceStatus,
+        previous_duration: Optional[float]
+    ) -> None:
+        """Fold an ended span into the service and slow-root aggregates"""
+        trace_id = span.trace_id
+        if self._trace_seq.get(trace_id) != seq:
+            return  # Trace already evicted
+        
+        duration = span.duration_ms()
+        ended_before = previous_duration is not None
+        error_delta = (span.status == TraceStatus.ERROR) - (ended_before and previous_status == TraceStatus.ERROR)
+        
+        stats = self._service_stats[span.service]
+        if ended_before:
+            stats.total_duration_ms -= previous_duration
+        else:
+            stats.ended_spans += 1
+        stats.total_duration_ms += duration
+        stats.error_spans += error_delta
+        if self._trace_services[trace_id].get(span.service) is span:
+            stats.error_traces += error_delta
+        
+        if self._trace_roots.get(trace_id) is span:
+            if ended_before:
+                self._remove_slow_root(previous_duration, seq)
+            insort(self._slow_roots, (duration, seq, trace_id))
+    
+    def _remove_slow_root(self, duration: float, seq: int) -> None:
+        i = bisect_left(self._slow_roots, (duration, seq))
+        if i < len(self._slow_roots) and self._slow_roots[i][1] == seq:
+            del self._slow_roots[i]
+    
+    def _cleanup_traces(self) -> None:
+        """Evict whole traces beyond the retention count or age"""
+        cutoff = self._retention_cutoff()
+        while len(self._traces) > self._max_retention or (
+            cutoff and self._traces and self._traces[next(iter(self._traces))][0].start_time < cutoff
+        ):
+            self._evict_trace(next(iter(self._traces)))
+        
+        # Drop index entries of evicted traces from the head
+        while len(self._spans):
+            seq, span = self._spans.first()[1]
+            if self._trace_seq.get(span.trace_id) == seq:
+                break
+            self._spans.popleft()
+    
+    def _evict_trace(self, trace_id: str) -> None:
+        spans = self._traces.pop(trace_id)
+        seq = self._trace_seq.pop(trace_id)
+        
+        for service, first in self._trace_services.pop(trace_id).items():
+            stats = self._service_stats[service]
+            stats.traces -= 1
+            if first.end_time and first.status == TraceStatus.ERROR:
+                stats.error_traces -= 1
+        
+        for span in spans:
+            stats = self._service_stats[span.service]
+            stats.spans -= 1
+            duration = span.duration_ms()
+            if duration is not None:
+                stats.ended_spans -= 1
+                stats.total_duration_ms -= duration
+                if span.status == TraceStatus.ERROR:
+                    stats.error_spans -= 1
+            if not stats.spans:
+                del self._service_stats[span.service]
+        
+        root = self._trace_roots.pop(trace_id, None)
+        if root and root.end_time:
+            self._remove_slow_root(root.duration_ms(), seq)
     
     # === Events ===
     
@@ -413,31 +663,51 @@ class ObservabilityPlatform:
         
         return events
     
+    # === Correlation ===
+    
+    def correlate_by_time(
+        self,
+        reference_time: Optional[datetime] = None,
+        metric_names: Optional[List[str]] = None
+    ) -> CorrelatedEvent:
+        """Correlate retained logs and spans around a point in time"""
+        reference_time = reference_time or datetime.now()
+        window = timedelta(seconds=self._correlation_engine.time_window_seconds)
+        start, end = reference_time - window, reference_time + window
+        return self._correlation_engine.correlate_by_time(
+            self._logs.window(start, end),
+            self.get_spans(start, end),
+            metric_names or [],
+            reference_time
+        )
+    
+    def correlate_by_trace(self, trace_id: str) -> CorrelatedEvent:
+        """Correlate a retained trace with the logs that carry its ID"""
+        index = self._log_indexes.get(('trace', trace_id))
+        return self._correlation_engine.correlate_by_trace(
+            index.items() if index else [],
+            self.get_trace(trace_id),
+            trace_id
+        )
+    
     # === Analysis ===
     
+    def get_service_stats(self, service: str) -> ServiceStats:
+        """Get span aggregates for a service"""
+        return self._service_stats.get(service) or ServiceStats()
+    
     def get_service_health(self, service: str) -> Dict[str, Any]:
         """Get health summary for a service"""
-        # Count error logs
-        error_logs = self.get_logs(service=service, level=LogLevel.ERROR)
-        warning_logs = self.get_logs(service=service, level=LogLevel.WARNING)
-        
-        # Get traces for service
-        service_traces = []
-        for trace_id, spans in self._traces.items():
-            for span in spans:
-                if span.service == service:
-                    service_traces.append(span)
-                    break
-        
-        error_traces = [t for t in service_traces if t.status == TraceStatus.ERROR]
+        error_logs = self._log_count(service, LogLevel.ERROR)
+        warning_logs = self._log_count(service, LogLevel.WARNING)
         
-        # Calculate health score
-        total_traces = len(service_traces)
-        error_rate = len(error_traces) / total_traces if total_traces > 0 else 0
+        stats = self.get_service_stats(service)
+        total_traces = stats.traces
+        error_rate = stats.error_traces / total_traces if total_traces > 0 else 0
         
-        if error_rate > 0.1 or len(error_logs) > 10:
+        if error_rate > 0.1 or error_logs > 10:
             status = "UNHEALTHY"
-        elif error_rate > 0.05 or len(warning_logs) > 10:
+        elif error_rate > 0.05 or warning_logs > 10:
             status = "DEGRADED"
         else:
             status = "HEALTHY"
@@ -445,24 +715,19 @@ class ObservabilityPlatform:
         return {
             'service': service,
             'status': status,
-            'error_logs': len(error_logs),
-            'warning_logs': len(warning_logs),
+            'error_logs': error_logs,
+            'warning_logs': warning_logs,
             'total_traces': total_traces,
-            'error_traces': len(error_traces),
+            'error_traces': stats.error_traces,
             'error_rate': error_rate,
+            'avg_span_duration_ms': stats.avg_duration_ms,
             'timestamp': datetime.now().isoformat()
         }
     
     def get_platform_summary(self) -> Dict[str, Any]:
         """Get overall platform summary"""
-        services = set()
-        for spans in self._traces.values():
-            for span in spans:
-                if span.service:
-                    services.add(span.service)
-        for log in self._logs:
-            if log.service:
-                services.add(log.service)
+        services = {service for service in self._service_stats if service}
+        services.update(key[1] for key in self._log_indexes if key[0] == 'service')
         
         return {
             'total_logs': len(self._logs),
@@ -471,3 +736,68 @@ class ObservabilityPlatform:
             'services': list(services),
             'timestamp': datetime.now().isoformat()
         }
+
+
+def benchmark_correlation(
+    retained: int = 100000,
+    queries: int = 200,
+    window_seconds: int = 5,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """Measure correlation and health query cost against retained history
+    
+    Retains one log and one root span per second of history, then
+    correlates around random points. The scan figure runs the same
+    CorrelationEngine over the full retained lists, as callers had to
+    before the indexes.
+    """
+    rng = random.Random(seed)
+    platform = ObservabilityPlatform(max_retention=retained)
+    platform._correlation_engine = CorrelationEngine(time_window_seconds=window_seconds)
+    services = [f"svc-{i}" for i in range(20)]
+    base = datetime.now() - timedelta(seconds=retained)
+    
+    for i in range(retained):
+        timestamp = base + timedelta(seconds=i)
+        service = services[i % len(services)]
+        platform._ingest_log(LogEntry(
+            level=LogLevel.ERROR if i % 50 == 0 else LogLevel.INFO,
+            message=f"event {i}",
+            service=service,
+            timestamp=timestamp
+        ))
+        span = TraceSpan(name="request", service=service, start_time=timestamp)
+        platform._add_span(span)
+        span.end(TraceStatus.ERROR if i % 40 == 0 else TraceStatus.OK)
+    
+    points = [base + timedelta(seconds=rng.randrange(retained)) for _ in range(queries)]
+    
+    start = time.perf_counter()
+    for point in points:
+        indexed_event = platform.correlate_by_time(point)
+    indexed = time.perf_counter() - start
+    
+    logs = platform.get_logs()
+    spans = platform.get_spans(base, base + timedelta(seconds=retained))
+    engine = CorrelationEngine(time_window_seconds=window_seconds)
+    start = time.perf_counter()
+    for point in points:
+        scan_event = engine.correlate_by_time(logs, spans, [], point)
+    scan = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for i in range(queries):
+        platform.get_service_health(services[i % len(services)])
+    health = time.perf_counter() - start
+    
+    return {
+        "retained": retained,
+        "queries": queries,
+        "indexed_ms_per_query": indexed / queries * 1000,
+        "scan_ms_per_query": scan / queries * 1000,
+        "health_us_per_query": health / queries * 1e6,
+        "same_result": (
+            indexed_event.related_logs == scan_event.related_logs and
+            indexed_event.related_traces == scan_event.related_traces
+        ),
+    }
@@ -43,6 +43,7 @@ from .python_bridge import (
     PythonEnvironment,
     PackageManager,
     PythonExecutor,
+    InterpreterPool,
 )
 
 __all__ = [
@@ -71,6 +72,7 @@ __all__ = [
     'PythonEnvironment',
     'PackageManager',
     'PythonExecutor',
+    'InterpreterPool',
 ]
 
 __version__ = '1.0.0'
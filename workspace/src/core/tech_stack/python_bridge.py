@@ -11,15 +11,19 @@ Reference: Hybrid architecture for optimal performance
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Callable, Tuple
 from datetime import datetime
+from collections import deque
 import uuid
 import asyncio
 import os
+import shlex
+import shutil
 import sys
 import subprocess
 import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +97,38 @@ class ExecutionResult:
     traceback: Optional[str] = None
 
 
+def _split_command(command: str) -> List[str]:
+    """Split a stored command string; a plain existing path is kept whole"""
+    return [command] if os.path.exists(command) else shlex.split(command)
+
+
+async def run_command(
+    command: List[str],
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None
+) -> Tuple[int, str, str]:
+    """Run a command to completion
+    
+    執行命令直到結束，超時則終止進程
+    
+    Returns:
+        (returncode, stdout, stderr)
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+
 @dataclass
 class PythonEnvironmentConfig:
     """Configuration for a Python environment
@@ -117,6 +153,8 @@ class PythonEnvironment:
     executing AI agent code safely.
     """
     
+    INSTALL_TIMEOUT = 600.0  # seconds
+    
     def __init__(self, config: PythonEnvironmentConfig):
         self.config = config
         self.id = str(uuid.uuid4())
@@ -146,19 +184,22 @@ class PythonEnvironment:
             return False
     
     async def _create_virtualenv(self) -> bool:
-        """Create a virtualenv environment"""
-        # In production: Actually create virtualenv
-        # subprocess.run([sys.executable, "-m", "venv", self.path])
-        
-        # Simulate environment creation
-        await asyncio.sleep(0.1)
-        
-        self.python_executable = os.path.join(
+        """Create a virtualenv environment (reused if it already exists)"""
+        python_executable = os.path.join(
             self.path, "bin" if os.name != "nt" else "Scripts", "python"
         )
-        self.pip_executable = os.path.join(
-            self.path, "bin" if os.name != "nt" else "Scripts", "pip"
-        )
+        
+        if not os.path.exists(python_executable):
+            base_python = shutil.which(f"python{self.config.python_version.value}") or sys.executable
+            returncode, _, stderr = await run_command(
+                [base_python, "-m", "venv", self.path], timeout=self.INSTALL_TIMEOUT
+            )
+            if returncode != 0:
+                logger.error(f"Failed to create virtualenv at {self.path}: {stderr.strip()}")
+                return False
+        
+        self.python_executable = python_executable
+        self.pip_executable = f"{shlex.quote(python_executable)} -m pip"
         self.is_active = True
         self.created_at = datetime.now()
         
@@ -181,7 +222,7 @@ class PythonEnvironment:
     async def _use_system_python(self) -> bool:
         """Use system Python"""
         self.python_executable = sys.executable
-        self.pip_executable = f"{sys.executable} -m pip"
+        self.pip_executable = f"{shlex.quote(sys.executable)} -m pip"
         self.is_active = True
         self.created_at = datetime.now()
         
@@ -196,10 +237,14 @@ class PythonEnvironment:
             return False
         
         try:
-            # In production: Actually install package
-            # subprocess.run([self.pip_executable, "install", package.get_install_string()])
-            
-            await asyncio.sleep(0.05)
+            returncode, _, stderr = await run_command(
+                self.pip_command() + ["install", package.get_install_string()],
+                env=self.process_env(),
+                timeout=self.INSTALL_TIMEOUT
+            )
+            if returncode != 0:
+                logger.error(f"Failed to install package {package.name}: {stderr.strip()}")
+                return False
             
             package.installed = True
             self.installed_packages[package.name] = package.version or "latest"
@@ -218,10 +263,14 @@ class PythonEnvironment:
             return False
         
         try:
-            # In production: Actually install from requirements
-            # subprocess.run([self.pip_executable, "install", "-r", requirements_path])
-            
-            await asyncio.sleep(0.1)
+            returncode, _, stderr = await run_command(
+                self.pip_command() + ["install", "-r", requirements_path],
+                env=self.process_env(),
+                timeout=self.INSTALL_TIMEOUT
+            )
+            if returncode != 0:
+                logger.error(f"Failed to install requirements from {requirements_path}: {stderr.strip()}")
+                return False
             return True
         except Exception as e:
             logger.error(f"Failed to install requirements from {requirements_path}: {e}")
@@ -246,6 +295,22 @@ class PythonEnvironment:
             logger.error(f"Failed to destroy environment {self.config.name}: {e}")
             return False
     
+    def python_command(self) -> List[str]:
+        """Command line that starts this environment's interpreter"""
+        if not self.is_active or not self.python_executable:
+            raise RuntimeError(f"Python environment {self.config.name} is not active")
+        return _split_command(self.python_executable)
+    
+    def pip_command(self) -> List[str]:
+        """Command line that runs pip for this environment"""
+        if not self.pip_executable:
+            raise RuntimeError(f"Python environment {self.config.name} is not active")
+        return _split_command(self.pip_executable)
+    
+    def process_env(self) -> Dict[str, str]:
+        """Process environment with the configured variables applied"""
+        return {**os.environ, **self.config.environment_variables}
+    
     def get_status(self) -> Dict[str, Any]:
         """Get environment status"""
         return {
@@ -322,11 +387,15 @@ class PackageManager:
     async def setup_ai_environment(
         self,
         env_name: str = "synergymesh_ai",
-        include_ml: bool = True
+        include_ml: bool = True,
+        install_packages: bool = True
     ) -> PythonEnvironment:
         """Set up a complete AI development environment
         
         設置完整的 AI 開發環境
+        
+        Args:
+            install_packages: Install the recommended packages (needs package index access)
         """
         config = PythonEnvironmentConfig(
             name=env_name,
@@ -342,8 +411,9 @@ class PackageManager:
         await env.create()
         
         # Install all packages
-        for package in config.packages:
-            await env.install_package(package)
+        if install_packages:
+            for package in config.packages:
+                await env.install_package(package)
         
         self.environments[env_name] = env
         return env
@@ -357,6 +427,320 @@ class PackageManager:
         return self.environments.get(name)
 
 
+# Worker interpreter loop: reads JSON requests from stdin and answers on a
+# private copy of stdout. User output is sent back as stream messages.
+_WORKER_SOURCE = r"""
+import importlib, io, json, os, runpy, sys, traceback
+
+_protocol = os.fdopen(os.dup(1), "w", buffering=1, encoding="utf-8")
+os.dup2(2, 1)
+_requests = sys.stdin
+sys.stdin = io.StringIO()
+
+def _send(message):
+    _protocol.write(json.dumps(message) + "\n")
+    _protocol.flush()
+
+def _rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class _Stream(io.TextIOBase):
+    def __init__(self, name):
+        self.name = name
+        self.request_id = None
+    def writable(self):
+        return True
+    def write(self, data):
+        if data:
+            _send({"id": self.request_id, "stream": self.name, "data": data})
+        return len(data)
+
+_failed = []
+for _name in json.loads(sys.argv[1]):
+    try:
+        importlib.import_module(_name)
+    except Exception:
+        _failed.append(_name)
+_send({"ready": True, "pid": os.getpid(), "rss": _rss(), "preload_failed": _failed})
+
+_stdout, _stderr = _Stream("stdout"), _Stream("stderr")
+sys.stdout, sys.stderr = _stdout, _stderr
+
+for _line in _requests:
+    _request = json.loads(_line)
+    _stdout.request_id = _stderr.request_id = _request["id"]
+    _reply = {"id": _request["id"], "done": True, "ok": True}
+    try:
+        if _request["mode"] == "script":
+            runpy.run_path(_request["source"], run_name="__main__")
+        elif _request["mode"] == "module":
+            runpy.run_module(_request["source"], run_name="__main__", alter_sys=True)
+        else:
+            exec(compile(_request["source"], "<inline>", "exec"), {"__name__": "__main__"})
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            _reply.update(ok=False, error_type="SystemExit", error_message=str(e.code))
+    except BaseException as e:
+        _reply.update(ok=False, error_type=type(e).__name__, error_message=str(e),
+                      traceback=traceback.format_exc())
+    _reply["rss"] = _rss()
+    _send(_reply)
+"""
+
+
+@dataclass
+class _PooledWorker:
+    """A pre-started worker interpreter"""
+    process: asyncio.subprocess.Process
+    baseline_rss: int = 0
+    rss: int = 0
+    runs: int = 0
+    stderr_task: Optional[asyncio.Task] = None
+
+
+class InterpreterPool:
+    """Pool of pre-started worker interpreters
+    
+    預啟動的 Python 解釋器池
+    
+    Workers start once, import the preload modules and then run many
+    snippets, so a call does not pay interpreter startup. Each run gets
+    fresh globals; imported modules stay warm between runs. A worker is
+    replaced after max_runs_per_worker runs, when its RSS has grown by more
+    than max_memory_growth_mb, when a call times out, or when it exits.
+    """
+    
+    def __init__(
+        self,
+        command: List[str],
+        size: int = 2,
+        preload_modules: Optional[List[str]] = None,
+        max_runs_per_worker: int = 100,
+        max_memory_growth_mb: float = 256.0,
+        env: Optional[Dict[str, str]] = None,
+        startup_timeout: float = 30.0
+    ):
+        self.command = command
+        self.size = size
+        self.preload_modules = preload_modules or []
+        self.max_runs_per_worker = max_runs_per_worker
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.env = env
+        self.startup_timeout = startup_timeout
+        
+        self._idle: deque = deque()
+        self._waiters: deque = deque()
+        self._workers: List[_PooledWorker] = []
+        self._closed = False
+        self.stats = {"spawned": 0, "recycled": 0, "timeouts": 0, "crashed": 0, "runs": 0}
+    
+    async def start(self) -> None:
+        """Start all workers ahead of the first call"""
+        missing = self.size - len(self._workers)
+        workers = await asyncio.gather(*(self._spawn() for _ in range(missing)))
+        for worker in workers:
+            self._release(worker)
+    
+    async def run(
+        self,
+        mode: ExecutionMode,
+        source: str,
+        timeout: float,
+        on_output: Optional[Callable[[str, str], Any]] = None,
+        capture_output: bool = True,
+        max_output_size: int = 1024 * 1024
+    ) -> ExecutionResult:
+        """Run code, a script path or a module name in a worker
+        
+        Raises:
+            asyncio.TimeoutError: The call exceeded timeout; the worker is killed
+        """
+        worker = await self._acquire()
+        result = ExecutionResult()
+        output = {"stdout": [], "stderr": []}
+        sizes = {"stdout": 0, "stderr": 0}
+        request_id = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        
+        try:
+            worker.process.stdin.write((json.dumps({
+                "id": request_id,
+                "mode": "inline" if mode == ExecutionMode.REPL else mode.value,
+                "source": source
+            }) + "\n").encode())
+            await worker.process.stdin.drain()
+            
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                line = await asyncio.wait_for(worker.process.stdout.readline(), remaining)
+                if not line:
+                    raise ConnectionError(
+                        f"Worker interpreter exited with code {await worker.process.wait()}"
+                    )
+                message = json.loads(line)
+                if message.get("id") != request_id:
+                    continue
+                
+                stream = message.get("stream")
+                if stream:
+                    data = message["data"]
+                    if capture_output and sizes[stream] < max_output_size:
+                        output[stream].append(data[:max_output_size - sizes[stream]])
+                        sizes[stream] += len(data)
+                    if on_output:
+                        if asyncio.iscoroutinefunction(on_output):
+                            await on_output(stream, data)
+                        else:
+                            on_output(stream, data)
+                    continue
+                
+                result.success = message["ok"]
+                result.error_type = message.get("error_type")
+                result.error_message = message.get("error_message")
+                result.traceback = message.get("traceback")
+                result.memory_usage = message.get("rss")
+                break
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            await self._discard(worker)
+            raise
+        except (ConnectionError, BrokenPipeError, ValueError) as e:
+            self.stats["crashed"] += 1
+            await self._discard(worker)
+            result.success = False
+            result.error_type = type(e).__name__
+            result.error_message = str(e)
+            worker = None
+        except BaseException:
+            await self._discard(worker)
+            raise
+        finally:
+            result.stdout = "".join(output["stdout"])
+            result.stderr = "".join(output["stderr"])
+        
+        if worker is not None:
+            self.stats["runs"] += 1
+            worker.runs += 1
+            worker.rss = result.memory_usage or worker.rss
+            growth_mb = (worker.rss - worker.baseline_rss) / (1024 * 1024)
+            if worker.runs >= self.max_runs_per_worker or growth_mb > self.max_memory_growth_mb:
+                self.stats["recycled"] += 1
+                await self._discard(worker)
+            else:
+                self._release(worker)
+        
+        return result
+    
+    async def close(self) -> None:
+        """Stop all workers"""
+        self._closed = True
+        for worker in list(self._workers):
+            await self._discard(worker)
+        self._idle.clear()
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_exception(RuntimeError("Interpreter pool closed"))
+        self._waiters.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            **self.stats,
+            "size": self.size,
+            "workers": len(self._workers),
+            "idle": len(self._idle),
+        }
+    
+    async def _spawn(self) -> _PooledWorker:
+        process = await asyncio.create_subprocess_exec(
+            *self.command, "-u", "-c", _WORKER_SOURCE, json.dumps(self.preload_modules),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self.env
+        )
+        worker = _PooledWorker(process=process)
+        self._workers.append(worker)
+        worker.stderr_task = asyncio.create_task(self._drain_stderr(process))
+        
+        try:
+            line = await asyncio.wait_for(process.stdout.readline(), self.startup_timeout)
+            ready = json.loads(line) if line else {}
+            if not ready.get("ready"):
+                raise RuntimeError(f"Worker interpreter failed to start: {self.command}")
+        except BaseException:
+            await self._discard(worker)
+            raise
+        
+        if ready["preload_failed"]:
+            logger.warning(f"Worker could not preload modules: {ready['preload_failed']}")
+        worker.baseline_rss = worker.rss = ready["rss"]
+        self.stats["spawned"] += 1
+        return worker
+    
+    async def _acquire(self) -> _PooledWorker:
+        if self._closed:
+            raise RuntimeError("Interpreter pool closed")
+        while self._idle:
+            worker = self._idle.popleft()
+            if worker.process.returncode is None:
+                return worker
+            await self._discard(worker)
+        if len(self._workers) < self.size:
+            return await self._spawn()
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        return await waiter
+    
+    def _release(self, worker: _PooledWorker) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(worker)
+                return
+        self._idle.append(worker)
+    
+    async def _discard(self, worker: _PooledWorker) -> None:
+        if worker in self._workers:
+            self._workers.remove(worker)
+        if worker.process.returncode is None:
+            worker.process.kill()
+            await worker.process.wait()
+        if worker.stderr_task:
+            await worker.stderr_task
+        
+        # A waiter that lost its worker gets a new one
+        if self._waiters and not self._closed:
+            asyncio.create_task(self._replace())
+    
+    async def _replace(self) -> None:
+        try:
+            worker = await self._spawn()
+        except Exception as e:
+            logger.error(f"Failed to start worker interpreter: {e}")
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_exception(e)
+                    break
+            return
+        self._release(worker)
+    
+    @staticmethod
+    async def _drain_stderr(process: asyncio.subprocess.Process) -> None:
+        """Log output written to the worker's raw file descriptors"""
+        async for line in process.stderr:
+            logger.debug(f"worker {process.pid}: {line.decode(errors='replace').rstrip()}")
+
+
 class PythonExecutor:
     """Executes Python code in managed environments
     
@@ -367,24 +751,45 @@ class PythonExecutor:
     - Memory limits
     - Output capture
     - Error handling
+    
+    Code runs in a pool of pre-started interpreters from the environment
+    (the current interpreter when no environment is given). Output can be
+    streamed with on_output(stream, data) while the code runs.
     """
     
-    def __init__(self, environment: Optional[PythonEnvironment] = None):
+    def __init__(
+        self,
+        environment: Optional[PythonEnvironment] = None,
+        pool_size: int = 2,
+        preload_modules: Optional[List[str]] = None,
+        max_runs_per_worker: int = 100,
+        max_memory_growth_mb: float = 256.0
+    ):
         self.environment = environment
         self.execution_history: List[ExecutionResult] = []
         self.default_timeout = 60.0  # seconds
         self.max_output_size = 1024 * 1024  # 1MB
+        self.pool_size = pool_size
+        self.preload_modules = preload_modules or ["json", "asyncio"]
+        self.max_runs_per_worker = max_runs_per_worker
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.pool: Optional[InterpreterPool] = None
     
     async def execute_code(
         self,
         code: str,
         mode: ExecutionMode = ExecutionMode.INLINE,
         timeout: Optional[float] = None,
-        capture_output: bool = True
+        capture_output: bool = True,
+        on_output: Optional[Callable[[str, str], Any]] = None
     ) -> ExecutionResult:
         """Execute Python code
         
         執行 Python 代碼
+        
+        Args:
+            code: Source code, a script path (SCRIPT) or a module name (MODULE)
+            on_output: Called with ("stdout" | "stderr", text) as output arrives
         """
         start_time = datetime.now()
         result = ExecutionResult()
@@ -392,15 +797,12 @@ class PythonExecutor:
         timeout = timeout or self.default_timeout
         
         try:
-            if mode == ExecutionMode.INLINE:
-                result = await self._execute_inline(code, timeout, capture_output)
-            elif mode == ExecutionMode.SCRIPT:
-                result = await self._execute_script(code, timeout, capture_output)
+            if mode == ExecutionMode.SCRIPT:
+                result = await self._execute_script(code, timeout, capture_output, on_output)
             elif mode == ExecutionMode.MODULE:
-                result = await self._execute_module(code, timeout, capture_output)
-            
-            result.execution_time = (datetime.now() - start_time).total_seconds()
-            result.success = True
+                result = await self._execute_module(code, timeout, capture_output, on_output)
+            else:
+                result = await self._execute_inline(code, timeout, capture_output, on_output)
             
         except asyncio.TimeoutError:
             result.success = False
@@ -411,6 +813,7 @@ class PythonExecutor:
             result.error_type = type(e).__name__
             result.error_message = str(e)
         
+        result.execution_time = (datetime.now() - start_time).total_seconds()
         self.execution_history.append(result)
         return result
     
@@ -418,58 +821,101 @@ class PythonExecutor:
         self,
         code: str,
         timeout: float,
-        capture_output: bool
+        capture_output: bool,
+        on_output: Optional[Callable[[str, str], Any]] = None
     ) -> ExecutionResult:
         """Execute inline Python code"""
-        result = ExecutionResult()
-        
-        # In production: Use subprocess with the environment's Python
-        # proc = await asyncio.create_subprocess_exec(
-        #     self.environment.python_executable, "-c", code,
-        #     stdout=asyncio.subprocess.PIPE,
-        #     stderr=asyncio.subprocess.PIPE
-        # )
-        # stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
-        
-        # Simulate execution
-        await asyncio.sleep(0.05)
-        
-        # Simulate output
-        result.stdout = f"Executed: {code[:50]}..."
-        result.stderr = ""
-        
-        return result
+        return await self._run_pooled(ExecutionMode.INLINE, code, timeout, capture_output, on_output)
     
     async def _execute_script(
         self,
         script_path: str,
         timeout: float,
-        capture_output: bool
+        capture_output: bool,
+        on_output: Optional[Callable[[str, str], Any]] = None
     ) -> ExecutionResult:
         """Execute a Python script file"""
-        result = ExecutionResult()
-        
-        # In production: Execute script file
-        await asyncio.sleep(0.05)
-        
-        result.stdout = f"Script executed: {script_path}"
-        return result
+        return await self._run_pooled(
+            ExecutionMode.SCRIPT, os.path.abspath(script_path), timeout, capture_output, on_output
+        )
     
     async def _execute_module(
         self,
         module_name: str,
         timeout: float,
-        capture_output: bool
+        capture_output: bool,
+        on_output: Optional[Callable[[str, str], Any]] = None
     ) -> ExecutionResult:
         """Execute a Python module"""
+        return await self._run_pooled(ExecutionMode.MODULE, module_name, timeout, capture_output, on_output)
+    
+    async def _run_pooled(
+        self,
+        mode: ExecutionMode,
+        source: str,
+        timeout: float,
+        capture_output: bool,
+        on_output: Optional[Callable[[str, str], Any]]
+    ) -> ExecutionResult:
+        if self.pool is None:
+            self.pool = InterpreterPool(
+                self._python_command(),
+                size=self.pool_size,
+                preload_modules=self.preload_modules,
+                max_runs_per_worker=self.max_runs_per_worker,
+                max_memory_growth_mb=self.max_memory_growth_mb,
+                env=self.environment.process_env() if self.environment else None
+            )
+        return await self.pool.run(
+            mode, source, timeout,
+            on_output=on_output,
+            capture_output=capture_output,
+            max_output_size=self.max_output_size
+        )
+    
+    async def execute_cold(self, code: str, timeout: Optional[float] = None) -> ExecutionResult:
+        """Execute inline code in a freshly started interpreter
+        
+        在新啟動的解釋器中執行代碼（不使用解釋器池）
+        """
+        start_time = datetime.now()
         result = ExecutionResult()
+        timeout = timeout or self.default_timeout
         
-        # In production: python -m module_name
-        await asyncio.sleep(0.05)
+        try:
+            returncode, stdout, stderr = await run_command(
+                self._python_command() + ["-c", code],
+                env=self.environment.process_env() if self.environment else None,
+                timeout=timeout
+            )
+            result.success = returncode == 0
+            result.stdout = stdout[:self.max_output_size]
+            result.stderr = stderr[:self.max_output_size]
+            if returncode != 0:
+                result.error_type = "ProcessError"
+                result.error_message = f"Interpreter exited with code {returncode}"
+        except asyncio.TimeoutError:
+            result.error_type = "TimeoutError"
+            result.error_message = f"Execution timed out after {timeout} seconds"
         
-        result.stdout = f"Module executed: {module_name}"
+        result.execution_time = (datetime.now() - start_time).total_seconds()
+        self.execution_history.append(result)
         return result
     
+    async def close(self) -> None:
+        """Stop the interpreter pool
+        
+        關閉解釋器池
+        """
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+    
+    def _python_command(self) -> List[str]:
+        if self.environment is None:
+            return [sys.executable]
+        return self.environment.python_command()
+    
     async def execute_function(
         self,
         module_name: str,
@@ -537,14 +983,23 @@ class PythonBridge:
     async def initialize(
         self,
         setup_ai_env: bool = True,
-        include_ml: bool = True
+        include_ml: bool = True,
+        environment: Optional[PythonEnvironment] = None
     ) -> bool:
         """Initialize the Python bridge
         
         初始化 Python 橋接器
+        
+        Args:
+            environment: Use an existing environment as the default instead
+                of setting up the AI environment
         """
         try:
-            if setup_ai_env:
+            if environment is not None:
+                self.package_manager.register_environment(environment)
+                self.default_environment = environment
+                self.executors["default"] = PythonExecutor(environment)
+            elif setup_ai_env:
                 self.default_environment = await self.package_manager.setup_ai_environment(
                     include_ml=include_ml
                 )
@@ -644,6 +1099,14 @@ print(f"CrewAI crew executed with {{len(config.get('agents', []))}} agents")
         
         return await self.execute_ai_code(code)
     
+    async def shutdown(self) -> None:
+        """Stop all executor interpreter pools
+        
+        關閉所有執行器的解釋器池
+        """
+        for executor in self.executors.values():
+            await executor.close()
+    
     def get_status(self) -> Dict[str, Any]:
         """Get bridge status
         
@@ -661,5 +1124,39 @@ print(f"CrewAI crew executed with {{len(config.get('agents', []))}} agents")
         }
 
 
+async def benchmark_execution(
+    runs: int = 20,
+    code: str = "import json\nprint(json.dumps({'ok': True}))",
+    environment: Optional[PythonEnvironment] = None
+) -> Dict[str, Any]:
+    """Compare pooled execution with a cold interpreter per call
+    
+    比較解釋器池與每次冷啟動的執行時間
+    """
+    executor = PythonExecutor(environment, pool_size=1)
+    try:
+        await executor.execute_code(code)  # start the worker
+        
+        start = time.perf_counter()
+        for _ in range(runs):
+            await executor.execute_code(code)
+        pooled = (time.perf_counter() - start) / runs
+        
+        start = time.perf_counter()
+        for _ in range(runs):
+            await executor.execute_cold(code)
+        cold = (time.perf_counter() - start) / runs
+    finally:
+        await executor.close()
+    
+    return {
+        "runs": runs,
+        "pooled_ms": pooled * 1000,
+        "cold_ms": cold * 1000,
+        "speedup": cold / pooled if pooled else 0.0,
+        "all_succeeded": all(r.success for r in executor.execution_history),
+    }
+
+
 # Import json for code generation
 import json
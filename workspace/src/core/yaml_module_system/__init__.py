@@ -26,6 +26,7 @@ from .yaml_schema_validator import (
     ValidationResult,
     ValidationError,
     SchemaRegistry,
+    CompiledSchema,
 )
 
 from .policy_gate import (
@@ -79,6 +80,7 @@ __all__ = [
     'ValidationResult',
     'ValidationError',
     'SchemaRegistry',
+    'CompiledSchema',
     
     # Policy Gate
     'PolicyGate',
@@ -6,11 +6,13 @@ JSON Schema 驗證系統，用於驗證 YAML 模組的結構和內容。
 Reference: Schema validation best practices [8]
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+import random
 import re
 import json
+import time
 
 
 class ValidationErrorType(Enum):
@@ -87,11 +89,18 @@ class SchemaRegistry:
     def __init__(self):
         self._schemas: Dict[str, Dict[str, Any]] = {}
         self._schema_versions: Dict[str, List[str]] = {}
+        self._revision = 0
+    
+    @property
+    def revision(self) -> int:
+        """註冊表版本，每次註冊遞增，用於使編譯結果失效"""
+        return self._revision
     
     def register(self, schema_id: str, schema: Dict[str, Any], version: str = "1.0.0") -> None:
         """註冊 Schema"""
         full_id = f"{schema_id}@{version}"
         self._schemas[full_id] = schema
+        self._revision += 1
         
         if schema_id not in self._schema_versions:
             self._schema_versions[schema_id] = []
@@ -120,6 +129,58 @@ class SchemaRegistry:
         return self._schema_versions.get(schema_id, [])
 
 
+def _has_duplicate_items(items: List[Any]) -> bool:
+    """
+    檢查數組是否有重複項目
+    
+    dict 與 list 以排序鍵後的 JSON 比較，其餘按值比較（1、1.0 與 True 視為相同）。
+    可雜湊的項目用集合檢查，其餘退回線性比較。
+    """
+    seen = set()
+    unhashable = []
+    for item in items:
+        item_key = json.dumps(item, sort_keys=True) if isinstance(item, (dict, list)) else item
+        try:
+            if item_key in seen or (unhashable and item_key in unhashable):
+                return True
+            seen.add(item_key)
+        except TypeError:
+            # 不可雜湊的項目（如 set）仍可能等於可雜湊的項目（如 frozenset）
+            if item_key in unhashable or any(item_key == other for other in seen):
+                return True
+            unhashable.append(item_key)
+    return False
+
+
+# 編譯後的檢查函數：(data, path, result) -> None
+_Check = Callable[[Any, str, ValidationResult], None]
+
+# 編譯後的節點：(檢查函數, 無需檢查的數據類型)
+_CompiledNode = Tuple[_Check, frozenset]
+
+
+class CompiledSchema:
+    """
+    編譯後的 Schema
+    
+    由 YAMLSchemaValidator.compile 產生。Schema 的關鍵字在編譯時解析為檢查函數，
+    驗證時不再讀取 Schema 字典；錯誤的順序、路徑與訊息與 validate 一致。
+    """
+    
+    def __init__(self, schema: Dict[str, Any], check: _Check, revision: Optional[int] = None):
+        self.schema = schema
+        self.schema_version = schema.get('$schema', 'unknown')
+        self.revision = revision
+        self._check = check
+    
+    def validate(self, data: Any, path: str = "$") -> ValidationResult:
+        """驗證數據是否符合 Schema"""
+        result = ValidationResult(valid=True)
+        result.schema_version = self.schema_version
+        self._check(data, path, result)
+        return result
+
+
 class YAMLSchemaValidator:
     """
     YAML Schema 驗證器
@@ -151,6 +212,7 @@ class YAMLSchemaValidator:
     def __init__(self, registry: Optional[SchemaRegistry] = None):
         self.registry = registry or SchemaRegistry()
         self._custom_validators: Dict[str, callable] = {}
+        self._compiled: Dict[Tuple[str, Optional[str]], CompiledSchema] = {}
     
     def register_custom_validator(self, name: str, validator: callable) -> None:
         """註冊自定義驗證器"""
@@ -175,6 +237,56 @@ class YAMLSchemaValidator:
         
         return result
     
+    def compile(self, schema: Dict[str, Any]) -> CompiledSchema:
+        """
+        將 Schema 編譯為可重複使用的驗證器
+        
+        編譯結果反映編譯當下的 Schema 內容；之後修改 Schema 字典不會生效。
+        自定義驗證器在驗證時才查找，編譯後註冊的驗證器同樣生效。
+        """
+        return CompiledSchema(schema, self._compile_node(schema, {})[0])
+    
+    def get_compiled(self, schema_id: str, version: Optional[str] = None) -> Optional[CompiledSchema]:
+        """
+        獲取註冊表中 Schema 的編譯結果
+        
+        每個 Schema 在同一註冊表版本內只編譯一次；註冊表有新的註冊時重新編譯。
+        """
+        key = (schema_id, version)
+        revision = self.registry.revision
+        compiled = self._compiled.get(key)
+        if compiled is not None and compiled.revision == revision:
+            return compiled
+        
+        schema = self.registry.get(schema_id, version)
+        if schema is None:
+            self._compiled.pop(key, None)
+            return None
+        
+        compiled = self.compile(schema)
+        compiled.revision = revision
+        self._compiled[key] = compiled
+        return compiled
+    
+    def validate_registered(
+        self,
+        data: Any,
+        schema_id: str,
+        version: Optional[str] = None,
+        path: str = "$",
+    ) -> ValidationResult:
+        """
+        使用註冊表中的 Schema 驗證數據
+        
+        結果與 validate(data, registry.get(schema_id, version), path) 相同，
+        但 Schema 只在註冊表變更後才重新編譯。
+        """
+        compiled = self.get_compiled(schema_id, version)
+        if compiled is None:
+            full_id = f"{schema_id}@{version}" if version else schema_id
+            raise ValueError(f"Schema not found: {full_id}")
+        return compiled.validate(data, path)
+    
     def _validate_node(self, data: Any, schema: Dict[str, Any], path: str, result: ValidationResult) -> None:
         """驗證單個節點"""
         
@@ -390,19 +502,13 @@ class YAMLSchemaValidator:
             ))
         
         # 唯一性
-        if schema.get('uniqueItems', False):
-            seen = []
-            for item in data:
-                item_json = json.dumps(item, sort_keys=True) if isinstance(item, (dict, list)) else item
-                if item_json in seen:
-                    result.add_error(ValidationError(
-                        path=path,
-                        error_type=ValidationErrorType.CUSTOM_VALIDATION_FAILED,
-                        message="Array items must be unique",
-                        actual=data,
-                    ))
-                    break
-                seen.append(item_json)
+        if schema.get('uniqueItems', False) and _has_duplicate_items(data):
+            result.add_error(ValidationError(
+                path=path,
+                error_type=ValidationErrorType.CUSTOM_VALIDATION_FAILED,
+                message="Array items must be unique",
+                actual=data,
+            ))
         
         # 項目驗證
         if 'items' in schema:
@@ -462,3 +568,566 @@ class YAMLSchemaValidator:
                 expected=f"<= {schema['maxProperties']} properties",
                 actual=len(data),
             ))
+    
+    # ============ Schema 編譯 ============
+    
+    def _compile_node(self, schema: Dict[str, Any], memo: Dict[int, _CompiledNode]) -> _CompiledNode:
+        """
+        將單個節點編譯為檢查函數，檢查順序與 _validate_node 一致
+        
+        同時返回對該節點無需任何檢查的數據類型，父節點遇到這些類型可直接跳過。
+        """
+        # 同一子 Schema 只編譯一次；自引用的 Schema 先以轉發函數佔位
+        if id(schema) in memo:
+            return memo[id(schema)]
+        compiled: List[_Check] = []
+        memo[id(schema)] = (lambda data, path, result: compiled[0](data, path, result), frozenset())
+        
+        common_checks = []
+        if 'type' in schema:
+            type_check = self._compile_type(schema['type'])
+            if type_check:
+                common_checks.append(type_check)
+        if 'enum' in schema:
+            common_checks.append(self._compile_enum(schema['enum']))
+        if 'const' in schema:
+            common_checks.append(self._compile_const(schema['const']))
+        
+        string_checks = tuple(self._compile_string(schema))
+        number_checks = tuple(self._compile_number(schema))
+        array_checks = tuple(self._compile_array(schema, memo))
+        object_checks = tuple(self._compile_object(schema, memo))
+        custom_checks = tuple(self._compile_custom(schema))
+        common_checks = tuple(common_checks)
+        
+        def check_node(data: Any, path: str, result: ValidationResult) -> None:
+            for check in common_checks:
+                check(data, path, result)
+            
+            if isinstance(data, str):
+                for check in string_checks:
+                    check(data, path, result)
+            elif isinstance(data, (int, float)):
+                if not isinstance(data, bool):
+                    for check in number_checks:
+                        check(data, path, result)
+            elif isinstance(data, list):
+                for check in array_checks:
+                    check(data, path, result)
+            elif isinstance(data, dict):
+                for check in object_checks:
+                    check(data, path, result)
+            
+            for check in custom_checks:
+                check(data, path, result)
+        
+        # 數據的確切類型屬於聲明類型時，類型檢查必然通過，只需執行該類型適用的檢查
+        fast_paths = {
+            exact_type: common_checks[1:] + self._branch_checks(
+                exact_type, string_checks, number_checks, array_checks, object_checks
+            ) + custom_checks
+            for exact_type in self._exact_types(schema.get('type'))
+        }
+        if fast_paths:
+            check_node = self._with_fast_paths(fast_paths, check_node)
+        noop_types = frozenset(exact_type for exact_type, checks in fast_paths.items() if not checks)
+        
+        compiled.append(check_node)
+        memo[id(schema)] = (check_node, noop_types)
+        return memo[id(schema)]
+    
+    def _exact_types(self, expected_type: Any) -> Tuple[type, ...]:
+        """聲明類型對應的 Python 類型；boolean 以外不含 bool（integer 對 bool 另有錯誤）"""
+        if not isinstance(expected_type, str) or expected_type == 'any':
+            return ()
+        python_type = self.TYPE_MAP.get(expected_type)
+        if python_type is None:
+            return ()
+        python_types = python_type if isinstance(python_type, tuple) else (python_type,)
+        if expected_type == 'boolean':
+            return python_types
+        return tuple(t for t in python_types if not issubclass(t, bool))
+    
+    @staticmethod
+    def _branch_checks(
+        exact_type: type,
+        string_checks: Tuple[_Check, ...],
+        number_checks: Tuple[_Check, ...],
+        array_checks: Tuple[_Check, ...],
+        object_checks: Tuple[_Check, ...],
+    ) -> Tuple[_Check, ...]:
+        """某一確切類型的數據適用的檢查，與 check_node 的分支一致"""
+        if issubclass(exact_type, str):
+            return string_checks
+        if issubclass(exact_type, (int, float)):
+            return () if issubclass(exact_type, bool) else number_checks
+        if issubclass(exact_type, list):
+            return array_checks
+        if issubclass(exact_type, dict):
+            return object_checks
+        return ()
+    
+    @staticmethod
+    def _with_fast_paths(fast_paths: Dict[type, Tuple[_Check, ...]], check_node: _Check) -> _Check:
+        """按數據的確切類型直接執行適用的檢查，其餘交給完整檢查"""
+        def check_fast(data: Any, path: str, result: ValidationResult) -> None:
+            checks = fast_paths.get(type(data))
+            if checks is None:
+                check_node(data, path, result)
+            else:
+                for check in checks:
+                    check(data, path, result)
+        
+        return check_fast
+    
+    def _compile_type(self, expected_type: str) -> Optional[_Check]:
+        """編譯類型檢查"""
+        if expected_type == 'any':
+            return None
+
+        try:
+            expected_python_type = self.TYPE_MAP.get(expected_type)
+        except TypeError:
+            # 無法識別的類型聲明（如類型列表）交由解釋器處理，行為保持一致
+            return lambda data, path, result: self._validate_type(data, expected_type, path, result)
+        if expected_python_type is None:
+            return None
+        
+        def check_type(data: Any, path: str, result: ValidationResult) -> None:
+            if isinstance(data, bool):
+                if expected_type == 'boolean':
+                    return
+                if expected_type == 'integer':
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.TYPE_MISMATCH,
+                        message=f"Expected {expected_type}, got boolean",
+                        expected=expected_type,
+                        actual=type(data).__name__,
+                    ))
+                    return
+            
+            if not isinstance(data, expected_python_type):
+                result.add_error(ValidationError(
+                    path=path,
+                    error_type=ValidationErrorType.TYPE_MISMATCH,
+                    message=f"Expected {expected_type}, got {type(data).__name__}",
+                    expected=expected_type,
+                    actual=type(data).__name__,
+                ))
+        
+        return check_type
+    
+    def _compile_enum(self, enum_values: List[Any]) -> _Check:
+        """編譯 enum 檢查"""
+        def check_enum(data: Any, path: str, result: ValidationResult) -> None:
+            if data not in enum_values:
+                result.add_error(ValidationError(
+                    path=path,
+                    error_type=ValidationErrorType.ENUM_VIOLATION,
+                    message=f"Value must be one of {enum_values}",
+                    expected=enum_values,
+                    actual=data,
+                ))
+        
+        return check_enum
+    
+    def _compile_const(self, const: Any) -> _Check:
+        """編譯 const 檢查"""
+        def check_const(data: Any, path: str, result: ValidationResult) -> None:
+            if data != const:
+                result.add_error(ValidationError(
+                    path=path,
+                    error_type=ValidationErrorType.ENUM_VIOLATION,
+                    message=f"Value must be exactly {const}",
+                    expected=const,
+                    actual=data,
+                ))
+        
+        return check_const
+    
+    def _compile_string(self, schema: Dict[str, Any]) -> List[_Check]:
+        """編譯字符串檢查，正則表達式只編譯一次"""
+        checks = []
+        
+        if 'minLength' in schema:
+            min_length = schema['minLength']
+            
+            def check_min_length(data: str, path: str, result: ValidationResult) -> None:
+                if len(data) < min_length:
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                        message=f"String length {len(data)} is less than minimum {min_length}",
+                        expected=f">= {min_length}",
+                        actual=len(data),
+                    ))
+            checks.append(check_min_length)
+        
+        if 'maxLength' in schema:
+            max_length = schema['maxLength']
+            
+            def check_max_length(data: str, path: str, result: ValidationResult) -> None:
+                if len(data) > max_length:
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                        message=f"String length {len(data)} is greater than maximum {max_length}",
+                        expected=f"<= {max_length}",
+                        actual=len(data),
+                    ))
+            checks.append(check_max_length)
+        
+        if 'pattern' in schema:
+            pattern = schema['pattern']
+            match_pattern = re.compile(pattern).match
+            
+            def check_pattern(data: str, path: str, result: ValidationResult) -> None:
+                if not match_pattern(data):
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.PATTERN_MISMATCH,
+                        message=f"String does not match pattern {pattern}",
+                        expected=pattern,
+                        actual=data,
+                    ))
+            checks.append(check_pattern)
+        
+        if 'format' in schema and schema['format'] in self.FORMAT_PATTERNS:
+            format_name = schema['format']
+            match_format = re.compile(self.FORMAT_PATTERNS[format_name]).match
+            
+            def check_format(data: str, path: str, result: ValidationResult) -> None:
+                if not match_format(data):
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.FORMAT_ERROR,
+                        message=f"String does not match format '{format_name}'",
+                        expected=format_name,
+                        actual=data,
+                    ))
+            checks.append(check_format)
+        
+        return checks
+    
+    def _compile_number(self, schema: Dict[str, Any]) -> List[_Check]:
+        """編譯數字檢查"""
+        checks = []
+        
+        if 'minimum' in schema:
+            minimum = schema['minimum']
+            
+            if 'exclusiveMinimum' in schema and schema['exclusiveMinimum']:
+                def check_minimum(data: float, path: str, result: ValidationResult) -> None:
+                    if data <= minimum:
+                        result.add_error(ValidationError(
+                            path=path,
+                            error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                            message=f"Value {data} must be greater than {minimum}",
+                            expected=f"> {minimum}",
+                            actual=data,
+                        ))
+            else:
+                def check_minimum(data: float, path: str, result: ValidationResult) -> None:
+                    if data < minimum:
+                        result.add_error(ValidationError(
+                            path=path,
+                            error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                            message=f"Value {data} is less than minimum {minimum}",
+                            expected=f">= {minimum}",
+                            actual=data,
+                        ))
+            checks.append(check_minimum)
+        
+        if 'maximum' in schema:
+            maximum = schema['maximum']
+            
+            if 'exclusiveMaximum' in schema and schema['exclusiveMaximum']:
+                def check_maximum(data: float, path: str, result: ValidationResult) -> None:
+                    if data >= maximum:
+                        result.add_error(ValidationError(
+                            path=path,
+                            error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                            message=f"Value {data} must be less than {maximum}",
+                            expected=f"< {maximum}",
+                            actual=data,
+                        ))
+            else:
+                def check_maximum(data: float, path: str, result: ValidationResult) -> None:
+                    if data > maximum:
+                        result.add_error(ValidationError(
+                            path=path,
+                            error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                            message=f"Value {data} is greater than maximum {maximum}",
+                            expected=f"<= {maximum}",
+                            actual=data,
+                        ))
+            checks.append(check_maximum)
+        
+        if 'multipleOf' in schema:
+            multiple_of = schema['multipleOf']
+            
+            def check_multiple_of(data: float, path: str, result: ValidationResult) -> None:
+                if data % multiple_of != 0:
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                        message=f"Value {data} is not a multiple of {multiple_of}",
+                        expected=f"multiple of {multiple_of}",
+                        actual=data,
+                    ))
+            checks.append(check_multiple_of)
+        
+        return checks
+    
+    def _compile_array(self, schema: Dict[str, Any], memo: Dict[int, _CompiledNode]) -> List[_Check]:
+        """編譯數組檢查"""
+        checks = []
+        
+        if 'minItems' in schema:
+            min_items = schema['minItems']
+            
+            def check_min_items(data: list, path: str, result: ValidationResult) -> None:
+                if len(data) < min_items:
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.ARRAY_LENGTH_ERROR,
+                        message=f"Array length {len(data)} is less than minimum {min_items}",
+                        expected=f">= {min_items} items",
+                        actual=len(data),
+                    ))
+            checks.append(check_min_items)
+        
+        if 'maxItems' in schema:
+            max_items = schema['maxItems']
+            
+            def check_max_items(data: list, path: str, result: ValidationResult) -> None:
+                if len(data) > max_items:
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.ARRAY_LENGTH_ERROR,
+                        message=f"Array length {len(data)} is greater than maximum {max_items}",
+                        expected=f"<= {max_items} items",
+                        actual=len(data),
+                    ))
+            checks.append(check_max_items)
+        
+        if schema.get('uniqueItems', False):
+            def check_unique(data: list, path: str, result: ValidationResult) -> None:
+                if _has_duplicate_items(data):
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.CUSTOM_VALIDATION_FAILED,
+                        message="Array items must be unique",
+                        actual=data,
+                    ))
+            checks.append(check_unique)
+        
+        if 'items' in schema:
+            check_item, item_noop_types = self._compile_node(schema['items'], memo)
+            
+            def check_items(data: list, path: str, result: ValidationResult) -> None:
+                for i, item in enumerate(data):
+                    if type(item) not in item_noop_types:
+                        check_item(item, f"{path}[{i}]", result)
+            checks.append(check_items)
+        
+        return checks
+    
+    def _compile_object(self, schema: Dict[str, Any], memo: Dict[int, _CompiledNode]) -> List[_Check]:
+        """編譯對象檢查"""
+        checks = []
+        
+        if 'required' in schema:
+            required_props = list(schema['required'])
+            
+            def check_required(data: dict, path: str, result: ValidationResult) -> None:
+                for required_prop in required_props:
+                    if required_prop not in data:
+                        result.add_error(ValidationError(
+                            path=f"{path}.{required_prop}",
+                            error_type=ValidationErrorType.REQUIRED_FIELD_MISSING,
+                            message=f"Required property '{required_prop}' is missing",
+                            expected=required_prop,
+                        ))
+            checks.append(check_required)
+        
+        if 'properties' in schema:
+            property_checks = [
+                (prop_name, f".{prop_name}", *self._compile_node(prop_schema, memo))
+                for prop_name, prop_schema in schema['properties'].items()
+            ]
+            
+            def check_properties(data: dict, path: str, result: ValidationResult) -> None:
+                for prop_name, suffix, check_property, noop_types in property_checks:
+                    if prop_name in data:
+                        value = data[prop_name]
+                        if type(value) not in noop_types:
+                            check_property(value, path + suffix, result)
+            checks.append(check_properties)
+        
+        if schema.get('additionalProperties') is False:
+            allowed_props = set(schema.get('properties', {}).keys())
+            allowed_props.update(schema.get('patternProperties', {}).keys())
+            
+            def check_additional(data: dict, path: str, result: ValidationResult) -> None:
+                for prop_name in data.keys():
+                    if prop_name not in allowed_props:
+                        result.add_error(ValidationError(
+                            path=f"{path}.{prop_name}",
+                            error_type=ValidationErrorType.ADDITIONAL_PROPERTY,
+                            message=f"Additional property '{prop_name}' is not allowed",
+                            actual=prop_name,
+                        ))
+            checks.append(check_additional)
+        
+        if 'minProperties' in schema:
+            min_properties = schema['minProperties']
+            
+            def check_min_properties(data: dict, path: str, result: ValidationResult) -> None:
+                if len(data) < min_properties:
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                        message=f"Object has {len(data)} properties, minimum is {min_properties}",
+                        expected=f">= {min_properties} properties",
+                        actual=len(data),
+                    ))
+            checks.append(check_min_properties)
+        
+        if 'maxProperties' in schema:
+            max_properties = schema['maxProperties']
+            
+            def check_max_properties(data: dict, path: str, result: ValidationResult) -> None:
+                if len(data) > max_properties:
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.VALUE_OUT_OF_RANGE,
+                        message=f"Object has {len(data)} properties, maximum is {max_properties}",
+                        expected=f"<= {max_properties} properties",
+                        actual=len(data),
+                    ))
+            checks.append(check_max_properties)
+        
+        return checks
+    
+    def _compile_custom(self, schema: Dict[str, Any]) -> List[_Check]:
+        """編譯自定義驗證，驗證器在驗證時查找"""
+        if 'x-custom-validator' not in schema:
+            return []
+        
+        validator_name = schema['x-custom-validator']
+        custom_validators = self._custom_validators
+        
+        def check_custom(data: Any, path: str, result: ValidationResult) -> None:
+            if validator_name in custom_validators:
+                try:
+                    custom_validators[validator_name](data, path, result)
+                except Exception as e:
+                    result.add_error(ValidationError(
+                        path=path,
+                        error_type=ValidationErrorType.CUSTOM_VALIDATION_FAILED,
+                        message=f"Custom validator '{validator_name}' failed: {str(e)}",
+                    ))
+        
+        return [check_custom]
+
+
+def benchmark_validation(
+    documents: int = 2000,
+    modules_per_document: int = 20,
+    invalid_ratio: float = 0.2,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    比較解釋執行與編譯後 Schema 的驗證吞吐量
+    
+    以模組清單 Schema 驗證隨機生成的清單文檔，部分文檔含錯誤；
+    同時確認兩種方式產生的錯誤完全相同。
+    """
+    rng = random.Random(seed)
+    module_schema = {
+        "type": "object",
+        "required": ["id", "version", "owner", "lifecycle"],
+        "additionalProperties": False,
+        "properties": {
+            "id": {"type": "string", "pattern": "^[a-z][a-z0-9-]{2,40}$"},
+            "version": {"type": "string", "format": "semver"},
+            "owner": {
+                "type": "object",
+                "required": ["team", "contacts"],
+                "properties": {
+                    "team": {"type": "string", "minLength": 2},
+                    "contacts": {
+                        "type": "array",
+                        "minItems": 1,
+                        "uniqueItems": True,
+                        "items": {"type": "string", "format": "email"},
+                    },
+                },
+            },
+            "lifecycle": {"type": "string", "enum": ["draft", "active", "deprecated"]},
+            "replicas": {"type": "integer", "minimum": 1, "maximum": 50},
+            "tags": {"type": "array", "uniqueItems": True, "items": {"type": "string"}},
+        },
+    }
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "required": ["apiVersion", "modules"],
+        "properties": {
+            "apiVersion": {"type": "string", "const": "v1"},
+            "modules": {"type": "array", "items": module_schema},
+        },
+    }
+    
+    def make_module(i: int, invalid: bool) -> Dict[str, Any]:
+        module = {
+            "id": f"module-{i}",
+            "version": f"1.{i % 10}.{rng.randrange(20)}",
+            "owner": {"team": "platform", "contacts": [f"owner{i}@example.com", "oncall@example.com"]},
+            "lifecycle": rng.choice(["draft", "active", "deprecated"]),
+            "replicas": rng.randrange(1, 10),
+            "tags": [f"tag-{j}" for j in range(rng.randrange(1, 6))],
+        }
+        if invalid:
+            broken = rng.randrange(4)
+            if broken == 0:
+                module["version"] = "latest"
+            elif broken == 1:
+                module["replicas"] = True
+            elif broken == 2:
+                module["owner"]["contacts"].append("oncall@example.com")
+            else:
+                module["unexpected"] = 1
+        return module
+    
+    docs = []
+    for _ in range(documents):
+        # 每份無效文檔只有一個模組出錯
+        broken_module = rng.randrange(modules_per_document) if rng.random() < invalid_ratio else -1
+        docs.append({
+            "apiVersion": "v1",
+            "modules": [make_module(i, i == broken_module) for i in range(modules_per_document)],
+        })
+    
+    validator = YAMLSchemaValidator()
+    validator.registry.register("module-manifest", schema)
+    
+    start = time.perf_counter()
+    interpreted = [validator.validate(doc, schema) for doc in docs]
+    interpreted_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    compiled = [validator.validate_registered(doc, "module-manifest") for doc in docs]
+    compiled_seconds = time.perf_counter() - start
+    
+    return {
+        "documents": documents,
+        "modules_per_document": modules_per_document,
+        "invalid_documents": sum(not r.valid for r in interpreted),
+        "interpreted_docs_per_second": documents / interpreted_seconds,
+        "compiled_docs_per_second": documents / compiled_seconds,
+        "speedup": interpreted_seconds / compiled_seconds,
+        "same_result": [r.to_dict() for r in interpreted] == [r.to_dict() for r in compiled],
+    }
@@ -8,21 +8,26 @@ import ast
 import json
 import time
 import hashlib
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
 from collections import defaultdict
 import numpy as np
-import pandas as pd
 from datetime import datetime
 
+import radon
 import radon.cli as radon_cli
-import radon.complexity as radon_cc
 import radon.metrics as radon_metrics
-from vprof import runner
+import radon.raw as radon_raw
+from radon.visitors import ComplexityVisitor
 import lizard
 
+# 分析邏輯變更時遞增，使舊的緩存結果失效
+ANALYZER_VERSION = "2"
+
 
 class ComplexityMetric(Enum):
     """複雜度度量類型"""
@@ -89,14 +94,110 @@ class ProjectComplexity:
     recommendations: List[str]
 
 
+def _file_complexity_to_dict(file_complexity: FileComplexity) -> Dict[str, Any]:
+    """將文件複雜度轉為可 JSON 序列化的字典"""
+    data = asdict(file_complexity)
+    data['risk_level'] = file_complexity.risk_level.value
+    for func_data, func in zip(data['functions'], file_complexity.functions, strict=True):
+        func_data['risk_level'] = func.risk_level.value
+    return data
+
+
+def _file_complexity_from_dict(data: Dict[str, Any]) -> FileComplexity:
+    """從字典還原文件複雜度"""
+    functions = [
+        FunctionComplexity(**{**func_data, 'risk_level': RiskLevel(func_data['risk_level'])})
+        for func_data in data['functions']
+    ]
+    return FileComplexity(**{
+        **data,
+        'functions': functions,
+        'risk_level': RiskLevel(data['risk_level'])
+    })
+
+
+class AnalysisCache:
+    """文件分析結果的持久化緩存
+
+    每個文件一行，記錄 mtime、大小、內容哈希與分析器鍵。mtime 與大小都未變時
+    無需讀取文件即可命中；否則比對內容哈希。分析器鍵包含分析器版本與閾值配置，
+    任一變化都會使結果失效。
+    """
+
+    def __init__(self, db_path: Path, analyzer_key: str):
+        self.db_path = Path(db_path)
+        self.analyzer_key = analyzer_key
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS file_results ("
+            "file_path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+            "content_hash TEXT, analyzer_key TEXT, result TEXT)"
+        )
+
+    def get(self, file_path: str, stat: os.stat_result, content_hash: Optional[str] = None) -> Optional[FileComplexity]:
+        """查詢緩存；未提供內容哈希時只按文件狀態匹配"""
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, content_hash, analyzer_key, result "
+            "FROM file_results WHERE file_path = ?",
+            (file_path,)
+        ).fetchone()
+        if row is None or row[3] != self.analyzer_key:
+            return None
+
+        if content_hash is None:
+            if (row[0], row[1]) != (stat.st_mtime_ns, stat.st_size):
+                return None
+        elif row[2] != content_hash:
+            return None
+        else:
+            # 內容未變但文件狀態變了（如切換分支），更新狀態以便下次直接命中
+            self._conn.execute(
+                "UPDATE file_results SET mtime_ns = ?, size = ? WHERE file_path = ?",
+                (stat.st_mtime_ns, stat.st_size, file_path)
+            )
+
+        return _file_complexity_from_dict(json.loads(row[4]))
+
+    def put(self, file_path: str, stat: os.stat_result, content_hash: str, file_complexity: FileComplexity):
+        """寫入分析結果"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO file_results VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                file_path,
+                stat.st_mtime_ns,
+                stat.st_size,
+                content_hash,
+                self.analyzer_key,
+                json.dumps(_file_complexity_to_dict(file_complexity), ensure_ascii=False)
+            )
+        )
+
+    def prune(self, root: Path, keep: Set[str]) -> int:
+        """刪除項目目錄下已不存在（或已被排除）的文件記錄"""
+        prefix = os.path.join(str(root), '')
+        stale = [
+            (path,) for (path,) in self._conn.execute("SELECT file_path FROM file_results")
+            if path.startswith(prefix) and path not in keep
+        ]
+        self._conn.executemany("DELETE FROM file_results WHERE file_path = ?", stale)
+        return len(stale)
+
+    def close(self):
+        """提交並關閉緩存"""
+        self._conn.commit()
+        self._conn.close()
+
+
 class CodeComplexityAnalyzer:
     """代碼複雜度分析器核心類"""
-    
-    def __init__(self, config_path: str = "config/complexity-analyzer-config.yaml"):
-        self.config = self._load_config(config_path)
+
+    def __init__(self, config_path: str = "config/complexity-analyzer-config.yaml", config: Optional[Dict[str, Any]] = None):
+        self.config = config if config is not None else self._load_config(config_path)
         self.complexity_cache = {}
         self.historical_data = []
-        
+        self.last_run_stats: Dict[str, Any] = {}
+
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """載入配置文件"""
         try:
@@ -137,7 +238,11 @@ class CodeComplexityAnalyzer:
                 ],
                 'output_directory': 'reports/complexity',
                 'enable_historical_tracking': True,
-                'enable_trend_analysis': True
+                'enable_trend_analysis': True,
+                'enable_file_cache': True,
+                'cache_file': None,  # 默認為 output_directory/analysis_cache.sqlite
+                'max_workers': None,  # 默認為 CPU 核數
+                'parallel_threshold': 8  # 待分析文件少於此數時在本進程內分析
             }
     
     def analyze_project(self, project_path: str) -> ProjectComplexity:
@@ -156,23 +261,11 @@ class CodeComplexityAnalyzer:
             raise ValueError("未找到 Python 文件")
         
         print(f"找到 {len(python_files)} 個 Python 文件")
-        
-        # 分析每個文件
-        file_complexities = []
-        total_functions = []
-        all_function_data = []
-        
-        for file_path in python_files:
-            try:
-                file_complexity = self.analyze_file(file_path)
-                file_complexities.append(file_complexity)
-                total_functions.extend(file_complexity.functions)
-                all_function_data.extend([asdict(f) for f in file_complexity.functions])
-                
-            except Exception as e:
-                print(f"分析文件失敗 {file_path}: {e}")
-                continue
-        
+
+        # 分析每個文件（未變更的文件直接取自緩存）
+        file_complexities = self._analyze_files(project_path, python_files)
+        total_functions = [func for file_complexity in file_complexities for func in file_complexity.functions]
+
         # 計算項目級別統計
         project_complexity = self._calculate_project_metrics(
             project_path.name,
@@ -186,10 +279,106 @@ class CodeComplexityAnalyzer:
         
         # 生成趨勢分析
         if self.config.get('enable_trend_analysis', True):
-            project_complexity.trends = self._analyze_trends()
-        
+            project_complexity.trends = self._analyze_trends(project_complexity.project_name)
+
         return project_complexity
-    
+
+    def _analyze_files(self, project_path: Path, python_files: List[Path]) -> List[FileComplexity]:
+        """分析文件列表，結果按文件順序返回
+
+        先查緩存，未命中的文件按數量在本進程或進程池中分析，並寫回緩存。
+        """
+        start_time = time.perf_counter()
+        results: List[Optional[FileComplexity]] = [None] * len(python_files)
+        pending = []  # (索引, 路徑, 內容, 內容哈希, 文件狀態)
+        cache_hits = 0
+        analyzed = 0
+        failed = 0
+
+        cache = self._open_cache()
+        try:
+            for index, file_path in enumerate(python_files):
+                try:
+                    # 讀取前取得狀態，讀取後的修改會改變 mtime 而不會被誤判為未變
+                    stat = file_path.stat()
+                    cached = cache.get(str(file_path), stat) if cache else None
+                    if cached is None:
+                        raw = file_path.read_bytes()
+                        content_hash = hashlib.sha256(raw).hexdigest()
+                        cached = cache.get(str(file_path), stat, content_hash) if cache else None
+                    if cached is not None:
+                        results[index] = cached
+                        cache_hits += 1
+                        continue
+                    pending.append((index, file_path, raw.decode('utf-8'), content_hash, stat))
+                except Exception as e:
+                    print(f"分析文件失敗 {file_path}: {e}")
+                    failed += 1
+
+            outcomes = self._run_analysis([(file_path, content) for _, file_path, content, _, _ in pending])
+            for (index, file_path, _, content_hash, stat), (file_complexity, error) in zip(pending, outcomes, strict=True):
+                if error is not None:
+                    print(f"分析文件失敗 {file_path}: {error}")
+                    failed += 1
+                    continue
+                results[index] = file_complexity
+                analyzed += 1
+                if cache:
+                    cache.put(str(file_path), stat, content_hash, file_complexity)
+
+            if cache:
+                cache.prune(project_path, {str(file_path) for file_path in python_files})
+        finally:
+            if cache:
+                cache.close()
+
+        self.last_run_stats = {
+            'files': len(python_files),
+            'cache_hits': cache_hits,
+            'analyzed': analyzed,
+            'failed': failed,
+            'elapsed_seconds': time.perf_counter() - start_time
+        }
+        print(
+            f"緩存命中 {cache_hits} 個，重新分析 {analyzed} 個，"
+            f"失敗 {failed} 個，耗時 {self.last_run_stats['elapsed_seconds']:.2f} 秒"
+        )
+
+        return [result for result in results if result is not None]
+
+    def _run_analysis(self, tasks: List[Tuple[Path, str]]) -> List[Tuple[Optional[FileComplexity], Optional[str]]]:
+        """分析待處理文件，返回與任務順序一致的 (結果, 錯誤) 列表"""
+        max_workers = self.config.get('max_workers') or os.cpu_count() or 1
+        if max_workers <= 1 or len(tasks) < self.config.get('parallel_threshold', 8):
+            return [_analyze_task(self, task) for task in tasks]
+
+        # 進程啟動有固定開銷，按工作進程數分塊以減少往返
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.config,)
+        ) as executor:
+            return list(executor.map(_analyze_in_worker, tasks, chunksize=chunksize))
+
+    def _open_cache(self) -> Optional[AnalysisCache]:
+        """打開文件分析緩存，未啟用時返回 None"""
+        if not self.config.get('enable_file_cache', True):
+            return None
+
+        cache_file = self.config.get('cache_file') or (
+            Path(self.config.get('output_directory', 'reports/complexity')) / 'analysis_cache.sqlite'
+        )
+        # 閾值影響風險等級與建議，因此與版本一起作為緩存鍵
+        analyzer_key = hashlib.sha256(json.dumps({
+            'analyzer_version': ANALYZER_VERSION,
+            'radon_version': radon.__version__,
+            'lizard_version': getattr(lizard, 'version', ''),
+            'thresholds': self.config.get('thresholds', {})
+        }, sort_keys=True).encode('utf-8')).hexdigest()
+
+        return AnalysisCache(Path(cache_file), analyzer_key)
+
     def _collect_python_files(self, project_path: Path) -> List[Path]:
         """收集 Python 文件"""
         exclude_patterns = self.config.get('exclude_patterns', [])
@@ -202,7 +391,8 @@ class CodeComplexityAnalyzer:
             
             python_files.append(file_path)
         
-        return python_files
+        # 固定順序，使並行與緩存下的結果與逐個分析一致
+        return sorted(python_files)
     
     def _should_exclude_file(self, file_path: Path, exclude_patterns: List[str]) -> bool:
         """判斷文件是否應該被排除"""
@@ -214,18 +404,21 @@ class CodeComplexityAnalyzer:
         
         return False
     
-    def analyze_file(self, file_path: Path) -> FileComplexity:
+    def analyze_file(self, file_path: Path, content: Optional[str] = None) -> FileComplexity:
         """分析單個文件的複雜度"""
-        print(f"分析文件: {file_path}")
-        
         # 讀取文件內容
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 使用 radon 分析
-        cc_results = radon_cc.cc_visit(content)
-        mi_results = radon_metrics.mi_visit(content, True)
-        halstead_results = radon_metrics.h_visit(content)
+        if content is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        
+        # 使用 radon 分析：只解析一次 AST，供圈複雜度、Halstead 與可維護性指數共用
+        tree = ast.parse(content)
+        complexity_visitor = ComplexityVisitor.from_ast(tree)
+        cc_results = complexity_visitor.blocks
+        halstead_results = radon_metrics.h_visit_ast(tree)
+        mi_results = self._calculate_maintainability_index(
+            content, halstead_results, complexity_visitor.total_complexity
+        )
         
         # 使用 lizard 分析
         lizard_result = lizard.analyze_file.analyze_source_code(
@@ -234,9 +427,10 @@ class CodeComplexityAnalyzer:
         
         # 分析函數
         functions = []
+        parameter_counts = self._count_parameters(tree)
         for func in cc_results:
             function_complexity = self._analyze_function(
-                func, file_path, content, halstead_results
+                func, file_path, content, halstead_results, parameter_counts
             )
             functions.append(function_complexity)
         
@@ -271,7 +465,31 @@ class CodeComplexityAnalyzer:
             technical_debt=technical_debt
         )
     
-    def _analyze_function(self, func, file_path: Path, content: str, halstead_results) -> FunctionComplexity:
+    def _count_parameters(self, tree: ast.AST) -> Dict[Tuple[int, str], int]:
+        """統計每個函數的參數數量，按 (起始行, 函數名) 索引"""
+        counts = {}
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                args = node.args
+                counts[(node.lineno, node.name)] = (
+                    len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs)
+                    + (args.vararg is not None) + (args.kwarg is not None)
+                )
+        return counts
+    
+    def _calculate_maintainability_index(self, content: str, halstead_results, total_complexity: int) -> float:
+        """計算文件可維護性指數，等同 radon_metrics.mi_visit(content, True)"""
+        raw_metrics = radon_raw.analyze(content)
+        comment_lines = raw_metrics.comments + raw_metrics.multi
+        comments_percent = comment_lines / float(raw_metrics.sloc) * 100 if raw_metrics.sloc != 0 else 0
+        return radon_metrics.mi_compute(
+            halstead_results.total.volume,
+            total_complexity,
+            raw_metrics.lloc,
+            comments_percent
+        )
+    
+    def _analyze_function(self, func, file_path: Path, content: str, halstead_results, parameter_counts: Optional[Dict[Tuple[int, str], int]] = None) -> FunctionComplexity:
         """分析單個函數的複雜度"""
         # 基本複雜度度量
         cyclomatic = func.complexity
@@ -284,10 +502,10 @@ class CodeComplexityAnalyzer:
         maintainability = self._calculate_function_maintainability(func, halstead_metrics)
         
         # 代碼行數
-        lines_of_code = func.endlineno - func.lineno + 1
+        lines_of_code = func.endline - func.lineno + 1
         
-        # 參數數量
-        parameters_count = len(func.arguments) if func.arguments else 0
+        # 參數數量（radon 的代碼塊不含參數，從 AST 統計）
+        parameters_count = (parameter_counts or {}).get((func.lineno, func.name), 0)
         
         # 嵌套深度
         nesting_depth = self._calculate_nesting_depth(func)
@@ -304,7 +522,7 @@ class CodeComplexityAnalyzer:
             name=func.name,
             file_path=str(file_path),
             line_start=func.lineno,
-            line_end=func.endlineno,
+            line_end=func.endline,
             cyclomatic_complexity=cyclomatic,
             cognitive_complexity=cognitive,
             halstead_metrics=halstead_metrics,
@@ -341,7 +559,7 @@ class CodeComplexityAnalyzer:
     def _calculate_function_maintainability(self, func, halstead_metrics: Dict[str, float]) -> float:
         """計算函數可維護性指數"""
         # 簡化的可維護性指數計算
-        base_mi = 171 - 5.2 * np.log(func.complexity) - 0.23 * func.complexity - 16.2 * np.log(func.endlineno - func.lineno + 1)
+        base_mi = 171 - 5.2 * np.log(func.complexity) - 0.23 * func.complexity - 16.2 * np.log(func.endline - func.lineno + 1)
         
         # 根據 Halstead 指標調整
         if halstead_metrics.get('volume', 0) > 1000:
@@ -537,7 +755,7 @@ class CodeComplexityAnalyzer:
         with open(historical_file, 'w', encoding='utf-8') as f:
             json.dump(historical_data, f, indent=2, ensure_ascii=False)
     
-    def _analyze_trends(self) -> List[Dict[str, Any]]:
+    def _analyze_trends(self, project_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """分析趨勢"""
         historical_file = Path(self.config.get('output_directory', 'reports/complexity')) / 'historical_data.json'
         
@@ -547,6 +765,10 @@ class CodeComplexityAnalyzer:
         with open(historical_file, 'r', encoding='utf-8') as f:
             historical_data = json.load(f)
         
+        # 多個項目共用輸出目錄時，只比較同一項目的數據點
+        if project_name is not None:
+            historical_data = [point for point in historical_data if point.get('project_name') == project_name]
+        
         if len(historical_data) < 2:
             return []
         
@@ -803,6 +1025,29 @@ class CodeComplexityAnalyzer:
         pass
 
 
+_worker_analyzer: Optional[CodeComplexityAnalyzer] = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    """進程池初始化：每個工作進程建立一個分析器"""
+    global _worker_analyzer
+    _worker_analyzer = CodeComplexityAnalyzer(config=config)
+
+
+def _analyze_task(analyzer: CodeComplexityAnalyzer, task: Tuple[Path, str]) -> Tuple[Optional[FileComplexity], Optional[str]]:
+    """分析一個文件，將異常轉為錯誤信息"""
+    file_path, content = task
+    try:
+        return analyzer.analyze_file(file_path, content), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _analyze_in_worker(task: Tuple[Path, str]) -> Tuple[Optional[FileComplexity], Optional[str]]:
+    """工作進程中的分析入口"""
+    return _analyze_task(_worker_analyzer, task)
+
+
 def main():
     """主函數"""
     import argparse
@@ -812,11 +1057,17 @@ def main():
     parser.add_argument("--output", "-o", help="輸出目錄")
     parser.add_argument("--config", "-c", help="配置文件路徑")
     parser.add_argument("--format", choices=['html', 'json', 'csv'], default='html', help="報告格式")
+    parser.add_argument("--workers", "-j", type=int, help="並行分析的進程數")
+    parser.add_argument("--no-cache", action="store_true", help="忽略文件分析緩存，重新分析所有文件")
     
     args = parser.parse_args()
     
     # 創建分析器
     analyzer = CodeComplexityAnalyzer(args.config)
+    if args.workers:
+        analyzer.config['max_workers'] = args.workers
+    if args.no_cache:
+        analyzer.config['enable_file_cache'] = False
     
     # 分析項目
     print("開始分析代碼複雜度...")
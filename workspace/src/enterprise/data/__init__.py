@@ -5,8 +5,10 @@ Essential for operations and SLA delivery:
 - Primary Database: Transaction data (orgs, repos, users, policies, runs)
 - Result/Report Storage: OLAP-ready for analytics
 - Object Storage: Reports, artifacts, raw results
-- Observability: Metrics (Prometheus), Logs, Tracing (OpenTelemetry)
-- Audit Log: Who changed what when (enterprise hard requirement)
+- Observability: Metrics (Prometheus, with an in-process aggregating
+  backend), Logs, Tracing (OpenTelemetry)
+- Audit Log: Who changed what when (enterprise hard requirement),
+  with a local append-only segmented backend and streaming export
 """
 
 from enterprise.data.audit import (
@@ -14,6 +16,10 @@ from enterprise.data.audit import (
     AuditEntry,
     AuditLogger,
 )
+from enterprise.data.audit_segments import (
+    SegmentedAuditStorage,
+    StreamingAuditExporter,
+)
 from enterprise.data.metrics import (
     Counter,
     Gauge,
@@ -21,6 +27,7 @@ from enterprise.data.metrics import (
     MetricLabels,
     MetricsCollector,
 )
+from enterprise.data.metrics_backend import InProcessMetricsBackend
 from enterprise.data.storage import (
     ObjectStorage,
     StorageLocation,
@@ -37,12 +44,15 @@ __all__ = [
     "AuditLogger",
     "AuditEntry",
     "AuditAction",
+    "SegmentedAuditStorage",
+    "StreamingAuditExporter",
     # Metrics
     "MetricsCollector",
     "Counter",
     "Gauge",
     "Histogram",
     "MetricLabels",
+    "InProcessMetricsBackend",
     # Storage
     "ObjectStorage",
     "StorageObject",
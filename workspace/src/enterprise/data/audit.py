@@ -12,6 +12,7 @@ This is a HARD requirement for enterprise customers.
 
 import json
 import logging
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -188,6 +189,36 @@ class AuditEntry:
             "source": self.source,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AuditEntry":
+        """Create from dictionary"""
+        return cls(
+            id=UUID(data["id"]),
+            action=AuditAction(data.get("action", "custom")),
+            severity=AuditSeverity(data.get("severity", "info")),
+            actor_id=UUID(data["actor_id"]) if data.get("actor_id") else None,
+            actor_type=data.get("actor_type", "user"),
+            actor_email=data.get("actor_email"),
+            actor_ip=data.get("actor_ip"),
+            actor_user_agent=data.get("actor_user_agent"),
+            org_id=UUID(data["org_id"]) if data.get("org_id") else None,
+            project_id=UUID(data["project_id"]) if data.get("project_id") else None,
+            repo_id=UUID(data["repo_id"]) if data.get("repo_id") else None,
+            resource_type=data.get("resource_type", ""),
+            resource_id=data.get("resource_id", ""),
+            resource_name=data.get("resource_name"),
+            description=data.get("description", ""),
+            details=data.get("details") or {},
+            old_value=data.get("old_value"),
+            new_value=data.get("new_value"),
+            request_id=data.get("request_id"),
+            session_id=data.get("session_id"),
+            correlation_id=UUID(data["correlation_id"]) if data.get("correlation_id") else None,
+            timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else datetime.utcnow(),
+            version=data.get("version", "1.0"),
+            source=data.get("source", "api"),
+        )
+
 
 @dataclass
 class AuditQuery:
@@ -239,6 +270,14 @@ class AuditExporter(Protocol):
         """Export audit logs in specified format"""
         ...
 
+    def stream(
+        self,
+        query: AuditQuery,
+        format: str = "jsonl",
+    ) -> AsyncIterator[bytes]:
+        """Export audit logs as a stream of encoded chunks"""
+        ...
+
 
 @dataclass
 class AuditLogger:
@@ -566,6 +605,39 @@ class AuditLogger:
         )
         return await self.exporter.export(query, format)
 
+    async def stream_audit_log(
+        self,
+        org_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+        format: str = "jsonl",
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an audit log export in chunks
+
+        Unlike export_audit_log, entries are never materialized all at once,
+        so year-long compliance exports run in bounded memory.
+
+        Args:
+            org_id: Organization to export
+            start_time: Start of period
+            end_time: End of period
+            format: Export format (jsonl, csv, json)
+
+        Yields:
+            Encoded export chunks
+        """
+        if not self.exporter:
+            raise ValueError("Streaming export requires an AuditExporter")
+
+        query = AuditQuery(
+            org_id=org_id,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        async for chunk in self.exporter.stream(query, format):
+            yield chunk
+
     # ------------------------------------------------------------------
     # Private Methods
     # ------------------------------------------------------------------
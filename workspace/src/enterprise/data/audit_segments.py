@@ -0,0 +1,638 @@
+"""
+Segmented Audit Storage
+
+Local append-only backend for AuditLogger, plus a streaming exporter:
+- Length-prefixed, checksummed records in fixed-size segment files
+- Sealed segments are never modified; CRCs detect torn or corrupt
+  records, not deliberate tampering
+- Per-segment sparse index: time range, org set, block offsets
+- Group fsync: concurrent writers share one fsync per batch
+- Streaming JSONL/CSV/JSON export in bounded memory
+
+Record layout: [u32 length][u32 crc32][JSON payload], big-endian.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import struct
+import zlib
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO
+from uuid import UUID
+
+from enterprise.data.audit import AuditEntry, AuditQuery
+
+logger = logging.getLogger(__name__)
+
+
+_HEADER = struct.Struct(">II")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _ts(value: datetime) -> float:
+    """Naive-UTC datetime to epoch seconds"""
+    return (value - _EPOCH).total_seconds()
+
+
+@dataclass
+class SegmentBlock:
+    """Sparse index entry: a run of consecutive records in a segment"""
+    offset: int
+    count: int = 0
+    min_ts: float = float("inf")
+    max_ts: float = float("-inf")
+
+    def add(self, ts: float) -> None:
+        self.count += 1
+        self.min_ts = min(self.min_ts, ts)
+        self.max_ts = max(self.max_ts, ts)
+
+    def overlaps(self, start: float | None, end: float | None) -> bool:
+        if start is not None and self.max_ts < start:
+            return False
+        return end is None or self.min_ts <= end
+
+
+@dataclass
+class SegmentIndex:
+    """Sparse index for one segment"""
+    seq: int
+    size: int = 0
+    count: int = 0
+    min_ts: float = float("inf")
+    max_ts: float = float("-inf")
+    org_ids: set[str] = field(default_factory=set)
+    blocks: list[SegmentBlock] = field(default_factory=list)
+
+    # Bytes known to be flushed to the file; readers never go past this
+    synced_size: int = 0
+
+    def add(self, offset: int, length: int, ts: float, org_id: str | None, block_size: int) -> None:
+        if not self.blocks or self.blocks[-1].count >= block_size:
+            self.blocks.append(SegmentBlock(offset=offset))
+        self.blocks[-1].add(ts)
+        self.count += 1
+        self.size = offset + length
+        self.min_ts = min(self.min_ts, ts)
+        self.max_ts = max(self.max_ts, ts)
+        self.org_ids.add(org_id or "")
+
+    def may_contain(self, org_id: str | None, start: float | None, end: float | None) -> bool:
+        if not self.count:
+            return False
+        if org_id is not None and org_id not in self.org_ids:
+            return False
+        if start is not None and self.max_ts < start:
+            return False
+        return end is None or self.min_ts <= end
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "size": self.size,
+            "count": self.count,
+            "min_ts": self.min_ts,
+            "max_ts": self.max_ts,
+            "org_ids": sorted(self.org_ids),
+            "blocks": [[b.offset, b.count, b.min_ts, b.max_ts] for b in self.blocks],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SegmentIndex":
+        return cls(
+            seq=data["seq"],
+            size=data["size"],
+            synced_size=data["size"],
+            count=data["count"],
+            min_ts=data["min_ts"],
+            max_ts=data["max_ts"],
+            org_ids=set(data["org_ids"]),
+            blocks=[
+                SegmentBlock(offset=o, count=c, min_ts=lo, max_ts=hi)
+                for o, c, lo, hi in data["blocks"]
+            ],
+        )
+
+
+@dataclass
+class SegmentedAuditStorage:
+    """
+    Append-only segmented audit storage
+
+    Implements AuditStorage on a local directory. Entries are appended to
+    the active segment; once it exceeds segment_max_bytes it is sealed and
+    its sparse index written next to it. Queries skip whole segments by
+    org/time and whole blocks by time before decoding any record.
+    """
+
+    directory: str
+
+    # Segment rolling
+    segment_max_bytes: int = 64 * 1024 * 1024
+
+    # Records per sparse index block
+    index_block_size: int = 256
+
+    # Group fsync: flush after this many records or this delay
+    fsync_batch_size: int = 128
+    fsync_interval_seconds: float = 0.005
+
+    # Wait for fsync before store() returns
+    durable: bool = True
+
+    _root: Path = field(init=False)
+    _indexes: list[SegmentIndex] = field(default_factory=list, init=False)
+    _active: BinaryIO | None = field(default=None, init=False)
+    _write_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    _pending: int = field(default=0, init=False)
+    _sync_waiters: list[asyncio.Future] = field(default_factory=list, init=False)
+    _sync_handle: asyncio.TimerHandle | None = field(default=None, init=False)
+    _sync_task: asyncio.Task | None = field(default=None, init=False)
+    _sync_error: BaseException | None = field(default=None, init=False)
+
+    def __post_init__(self):
+        self._root = Path(self.directory)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    # ------------------------------------------------------------------
+    # AuditStorage
+    # ------------------------------------------------------------------
+
+    async def store(self, entry: AuditEntry) -> AuditEntry:
+        """
+        Append an entry; waits for the group fsync when durable
+
+        A failed background fsync is raised from the next store() call.
+        """
+        if self._sync_error is not None:
+            error, self._sync_error = self._sync_error, None
+            raise error
+
+        payload = json.dumps(entry.to_dict(), separators=(",", ":")).encode("utf-8")
+        record = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        async with self._write_lock:
+            index = self._indexes[-1]
+            if index.size and index.size + len(record) > self.segment_max_bytes:
+                await self._roll()
+                index = self._indexes[-1]
+
+            offset = index.size
+            self._active.write(record)
+            index.add(
+                offset,
+                len(record),
+                _ts(entry.timestamp),
+                str(entry.org_id) if entry.org_id else None,
+                self.index_block_size,
+            )
+            self._pending += 1
+            waiter = self._schedule_sync()
+
+        if waiter is not None:
+            await waiter
+
+        return entry
+
+    async def query(
+        self,
+        query: AuditQuery,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[AuditEntry]:
+        """Query entries in append order"""
+        await self.flush()
+        records = self._scan(query, self._snapshot())
+        return await asyncio.to_thread(
+            lambda: [
+                AuditEntry.from_dict(d)
+                for d in islice(records, offset, offset + limit)
+            ]
+        )
+
+    async def count(self, query: AuditQuery) -> int:
+        """Count matching entries"""
+        await self.flush()
+        if self._is_unfiltered(query):
+            return sum(index.count for index in self._indexes)
+        records = self._scan(query, self._snapshot())
+        return await asyncio.to_thread(lambda: sum(1 for _ in records))
+
+    async def get_by_id(self, entry_id: UUID) -> AuditEntry | None:
+        """Get an entry by ID (full scan, newest segment first)"""
+        await self.flush()
+        target = str(entry_id)
+        snapshot = self._snapshot()
+
+        def find() -> dict[str, Any] | None:
+            for index, size in reversed(snapshot):
+                for data in self._read_segment(index, AuditQuery(), size):
+                    if data["id"] == target:
+                        return data
+            return None
+
+        data = await asyncio.to_thread(find)
+        return AuditEntry.from_dict(data) if data else None
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+
+    async def scan(
+        self,
+        query: AuditQuery,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Stream matching entries (as dicts) in batches
+
+        Disk reads run off the event loop; at most one batch is held in memory.
+        """
+        await self.flush()
+        records = self._scan(query, self._snapshot())
+        while True:
+            batch = await asyncio.to_thread(lambda: list(islice(records, batch_size)))
+            if not batch:
+                return
+            yield batch
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def flush(self) -> None:
+        """Flush and fsync pending writes"""
+        if self._pending:
+            await self._sync()
+
+    async def close(self) -> None:
+        """Flush and close the active segment"""
+        await self.flush()
+        if self._active:
+            self._active.close()
+            self._active = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get storage statistics"""
+        return {
+            "segments": len(self._indexes),
+            "entries": sum(index.count for index in self._indexes),
+            "bytes": sum(index.size for index in self._indexes),
+        }
+
+    # ------------------------------------------------------------------
+    # Group fsync
+    # ------------------------------------------------------------------
+
+    def _schedule_sync(self) -> asyncio.Future | None:
+        loop = asyncio.get_running_loop()
+        waiter = None
+        if self.durable:
+            waiter = loop.create_future()
+            self._sync_waiters.append(waiter)
+
+        if self._pending >= self.fsync_batch_size:
+            self._start_sync()
+        elif self._sync_handle is None and self._sync_task is None:
+            self._sync_handle = loop.call_later(self.fsync_interval_seconds, self._start_sync)
+
+        return waiter
+
+    def _start_sync(self) -> None:
+        if self._sync_handle:
+            self._sync_handle.cancel()
+            self._sync_handle = None
+        if self._sync_task is None:
+            self._sync_task = asyncio.ensure_future(self._sync())
+            self._sync_task.add_done_callback(self._on_sync_done)
+
+    def _on_sync_done(self, task: asyncio.Task) -> None:
+        """Log a failed background sync and keep it for the next store()"""
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error(f"Background audit fsync failed: {task.exception()}")
+        self._sync_error = task.exception()
+
+    async def _sync(self) -> None:
+        """
+        Flush under the write lock, fsync outside it
+
+        The fsync runs on a duplicate descriptor so appends (and a segment
+        roll closing the original file) can proceed while it is in flight.
+        """
+        waiters: list[asyncio.Future] = []
+        fd = None
+        try:
+            async with self._write_lock:
+                waiters, self._sync_waiters = self._sync_waiters, []
+                self._pending = 0
+                if self._sync_handle:
+                    self._sync_handle.cancel()
+                    self._sync_handle = None
+                # Appends from here on schedule their own sync
+                if self._sync_task is asyncio.current_task():
+                    self._sync_task = None
+                index = self._indexes[-1]
+                self._active.flush()
+                index.synced_size = index.size
+                fd = os.dup(self._active.fileno())
+
+            await asyncio.to_thread(os.fsync, fd)
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            raise
+        finally:
+            if self._sync_task is asyncio.current_task():
+                self._sync_task = None
+            if fd is not None:
+                os.close(fd)
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, seq: int) -> Path:
+        return self._root / f"segment-{seq:08d}.log"
+
+    def _index_path(self, seq: int) -> Path:
+        return self._root / f"segment-{seq:08d}.idx"
+
+    def _open(self) -> None:
+        """Load sealed indexes and recover the active segment"""
+        seqs = sorted(int(p.stem.split("-")[1]) for p in self._root.glob("segment-*.log"))
+
+        for seq in seqs[:-1]:
+            index_path = self._index_path(seq)
+            if index_path.exists():
+                self._indexes.append(SegmentIndex.from_dict(json.loads(index_path.read_text())))
+            else:
+                index = self._rebuild_index(seq)
+                index.synced_size = index.size
+                index_path.write_text(json.dumps(index.to_dict()))
+                self._indexes.append(index)
+
+        active_seq = seqs[-1] if seqs else 1
+        active = self._rebuild_index(active_seq)
+        active.synced_size = active.size
+        self._indexes.append(active)
+        self._open_active(active_seq)
+
+    def _open_active(self, seq: int) -> None:
+        """Open a segment for appending; closed by _roll() or close()"""
+        # Appends share this handle across calls, so it cannot be scoped to a with block
+        self._active = open(self._segment_path(seq), "ab")  # noqa: SIM115
+
+    def _rebuild_index(self, seq: int) -> SegmentIndex:
+        """Scan a segment, truncating any torn record at its tail"""
+        index = SegmentIndex(seq=seq)
+        path = self._segment_path(seq)
+        if not path.exists():
+            return index
+
+        with open(path, "rb") as f:
+            offset = 0
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                length, crc = _HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                data = json.loads(payload)
+                index.add(
+                    offset,
+                    _HEADER.size + length,
+                    _ts(datetime.fromisoformat(data["timestamp"])),
+                    data.get("org_id"),
+                    self.index_block_size,
+                )
+                offset += _HEADER.size + length
+
+        if path.stat().st_size > offset:
+            logger.warning(f"Truncating torn audit record in {path.name} at offset {offset}")
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+
+        return index
+
+    async def _roll(self) -> None:
+        """Seal the active segment and start a new one (write lock held)"""
+        sealed = self._indexes[-1]
+        self._active.flush()
+        sealed.synced_size = sealed.size
+        await asyncio.to_thread(os.fsync, self._active.fileno())
+        self._active.close()
+
+        index_path = self._index_path(sealed.seq)
+        tmp_path = index_path.with_suffix(".idx.tmp")
+        tmp_path.write_text(json.dumps(sealed.to_dict()))
+        os.replace(tmp_path, index_path)
+
+        next_seq = sealed.seq + 1
+        self._indexes.append(SegmentIndex(seq=next_seq))
+        self._open_active(next_seq)
+        logger.info(f"Sealed audit segment {sealed.seq}: {sealed.count} entries")
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _snapshot(self) -> list[tuple[SegmentIndex, int]]:
+        """Segments and flushed sizes visible to a new reader"""
+        return [(index, index.synced_size) for index in self._indexes]
+
+    def _scan(
+        self,
+        query: AuditQuery,
+        snapshot: list[tuple[SegmentIndex, int]],
+    ) -> Iterator[dict[str, Any]]:
+        org_id = str(query.org_id) if query.org_id else None
+        start = _ts(query.start_time) if query.start_time else None
+        end = _ts(query.end_time) if query.end_time else None
+
+        # Records appended after the snapshot was taken are not visible
+        for index, size in snapshot:
+            if index.may_contain(org_id, start, end):
+                yield from self._read_segment(index, query, size)
+
+    def _read_segment(
+        self,
+        index: SegmentIndex,
+        query: AuditQuery,
+        size: int,
+    ) -> Iterator[dict[str, Any]]:
+        start = _ts(query.start_time) if query.start_time else None
+        end = _ts(query.end_time) if query.end_time else None
+        blocks = index.blocks[:]
+
+        with open(self._segment_path(index.seq), "rb") as f:
+            for block in blocks:
+                if block.offset >= size:
+                    break
+                if not block.overlaps(start, end):
+                    continue
+                f.seek(block.offset)
+                for _ in range(block.count):
+                    if f.tell() >= size:
+                        break
+                    length, _crc = _HEADER.unpack(f.read(_HEADER.size))
+                    data = json.loads(f.read(length))
+                    if _matches(data, query):
+                        yield data
+
+    @staticmethod
+    def _is_unfiltered(query: AuditQuery) -> bool:
+        return not any(
+            getattr(query, name) is not None
+            for name in query.__dataclass_fields__
+        )
+
+
+def _matches(data: dict[str, Any], query: AuditQuery) -> bool:
+    """Match a decoded record against a query"""
+    if query.org_id and data.get("org_id") != str(query.org_id):
+        return False
+    if query.actor_id and data.get("actor_id") != str(query.actor_id):
+        return False
+    if query.actions and data.get("action") not in {a.value for a in query.actions}:
+        return False
+    if query.resource_type and data.get("resource_type") != query.resource_type:
+        return False
+    if query.resource_id and data.get("resource_id") != query.resource_id:
+        return False
+    if query.severity and data.get("severity") != query.severity.value:
+        return False
+    if query.start_time or query.end_time:
+        ts = datetime.fromisoformat(data["timestamp"])
+        if query.start_time and ts < query.start_time:
+            return False
+        if query.end_time and ts > query.end_time:
+            return False
+    if query.search_text:
+        needle = query.search_text.lower()
+        if needle not in (data.get("description") or "").lower() and needle not in (
+            data.get("resource_name") or ""
+        ).lower():
+            return False
+    return True
+
+
+# Column order for CSV export
+AUDIT_EXPORT_COLUMNS = [
+    "id", "timestamp", "action", "severity",
+    "actor_id", "actor_type", "actor_email", "actor_ip", "actor_user_agent",
+    "org_id", "project_id", "repo_id",
+    "resource_type", "resource_id", "resource_name",
+    "description", "details", "old_value", "new_value",
+    "request_id", "session_id", "correlation_id",
+    "version", "source",
+]
+
+
+@dataclass
+class StreamingAuditExporter:
+    """
+    Streaming Audit Exporter
+
+    Implements AuditExporter over SegmentedAuditStorage. Entries are read,
+    encoded and emitted chunk by chunk, so memory stays bounded by
+    chunk_size regardless of the export period.
+    """
+
+    storage: SegmentedAuditStorage
+    chunk_size: int = 1000
+
+    async def export(
+        self,
+        query: AuditQuery,
+        format: str = "json",
+    ) -> bytes:
+        """Export to a single bytes object (small exports only)"""
+        return b"".join([chunk async for chunk in self.stream(query, format)])
+
+    async def stream(
+        self,
+        query: AuditQuery,
+        format: str = "jsonl",
+    ) -> AsyncIterator[bytes]:
+        """Export as a stream of encoded chunks"""
+        if format not in ("jsonl", "csv", "json"):
+            raise ValueError(f"Unsupported export format: {format}")
+
+        first = True
+        async for batch in self.storage.scan(query, self.chunk_size):
+            if format == "jsonl":
+                yield self._encode_jsonl(batch)
+            elif format == "csv":
+                yield self._encode_csv(batch, header=first)
+            else:
+                yield self._encode_json(batch, first)
+            first = False
+
+        if format == "json":
+            yield b"[]" if first else b"\n]\n"
+        elif format == "csv" and first:
+            yield self._encode_csv([], header=True)
+
+    async def export_to_file(
+        self,
+        query: AuditQuery,
+        path: str,
+        format: str = "jsonl",
+    ) -> int:
+        """
+        Stream an export into a file
+
+        Returns:
+            Number of bytes written
+        """
+        written = 0
+        with open(path, "wb") as f:
+            async for chunk in self.stream(query, format):
+                await asyncio.to_thread(f.write, chunk)
+                written += len(chunk)
+        return written
+
+    # ------------------------------------------------------------------
+    # Encoders
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode_jsonl(batch: list[dict[str, Any]]) -> bytes:
+        return "".join(
+            json.dumps(record, separators=(",", ":")) + "\n" for record in batch
+        ).encode("utf-8")
+
+    @staticmethod
+    def _encode_json(batch: list[dict[str, Any]], first: bool) -> bytes:
+        body = ",\n".join(json.dumps(record) for record in batch)
+        return (("[\n" if first else ",\n") + body).encode("utf-8")
+
+    @staticmethod
+    def _encode_csv(batch: list[dict[str, Any]], header: bool) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=AUDIT_EXPORT_COLUMNS, extrasaction="ignore")
+        if header:
+            writer.writeheader()
+        for record in batch:
+            writer.writerow({
+                key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                for key, value in record.items()
+            })
+        return buffer.getvalue().encode("utf-8")
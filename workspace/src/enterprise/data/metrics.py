@@ -7,6 +7,9 @@ Prometheus-compatible metrics for observability:
 - Resource metrics (queue depth, memory, etc.)
 
 Essential for operating at scale and delivering SLA.
+
+Label sets are bound to series handles once (Counter.series(...) or the
+cached MetricLabels path) so hot paths do not rebuild label dicts.
 """
 
 import logging
@@ -27,12 +30,12 @@ class MetricType(Enum):
     SUMMARY = "summary"       # Similar to histogram
 
 
-@dataclass
+@dataclass(frozen=True)
 class MetricLabels:
     """
     Metric labels for dimensionality
 
-    Common labels used across metrics.
+    Common labels used across metrics. Frozen so it can key series caches.
     """
     org_id: str | None = None
     repo: str | None = None
@@ -86,44 +89,136 @@ class MetricsBackend(Protocol):
     ) -> None:
         ...
 
+    # Backends may also provide
+    #   bind_series(metric_type, name, labels, description, buckets) -> series
+    # returning a handle with inc/set/dec/observe; see InProcessMetricsBackend.
+
+
+class _NullSeries:
+    """Series handle for metrics without a backend"""
+
+    def inc(self, value: float = 1.0) -> None:
+        pass
+
+    def dec(self, value: float = 1.0) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+_NULL_SERIES = _NullSeries()
+
 
 @dataclass
-class Counter:
+class _BackendSeries:
     """
-    Counter metric
+    Series handle over a plain MetricsBackend
 
-    Monotonically increasing counter.
+    The label dict is built once; gauge inc/dec track the value locally.
     """
+    backend: MetricsBackend
+    metric_type: MetricType
+    name: str
+    labels: dict[str, str] | None
+    value: float = 0.0
+
+    def inc(self, value: float = 1.0) -> None:
+        if self.metric_type == MetricType.GAUGE:
+            self.set(self.value + value)
+        else:
+            self.backend.counter_inc(self.name, value, self.labels)
+
+    def dec(self, value: float = 1.0) -> None:
+        self.set(self.value - value)
+
+    def set(self, value: float) -> None:
+        self.value = value
+        self.backend.gauge_set(self.name, value, self.labels)
+
+    def observe(self, value: float) -> None:
+        self.backend.histogram_observe(self.name, value, self.labels)
+
+
+@dataclass
+class _Metric:
+    """Shared series binding for Counter, Gauge and Histogram"""
     name: str
     description: str = ""
     labels: list[str] = field(default_factory=list)
     _backend: MetricsBackend | None = None
 
+    _type = MetricType.COUNTER
+
+    def __post_init__(self):
+        self._by_values: dict[tuple, Any] = {}
+        self._by_labels: dict[MetricLabels | None, Any] = {}
+
+    def series(self, *values: str) -> Any:
+        """
+        Series handle for label values, in the order of `labels`
+
+        Handles are cached, so repeated calls with the same values are a
+        single dict lookup.
+        """
+        handle = self._by_values.get(values)
+        if handle is None:
+            if len(values) != len(self.labels):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labels}, got {len(values)} values"
+                )
+            handle = self._by_values[values] = self._bind(dict(zip(self.labels, values)))
+        return handle
+
+    def bind(self, labels: MetricLabels | None = None) -> Any:
+        """Series handle for a MetricLabels set"""
+        handle = self._by_labels.get(labels)
+        if handle is None:
+            handle = self._by_labels[labels] = self._bind(labels.to_dict() if labels else None)
+        return handle
+
+    def _bind(self, labels: dict[str, str] | None) -> Any:
+        if self._backend is None:
+            return _NULL_SERIES
+        bind_series = getattr(self._backend, "bind_series", None)
+        if bind_series is not None:
+            return bind_series(
+                self._type, self.name, labels, self.description, getattr(self, "buckets", None)
+            )
+        return _BackendSeries(self._backend, self._type, self.name, labels)
+
+
+@dataclass
+class Counter(_Metric):
+    """
+    Counter metric
+
+    Monotonically increasing counter.
+    """
+
+    _type = MetricType.COUNTER
+
     def inc(
         self,
         value: float = 1.0,
         labels: MetricLabels | None = None,
     ) -> None:
         """Increment the counter"""
-        if self._backend:
-            self._backend.counter_inc(
-                self.name,
-                value,
-                labels.to_dict() if labels else None,
-            )
+        self.bind(labels).inc(value)
 
 
 @dataclass
-class Gauge:
+class Gauge(_Metric):
     """
     Gauge metric
 
     Value that can go up or down.
     """
-    name: str
-    description: str = ""
-    labels: list[str] = field(default_factory=list)
-    _backend: MetricsBackend | None = None
+
+    _type = MetricType.GAUGE
 
     def set(
         self,
@@ -131,12 +226,7 @@ class Gauge:
         labels: MetricLabels | None = None,
     ) -> None:
         """Set the gauge value"""
-        if self._backend:
-            self._backend.gauge_set(
-                self.name,
-                value,
-                labels.to_dict() if labels else None,
-            )
+        self.bind(labels).set(value)
 
     def inc(
         self,
@@ -144,8 +234,7 @@ class Gauge:
         labels: MetricLabels | None = None,
     ) -> None:
         """Increment the gauge"""
-        # Note: Actual implementation would track current value
-        pass
+        self.bind(labels).inc(value)
 
     def dec(
         self,
@@ -153,23 +242,21 @@ class Gauge:
         labels: MetricLabels | None = None,
     ) -> None:
         """Decrement the gauge"""
-        pass
+        self.bind(labels).dec(value)
 
 
 @dataclass
-class Histogram:
+class Histogram(_Metric):
     """
     Histogram metric
 
     Distribution of values with configurable buckets.
     """
-    name: str
-    description: str = ""
-    labels: list[str] = field(default_factory=list)
     buckets: list[float] = field(default_factory=lambda: [
         0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
     ])
-    _backend: MetricsBackend | None = None
+
+    _type = MetricType.HISTOGRAM
 
     def observe(
         self,
@@ -177,12 +264,7 @@ class Histogram:
         labels: MetricLabels | None = None,
     ) -> None:
         """Observe a value"""
-        if self._backend:
-            self._backend.histogram_observe(
-                self.name,
-                value,
-                labels.to_dict() if labels else None,
-            )
+        self.bind(labels).observe(value)
 
     def time(self, labels: MetricLabels | None = None):
         """Context manager for timing operations"""
@@ -447,8 +529,7 @@ class MetricsCollector:
         run_type: str,
     ) -> None:
         """Record that a run has started"""
-        labels = MetricLabels(org_id=org_id, repo=repo, run_type=run_type)
-        self.runs_in_progress.inc(1, labels)
+        self.runs_in_progress.series(org_id, run_type).inc(1)
 
     def record_run_completed(
         self,
@@ -460,15 +541,9 @@ class MetricsCollector:
         findings_count: int = 0,
     ) -> None:
         """Record that a run has completed"""
-        labels = MetricLabels(
-            org_id=org_id, repo=repo, run_type=run_type, status=status
-        )
-        self.runs_total.inc(1, labels)
-        self.runs_in_progress.dec(1, MetricLabels(org_id=org_id, run_type=run_type))
-        self.runs_duration_seconds.observe(
-            duration_seconds,
-            MetricLabels(org_id=org_id, run_type=run_type)
-        )
+        self.runs_total.series(org_id, repo, run_type, status).inc(1)
+        self.runs_in_progress.series(org_id, run_type).dec(1)
+        self.runs_duration_seconds.series(org_id, run_type).observe(duration_seconds)
 
     def record_webhook_received(
         self,
@@ -476,8 +551,7 @@ class MetricsCollector:
         event_type: str,
     ) -> None:
         """Record webhook reception"""
-        labels = MetricLabels(provider=provider)
-        self.webhooks_received_total.inc(1, labels)
+        self.webhooks_received_total.series(provider, event_type).inc(1)
 
     def record_gate_result(
         self,
@@ -487,18 +561,14 @@ class MetricsCollector:
         duration_seconds: float,
     ) -> None:
         """Record gate check result"""
-        labels = MetricLabels(org_id=org_id, repo=repo)
-        self.gate_checks_total.inc(1, labels)
+        self.gate_checks_total.series(org_id, repo).inc(1)
 
         if passed:
-            self.gate_passed_total.inc(1, labels)
+            self.gate_passed_total.series(org_id, repo).inc(1)
         else:
-            self.gate_failed_total.inc(1, labels)
+            self.gate_failed_total.series(org_id, repo).inc(1)
 
-        self.gate_duration_seconds.observe(
-            duration_seconds,
-            MetricLabels(org_id=org_id)
-        )
+        self.gate_duration_seconds.series(org_id).observe(duration_seconds)
 
     def record_error(
         self,
@@ -506,12 +576,7 @@ class MetricsCollector:
         error_type: str,
     ) -> None:
         """Record an error"""
-        if self.backend:
-            self.backend.counter_inc(
-                f"{self.prefix}_errors_total",
-                1,
-                {"component": component, "error_type": error_type},
-            )
+        self.errors_total.series(component, error_type).inc(1)
 
     def update_queue_depth(
         self,
@@ -519,5 +584,4 @@ class MetricsCollector:
         depth: int,
     ) -> None:
         """Update queue depth gauge"""
-        labels = MetricLabels(queue=queue)
-        self.queue_depth.set(float(depth), labels)
+        self.queue_depth.series(queue).set(float(depth))
@@ -0,0 +1,335 @@
+"""
+In-Process Metrics Backend
+
+Bundled MetricsBackend that aggregates in memory and renders Prometheus
+text exposition:
+- Label sets are bound once to series handles; writes go straight to them
+- Counters and histograms write to per-thread cells, so concurrent
+  writers never contend or lose updates
+- Histograms aggregate into their configured buckets at observe time
+- Snapshots and rendering read cells without blocking writers
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+from enterprise.data.metrics import MetricType
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Cells:
+    """Per-thread accumulators; each thread only writes its own cell"""
+
+    __slots__ = ("_cells", "_lock", "_size")
+
+    def __init__(self, size: int):
+        self._cells: dict[int, list[float]] = {}
+        self._lock = threading.Lock()
+        self._size = size
+
+    def cell(self) -> list[float]:
+        ident = threading.get_ident()
+        cell = self._cells.get(ident)
+        if cell is None:
+            with self._lock:
+                cell = self._cells[ident] = [0.0] * self._size
+        return cell
+
+    def total(self) -> list[float]:
+        with self._lock:
+            cells = list(self._cells.values())
+        totals = [0.0] * self._size
+        for cell in cells:
+            for i, value in enumerate(cell):
+                totals[i] += value
+        return totals
+
+
+class CounterSeries:
+    """Bound counter series"""
+
+    __slots__ = ("_cells", "labels")
+
+    def __init__(self, labels: dict[str, str]):
+        self.labels = labels
+        self._cells = _Cells(1)
+
+    def inc(self, value: float = 1.0) -> None:
+        cells = self._cells._cells.get(threading.get_ident()) or self._cells.cell()
+        cells[0] += value
+
+    @property
+    def value(self) -> float:
+        return self._cells.total()[0]
+
+
+class GaugeSeries:
+    """Bound gauge series"""
+
+    __slots__ = ("_value", "_lock", "labels")
+
+    def __init__(self, labels: dict[str, str]):
+        self.labels = labels
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, value: float = 1.0) -> None:
+        with self._lock:
+            self._value += value
+
+    def dec(self, value: float = 1.0) -> None:
+        with self._lock:
+            self._value -= value
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class HistogramSeries:
+    """
+    Bound histogram series
+
+    Cell layout: one count per bucket plus +Inf, then sum.
+    """
+
+    __slots__ = ("_cells", "buckets", "labels")
+
+    def __init__(self, labels: dict[str, str], buckets: tuple[float, ...]):
+        self.labels = labels
+        self.buckets = buckets
+        self._cells = _Cells(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        cells = self._cells._cells.get(threading.get_ident()) or self._cells.cell()
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def snapshot(self) -> tuple[list[float], float, float]:
+        """(cumulative bucket counts incl. +Inf, sum, count)"""
+        totals = self._cells.total()
+        cumulative = []
+        running = 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1], running
+
+
+@dataclass
+class MetricFamily:
+    """All series of one metric name"""
+    name: str
+    type: MetricType
+    description: str = ""
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    series: dict[tuple, Any] = field(default_factory=dict)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str], extra: str = "") -> str:
+    parts = [f'{k}="{_escape(str(v))}"' for k, v in labels.items()]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class InProcessMetricsBackend:
+    """
+    In-Process Metrics Backend
+
+    Implements MetricsBackend and the optional bind_series hook used by
+    Counter, Gauge and Histogram to pre-bind label sets.
+    """
+
+    def __init__(self):
+        self._families: dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Series Binding
+    # ------------------------------------------------------------------
+
+    def bind_series(
+        self,
+        metric_type: MetricType,
+        name: str,
+        labels: dict[str, str] | None = None,
+        description: str = "",
+        buckets: list[float] | tuple[float, ...] | None = None,
+    ) -> CounterSeries | GaugeSeries | HistogramSeries:
+        """Get or create the series for a label set"""
+        labels = labels or {}
+        key = tuple(labels.items())
+        family = self._families.get(name)
+        if family is not None and family.type == metric_type:
+            series = family.series.get(key)
+            if series is not None:
+                return series
+
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(
+                    name=name,
+                    type=metric_type,
+                    description=description,
+                    buckets=tuple(sorted(buckets)) if buckets else DEFAULT_BUCKETS,
+                )
+            elif family.type != metric_type:
+                raise ValueError(
+                    f"Metric {name} is a {family.type.value}, not a {metric_type.value}"
+                )
+            series = family.series.get(key)
+            if series is None:
+                if metric_type == MetricType.COUNTER:
+                    series = CounterSeries(dict(labels))
+                elif metric_type == MetricType.GAUGE:
+                    series = GaugeSeries(dict(labels))
+                else:
+                    series = HistogramSeries(dict(labels), family.buckets)
+                # Copy-on-write so readers can iterate without the lock
+                family.series = {**family.series, key: series}
+            return series
+
+    # ------------------------------------------------------------------
+    # MetricsBackend
+    # ------------------------------------------------------------------
+
+    def counter_inc(
+        self,
+        name: str,
+        value: float = 1.0,
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        self.bind_series(MetricType.COUNTER, name, labels).inc(value)
+
+    def gauge_set(
+        self,
+        name: str,
+        value: float,
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        self.bind_series(MetricType.GAUGE, name, labels).set(value)
+
+    def histogram_observe(
+        self,
+        name: str,
+        value: float,
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        self.bind_series(MetricType.HISTOGRAM, name, labels).observe(value)
+
+    # ------------------------------------------------------------------
+    # Snapshots and Exposition
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Aggregated values per metric and label set"""
+        result = {}
+        for family in list(self._families.values()):
+            samples = []
+            for series in family.series.values():
+                if family.type == MetricType.HISTOGRAM:
+                    buckets, total, count = series.snapshot()
+                    value = {
+                        "buckets": dict(zip([*family.buckets, math.inf], buckets)),
+                        "sum": total,
+                        "count": count,
+                    }
+                else:
+                    value = series.value
+                samples.append({"labels": series.labels, "value": value})
+            result[family.name] = {"type": family.type.value, "samples": samples}
+        return result
+
+    def render_prometheus(self) -> str:
+        """Render Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for family in sorted(list(self._families.values()), key=lambda f: f.name):
+            if family.description:
+                lines.append(f"# HELP {family.name} {_escape(family.description)}")
+            lines.append(f"# TYPE {family.name} {family.type.value}")
+
+            for series in family.series.values():
+                if family.type == MetricType.HISTOGRAM:
+                    buckets, total, count = series.snapshot()
+                    for bound, cumulative in zip([*family.buckets, math.inf], buckets):
+                        le = f'le="{_format_value(bound)}"'
+                        lines.append(
+                            f"{family.name}_bucket{_format_labels(series.labels, le)} "
+                            f"{_format_value(cumulative)}"
+                        )
+                    labels = _format_labels(series.labels)
+                    lines.append(f"{family.name}_sum{labels} {_format_value(total)}")
+                    lines.append(f"{family.name}_count{labels} {_format_value(count)}")
+                else:
+                    lines.append(
+                        f"{family.name}{_format_labels(series.labels)} {_format_value(series.value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def benchmark_observations(
+    observations: int = 200_000,
+    threads: int = 4,
+) -> dict[str, Any]:
+    """
+    Measure per-observation cost of bound series
+
+    Runs a single writer, then `threads` concurrent writers, each doing
+    counter increments and histogram observations on shared series.
+    """
+    backend = InProcessMetricsBackend()
+    counter = backend.bind_series(MetricType.COUNTER, "bench_total", {"provider": "github"})
+    histogram = backend.bind_series(MetricType.HISTOGRAM, "bench_seconds", {"provider": "github"})
+
+    def write(count: int) -> None:
+        inc, observe = counter.inc, histogram.observe
+        for i in range(count):
+            inc()
+            observe((i % 100) / 100)
+
+    start = time.perf_counter()
+    write(observations)
+    single = time.perf_counter() - start
+
+    per_thread = observations // threads
+    workers = [threading.Thread(target=write, args=(per_thread,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    concurrent = time.perf_counter() - start
+
+    expected = observations + per_thread * threads
+    return {
+        "observations": observations,
+        "threads": threads,
+        # Each loop iteration is one increment and one observation
+        "single_ns_per_op": single / (observations * 2) * 1e9,
+        "concurrent_ns_per_op": concurrent / (per_thread * threads * 2) * 1e9,
+        "counter_total": counter.value,
+        "histogram_count": histogram.snapshot()[2],
+        "lossless": counter.value == expected and histogram.snapshot()[2] == expected,
+    }
@@ -3,21 +3,28 @@ Event and Job Orchestration System
 
 This is the critical infrastructure for "strong gate + reporting":
 - Event Log: Webhook events are persisted first, enabling replay and audit
+  (bulk ingestion, streaming and checkpointed replay)
 - Job Queue: Separate queues for gate (high priority) and report (low priority)
 - Idempotency: Same PR/commit webhook resend won't cause duplicate runs
+  (with a local filter/cache fast path in front of storage)
 - Retry/DLQ: Controlled retry for tool/provider failures
 - State Machine: Run lifecycle tracking (queued → running → completed/failed)
 """
 
 from enterprise.events.event_log import (
+    EventCursor,
     EventFilter,
     EventLog,
+    ReplayCheckpoint,
     StoredEvent,
 )
 from enterprise.events.idempotency import (
+    AtomicIdempotencyStorage,
     IdempotencyKey,
     IdempotencyManager,
 )
+from enterprise.events.idempotency_cache import LocalIdempotencyCache
+from enterprise.events.idempotency_store import SQLiteIdempotencyStorage
 from enterprise.events.job_queue import (
     DeadLetterQueue,
     Job,
@@ -25,8 +32,10 @@ from enterprise.events.job_queue import (
     JobQueue,
     JobStatus,
 )
+from enterprise.events.run_store import SQLiteRunStorage
 from enterprise.events.state_machine import (
     Run,
+    RunCursor,
     RunState,
     RunStateMachine,
     RunTransition,
@@ -37,6 +46,8 @@ __all__ = [
     "EventLog",
     "StoredEvent",
     "EventFilter",
+    "EventCursor",
+    "ReplayCheckpoint",
     # Job Queue
     "JobQueue",
     "Job",
@@ -46,9 +57,14 @@ __all__ = [
     # Idempotency
     "IdempotencyManager",
     "IdempotencyKey",
+    "LocalIdempotencyCache",
+    "AtomicIdempotencyStorage",
+    "SQLiteIdempotencyStorage",
     # State Machine
     "RunStateMachine",
     "Run",
     "RunState",
     "RunTransition",
+    "RunCursor",
+    "SQLiteRunStorage",
 ]
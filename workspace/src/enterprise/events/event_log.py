@@ -6,11 +6,15 @@ This enables:
 - Replay: Re-process events if needed
 - Audit: Complete history of all events
 - Reliability: Events are never lost
+- Bulk ingestion: Batches are stored in one write and published together
+- Streaming replay: Keyset-paginated, concurrent, checkpointed replay
 
 This is the CORE of event-driven architecture.
 """
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -148,12 +152,47 @@ class EventFilter:
     correlation_id: UUID | None = None
 
 
+@dataclass(frozen=True)
+class EventCursor:
+    """
+    Keyset pagination cursor
+
+    Events are ordered by (received_at, id); a cursor points at the last
+    event of the previous page.
+    """
+    received_at: datetime
+    event_id: UUID
+
+    @classmethod
+    def after(cls, event: StoredEvent) -> "EventCursor":
+        """Cursor positioned after the given event"""
+        return cls(received_at=event.received_at, event_id=event.id)
+
+
+@dataclass
+class ReplayCheckpoint:
+    """
+    Progress of a (possibly interrupted) bulk replay
+
+    Every event at or before `cursor` has been replayed.
+    """
+    replay_id: str
+    cursor: EventCursor | None = None
+    replayed: int = 0
+    completed: bool = False
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+
 class EventStorage(Protocol):
     """Storage interface for event log"""
 
     async def save(self, event: StoredEvent) -> StoredEvent:
         ...
 
+    async def save_batch(self, events: list[StoredEvent]) -> list[StoredEvent]:
+        """Persist all events in a single write (all or nothing)"""
+        ...
+
     async def get(self, event_id: UUID) -> StoredEvent | None:
         ...
 
@@ -168,6 +207,20 @@ class EventStorage(Protocol):
     ) -> list[StoredEvent]:
         ...
 
+    async def query_page(
+        self,
+        filter: EventFilter,
+        after: EventCursor | None = None,
+        limit: int = 100,
+    ) -> list[StoredEvent]:
+        """
+        Query events ordered by (received_at, id), strictly after cursor
+
+        Backends should serve this from an index on (org_id, received_at, id)
+        so each page costs O(limit) regardless of depth.
+        """
+        ...
+
     async def count(self, filter: EventFilter) -> int:
         ...
 
@@ -178,6 +231,19 @@ class EventPublisher(Protocol):
     async def publish(self, event: StoredEvent) -> None:
         ...
 
+    async def publish_batch(self, events: list[StoredEvent]) -> None:
+        ...
+
+
+class ReplayCheckpointStore(Protocol):
+    """Storage for bulk replay progress"""
+
+    async def load(self, replay_id: str) -> ReplayCheckpoint | None:
+        ...
+
+    async def save(self, checkpoint: ReplayCheckpoint) -> None:
+        ...
+
 
 @dataclass
 class EventLog:
@@ -193,11 +259,16 @@ class EventLog:
 
     storage: EventStorage
     publisher: EventPublisher | None = None
+    checkpoint_store: ReplayCheckpointStore | None = None
 
     # Retention settings
     retention_days: int = 90
     max_retry_count: int = 3
 
+    # Streaming / replay settings
+    page_size: int = 500
+    replay_max_in_flight: int = 16
+
     # ------------------------------------------------------------------
     # Event Ingestion
     # ------------------------------------------------------------------
@@ -267,6 +338,75 @@ class EventLog:
 
         return event
 
+    async def store_events(
+        self,
+        batch: list[dict[str, Any]],
+    ) -> list[StoredEvent]:
+        """
+        Store a batch of events (落盤) in a single storage write
+
+        Each item takes the same keyword arguments as store_event().
+        The whole batch is persisted before any event is published,
+        and is then published in one call.
+
+        Returns:
+            Stored events, in batch order
+        """
+        if not batch:
+            return []
+
+        events = [
+            StoredEvent(
+                org_id=item["org_id"],
+                event_type=item["event_type"],
+                source=item["source"],
+                source_id=item["source_id"],
+                payload=item["payload"],
+                repo_id=item.get("repo_id"),
+                repo_full_name=item.get("repo_full_name", ""),
+                head_sha=item.get("head_sha"),
+                pr_number=item.get("pr_number"),
+                ref=item.get("ref"),
+                correlation_id=item.get("correlation_id") or uuid4(),
+                status=EventStatus.RECEIVED,
+            )
+            for item in batch
+        ]
+
+        # Persist first (落盤)
+        events = await self.storage.save_batch(events)
+
+        logger.info(f"Events stored: count={len(events)}")
+
+        # Publish for processing
+        if self.publisher:
+            await self.publisher.publish_batch(events)
+
+        return events
+
+    async def stream_events(
+        self,
+        filter: EventFilter,
+        after: EventCursor | None = None,
+        page_size: int | None = None,
+    ) -> AsyncIterator[StoredEvent]:
+        """
+        Stream events matching filter in (received_at, id) order
+
+        Uses keyset pagination, so memory is bounded by page_size and
+        pages stay cheap however deep the stream goes.
+        """
+        size = page_size or self.page_size
+        cursor = after
+
+        while True:
+            page = await self.storage.query_page(filter, after=cursor, limit=size)
+            for event in page:
+                yield event
+            if len(page) < size:
+                return
+            cursor = EventCursor.after(page[-1])
+
     async def get_event(self, event_id: UUID) -> StoredEvent | None:
         """Get an event by ID"""
         return await self.storage.get(event_id)
@@ -378,17 +518,7 @@ class EventLog:
         if not event:
             raise ValueError(f"Event not found: {event_id}")
 
-        # Reset status
-        event.status = EventStatus.RECEIVED
-        event.processed_at = None
-        event.process_error = None
-        event.job_ids = []
-
-        event = await self.storage.update(event)
-
-        # Re-publish
-        if self.publisher:
-            await self.publisher.publish(event)
+        event = await self._reset_and_publish(event)
 
         logger.info(f"Event replayed: id={event_id}")
 
@@ -397,22 +527,32 @@ class EventLog:
     async def replay_events(
         self,
         filter: EventFilter,
-        limit: int = 1000,
+        limit: int | None = 1000,
+        max_in_flight: int | None = None,
+        replay_id: str | None = None,
     ) -> int:
         """
         Replay multiple events matching filter
 
-        Use with caution - can cause load spikes.
+        Use with caution - can cause load spikes. Events are streamed page
+        by page and replayed with at most max_in_flight concurrent replays.
+
+        Args:
+            filter: Events to replay
+            limit: Maximum events to replay (None for all)
+            max_in_flight: Concurrent replay limit (default replay_max_in_flight)
+            replay_id: Checkpoint key; re-running with the same ID resumes
+                after the last completed page
 
         Returns:
             Number of events replayed
         """
-        events = await self.storage.query(filter, limit=limit)
-        count = 0
-
-        for event in events:
-            await self.replay_event(event.id)
-            count += 1
+        count = await self._replay_stream(
+            filter,
+            limit=limit,
+            max_in_flight=max_in_flight,
+            replay_id=replay_id,
+        )
 
         logger.info(f"Events replayed: count={count}")
 
@@ -422,6 +562,8 @@ class EventLog:
         self,
         org_id: UUID,
         max_retry: int = 3,
+        max_in_flight: int | None = None,
+        replay_id: str | None = None,
     ) -> int:
         """Replay all failed events that haven't exceeded retry limit"""
         filter = EventFilter(
@@ -429,18 +571,103 @@ class EventLog:
             status=EventStatus.FAILED,
         )
 
-        events = await self.storage.query(filter, limit=10000)
-        count = 0
-
-        for event in events:
-            if event.retry_count < max_retry:
-                await self.replay_event(event.id)
-                count += 1
+        count = await self._replay_stream(
+            filter,
+            limit=None,
+            max_in_flight=max_in_flight,
+            replay_id=replay_id,
+            predicate=lambda event: event.retry_count < max_retry,
+        )
 
         logger.info(f"Failed events replayed: count={count}")
 
         return count
 
+    async def _replay_stream(
+        self,
+        filter: EventFilter,
+        limit: int | None,
+        max_in_flight: int | None,
+        replay_id: str | None,
+        predicate: Callable[[StoredEvent], bool] | None = None,
+    ) -> int:
+        """
+        Stream, replay concurrently, and checkpoint after each page
+
+        A page is checkpointed only once every replay in it has finished,
+        so a crashed replay resumes at the first unfinished page (events in
+        that page may be replayed twice; consumers are idempotent).
+        """
+        checkpoint = None
+        if replay_id and self.checkpoint_store:
+            checkpoint = await self.checkpoint_store.load(replay_id)
+            if checkpoint and checkpoint.completed:
+                logger.info(f"Replay already completed: replay_id={replay_id}")
+                return 0
+        if replay_id and checkpoint is None:
+            checkpoint = ReplayCheckpoint(replay_id=replay_id)
+
+        semaphore = asyncio.Semaphore(max_in_flight or self.replay_max_in_flight)
+
+        async def replay_one(event: StoredEvent) -> None:
+            async with semaphore:
+                await self._reset_and_publish(event)
+
+        cursor = checkpoint.cursor if checkpoint else None
+        count = 0
+        exhausted = False
+
+        while limit is None or count < limit:
+            page = await self.storage.query_page(filter, after=cursor, limit=self.page_size)
+            exhausted = len(page) < self.page_size
+
+            selected = [e for e in page if predicate is None or predicate(e)]
+            if limit is not None and len(selected) > limit - count:
+                # Stop mid-page; resume right after the last replayed event
+                selected = selected[:limit - count]
+                page = page[:page.index(selected[-1]) + 1]
+                exhausted = False
+
+            await asyncio.gather(*(replay_one(e) for e in selected))
+            count += len(selected)
+
+            if page:
+                cursor = EventCursor.after(page[-1])
+                if checkpoint:
+                    checkpoint.cursor = cursor
+                    checkpoint.replayed += len(selected)
+                    checkpoint.updated_at = datetime.utcnow()
+                    await self._save_checkpoint(checkpoint)
+
+            if exhausted:
+                break
+
+        if checkpoint and exhausted:
+            checkpoint.completed = True
+            checkpoint.updated_at = datetime.utcnow()
+            await self._save_checkpoint(checkpoint)
+
+        return count
+
+    async def _save_checkpoint(self, checkpoint: ReplayCheckpoint) -> None:
+        if self.checkpoint_store:
+            await self.checkpoint_store.save(checkpoint)
+
+    async def _reset_and_publish(self, event: StoredEvent) -> StoredEvent:
+        """Reset an event to RECEIVED and re-publish it"""
+        event.status = EventStatus.RECEIVED
+        event.processed_at = None
+        event.process_error = None
+        event.job_ids = []
+
+        event = await self.storage.update(event)
+
+        # Re-publish
+        if self.publisher:
+            await self.publisher.publish(event)
+
+        return event
+
     # ------------------------------------------------------------------
     # Correlation
     # ------------------------------------------------------------------
@@ -9,14 +9,16 @@ Ensures that the same PR/commit webhook resend:
 Key principle: Same input → Same output, no side effects on retry.
 """
 
+import asyncio
 import hashlib
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Generic, Protocol, TypeVar
+from typing import Any, Generic, Protocol, TypeVar, runtime_checkable
 from uuid import UUID, uuid4
 
+from enterprise.events.idempotency_cache import LocalIdempotencyCache
 
 logger = logging.getLogger(__name__)
 
@@ -124,6 +126,20 @@ class IdempotencyStorage(Protocol):
         ...
 
 
+@runtime_checkable
+class AtomicIdempotencyStorage(IdempotencyStorage, Protocol):
+    """
+    Storage that can insert a record only if its key is not yet taken
+
+    Optional capability; IdempotencyManager uses it to skip the lookup read
+    for keys its Bloom filter has never seen.
+    """
+
+    async def save_if_absent(self, record: IdempotencyRecord) -> IdempotencyRecord | None:
+        """Insert record atomically; None if key_hash already exists"""
+        ...
+
+
 @dataclass
 class IdempotencyResult(Generic[T]):
     """Result of an idempotency check"""
@@ -142,6 +158,18 @@ class IdempotencyManager:
     - Duplicate request: Return cached result
     - In-flight duplicate: Wait for original or fail
 
+    With a local_cache (the default), lookups go through a process-local
+    fast path first:
+    - Completed records are served from a bounded TTL cache
+    - Concurrent checks of one key share a single storage lookup
+    - Keys the Bloom filter has never seen skip the storage read when the
+      storage is an AtomicIdempotencyStorage, whose save_if_absent(record)
+      returns None if the key already exists; the filter only knows what this process
+      wrote since it started, so the conditional insert stays the authority
+
+    complete/fail always re-read the stored record before writing, and
+    refuse to overwrite a record another attempt has taken over.
+
     Usage:
         async with idempotency.guard(key) as result:
             if result.is_duplicate:
@@ -160,9 +188,19 @@ class IdempotencyManager:
     # TTL for records
     default_ttl_seconds: int = 86400  # 24 hours
 
-    # In-memory cache for hot path (optional)
-    _cache: dict[str, IdempotencyRecord] = field(default_factory=dict)
-    _cache_enabled: bool = False
+    # Process-local fast path (None disables it)
+    local_cache: LocalIdempotencyCache | None = field(default_factory=LocalIdempotencyCache)
+
+    stats: dict[str, int] = field(default_factory=lambda: {
+        "cache_hits": 0,
+        "coalesced": 0,
+        "filter_skips": 0,
+        "storage_reads": 0,
+        "storage_writes": 0,
+    })
+
+    # key_hash -> future resolved with the leader's result (None on error)
+    _inflight: dict[str, asyncio.Future] = field(default_factory=dict)
 
     # ------------------------------------------------------------------
     # Idempotency Checking
@@ -185,28 +223,98 @@ class IdempotencyManager:
         """
         key_hash = key.hash
 
-        # Check cache first
-        if self._cache_enabled and key_hash in self._cache:
-            record = self._cache[key_hash]
-            if record.status == IdempotencyStatus.COMPLETED:
-                return IdempotencyResult(
-                    is_duplicate=True,
-                    record=record,
-                    cached_result=record.result,
-                )
+        if self.local_cache is None:
+            return await self._check(key, key_hash, ttl_seconds)
 
-        # Check storage
+        record = self.local_cache.get_completed(key_hash)
+        if record:
+            self.stats["cache_hits"] += 1
+            return IdempotencyResult(
+                is_duplicate=True,
+                record=record,
+                cached_result=record.result,
+            )
+
+        # Coalesce with a check of the same key already in flight here
+        while (leader := self._inflight.get(key_hash)) is not None:
+            result = await asyncio.shield(leader)
+            if result is None:
+                # Leader failed before deciding; try again ourselves
+                continue
+            self.stats["coalesced"] += 1
+            if result.is_duplicate:
+                return result
+            # The leader now owns the operation, so to us it is in flight
+            return IdempotencyResult(
+                is_duplicate=True,
+                record=result.record,
+                cached_result=None,
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key_hash] = future
+        try:
+            result = await self._check(key, key_hash, ttl_seconds)
+        except BaseException:
+            future.set_result(None)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key_hash]
+
+    async def _check(
+        self,
+        key: IdempotencyKey,
+        key_hash: str,
+        ttl_seconds: int | None,
+    ) -> IdempotencyResult:
+        if (
+            self.local_cache is not None
+            and isinstance(self.storage, AtomicIdempotencyStorage)
+            and key_hash not in self.local_cache.filter
+        ):
+            # Never written by this process: try the insert before any read
+            self.stats["filter_skips"] += 1
+            self.stats["storage_writes"] += 1
+            record = self._new_record(key, key_hash, ttl_seconds)
+            saved = await self.storage.save_if_absent(record)
+            if saved is not None:
+                return self._created(key, saved)
+            # Written before, by another process or a previous run of this
+            # one; fall through to the full lookup
+
+        result = await self._lookup(key, key_hash)
+        if result:
+            return result
+
+        # New operation - create record
+        self.stats["storage_writes"] += 1
+        record = self._new_record(key, key_hash, ttl_seconds)
+        return self._created(key, await self.storage.save(record))
+
+    async def _lookup(
+        self,
+        key: IdempotencyKey,
+        key_hash: str,
+    ) -> IdempotencyResult | None:
+        """Result for an existing live record, or None if the key is free"""
+        self.stats["storage_reads"] += 1
         record = await self.storage.get_by_key(key_hash)
 
         if record:
             # Check if expired
             if record.expires_at and datetime.utcnow() > record.expires_at:
+                self.stats["storage_writes"] += 1
                 await self.storage.delete(key_hash)
                 record = None
 
         if record:
             if record.status == IdempotencyStatus.COMPLETED:
                 logger.debug(f"Idempotency hit (completed): {key}")
+                if self.local_cache is not None:
+                    self.local_cache.put_completed(record)
                 return IdempotencyResult(
                     is_duplicate=True,
                     record=record,
@@ -225,12 +333,19 @@ class IdempotencyManager:
             elif record.status == IdempotencyStatus.FAILED:
                 # Previous attempt failed - allow retry
                 logger.debug(f"Idempotency hit (failed, allowing retry): {key}")
+                self.stats["storage_writes"] += 1
                 await self.storage.delete(key_hash)
-                record = None
 
-        # New operation - create record
+        return None
+
+    def _new_record(
+        self,
+        key: IdempotencyKey,
+        key_hash: str,
+        ttl_seconds: int | None,
+    ) -> IdempotencyRecord:
         ttl = ttl_seconds or self.default_ttl_seconds
-        record = IdempotencyRecord(
+        return IdempotencyRecord(
             key_hash=key_hash,
             key_string=str(key),
             org_id=key.org_id,
@@ -239,10 +354,14 @@ class IdempotencyManager:
             expires_at=datetime.utcnow() + timedelta(seconds=ttl),
         )
 
-        record = await self.storage.save(record)
-
-        if self._cache_enabled:
-            self._cache[key_hash] = record
+    def _created(
+        self,
+        key: IdempotencyKey,
+        record: IdempotencyRecord,
+    ) -> IdempotencyResult:
+        if self.local_cache is not None:
+            self.local_cache.filter.add(record.key_hash)
+            self.local_cache.own(record)
 
         logger.debug(f"Idempotency miss, new record: {key}")
 
@@ -251,6 +370,18 @@ class IdempotencyManager:
             record=record,
         )
 
+    async def _owned_record(self, key: IdempotencyKey, key_hash: str) -> IdempotencyRecord:
+        """Current stored record, checked against the one this manager created"""
+        owned = self.local_cache.take_owned(key_hash) if self.local_cache else None
+
+        self.stats["storage_reads"] += 1
+        record = await self.storage.get_by_key(key_hash)
+        if not record:
+            raise ValueError(f"No idempotency record found for key: {key}")
+        if owned is not None and record.id != owned.id:
+            raise ValueError(f"Idempotency record for key {key} was taken over by another attempt")
+        return record
+
     async def complete(
         self,
         key: IdempotencyKey,
@@ -263,18 +394,17 @@ class IdempotencyManager:
         """
         key_hash = key.hash
 
-        record = await self.storage.get_by_key(key_hash)
-        if not record:
-            raise ValueError(f"No idempotency record found for key: {key}")
+        record = await self._owned_record(key, key_hash)
 
         record.status = IdempotencyStatus.COMPLETED
         record.result = result
         record.completed_at = datetime.utcnow()
 
+        self.stats["storage_writes"] += 1
         record = await self.storage.update(record)
 
-        if self._cache_enabled:
-            self._cache[key_hash] = record
+        if self.local_cache is not None:
+            self.local_cache.put_completed(record)
 
         logger.debug(f"Idempotency completed: {key}")
 
@@ -292,18 +422,17 @@ class IdempotencyManager:
         """
         key_hash = key.hash
 
-        record = await self.storage.get_by_key(key_hash)
-        if not record:
-            raise ValueError(f"No idempotency record found for key: {key}")
+        record = await self._owned_record(key, key_hash)
 
         record.status = IdempotencyStatus.FAILED
         record.error = error
         record.completed_at = datetime.utcnow()
 
+        self.stats["storage_writes"] += 1
         record = await self.storage.update(record)
 
-        if self._cache_enabled:
-            self._cache[key_hash] = record
+        if self.local_cache is not None:
+            self.local_cache.forget(key_hash)
 
         logger.debug(f"Idempotency failed: {key} error={error}")
 
@@ -320,15 +449,23 @@ class IdempotencyManager:
         """
         key_hash = key.hash
 
+        self.stats["storage_writes"] += 1
         result = await self.storage.delete(key_hash)
 
-        if self._cache_enabled and key_hash in self._cache:
-            del self._cache[key_hash]
+        if self.local_cache is not None:
+            self.local_cache.forget(key_hash)
 
         logger.debug(f"Idempotency released: {key}")
 
         return result
 
+    def get_stats(self) -> dict[str, Any]:
+        """Get fast-path and storage round-trip statistics"""
+        stats: dict[str, Any] = dict(self.stats)
+        if self.local_cache is not None:
+            stats.update(self.local_cache.get_stats())
+        return stats
+
     # ------------------------------------------------------------------
     # Context Manager
     # ------------------------------------------------------------------
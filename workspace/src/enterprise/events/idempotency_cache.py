@@ -0,0 +1,162 @@
+"""
+Idempotency Local Cache
+
+Process-local layer in front of IdempotencyStorage:
+- Bloom filter over every key this process has written, so never-seen
+  keys can skip the storage read
+- Bounded TTL cache of completed records, so duplicates of finished
+  operations are answered without a round-trip
+- Records this process holds in progress, so complete/fail can tell
+  whether another attempt has taken the key over
+"""
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from enterprise.events.idempotency import IdempotencyRecord
+
+
+class BloomFilter:
+    """
+    Bloom filter over hex key hashes
+
+    Sized for `capacity` keys at `error_rate`. Bits are never cleared, so a
+    negative answer stays correct for the life of the filter; inserting past
+    capacity only raises the false-positive rate, which costs storage reads
+    but never correctness.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key_hash: str) -> list[int]:
+        # Double hashing over two 64-bit slices of the SHA-256 digest
+        h1 = int(key_hash[:16], 16)
+        h2 = int(key_hash[16:32], 16) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key_hash: str) -> None:
+        for pos in self._positions(key_hash):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key_hash: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key_hash))
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """False-positive rate at the current fill"""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+@dataclass
+class LocalIdempotencyCache:
+    """
+    Local Idempotency Cache
+
+    Holds the process-local state IdempotencyManager consults before
+    going to storage. Only completed records are cached for duplicates:
+    in-progress and failed keys always go back to storage, which stays the
+    source of truth for ownership.
+    """
+
+    # Completed record cache
+    max_entries: int = 10000
+    ttl_seconds: float = 300.0
+
+    # In-progress records remembered for complete/fail
+    max_owned: int = 10000
+
+    # Bloom filter sizing
+    filter_capacity: int = 1_000_000
+    filter_error_rate: float = 0.001
+
+    clock: Callable[[], float] = time.monotonic
+
+    filter: BloomFilter = field(init=False)
+    _completed: OrderedDict[str, tuple[float, "IdempotencyRecord"]] = field(
+        default_factory=OrderedDict, init=False
+    )
+    _owned: OrderedDict[str, "IdempotencyRecord"] = field(default_factory=OrderedDict, init=False)
+
+    def __post_init__(self):
+        self.filter = BloomFilter(self.filter_capacity, self.filter_error_rate)
+
+    # ------------------------------------------------------------------
+    # Completed Records
+    # ------------------------------------------------------------------
+
+    def get_completed(self, key_hash: str) -> "IdempotencyRecord | None":
+        """Cached completed record, if fresh"""
+        entry = self._completed.get(key_hash)
+        if entry is None:
+            return None
+        expires, record = entry
+        if self.clock() >= expires or (
+            record.expires_at and datetime.utcnow() > record.expires_at
+        ):
+            del self._completed[key_hash]
+            return None
+        self._completed.move_to_end(key_hash)
+        return record
+
+    def put_completed(self, record: "IdempotencyRecord") -> None:
+        self._completed[record.key_hash] = (self.clock() + self.ttl_seconds, record)
+        self._completed.move_to_end(record.key_hash)
+        while len(self._completed) > self.max_entries:
+            self._completed.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Owned Records
+    # ------------------------------------------------------------------
+
+    def own(self, record: "IdempotencyRecord") -> None:
+        """
+        Remember a record this process created and is executing
+
+        Records that expire or overflow max_owned without complete/fail are
+        dropped; complete/fail then simply skip the ownership check.
+        """
+        self._owned[record.key_hash] = record
+        self._owned.move_to_end(record.key_hash)
+
+        now = datetime.utcnow()
+        while self._owned:
+            oldest = next(iter(self._owned.values()))
+            if len(self._owned) <= self.max_owned and not (
+                oldest.expires_at and now > oldest.expires_at
+            ):
+                break
+            self._owned.popitem(last=False)
+
+    def take_owned(self, key_hash: str) -> "IdempotencyRecord | None":
+        return self._owned.pop(key_hash, None)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def forget(self, key_hash: str) -> None:
+        """Drop cached state for a key (the filter keeps it)"""
+        self._completed.pop(key_hash, None)
+        self._owned.pop(key_hash, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "completed_cached": len(self._completed),
+            "owned": len(self._owned),
+            "filter_keys": self.filter.count,
+            "filter_error_rate": self.filter.estimated_error_rate,
+        }
@@ -0,0 +1,173 @@
+"""
+SQLite Idempotency Storage
+
+Bundled IdempotencyStorage backend for single-node deployments and tests:
+- Atomic save_if_absent (INSERT OR IGNORE), so IdempotencyManager can
+  skip the lookup read for keys its filter has never seen
+- Indexed on expires_at so cleanup never scans live records
+- Blocking sqlite3 calls run off the event loop
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from enterprise.events.idempotency import IdempotencyRecord, IdempotencyStatus
+
+# Fixed-width timestamps so string order == time order
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_records (
+    key_hash TEXT PRIMARY KEY,
+    expires_at TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_expires
+    ON idempotency_records (expires_at);
+"""
+
+
+def _fmt(value: datetime | None) -> str | None:
+    return value.strftime(_TS_FORMAT) if value else None
+
+
+def _parse(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _record_to_dict(record: IdempotencyRecord) -> dict[str, Any]:
+    return {
+        "id": str(record.id),
+        "key_hash": record.key_hash,
+        "key_string": record.key_string,
+        "org_id": str(record.org_id),
+        "status": record.status.value,
+        "result": record.result,
+        "error": record.error,
+        "created_at": record.created_at.isoformat(),
+        "completed_at": record.completed_at.isoformat() if record.completed_at else None,
+        "expires_at": record.expires_at.isoformat() if record.expires_at else None,
+        "operation_type": record.operation_type,
+        "request_id": record.request_id,
+    }
+
+
+def _record_from_dict(data: dict[str, Any]) -> IdempotencyRecord:
+    return IdempotencyRecord(
+        id=UUID(data["id"]),
+        key_hash=data["key_hash"],
+        key_string=data.get("key_string", ""),
+        org_id=UUID(data["org_id"]),
+        status=IdempotencyStatus(data["status"]),
+        result=data.get("result"),
+        error=data.get("error"),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        completed_at=_parse(data.get("completed_at")),
+        expires_at=_parse(data.get("expires_at")),
+        operation_type=data.get("operation_type", ""),
+        request_id=data.get("request_id"),
+    )
+
+
+@dataclass
+class SQLiteIdempotencyStorage:
+    """
+    SQLite Idempotency Storage
+
+    Implements AtomicIdempotencyStorage. Records are stored as a JSON body
+    keyed by key_hash, with expires_at alongside for cleanup.
+    """
+
+    path: str = ":memory:"
+
+    _conn: sqlite3.Connection = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # IdempotencyStorage
+    # ------------------------------------------------------------------
+
+    async def get_by_key(self, key_hash: str) -> IdempotencyRecord | None:
+        def run() -> tuple[str] | None:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT body FROM idempotency_records WHERE key_hash = ?", (key_hash,)
+                ).fetchone()
+
+        row = await asyncio.to_thread(run)
+        return _record_from_dict(json.loads(row[0])) if row else None
+
+    async def save(self, record: IdempotencyRecord) -> IdempotencyRecord:
+        await self._write(
+            "INSERT OR REPLACE INTO idempotency_records (key_hash, expires_at, body) "
+            "VALUES (?, ?, ?)",
+            self._params(record),
+        )
+        return record
+
+    async def save_if_absent(self, record: IdempotencyRecord) -> IdempotencyRecord | None:
+        inserted = await self._write(
+            "INSERT OR IGNORE INTO idempotency_records (key_hash, expires_at, body) "
+            "VALUES (?, ?, ?)",
+            self._params(record),
+        )
+        return record if inserted else None
+
+    async def update(self, record: IdempotencyRecord) -> IdempotencyRecord:
+        key_hash, expires_at, body = self._params(record)
+        await self._write(
+            "UPDATE idempotency_records SET expires_at = ?, body = ? WHERE key_hash = ?",
+            (expires_at, body, key_hash),
+        )
+        return record
+
+    async def delete(self, key_hash: str) -> bool:
+        return bool(await self._write(
+            "DELETE FROM idempotency_records WHERE key_hash = ?", (key_hash,)
+        ))
+
+    async def cleanup_expired(self) -> int:
+        return await self._write(
+            "DELETE FROM idempotency_records WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (_fmt(datetime.utcnow()),),
+        )
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _params(record: IdempotencyRecord) -> tuple[Any, ...]:
+        return (
+            record.key_hash,
+            _fmt(record.expires_at),
+            json.dumps(_record_to_dict(record)),
+        )
+
+    async def _write(self, sql: str, params: tuple[Any, ...]) -> int:
+        """Execute and commit; returns the number of rows changed"""
+        def run() -> int:
+            with self._lock:
+                changed = self._conn.execute(sql, params).rowcount
+                self._conn.commit()
+                return changed
+
+        return await asyncio.to_thread(run)
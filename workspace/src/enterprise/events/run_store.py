@@ -0,0 +1,303 @@
+"""
+SQLite Run Storage
+
+Bundled RunStorage backend for single-node deployments and tests:
+- Indexed on (org, state, deadline) and (org, created_at, id)
+- Partial index over active runs so timeout sweeps never touch history
+- Keyset pagination for listing millions of historical runs
+- Blocking sqlite3 calls run off the event loop
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from enterprise.events.state_machine import (
+    Run,
+    RunCursor,
+    RunState,
+    RunTransition,
+    TransitionType,
+)
+
+# Fixed-width timestamps so string order == time order
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+_ACTIVE_STATES = ("queued", "preparing", "running")
+_ACTIVE_FILTER = f"state IN ({', '.join(repr(s) for s in _ACTIVE_STATES)})"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    org_id TEXT NOT NULL,
+    repo_id TEXT NOT NULL,
+    head_sha TEXT NOT NULL,
+    pr_number INTEGER,
+    state TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    deadline TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_org_created
+    ON runs (org_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_runs_org_state_deadline
+    ON runs (org_id, state, deadline);
+CREATE INDEX IF NOT EXISTS idx_runs_org_state_created
+    ON runs (org_id, state, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_runs_org_repo_sha
+    ON runs (org_id, repo_id, head_sha, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_active_deadline
+    ON runs (state, deadline, id)
+    WHERE {_ACTIVE_FILTER};
+
+CREATE TABLE IF NOT EXISTS run_transitions (
+    id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transitions_run
+    ON run_transitions (run_id, timestamp);
+"""
+
+
+def _fmt(value: datetime | None) -> str | None:
+    return value.strftime(_TS_FORMAT) if value else None
+
+
+def _transition_to_dict(transition: RunTransition) -> dict[str, Any]:
+    return {
+        "id": str(transition.id),
+        "run_id": str(transition.run_id),
+        "from_state": transition.from_state.value,
+        "to_state": transition.to_state.value,
+        "transition_type": transition.transition_type.value,
+        "reason": transition.reason,
+        "error": transition.error,
+        "metadata": transition.metadata,
+        "triggered_by": transition.triggered_by,
+        "worker_id": transition.worker_id,
+        "timestamp": transition.timestamp.isoformat(),
+    }
+
+
+def _transition_from_dict(data: dict[str, Any]) -> RunTransition:
+    return RunTransition(
+        id=UUID(data["id"]),
+        run_id=UUID(data["run_id"]),
+        from_state=RunState(data["from_state"]),
+        to_state=RunState(data["to_state"]),
+        transition_type=TransitionType(data["transition_type"]),
+        reason=data.get("reason", ""),
+        error=data.get("error"),
+        metadata=data.get("metadata", {}),
+        triggered_by=data.get("triggered_by"),
+        worker_id=data.get("worker_id"),
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+    )
+
+
+@dataclass
+class SQLiteRunStorage:
+    """
+    SQLite Run Storage
+
+    Implements RunStorage. Filter columns are stored alongside a JSON body
+    (Run.to_dict) so every query is served from an index.
+    """
+
+    path: str = ":memory:"
+
+    _conn: sqlite3.Connection = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # RunStorage
+    # ------------------------------------------------------------------
+
+    async def save(self, run: Run) -> Run:
+        await self._write(
+            "INSERT INTO runs (id, org_id, repo_id, head_sha, pr_number, state, "
+            "created_at, deadline, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._run_params(run),
+        )
+        return run
+
+    async def update(self, run: Run) -> Run:
+        params = self._run_params(run)
+        await self._write(
+            "UPDATE runs SET org_id = ?, repo_id = ?, head_sha = ?, pr_number = ?, "
+            "state = ?, created_at = ?, deadline = ?, body = ? WHERE id = ?",
+            (*params[1:], params[0]),
+        )
+        return run
+
+    async def get(self, run_id: UUID) -> Run | None:
+        rows = await self._read("SELECT body FROM runs WHERE id = ?", (str(run_id),))
+        return self._to_run(rows[0]) if rows else None
+
+    async def query(
+        self,
+        org_id: UUID,
+        state: RunState | None = None,
+        repo_id: UUID | None = None,
+        head_sha: str | None = None,
+        pr_number: int | None = None,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[Run]:
+        where, params = self._filters(org_id, state, repo_id, head_sha, pr_number)
+        rows = await self._read(
+            f"SELECT body FROM runs WHERE {where} "
+            "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset),
+        )
+        return [self._to_run(row) for row in rows]
+
+    async def query_page(
+        self,
+        org_id: UUID,
+        state: RunState | None = None,
+        repo_id: UUID | None = None,
+        head_sha: str | None = None,
+        pr_number: int | None = None,
+        after: RunCursor | None = None,
+        limit: int = 100,
+    ) -> list[Run]:
+        where, params = self._filters(org_id, state, repo_id, head_sha, pr_number)
+        if after:
+            where += " AND (created_at, id) < (?, ?)"
+            params.extend([_fmt(after.created_at), str(after.run_id)])
+        rows = await self._read(
+            f"SELECT body FROM runs WHERE {where} "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [self._to_run(row) for row in rows]
+
+    async def query_deadlines(
+        self,
+        state: RunState,
+        org_id: UUID | None = None,
+        due_before: datetime | None = None,
+        limit: int = 10000,
+    ) -> list[tuple[datetime, UUID]]:
+        # Enum values are inlined: the planner can only match the partial
+        # index over active runs against literal terms, not parameters
+        where = f"state = '{state.value}' AND deadline IS NOT NULL"
+        params: list[Any] = []
+        if state.value in _ACTIVE_STATES:
+            where += f" AND {_ACTIVE_FILTER}"
+        if org_id:
+            where += " AND org_id = ?"
+            params.append(str(org_id))
+        if due_before:
+            where += " AND deadline < ?"
+            params.append(_fmt(due_before))
+
+        rows = await self._read(
+            f"SELECT deadline, id FROM runs WHERE {where} ORDER BY deadline LIMIT ?",
+            (*params, limit),
+        )
+        return [
+            (datetime.strptime(row["deadline"], _TS_FORMAT), UUID(row["id"]))
+            for row in rows
+        ]
+
+    async def save_transition(self, transition: RunTransition) -> RunTransition:
+        await self._write(
+            "INSERT INTO run_transitions (id, run_id, timestamp, body) VALUES (?, ?, ?, ?)",
+            (
+                str(transition.id),
+                str(transition.run_id),
+                _fmt(transition.timestamp),
+                json.dumps(_transition_to_dict(transition)),
+            ),
+        )
+        return transition
+
+    async def get_transitions(self, run_id: UUID) -> list[RunTransition]:
+        rows = await self._read(
+            "SELECT body FROM run_transitions WHERE run_id = ? ORDER BY timestamp",
+            (str(run_id),),
+        )
+        return [_transition_from_dict(json.loads(row["body"])) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _run_params(run: Run) -> tuple[Any, ...]:
+        return (
+            str(run.id),
+            str(run.org_id),
+            str(run.repo_id),
+            run.head_sha,
+            run.pr_number,
+            run.state.value,
+            _fmt(run.created_at),
+            _fmt(run.deadline),
+            json.dumps(run.to_dict()),
+        )
+
+    @staticmethod
+    def _to_run(row: sqlite3.Row) -> Run:
+        return Run.from_dict(json.loads(row["body"]))
+
+    @staticmethod
+    def _filters(
+        org_id: UUID,
+        state: RunState | None,
+        repo_id: UUID | None,
+        head_sha: str | None,
+        pr_number: int | None,
+    ) -> tuple[str, list[Any]]:
+        clauses = ["org_id = ?"]
+        params: list[Any] = [str(org_id)]
+        if state:
+            clauses.append("state = ?")
+            params.append(state.value)
+        if repo_id:
+            clauses.append("repo_id = ?")
+            params.append(str(repo_id))
+        if head_sha:
+            clauses.append("head_sha = ?")
+            params.append(head_sha)
+        if pr_number is not None:
+            clauses.append("pr_number = ?")
+            params.append(pr_number)
+        return " AND ".join(clauses), params
+
+    async def _write(self, sql: str, params: tuple[Any, ...]) -> None:
+        def run() -> None:
+            with self._lock:
+                self._conn.execute(sql, params)
+                self._conn.commit()
+
+        await asyncio.to_thread(run)
+
+    async def _read(self, sql: str, params: tuple[Any, ...]) -> list[sqlite3.Row]:
+        def run() -> list[sqlite3.Row]:
+            with self._lock:
+                return self._conn.execute(sql, params).fetchall()
+
+        return await asyncio.to_thread(run)
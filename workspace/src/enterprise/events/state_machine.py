@@ -5,12 +5,16 @@ Manages the lifecycle of analysis runs:
 - queued → running → completed/failed/canceled
 
 Features:
-- Queryable state
+- Queryable state (keyset-paginated listing)
 - Replayable transitions
 - Full audit trail
+- Deadline-heap timeout sweeps
 """
 
+import asyncio
+import heapq
 import logging
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -188,16 +192,79 @@ class Run:
             "findings_count": self.findings_count,
             "error": self.error,
             "check_run_id": self.check_run_id,
+            "status_id": self.status_id,
+            "comment_id": self.comment_id,
             "created_at": self.created_at.isoformat(),
             "queued_at": self.queued_at.isoformat() if self.queued_at else None,
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "timeout_seconds": self.timeout_seconds,
+            "deadline": self.deadline.isoformat() if self.deadline else None,
             "worker_id": self.worker_id,
+            "worker_version": self.worker_version,
             "attempt": self.attempt,
+            "max_attempts": self.max_attempts,
             "duration_seconds": self.duration_seconds,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Run":
+        """Create from dictionary (transitions are loaded separately)"""
+        def parse_time(key: str) -> datetime | None:
+            return datetime.fromisoformat(data[key]) if data.get(key) else None
+
+        return cls(
+            id=UUID(data["id"]),
+            org_id=UUID(data["org_id"]),
+            repo_id=UUID(data["repo_id"]),
+            repo_full_name=data.get("repo_full_name", ""),
+            event_id=UUID(data["event_id"]) if data.get("event_id") else None,
+            job_id=UUID(data["job_id"]) if data.get("job_id") else None,
+            correlation_id=UUID(data["correlation_id"]) if data.get("correlation_id") else None,
+            head_sha=data.get("head_sha", ""),
+            base_sha=data.get("base_sha"),
+            ref=data.get("ref"),
+            pr_number=data.get("pr_number"),
+            state=RunState(data.get("state", "queued")),
+            previous_state=RunState(data["previous_state"]) if data.get("previous_state") else None,
+            run_type=data.get("run_type", ""),
+            policy_ids=[UUID(p) for p in data.get("policy_ids", [])],
+            tools=data.get("tools", []),
+            result=data.get("result"),
+            findings_count=data.get("findings_count", 0),
+            error=data.get("error"),
+            check_run_id=data.get("check_run_id"),
+            status_id=data.get("status_id"),
+            comment_id=data.get("comment_id"),
+            created_at=parse_time("created_at") or datetime.utcnow(),
+            queued_at=parse_time("queued_at"),
+            started_at=parse_time("started_at"),
+            completed_at=parse_time("completed_at"),
+            timeout_seconds=data.get("timeout_seconds", 600),
+            deadline=parse_time("deadline"),
+            worker_id=data.get("worker_id"),
+            worker_version=data.get("worker_version"),
+            attempt=data.get("attempt", 1),
+            max_attempts=data.get("max_attempts", 3),
+        )
+
+
+@dataclass(frozen=True)
+class RunCursor:
+    """
+    Keyset pagination cursor for runs
+
+    Runs are listed newest first, ordered by (created_at, id) descending;
+    a cursor points at the last run of the previous page.
+    """
+    created_at: datetime
+    run_id: UUID
+
+    @classmethod
+    def after(cls, run: Run) -> "RunCursor":
+        """Cursor positioned after the given run"""
+        return cls(created_at=run.created_at, run_id=run.id)
+
 
 class InvalidTransitionError(Exception):
     """Raised when an invalid state transition is attempted"""
@@ -228,6 +295,34 @@ class RunStorage(Protocol):
     ) -> list[Run]:
         ...
 
+    async def query_page(
+        self,
+        org_id: UUID,
+        state: RunState | None = None,
+        repo_id: UUID | None = None,
+        head_sha: str | None = None,
+        pr_number: int | None = None,
+        after: RunCursor | None = None,
+        limit: int = 100,
+    ) -> list[Run]:
+        """Query runs newest first, strictly after the cursor"""
+        ...
+
+    async def query_deadlines(
+        self,
+        state: RunState,
+        org_id: UUID | None = None,
+        due_before: datetime | None = None,
+        limit: int = 10000,
+    ) -> list[tuple[datetime, UUID]]:
+        """
+        (deadline, run_id) of runs in a state, earliest deadline first
+
+        Backends should answer this from an index on (state, deadline)
+        without loading run bodies.
+        """
+        ...
+
     async def save_transition(self, transition: RunTransition) -> RunTransition:
         ...
 
@@ -256,6 +351,12 @@ class RunStateMachine:
     storage: RunStorage
     event_publisher: EventPublisher | None = None
 
+    # Timeout monitoring: in-process min-heap of (deadline, run_id)
+    deadline_resync_seconds: float = 60.0
+    _deadlines: list[tuple[datetime, UUID]] = field(default_factory=list)
+    _deadlines_loaded: bool = False
+    _deadline_added: asyncio.Event = field(default_factory=asyncio.Event)
+
     # ------------------------------------------------------------------
     # Run Creation
     # ------------------------------------------------------------------
@@ -411,6 +512,7 @@ class RunStateMachine:
         if to_state == RunState.RUNNING:
             run.started_at = datetime.utcnow()
             run.worker_id = worker_id
+            self._track_deadline(run)
 
         if to_state in {RunState.COMPLETED, RunState.FAILED, RunState.CANCELED, RunState.TIMED_OUT}:
             run.completed_at = datetime.utcnow()
@@ -559,18 +661,63 @@ class RunStateMachine:
         pr_number: int | None = None,
         offset: int = 0,
         limit: int = 100,
+        after: RunCursor | None = None,
     ) -> list[Run]:
-        """List runs with filters"""
-        return await self.storage.query(
+        """
+        List runs with filters, newest first
+
+        Pass `after=RunCursor.after(runs[-1])` to fetch the next page; keyset
+        pages cost the same at any depth. `offset` is kept for compatibility
+        and falls back to the storage's offset query.
+        """
+        if offset:
+            return await self.storage.query(
+                org_id=org_id,
+                state=state,
+                repo_id=repo_id,
+                head_sha=head_sha,
+                pr_number=pr_number,
+                offset=offset,
+                limit=limit,
+            )
+
+        return await self.storage.query_page(
             org_id=org_id,
             state=state,
             repo_id=repo_id,
             head_sha=head_sha,
             pr_number=pr_number,
-            offset=offset,
+            after=after,
             limit=limit,
         )
 
+    async def iter_runs(
+        self,
+        org_id: UUID,
+        state: RunState | None = None,
+        repo_id: UUID | None = None,
+        head_sha: str | None = None,
+        pr_number: int | None = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[Run]:
+        """Iterate every matching run, newest first, one page in memory at a time"""
+        cursor = None
+        while True:
+            page = await self.list_runs(
+                org_id=org_id,
+                state=state,
+                repo_id=repo_id,
+                head_sha=head_sha,
+                pr_number=pr_number,
+                limit=page_size,
+                after=cursor,
+            )
+            for run in page:
+                yield run
+            if len(page) < page_size:
+                return
+            cursor = RunCursor.after(page[-1])
+
     async def get_latest_run(
         self,
         org_id: UUID,
@@ -579,7 +726,7 @@ class RunStateMachine:
         run_type: str | None = None,
     ) -> Run | None:
         """Get the most recent run for a commit"""
-        runs = await self.storage.query(
+        runs = await self.storage.query_page(
             org_id=org_id,
             repo_id=repo_id,
             head_sha=head_sha,
@@ -602,31 +749,101 @@ class RunStateMachine:
         """
         Check for timed out runs and transition them
 
-        Should be called periodically by a background job.
+        Only runs whose deadline has passed are loaded: due entries are
+        popped from the in-process deadline heap, which is seeded from
+        storage (deadlines of RUNNING runs only) on first use.
         """
-        # Query for runs past their deadline
-        # This depends on storage implementation
+        if not self._deadlines_loaded:
+            await self.load_deadlines()
+
         count = 0
+        now = datetime.utcnow()
+        deferred = []
 
-        # Example: Get all running runs and check deadline
-        running_runs = await self.storage.query(
-            org_id=org_id,
-            state=RunState.RUNNING,
-            limit=1000,
-        )
+        while self._deadlines and self._deadlines[0][0] < now:
+            deadline, run_id = heapq.heappop(self._deadlines)
 
-        now = datetime.utcnow()
+            run = await self.storage.get(run_id)
+            if not run or run.state != RunState.RUNNING or run.deadline != deadline:
+                # Finished, not started yet (re-tracked on start) or stale entry
+                continue
 
-        for run in running_runs:
-            if run.deadline and now > run.deadline:
-                await self.timeout_run(run.id)
-                count += 1
+            if org_id and run.org_id != org_id:
+                deferred.append((deadline, run_id))
+                continue
+
+            await self.timeout_run(run.id)
+            count += 1
+
+        for entry in deferred:
+            heapq.heappush(self._deadlines, entry)
 
         if count > 0:
             logger.warning(f"Timed out {count} runs")
 
         return count
 
+    async def load_deadlines(self) -> int:
+        """
+        (Re)seed the deadline heap from storage
+
+        Call periodically when other processes also start runs;
+        run_timeout_monitor() does this every deadline_resync_seconds.
+        """
+        entries = await self.storage.query_deadlines(RunState.RUNNING)
+        self._deadlines = list(entries)
+        heapq.heapify(self._deadlines)
+        self._deadlines_loaded = True
+        self._deadline_added.set()
+        return len(self._deadlines)
+
+    def next_deadline(self) -> datetime | None:
+        """Earliest tracked deadline"""
+        return self._deadlines[0][0] if self._deadlines else None
+
+    async def run_timeout_monitor(self, stop: asyncio.Event) -> None:
+        """
+        Background loop: sleep until the next deadline, then sweep
+
+        Wakes early when an earlier deadline is tracked and resyncs
+        from storage every deadline_resync_seconds.
+        """
+        await self.load_deadlines()
+        last_sync = datetime.utcnow()
+
+        while not stop.is_set():
+            now = datetime.utcnow()
+            if (now - last_sync).total_seconds() >= self.deadline_resync_seconds:
+                await self.load_deadlines()
+                last_sync = now
+
+            try:
+                await self.check_timeouts()
+            except Exception as e:
+                logger.error(f"Timeout sweep failed: {e}")
+
+            wait = self.deadline_resync_seconds
+            nxt = self.next_deadline()
+            if nxt:
+                wait = min(wait, max((nxt - datetime.utcnow()).total_seconds(), 0.0) + 0.001)
+
+            self._deadline_added.clear()
+            waiters = [
+                asyncio.ensure_future(stop.wait()),
+                asyncio.ensure_future(self._deadline_added.wait()),
+            ]
+            await asyncio.wait(waiters, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in waiters:
+                waiter.cancel()
+
+    def _track_deadline(self, run: Run) -> None:
+        if not run.deadline:
+            return
+        earliest = self.next_deadline()
+        heapq.heappush(self._deadlines, (run.deadline, run.id))
+        if earliest is None or run.deadline < earliest:
+            self._deadline_added.set()
+
     # ------------------------------------------------------------------
     # Replay
     # ------------------------------------------------------------------
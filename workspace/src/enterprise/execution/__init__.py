@@ -3,6 +3,7 @@ Execution Isolation and Security Module
 
 Since we run code/content from external repos, isolation is critical:
 - Container isolation: Each analysis runs in an isolated container
+- Warm pools: Pre-created, reset-able environments avoid cold starts
 - Network restrictions: Egress deny by default
 - Resource quotas: CPU/Memory/Time limits
 - Secrets management: KMS/Vault/Secret Manager integration
@@ -14,6 +15,13 @@ from enterprise.execution.isolator import (
     ExecutionResult,
     ExecutionSpec,
     IsolationPolicy,
+    ReusableContainerRuntime,
+)
+from enterprise.execution.local_runtime import LocalProcessRuntime
+from enterprise.execution.pool import (
+    EnvironmentPool,
+    EnvironmentPoolConfig,
+    PoolExhaustedError,
 )
 from enterprise.execution.quota import (
     QuotaExceededError,
@@ -37,6 +45,12 @@ __all__ = [
     "ExecutionSpec",
     "ExecutionResult",
     "IsolationPolicy",
+    "ReusableContainerRuntime",
+    # Pool
+    "EnvironmentPool",
+    "EnvironmentPoolConfig",
+    "PoolExhaustedError",
+    "LocalProcessRuntime",
     # Quota
     "ResourceQuotaManager",
     "ResourceQuota",
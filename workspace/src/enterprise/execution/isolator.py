@@ -3,7 +3,7 @@ Execution Isolator
 
 Provides isolated execution environments for analysis:
 - Container/Kubernetes Job based isolation
-- Destroyed after execution completes
+- Destroyed after execution completes (or reset and returned to a warm pool)
 - Network restrictions (egress deny by default)
 - Resource limits
 
@@ -15,9 +15,12 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 from uuid import UUID, uuid4
 
+if TYPE_CHECKING:
+    from enterprise.execution.pool import EnvironmentPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -192,6 +195,38 @@ class ContainerRuntime(Protocol):
         ...
 
 
+class ReusableContainerRuntime(ContainerRuntime, Protocol):
+    """
+    Container runtime that supports warm, reusable environments
+
+    Pooled environments are created once with an idle entrypoint; each
+    execution is run inside them and the environment is reset afterwards.
+    """
+
+    async def exec_in_container(
+        self,
+        container_id: str,
+        spec: ExecutionSpec,
+        timeout: int,
+    ) -> tuple[int, str, str]:
+        """Run spec command in a running container, return (exit_code, stdout, stderr)"""
+        ...
+
+    async def reset_container(
+        self,
+        container_id: str,
+    ) -> None:
+        """Reset container filesystem/process state for reuse"""
+        ...
+
+    async def check_health(
+        self,
+        container_id: str,
+    ) -> bool:
+        """Return True if the container can accept another execution"""
+        ...
+
+
 class KubernetesClient(Protocol):
     """Interface for Kubernetes operations"""
 
@@ -243,13 +278,17 @@ class ExecutionIsolator:
     Execution Isolator
 
     Runs analysis in isolated environments (containers or K8s Jobs).
-    Environments are destroyed after execution.
+    Environments are destroyed after execution, unless an environment
+    pool is configured, in which case they are reset and reused.
     """
 
     # Runtime backends
     container_runtime: ContainerRuntime | None = None
     kubernetes_client: KubernetesClient | None = None
 
+    # Warm environment pool (takes precedence over the backends above)
+    environment_pool: "EnvironmentPool | None" = None
+
     # Configuration
     default_namespace: str = "mno-workers"
     default_image: str = "mno/worker:latest"
@@ -270,13 +309,16 @@ class ExecutionIsolator:
         """
         Execute in an isolated environment
 
-        The environment is destroyed after execution completes.
+        The environment is destroyed after execution completes, or reset
+        and returned to the pool when one is configured.
         """
         result = ExecutionResult(spec_id=spec.id)
         result.started_at = datetime.utcnow()
 
         try:
-            if self.kubernetes_client:
+            if self.environment_pool:
+                result = await self._execute_pooled(spec, result)
+            elif self.kubernetes_client:
                 result = await self._execute_kubernetes(spec, result)
             elif self.container_runtime:
                 result = await self._execute_container(spec, result)
@@ -359,6 +401,40 @@ class ExecutionIsolator:
 
         return result
 
+    async def _execute_pooled(
+        self,
+        spec: ExecutionSpec,
+        result: ExecutionResult,
+    ) -> ExecutionResult:
+        """Execute inside a warm environment borrowed from the pool"""
+        pool = self.environment_pool
+        timeout = spec.isolation_policy.execution_timeout_seconds
+        env = await pool.acquire(spec)
+        result.container_id = env.container_id
+        reusable = False
+
+        try:
+            exit_code, stdout, stderr = await asyncio.wait_for(
+                pool.runtime.exec_in_container(env.container_id, spec, timeout),
+                timeout=timeout + 10,
+            )
+
+            result.exit_code = exit_code
+            result.stdout = stdout
+            result.stderr = stderr
+
+            usage = await pool.runtime.get_resource_usage(env.container_id)
+            result.cpu_usage_seconds = usage.get("cpu_seconds")
+            result.memory_peak_bytes = usage.get("memory_peak_bytes")
+
+            # Timed out or crashed environments are never handed out again
+            reusable = True
+
+        finally:
+            await pool.release(env, reusable=reusable)
+
+        return result
+
     async def _execute_kubernetes(
         self,
         spec: ExecutionSpec,
@@ -0,0 +1,237 @@
+"""
+Local Process Runtime
+
+A ContainerRuntime backed by local subprocesses and scratch directories.
+Intended for tests and single-host development, NOT for running untrusted
+code in production:
+- Each "container" is a private working directory
+- Commands run as subprocesses with a scrubbed environment
+- Optional Linux namespace isolation via `unshare` (no network)
+- Supports warm reuse (exec/reset/health) for EnvironmentPool
+"""
+
+import asyncio
+import logging
+import os
+import resource
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from enterprise.execution.isolator import ExecutionSpec, NetworkPolicy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _LocalContainer:
+    """State for one local environment"""
+    id: str
+    root: Path
+    spec: ExecutionSpec
+    process: asyncio.subprocess.Process | None = None
+    stdout: str = ""
+    stderr: str = ""
+    cpu_seconds: float = 0.0
+
+
+@dataclass
+class LocalProcessRuntime:
+    """
+    Local Process Runtime
+
+    Implements ContainerRuntime and ReusableContainerRuntime using
+    subprocesses confined to per-environment scratch directories.
+    """
+
+    # Parent directory for environment roots (system temp dir if None)
+    base_dir: str | None = None
+
+    # Wrap commands in `unshare` when the host supports it
+    use_namespaces: bool = False
+
+    # Environment variables passed through from the host
+    inherited_env: tuple[str, ...] = ("PATH", "LANG", "LC_ALL")
+
+    _containers: dict[str, _LocalContainer] = field(default_factory=dict)
+
+    # ------------------------------------------------------------------
+    # ContainerRuntime
+    # ------------------------------------------------------------------
+
+    async def create_container(
+        self,
+        spec: ExecutionSpec,
+    ) -> str:
+        """Create a scratch environment, return its ID"""
+        container_id = f"local-{uuid4().hex[:12]}"
+        root = Path(tempfile.mkdtemp(prefix=f"{container_id}-", dir=self.base_dir))
+        self._containers[container_id] = _LocalContainer(
+            id=container_id,
+            root=root,
+            spec=spec,
+        )
+        return container_id
+
+    async def start_container(
+        self,
+        container_id: str,
+    ) -> None:
+        """Start the spec command; pooled environments without a command stay idle"""
+        container = self._get(container_id)
+        if not container.spec.command:
+            return
+        container.process = await self._spawn(container, container.spec)
+
+    async def wait_for_container(
+        self,
+        container_id: str,
+        timeout: int,
+    ) -> int:
+        """Wait for the started command to exit, return exit code"""
+        container = self._get(container_id)
+        if container.process is None:
+            return 0
+        container.stdout, container.stderr = await self._communicate(
+            container, container.process, timeout
+        )
+        return container.process.returncode
+
+    async def get_logs(
+        self,
+        container_id: str,
+    ) -> tuple[str, str]:
+        """Get captured output of the last command"""
+        container = self._get(container_id)
+        return container.stdout, container.stderr
+
+    async def destroy_container(
+        self,
+        container_id: str,
+    ) -> None:
+        """Kill any running process and remove the environment root"""
+        container = self._containers.pop(container_id, None)
+        if container is None:
+            return
+        if container.process and container.process.returncode is None:
+            container.process.kill()
+            await container.process.wait()
+        shutil.rmtree(container.root, ignore_errors=True)
+
+    async def get_resource_usage(
+        self,
+        container_id: str,
+    ) -> dict[str, Any]:
+        """Get CPU time consumed by the last command"""
+        container = self._get(container_id)
+        return {"cpu_seconds": container.cpu_seconds}
+
+    # ------------------------------------------------------------------
+    # ReusableContainerRuntime
+    # ------------------------------------------------------------------
+
+    async def exec_in_container(
+        self,
+        container_id: str,
+        spec: ExecutionSpec,
+        timeout: int,
+    ) -> tuple[int, str, str]:
+        """Run spec command inside an existing environment"""
+        container = self._get(container_id)
+        container.process = await self._spawn(container, spec)
+        container.stdout, container.stderr = await self._communicate(
+            container, container.process, timeout
+        )
+        return container.process.returncode, container.stdout, container.stderr
+
+    async def reset_container(
+        self,
+        container_id: str,
+    ) -> None:
+        """Wipe the environment root and captured state"""
+        container = self._get(container_id)
+        if container.process and container.process.returncode is None:
+            raise RuntimeError(f"Environment {container_id} still has a running process")
+        for child in container.root.iterdir():
+            if child.is_dir() and not child.is_symlink():
+                shutil.rmtree(child)
+            else:
+                child.unlink()
+        container.process = None
+        container.stdout = ""
+        container.stderr = ""
+        container.cpu_seconds = 0.0
+
+    async def check_health(
+        self,
+        container_id: str,
+    ) -> bool:
+        """Environment is healthy if it exists and its root is writable"""
+        container = self._containers.get(container_id)
+        return container is not None and os.access(container.root, os.W_OK)
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _get(self, container_id: str) -> _LocalContainer:
+        container = self._containers.get(container_id)
+        if container is None:
+            raise KeyError(f"Unknown environment: {container_id}")
+        return container
+
+    async def _spawn(
+        self,
+        container: _LocalContainer,
+        spec: ExecutionSpec,
+    ) -> asyncio.subprocess.Process:
+        argv = [*spec.command, *spec.args]
+        if not argv:
+            raise ValueError("ExecutionSpec has no command")
+
+        if self.use_namespaces and shutil.which("unshare"):
+            prefix = ["unshare", "--user", "--map-root-user", "--pid", "--fork"]
+            if spec.isolation_policy.network_policy == NetworkPolicy.DENY_ALL:
+                prefix.append("--net")
+            argv = [*prefix, *argv]
+
+        env = {k: os.environ[k] for k in self.inherited_env if k in os.environ}
+        env.update(spec.env_vars)
+        env["HOME"] = str(container.root)
+        env["TMPDIR"] = str(container.root)
+
+        return await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=container.root,
+            env=env,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+    async def _communicate(
+        self,
+        container: _LocalContainer,
+        process: asyncio.subprocess.Process,
+        timeout: int,
+    ) -> tuple[str, str]:
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+        # Approximate: other children reaped concurrently are attributed too
+        container.cpu_seconds = (after.ru_utime + after.ru_stime) - (
+            before.ru_utime + before.ru_stime
+        )
+        return (
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
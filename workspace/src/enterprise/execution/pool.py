@@ -0,0 +1,375 @@
+"""
+Warm Execution Environment Pool
+
+Keeps pre-created, reset-able execution environments so short analyses
+do not pay container cold-start cost:
+- Pools keyed by (image, isolation level, tenant fingerprint) so an
+  environment is only reused by specs from the same org, pull secret,
+  working dir and isolation policy
+- Health checks before hand-out
+- Max-reuse count before an environment is retired
+- Background replenishment to keep the pool warm
+
+Environments are reset between executions and destroyed on any failure,
+so no state leaks from one run into the next.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from enterprise.execution.isolator import (
+    ExecutionSpec,
+    IsolationLevel,
+    IsolationPolicy,
+    ReusableContainerRuntime,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# (image, isolation level, fingerprint of org / pull secret / working dir / policy)
+PoolKey = tuple[str, IsolationLevel, str]
+
+
+def spec_fingerprint(spec: ExecutionSpec) -> str:
+    """Fingerprint of the spec fields baked into a pooled environment"""
+    payload = json.dumps(
+        {
+            "org_id": str(spec.org_id),
+            "image_pull_secret": spec.image_pull_secret,
+            "working_dir": spec.working_dir,
+            "isolation_policy": asdict(spec.isolation_policy),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no environment becomes available within the acquire timeout"""
+    def __init__(self, key: PoolKey, timeout: float):
+        self.key = key
+        self.timeout = timeout
+        super().__init__(
+            f"No warm environment available for image={key[0]} "
+            f"level={key[1].value} within {timeout:.1f}s"
+        )
+
+
+@dataclass
+class EnvironmentPoolConfig:
+    """Sizing and lifecycle configuration for the environment pool"""
+    # Environments kept warm per pool key
+    min_size: int = 2
+    # Hard cap on environments per pool key
+    max_size: int = 8
+
+    # Retire an environment after this many executions
+    max_reuse: int = 50
+
+    # Re-check health of idle environments older than this
+    health_check_interval_seconds: float = 30.0
+
+    # How long acquire() waits for a free environment
+    acquire_timeout_seconds: float = 60.0
+
+
+@dataclass
+class PooledEnvironment:
+    """A warm environment owned by the pool"""
+    container_id: str
+    key: PoolKey
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_health_check: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _PoolSlot:
+    """Per-key pool state"""
+    template: ExecutionSpec
+    idle: deque = field(default_factory=deque)
+    total: int = 0
+    condition: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+@dataclass
+class EnvironmentPool:
+    """
+    Warm Environment Pool
+
+    Hands out pre-created environments per ExecutionSpec and takes them back
+    after execution. Environments are reset on release and destroyed when
+    unhealthy, failed, or past their reuse budget.
+    """
+
+    runtime: ReusableContainerRuntime
+    config: EnvironmentPoolConfig = field(default_factory=EnvironmentPoolConfig)
+    default_image: str = "mno/worker:latest"
+
+    _slots: dict[PoolKey, _PoolSlot] = field(default_factory=dict)
+    _background: set[asyncio.Task] = field(default_factory=set)
+    _closed: bool = False
+
+    # Counters
+    _created: int = 0
+    _reused: int = 0
+    _retired: int = 0
+
+    # ------------------------------------------------------------------
+    # Acquire / Release
+    # ------------------------------------------------------------------
+
+    def key_for(self, spec: ExecutionSpec) -> PoolKey:
+        """Pool key for an execution spec"""
+        return (
+            spec.image or self.default_image,
+            spec.isolation_policy.level,
+            spec_fingerprint(spec),
+        )
+
+    async def acquire(self, spec: ExecutionSpec) -> PooledEnvironment:
+        """
+        Acquire a warm environment for the spec
+
+        Waits up to acquire_timeout_seconds when the pool for this key is
+        at max_size and every environment is busy.
+        """
+        if self._closed:
+            raise RuntimeError("Environment pool is closed")
+
+        key = self.key_for(spec)
+        slot = self._get_slot(key, spec)
+        deadline = time.monotonic() + self.config.acquire_timeout_seconds
+
+        while True:
+            async with slot.condition:
+                while not slot.idle and slot.total >= self.config.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhaustedError(key, self.config.acquire_timeout_seconds)
+                    try:
+                        await asyncio.wait_for(slot.condition.wait(), timeout=remaining)
+                    except TimeoutError:
+                        raise PoolExhaustedError(
+                            key, self.config.acquire_timeout_seconds
+                        ) from None
+
+                if slot.idle:
+                    env = slot.idle.popleft()
+                else:
+                    # Reserve a slot, create outside the lock
+                    slot.total += 1
+                    env = None
+
+            if env is None:
+                try:
+                    env = await self._create(key, slot.template)
+                except Exception:
+                    await self._forget(slot)
+                    raise
+                return env
+
+            if await self._is_healthy(env):
+                self._reused += 1
+                return env
+
+            await self._retire(slot, env, reason="failed health check")
+
+    async def release(
+        self,
+        env: PooledEnvironment,
+        reusable: bool = True,
+    ) -> None:
+        """
+        Return an environment to the pool
+
+        The environment is reset before it is handed out again. It is
+        destroyed instead when not reusable, past max_reuse, or the reset fails.
+        """
+        slot = self._slots[env.key]
+        env.uses += 1
+
+        if self._closed or not reusable:
+            await self._retire(slot, env, reason="not reusable")
+            return
+
+        if env.uses >= self.config.max_reuse:
+            await self._retire(slot, env, reason="max reuse reached")
+            return
+
+        try:
+            await self.runtime.reset_container(env.container_id)
+        except Exception as e:
+            logger.warning(f"Failed to reset environment {env.container_id}: {e}")
+            await self._retire(slot, env, reason="reset failed")
+            return
+
+        async with slot.condition:
+            slot.idle.append(env)
+            slot.condition.notify()
+
+    # ------------------------------------------------------------------
+    # Warm-up / Shutdown
+    # ------------------------------------------------------------------
+
+    async def warm(
+        self,
+        image: str | None = None,
+        level: IsolationLevel = IsolationLevel.STANDARD,
+        count: int | None = None,
+        spec: ExecutionSpec | None = None,
+    ) -> int:
+        """
+        Pre-create environments for (image, level)
+
+        Pass spec to warm the pool that spec will acquire from; image and
+        level are then taken from the spec. Returns the number of
+        environments created.
+        """
+        if spec is None:
+            spec = ExecutionSpec(
+                image=image,
+                isolation_policy=IsolationPolicy(level=level),
+            )
+        key = self.key_for(spec)
+        slot = self._get_slot(key, spec)
+        return await self._fill(key, slot, count or self.config.min_size)
+
+    async def close(self) -> None:
+        """Destroy all idle environments and stop replenishment"""
+        self._closed = True
+
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+        for slot in self._slots.values():
+            while slot.idle:
+                env = slot.idle.popleft()
+                await self._destroy(env)
+                slot.total -= 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            "created": self._created,
+            "reused": self._reused,
+            "retired": self._retired,
+            "pools": {
+                f"{image}:{level.value}:{fingerprint}": {
+                    "idle": len(slot.idle),
+                    "total": slot.total,
+                }
+                for (image, level, fingerprint), slot in self._slots.items()
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _get_slot(self, key: PoolKey, spec: ExecutionSpec) -> _PoolSlot:
+        slot = self._slots.get(key)
+        if slot is None:
+            # Every field copied here is covered by the key fingerprint, so
+            # the template matches any spec that maps to this slot
+            template = ExecutionSpec(
+                org_id=spec.org_id,
+                image=key[0],
+                image_pull_secret=spec.image_pull_secret,
+                working_dir=spec.working_dir,
+                isolation_policy=spec.isolation_policy,
+                labels={"mno.io/pooled": "true"},
+            )
+            slot = _PoolSlot(template=template)
+            self._slots[key] = slot
+        return slot
+
+    async def _fill(self, key: PoolKey, slot: _PoolSlot, count: int) -> int:
+        target = min(count, self.config.max_size)
+
+        async with slot.condition:
+            missing = max(0, target - slot.total)
+            slot.total += missing
+
+        created = await asyncio.gather(
+            *(self._create(key, slot.template) for _ in range(missing)),
+            return_exceptions=True,
+        )
+
+        added = 0
+        for env in created:
+            if isinstance(env, BaseException):
+                logger.warning(f"Failed to pre-create environment for {key}: {env}")
+                await self._forget(slot)
+                continue
+            async with slot.condition:
+                slot.idle.append(env)
+                slot.condition.notify()
+            added += 1
+
+        return added
+
+    async def _create(self, key: PoolKey, template: ExecutionSpec) -> PooledEnvironment:
+        container_id = await asyncio.wait_for(
+            self.runtime.create_container(template),
+            timeout=template.isolation_policy.setup_timeout_seconds,
+        )
+        try:
+            await self.runtime.start_container(container_id)
+        except Exception:
+            await self._destroy_id(container_id)
+            raise
+
+        self._created += 1
+        logger.debug(f"Created pooled environment {container_id} for {key}")
+        return PooledEnvironment(container_id=container_id, key=key)
+
+    async def _is_healthy(self, env: PooledEnvironment) -> bool:
+        now = time.monotonic()
+        if now - env.last_health_check < self.config.health_check_interval_seconds:
+            return True
+        try:
+            healthy = await self.runtime.check_health(env.container_id)
+        except Exception as e:
+            logger.warning(f"Health check failed for {env.container_id}: {e}")
+            healthy = False
+        env.last_health_check = now
+        return healthy
+
+    async def _retire(self, slot: _PoolSlot, env: PooledEnvironment, reason: str) -> None:
+        logger.debug(f"Retiring environment {env.container_id}: {reason}")
+        self._retired += 1
+        await self._destroy(env)
+        await self._forget(slot)
+        self._schedule_replenish(env.key, slot)
+
+    async def _forget(self, slot: _PoolSlot) -> None:
+        async with slot.condition:
+            slot.total -= 1
+            slot.condition.notify()
+
+    async def _destroy(self, env: PooledEnvironment) -> None:
+        await self._destroy_id(env.container_id)
+
+    async def _destroy_id(self, container_id: str) -> None:
+        try:
+            await self.runtime.destroy_container(container_id)
+        except Exception as e:
+            logger.warning(f"Failed to destroy environment {container_id}: {e}")
+
+    def _schedule_replenish(self, key: PoolKey, slot: _PoolSlot) -> None:
+        if self._closed or slot.total >= self.config.min_size:
+            return
+        task = asyncio.create_task(self._fill(key, slot, self.config.min_size))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
@@ -4,7 +4,7 @@ Git Provider Integration Module
 Provides stable integration with GitHub/GitLab including:
 - Webhook Receiver with signature verification
 - Anti-replay protection (timestamp/nonce)
-- Rate limiting and backpressure
+- Rate limiting and backpressure (bundled GCRA limiter)
 - Provider App/OAuth installation management
 - Check Run / Status / Comment write-back
 """
@@ -20,6 +20,10 @@ from enterprise.integrations.webhook import (
     WebhookReceiver,
     WebhookValidationError,
 )
+from enterprise.integrations.webhook_store import (
+    GCRARateLimiter,
+    ShardedNonceStore,
+)
 from enterprise.integrations.writeback import (
     CheckRunConclusion,
     CheckRunStatus,
@@ -33,6 +37,8 @@ __all__ = [
     "WebhookReceiver",
     "WebhookEvent",
     "WebhookValidationError",
+    "ShardedNonceStore",
+    "GCRARateLimiter",
     # Providers
     "GitProviderManager",
     "GitProvider",
@@ -9,6 +9,7 @@ Handles incoming webhooks from Git providers with:
 
 import hashlib
 import hmac
+import json
 import logging
 import time
 from dataclasses import dataclass, field
@@ -17,6 +18,8 @@ from enum import Enum
 from typing import Any, Protocol
 from uuid import UUID, uuid4
 
+from enterprise.integrations.webhook_store import GCRARateLimiter, ShardedNonceStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -156,6 +159,8 @@ class WebhookReceiver:
     - Anti-replay protection
     - Rate limiting
     - Event normalization
+
+    Without a nonce_store an in-memory ShardedNonceStore is used.
     """
 
     nonce_store: NonceStore | None = None
@@ -167,13 +172,13 @@ class WebhookReceiver:
     rate_limit_per_minute: int = 1000
     max_payload_size: int = 10 * 1024 * 1024  # 10 MB
 
-    # In-memory nonce cache (for MVP, use Redis in production)
-    _nonces: set[str] = field(default_factory=set)
-    _nonce_timestamps: dict[str, float] = field(default_factory=dict)
-
     # Secrets (should come from secrets manager)
     webhook_secrets: dict[str, str] = field(default_factory=dict)  # repo_id -> secret
 
+    def __post_init__(self):
+        if self.nonce_store is None:
+            self.nonce_store = ShardedNonceStore()
+
     # ------------------------------------------------------------------
     # Webhook Reception
     # ------------------------------------------------------------------
@@ -371,31 +376,10 @@ class WebhookReceiver:
 
         Returns True if nonce is new, False if it's a replay.
         """
-        if self.nonce_store:
-            return await self.nonce_store.check_and_store(
-                nonce,
-                self.replay_window_seconds,
-            )
-
-        # In-memory fallback (for MVP)
-        now = time.time()
-
-        # Clean old nonces
-        expired = [
-            n for n, ts in self._nonce_timestamps.items()
-            if now - ts > self.replay_window_seconds
-        ]
-        for n in expired:
-            self._nonces.discard(n)
-            del self._nonce_timestamps[n]
-
-        # Check and store
-        if nonce in self._nonces:
-            return False
-
-        self._nonces.add(nonce)
-        self._nonce_timestamps[nonce] = now
-        return True
+        return await self.nonce_store.check_and_store(
+            nonce,
+            self.replay_window_seconds,
+        )
 
     def _get_delivery_id(self, provider: str, headers: dict[str, str]) -> str | None:
         """Get delivery ID from headers based on provider"""
@@ -431,8 +415,6 @@ class WebhookReceiver:
         body: bytes,
     ) -> WebhookEvent:
         """Parse and normalize webhook payload"""
-        import json
-
         try:
             payload = json.loads(body)
         except json.JSONDecodeError as e:
@@ -633,3 +615,60 @@ class WebhookReceiver:
             event.head_ref = new.get("name")
 
         return event
+
+
+async def benchmark_receive(
+    deliveries: int = 20000,
+    installations: int = 50,
+    path: str | None = None,
+) -> dict[str, Any]:
+    """
+    Measure WebhookReceiver.receive throughput
+
+    Signed GitHub push deliveries with unique delivery IDs go through
+    signature verification, the nonce store and the rate limiter. With
+    path set, both stores persist to that SQLite file.
+    """
+    secret = "benchmark-secret"
+    body = json.dumps({
+        "ref": "refs/heads/main",
+        "before": "0" * 40,
+        "after": "1" * 40,
+        "repository": {"id": 1, "full_name": "acme/api"},
+        "sender": {"id": 2, "login": "octocat"},
+    }).encode()
+    signature = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+    nonce_store = ShardedNonceStore(path=path)
+    rate_limiter = GCRARateLimiter(path=path)
+    receiver = WebhookReceiver(
+        nonce_store=nonce_store,
+        rate_limiter=rate_limiter,
+        rate_limit_per_minute=deliveries,
+    )
+
+    # Keep per-delivery logging out of the measurement
+    previous_level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        start = time.perf_counter()
+        for i in range(deliveries):
+            await receiver.receive("github", {
+                "X-Hub-Signature-256": signature,
+                "X-GitHub-Event": "push",
+                "X-GitHub-Delivery": f"delivery-{i}",
+                "X-GitHub-Hook-Installation-Target-ID": str(i % installations),
+            }, body, secret)
+        elapsed = time.perf_counter() - start
+    finally:
+        logger.setLevel(previous_level)
+        await nonce_store.flush()
+        nonce_store.close()
+        rate_limiter.close()
+
+    return {
+        "deliveries": deliveries,
+        "seconds": elapsed,
+        "deliveries_per_second": deliveries / elapsed,
+        "persistent": path is not None,
+    }
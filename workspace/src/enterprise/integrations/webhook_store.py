@@ -0,0 +1,350 @@
+"""
+Webhook Stores
+
+Bundled NonceStore and RateLimiter backends for a busy WebhookReceiver:
+- Sharded nonce store with TTL expiry by time bucket (no full sweeps)
+- GCRA rate limiter: one timestamp per key, O(1) per check
+- Optional write-behind persistence to a local SQLite file so replay
+  protection and limits survive restarts (entries accepted within the
+  last flush interval are lost on a crash without close())
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class _PersistentMap:
+    """
+    SQLite-backed key -> expiry map with write-behind batching
+
+    Writes are buffered and flushed in one transaction once batch_size
+    entries are pending, or by a timer flush_interval after the first
+    buffered write, so an idle store still persists within flush_interval.
+    close() writes everything still buffered or in flight. Rows whose
+    expiry has passed are ignored on load and removed by delete_expired.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+    ):
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: dict[str, float] = {}
+        self._in_flight: list[dict[str, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_expires ON {table} (expires_at)"
+        )
+        self._conn.commit()
+
+    def load(self, now: float) -> list[tuple[str, float]]:
+        """Unexpired rows"""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT key, expires_at FROM {self.table} WHERE expires_at > ?", (now,)
+            ).fetchall()
+
+    def put(self, key: str, expires_at: float) -> bool:
+        """Buffer a write; returns True when a flush is due"""
+        self._pending[key] = expires_at
+        if len(self._pending) >= self.batch_size:
+            return True
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._flush_later
+            )
+        return False
+
+    async def flush(self) -> int:
+        """Write pending entries off the event loop"""
+        self._cancel_timer()
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        self._in_flight.append(batch)
+        await asyncio.to_thread(self._write, batch)
+        return len(batch)
+
+    async def delete_expired(self, now: float) -> None:
+        await asyncio.to_thread(self._delete_expired, now)
+
+    def close(self) -> None:
+        """Write buffered and in-flight entries, then close the file"""
+        self._cancel_timer()
+        with self._lock:
+            if self._closed:
+                return
+            for batch in [*self._in_flight, self._pending]:
+                self._commit(batch)
+            self._in_flight, self._pending = [], {}
+            self._closed = True
+            self._conn.close()
+
+    def _flush_later(self) -> None:
+        self._timer = None
+        if self._pending and not self._closed:
+            task = asyncio.ensure_future(self.flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task) -> None:
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Webhook store flush to {self.table} failed: {task.exception()}")
+
+    def _cancel_timer(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write(self, batch: dict[str, float]) -> None:
+        with self._lock:
+            # close() already wrote it
+            if self._closed:
+                return
+            self._commit(batch)
+            self._in_flight = [b for b in self._in_flight if b is not batch]
+
+    def _commit(self, batch: dict[str, float]) -> None:
+        if not batch:
+            return
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO {self.table} (key, expires_at) VALUES (?, ?)",
+            batch.items(),
+        )
+        self._conn.commit()
+
+    def _delete_expired(self, now: float) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+
+class ShardedNonceStore:
+    """
+    Sharded Nonce Store
+
+    Implements NonceStore. Nonces are spread over shards by hash, each with
+    its own lock, so the store can be shared between threads. Every nonce is
+    also filed under the time bucket in which it expires; expiry walks only
+    the buckets that have ended, so cleanup cost is proportional to the
+    number of expired nonces rather than the size of the store.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        bucket_seconds: float = 5.0,
+        path: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.bucket_seconds = bucket_seconds
+        self._clock = clock
+        self._shards: list[dict[str, float]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._buckets: dict[int, list[str]] = {}
+        self._bucket_heap: list[int] = []
+        self._buckets_lock = threading.Lock()
+        self._next_expiry = math.inf
+        self.stats = {"accepted": 0, "replays": 0, "expired": 0}
+
+        self._persistence = _PersistentMap(path, "webhook_nonces") if path else None
+        if self._persistence:
+            for nonce, expires_at in self._persistence.load(self._clock()):
+                self._store(nonce, expires_at)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    async def check_and_store(self, nonce: str, ttl_seconds: int = 300) -> bool:
+        """
+        Check if nonce exists, if not store it.
+
+        Returns True if nonce is new (valid), False if replay (duplicate).
+        """
+        now = self._clock()
+        if now >= self._next_expiry:
+            await self.cleanup_expired()
+
+        index = hash(nonce) % len(self._shards)
+        shard = self._shards[index]
+        with self._locks[index]:
+            expires_at = shard.get(nonce)
+            if expires_at is not None and expires_at > now:
+                self.stats["replays"] += 1
+                return False
+            expires_at = now + ttl_seconds
+            shard[nonce] = expires_at
+        self._file(nonce, expires_at)
+        self.stats["accepted"] += 1
+
+        if self._persistence and self._persistence.put(nonce, expires_at):
+            await self._persistence.flush()
+        return True
+
+    async def cleanup_expired(self) -> int:
+        """Clean up expired nonces, return count removed"""
+        now = self._clock()
+        removed = 0
+        with self._buckets_lock:
+            due = []
+            while self._bucket_heap and (self._bucket_heap[0] + 1) * self.bucket_seconds <= now:
+                due.append(self._buckets.pop(heapq.heappop(self._bucket_heap)))
+            self._next_expiry = (
+                (self._bucket_heap[0] + 1) * self.bucket_seconds if self._bucket_heap else math.inf
+            )
+
+        for nonces in due:
+            for nonce in nonces:
+                index = hash(nonce) % len(self._shards)
+                shard = self._shards[index]
+                with self._locks[index]:
+                    # A nonce stored again after expiring lives in a later bucket
+                    expires_at = shard.get(nonce)
+                    if expires_at is not None and expires_at <= now:
+                        del shard[nonce]
+                        removed += 1
+
+        self.stats["expired"] += removed
+        if self._persistence and due:
+            await self._persistence.delete_expired(now)
+        return removed
+
+    async def flush(self) -> None:
+        """Write buffered nonces to the SQLite file"""
+        if self._persistence:
+            await self._persistence.flush()
+
+    def close(self) -> None:
+        """Flush and close the SQLite file"""
+        if self._persistence:
+            self._persistence.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get store statistics"""
+        return {
+            **self.stats,
+            "nonces": len(self),
+            "buckets": len(self._buckets),
+            "persistent": self._persistence is not None,
+        }
+
+    def _store(self, nonce: str, expires_at: float) -> None:
+        self._shards[hash(nonce) % len(self._shards)][nonce] = expires_at
+        self._file(nonce, expires_at)
+
+    def _file(self, nonce: str, expires_at: float) -> None:
+        bucket = int(expires_at // self.bucket_seconds)
+        with self._buckets_lock:
+            nonces = self._buckets.get(bucket)
+            if nonces is None:
+                nonces = self._buckets[bucket] = []
+                heapq.heappush(self._bucket_heap, bucket)
+                self._next_expiry = min(self._next_expiry, (bucket + 1) * self.bucket_seconds)
+            nonces.append(nonce)
+
+
+class GCRARateLimiter:
+    """
+    GCRA Rate Limiter
+
+    Implements RateLimiter with the generic cell rate algorithm: each key
+    stores only its theoretical arrival time (TAT). A key may spend `limit`
+    requests at once and then one every window_seconds / limit seconds,
+    which behaves like a sliding window without per-request timestamps.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        clock: Callable[[], float] = time.time,
+        prune_every: int = 10000,
+    ):
+        self._clock = clock
+        self._tat: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._prune_every = prune_every
+        self._checks = 0
+        self.stats = {"allowed": 0, "limited": 0}
+
+        self._persistence = _PersistentMap(path, "webhook_rate_limits") if path else None
+        if self._persistence:
+            self._tat.update(self._persistence.load(self._clock()))
+
+    async def check_rate_limit(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: int
+    ) -> tuple[bool, int]:
+        """
+        Check rate limit for a key.
+
+        Returns (allowed, remaining_count).
+        """
+        now = self._clock()
+        interval = window_seconds / limit
+
+        with self._lock:
+            tat = max(self._tat.get(key, now), now)
+            new_tat = tat + interval
+            if new_tat - now > window_seconds:
+                self.stats["limited"] += 1
+                return False, 0
+            self._tat[key] = new_tat
+
+            self._checks += 1
+            if self._checks % self._prune_every == 0:
+                # Keys whose TAT has passed are back to a full budget
+                self._tat = {k: v for k, v in self._tat.items() if v > now}
+
+        self.stats["allowed"] += 1
+        remaining = int((window_seconds - (new_tat - now)) / interval + 1e-9)
+
+        if self._persistence and self._persistence.put(key, new_tat):
+            await self._persistence.flush()
+        return True, remaining
+
+    async def flush(self) -> None:
+        """Write buffered state to the SQLite file"""
+        if self._persistence:
+            await self._persistence.flush()
+
+    def close(self) -> None:
+        """Flush and close the SQLite file"""
+        if self._persistence:
+            self._persistence.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get limiter statistics"""
+        return {
+            **self.stats,
+            "keys": len(self._tat),
+            "persistent": self._persistence is not None,
+        }
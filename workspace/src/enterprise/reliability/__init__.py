@@ -4,6 +4,7 @@ Reliability and Operability Module
 Essential for selling "strong gate" with SLA commitment:
 - Degradation Strategy: What happens when gate times out or dependencies fail
 - Disaster Recovery: DB backup, event log retention, replay capability
+  (chunked, deduplicated incremental backups)
 - Versioning: API versions, event schema versions, policy versions
 - Capacity Management: Per-org quotas to prevent cost overrun
 """
@@ -14,6 +15,11 @@ from enterprise.reliability.capacity import (
     CostEstimate,
     UsageForecast,
 )
+from enterprise.reliability.chunked_backup import (
+    BackupManifest,
+    ChunkedBackupEngine,
+    LocalChunkStore,
+)
 from enterprise.reliability.degradation import (
     CircuitBreaker,
     DegradationMode,
@@ -46,6 +52,9 @@ __all__ = [
     "BackupConfig",
     "RecoveryPoint",
     "RecoveryPlan",
+    "ChunkedBackupEngine",
+    "LocalChunkStore",
+    "BackupManifest",
     # Versioning
     "VersionManager",
     "APIVersion",
@@ -0,0 +1,568 @@
+"""
+Chunked, Deduplicating Backups
+
+Incremental backup pipeline used by DisasterRecovery:
+- Content-defined chunking (gear hash, normalized like FastCDC) so an
+  insertion only changes the chunks around it
+- Chunks are addressed by SHA-256 and stored once across all backups
+- Chunking, hashing and compression run in a process pool
+- Restores stream chunks back in parallel, in order, with bounded memory
+- Mark-and-sweep garbage collection of chunks no manifest references,
+  serialized against in-flight backups
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import zlib
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Protocol
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+_MASK64 = (1 << 64) - 1
+
+# Deterministic gear table; changing it changes every chunk boundary
+_GEAR = [
+    int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], "big")
+    for i in range(256)
+]
+
+
+def find_chunk_boundaries(
+    data: bytes,
+    min_size: int,
+    avg_size: int,
+    max_size: int,
+) -> list[int]:
+    """
+    Content-defined chunk boundaries (end offsets) for data
+
+    Uses a gear rolling hash tested on its high bits; a stricter mask is
+    used before avg_size and a looser one after, which narrows the chunk
+    size distribution around avg_size.
+    """
+    bits = max(avg_size.bit_length() - 1, 2)
+    mask_strict = ((1 << (bits + 1)) - 1) << (64 - bits - 1)
+    mask_loose = ((1 << (bits - 1)) - 1) << (64 - bits + 1)
+    gear = _GEAR
+
+    boundaries = []
+    start = 0
+    length = len(data)
+
+    while start < length:
+        remaining = length - start
+        if remaining <= min_size:
+            boundaries.append(length)
+            break
+
+        end = start + min(remaining, max_size)
+        normal = start + min(remaining, avg_size)
+        pos = start + min_size
+        h = 0
+        cut = end
+
+        while pos < normal:
+            h = ((h << 1) + gear[data[pos]]) & _MASK64
+            pos += 1
+            if not h & mask_strict:
+                cut = pos
+                break
+        else:
+            while pos < end:
+                h = ((h << 1) + gear[data[pos]]) & _MASK64
+                pos += 1
+                if not h & mask_loose:
+                    cut = pos
+                    break
+
+        boundaries.append(cut)
+        start = cut
+
+    return boundaries
+
+
+@dataclass
+class ChunkRef:
+    """Reference to one stored chunk"""
+    digest: str
+    size: int
+    stored_size: int = 0
+
+    def to_list(self) -> list[Any]:
+        return [self.digest, self.size, self.stored_size]
+
+    @classmethod
+    def from_list(cls, data: list[Any]) -> "ChunkRef":
+        return cls(digest=data[0], size=data[1], stored_size=data[2])
+
+
+@dataclass
+class BackupManifest:
+    """
+    Manifest of a chunked backup
+
+    Lists, per stream (e.g. "database", "events"), the ordered chunks
+    that reassemble it.
+    """
+    backup_id: UUID
+    parent_backup_id: UUID | None = None
+    streams: dict[str, list[ChunkRef]] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    # Bytes referenced by this backup
+    logical_bytes: int = 0
+    # Bytes newly written to the chunk store by this backup
+    stored_bytes: int = 0
+
+    @property
+    def checksum(self) -> str:
+        """Digest over every stream's chunk list"""
+        h = hashlib.sha256()
+        for name in sorted(self.streams):
+            h.update(name.encode("utf-8"))
+            for ref in self.streams[name]:
+                h.update(bytes.fromhex(ref.digest))
+        return h.hexdigest()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "backup_id": str(self.backup_id),
+            "parent_backup_id": str(self.parent_backup_id) if self.parent_backup_id else None,
+            "streams": {
+                name: [ref.to_list() for ref in refs]
+                for name, refs in self.streams.items()
+            },
+            "created_at": self.created_at.isoformat(),
+            "logical_bytes": self.logical_bytes,
+            "stored_bytes": self.stored_bytes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BackupManifest":
+        return cls(
+            backup_id=UUID(data["backup_id"]),
+            parent_backup_id=UUID(data["parent_backup_id"]) if data.get("parent_backup_id") else None,
+            streams={
+                name: [ChunkRef.from_list(ref) for ref in refs]
+                for name, refs in data.get("streams", {}).items()
+            },
+            created_at=datetime.fromisoformat(data["created_at"]),
+            logical_bytes=data.get("logical_bytes", 0),
+            stored_bytes=data.get("stored_bytes", 0),
+        )
+
+
+class ChunkStore(Protocol):
+    """
+    Content-addressed chunk storage
+
+    Methods are synchronous and the store must be picklable: worker
+    processes write chunks directly.
+    """
+
+    def has_chunk(self, digest: str) -> bool:
+        ...
+
+    def put_chunk(self, digest: str, data: bytes) -> None:
+        """Store compressed chunk bytes (idempotent)"""
+        ...
+
+    def get_chunk(self, digest: str) -> bytes:
+        """Return compressed chunk bytes"""
+        ...
+
+    def delete_chunk(self, digest: str) -> None:
+        ...
+
+    def list_chunks(self) -> list[str]:
+        ...
+
+    def save_manifest(self, manifest: BackupManifest) -> str:
+        """Persist a manifest, return its location"""
+        ...
+
+    def load_manifest(self, backup_id: UUID) -> BackupManifest | None:
+        ...
+
+    def delete_manifest(self, backup_id: UUID) -> None:
+        ...
+
+    def list_manifests(self) -> list[UUID]:
+        ...
+
+
+@dataclass
+class LocalChunkStore:
+    """
+    Chunk store on a local directory
+
+    Layout:
+        chunks/ab/abcdef...   zlib-compressed chunk
+        manifests/<id>.json   backup manifests
+    """
+
+    root: str
+
+    def __post_init__(self):
+        Path(self.root, "chunks").mkdir(parents=True, exist_ok=True)
+        Path(self.root, "manifests").mkdir(parents=True, exist_ok=True)
+
+    def _chunk_path(self, digest: str) -> Path:
+        return Path(self.root, "chunks", digest[:2], digest)
+
+    def _manifest_path(self, backup_id: UUID) -> Path:
+        return Path(self.root, "manifests", f"{backup_id}.json")
+
+    def has_chunk(self, digest: str) -> bool:
+        return self._chunk_path(digest).exists()
+
+    def put_chunk(self, digest: str, data: bytes) -> None:
+        path = self._chunk_path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        _atomic_write(path, data)
+
+    def get_chunk(self, digest: str) -> bytes:
+        return self._chunk_path(digest).read_bytes()
+
+    def delete_chunk(self, digest: str) -> None:
+        self._chunk_path(digest).unlink(missing_ok=True)
+
+    def list_chunks(self) -> list[str]:
+        return [p.name for p in Path(self.root, "chunks").glob("*/*") if not p.name.endswith(".tmp")]
+
+    def save_manifest(self, manifest: BackupManifest) -> str:
+        path = self._manifest_path(manifest.backup_id)
+        _atomic_write(path, json.dumps(manifest.to_dict()).encode("utf-8"))
+        return str(path)
+
+    def load_manifest(self, backup_id: UUID) -> BackupManifest | None:
+        path = self._manifest_path(backup_id)
+        if not path.exists():
+            return None
+        return BackupManifest.from_dict(json.loads(path.read_text()))
+
+    def delete_manifest(self, backup_id: UUID) -> None:
+        self._manifest_path(backup_id).unlink(missing_ok=True)
+
+    def list_manifests(self) -> list[UUID]:
+        return [UUID(p.stem) for p in Path(self.root, "manifests").glob("*.json")]
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _process_block(
+    store: ChunkStore,
+    data: bytes,
+    min_size: int,
+    avg_size: int,
+    max_size: int,
+    compression_level: int,
+) -> list[tuple[str, int, int]]:
+    """
+    Worker: chunk, hash, compress and store one block
+
+    Returns (digest, size, stored_size) per chunk; stored_size is 0 for
+    chunks that were already present.
+    """
+    refs = []
+    view = memoryview(data)
+    start = 0
+    for end in find_chunk_boundaries(data, min_size, avg_size, max_size):
+        chunk = view[start:end]
+        digest = hashlib.sha256(chunk).hexdigest()
+        stored = 0
+        if not store.has_chunk(digest):
+            compressed = zlib.compress(chunk, compression_level)
+            store.put_chunk(digest, compressed)
+            stored = len(compressed)
+        refs.append((digest, end - start, stored))
+        start = end
+    return refs
+
+
+def _load_chunk(store: ChunkStore, digest: str) -> bytes:
+    """Worker: fetch, decompress and verify one chunk"""
+    data = zlib.decompress(store.get_chunk(digest))
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f"Chunk {digest} is corrupt")
+    return data
+
+
+@dataclass
+class ChunkedBackupEngine:
+    """
+    Chunked Backup Engine
+
+    Turns files into deduplicated chunk lists and back. Input is read in
+    blocks of block_size; each block is chunked independently in a worker
+    process, so chunking parallelizes while still deduplicating everything
+    but the chunks straddling block edges.
+    """
+
+    store: ChunkStore
+
+    # Chunk sizes
+    min_chunk_size: int = 16 * 1024
+    avg_chunk_size: int = 64 * 1024
+    max_chunk_size: int = 256 * 1024
+
+    # Parallelism
+    block_size: int = 8 * 1024 * 1024
+    max_workers: int | None = None
+    max_in_flight: int = 8
+
+    compression_level: int = 6
+
+    # Injected executor (tests / shared pools); a process pool is created otherwise
+    executor: Executor | None = None
+
+    # Backups share the gate, garbage collection holds it exclusively
+    _gate: asyncio.Condition = field(default_factory=asyncio.Condition, init=False, repr=False)
+    _active_backups: int = field(default=0, init=False, repr=False)
+    _collecting: bool = field(default=False, init=False, repr=False)
+
+    # ------------------------------------------------------------------
+    # Backup
+    # ------------------------------------------------------------------
+
+    async def backup(
+        self,
+        backup_id: UUID,
+        sources: dict[str, str],
+        parent_backup_id: UUID | None = None,
+    ) -> BackupManifest:
+        """
+        Back up files into the chunk store
+
+        Args:
+            backup_id: ID of the backup record
+            sources: Stream name -> local file path
+            parent_backup_id: Previous backup in the chain (informational;
+                dedup is global across all backups)
+
+        Returns:
+            Saved manifest
+        """
+        manifest = BackupManifest(backup_id=backup_id, parent_backup_id=parent_backup_id)
+
+        # Chunks skipped via has_chunk are only referenced once the manifest
+        # is saved; hold off garbage collection until then
+        async with self._gate:
+            await self._gate.wait_for(lambda: not self._collecting)
+            self._active_backups += 1
+        try:
+            with self._executor() as executor:
+                for name, path in sources.items():
+                    refs = await self._backup_file(executor, path)
+                    manifest.streams[name] = refs
+                    manifest.logical_bytes += sum(r.size for r in refs)
+                    manifest.stored_bytes += sum(r.stored_size for r in refs)
+
+            await asyncio.to_thread(self.store.save_manifest, manifest)
+        finally:
+            async with self._gate:
+                self._active_backups -= 1
+                self._gate.notify_all()
+
+        logger.info(
+            f"Chunked backup {backup_id}: logical={manifest.logical_bytes} "
+            f"stored={manifest.stored_bytes} bytes"
+        )
+
+        return manifest
+
+    async def _backup_file(self, executor: Executor, path: str) -> list[ChunkRef]:
+        loop = asyncio.get_running_loop()
+        in_flight: deque[asyncio.Future] = deque()
+        refs: list[ChunkRef] = []
+
+        def collect(future_refs: list[tuple[str, int, int]]) -> None:
+            refs.extend(ChunkRef(d, s, st) for d, s, st in future_refs)
+
+        with open(path, "rb") as f:
+            while True:
+                block = await asyncio.to_thread(f.read, self.block_size)
+                if not block:
+                    break
+                in_flight.append(loop.run_in_executor(
+                    executor,
+                    _process_block,
+                    self.store,
+                    block,
+                    self.min_chunk_size,
+                    self.avg_chunk_size,
+                    self.max_chunk_size,
+                    self.compression_level,
+                ))
+                # Results are collected in submission order
+                if len(in_flight) >= self.max_in_flight:
+                    collect(await in_flight.popleft())
+
+        while in_flight:
+            collect(await in_flight.popleft())
+
+        return refs
+
+    # ------------------------------------------------------------------
+    # Restore
+    # ------------------------------------------------------------------
+
+    async def restore(
+        self,
+        backup_id: UUID,
+        destination_dir: str,
+    ) -> dict[str, str]:
+        """
+        Restore every stream of a backup into destination_dir
+
+        Returns:
+            Stream name -> restored file path
+        """
+        manifest = await asyncio.to_thread(self.store.load_manifest, backup_id)
+        if manifest is None:
+            raise ValueError(f"Backup manifest not found: {backup_id}")
+
+        Path(destination_dir).mkdir(parents=True, exist_ok=True)
+        paths = {}
+
+        with self._executor() as executor:
+            for name, refs in manifest.streams.items():
+                path = str(Path(destination_dir, name))
+                await self._restore_file(executor, refs, path)
+                paths[name] = path
+
+        return paths
+
+    async def _restore_file(
+        self,
+        executor: Executor,
+        refs: list[ChunkRef],
+        path: str,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        in_flight: deque[asyncio.Future] = deque()
+
+        with open(path, "wb") as f:
+            for ref in refs:
+                in_flight.append(loop.run_in_executor(executor, _load_chunk, self.store, ref.digest))
+                if len(in_flight) >= self.max_in_flight * 4:
+                    await asyncio.to_thread(f.write, await in_flight.popleft())
+            while in_flight:
+                await asyncio.to_thread(f.write, await in_flight.popleft())
+
+    # ------------------------------------------------------------------
+    # Verification / GC
+    # ------------------------------------------------------------------
+
+    async def verify(
+        self,
+        backup_id: UUID,
+        streams: Iterable[str] = (),
+    ) -> bool:
+        """
+        Check every chunk referenced by a backup is present
+
+        Args:
+            backup_id: ID of the backup record
+            streams: Stream names the manifest must contain
+        """
+        manifest = await asyncio.to_thread(self.store.load_manifest, backup_id)
+        if manifest is None:
+            return False
+        missing = set(streams) - set(manifest.streams)
+        if missing:
+            logger.warning(f"Backup {backup_id} manifest lacks streams: {sorted(missing)}")
+            return False
+
+        def check() -> bool:
+            return all(
+                self.store.has_chunk(ref.digest)
+                for refs in manifest.streams.values()
+                for ref in refs
+            )
+
+        return await asyncio.to_thread(check)
+
+    async def delete_backup(self, backup_id: UUID) -> None:
+        """Delete a backup's manifest (chunks are reclaimed by collect_garbage)"""
+        await asyncio.to_thread(self.store.delete_manifest, backup_id)
+
+    async def collect_garbage(self) -> int:
+        """
+        Delete chunks referenced by no manifest
+
+        Waits for in-progress backups on this engine to save their manifests
+        and blocks new ones until the sweep is done. Backups running through
+        another engine on the same store are not covered.
+
+        Returns:
+            Number of chunks deleted
+        """
+        def sweep() -> int:
+            live = set()
+            for backup_id in self.store.list_manifests():
+                manifest = self.store.load_manifest(backup_id)
+                if manifest:
+                    live.update(ref.digest for refs in manifest.streams.values() for ref in refs)
+
+            deleted = 0
+            for digest in self.store.list_chunks():
+                if digest not in live:
+                    self.store.delete_chunk(digest)
+                    deleted += 1
+            return deleted
+
+        async with self._gate:
+            await self._gate.wait_for(lambda: not self._collecting and not self._active_backups)
+            self._collecting = True
+        try:
+            deleted = await asyncio.to_thread(sweep)
+        finally:
+            async with self._gate:
+                self._collecting = False
+                self._gate.notify_all()
+
+        logger.info(f"Chunk GC: {deleted} unreferenced chunks deleted")
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _executor(self) -> Executor:
+        if self.executor is not None:
+            return _Borrowed(self.executor)
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+
+class _Borrowed:
+    """Context manager that does not shut down an injected executor"""
+
+    def __init__(self, executor: Executor):
+        self.executor = executor
+
+    def __enter__(self) -> Executor:
+        return self.executor
+
+    def __exit__(self, *exc) -> None:
+        return None
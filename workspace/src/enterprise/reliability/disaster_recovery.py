@@ -6,15 +6,22 @@ Ensures business continuity:
 - Event log retention and replay
 - Point-in-time recovery capability
 - Recovery Time Objective (RTO) and Recovery Point Objective (RPO)
+- Chunked, deduplicated incremental backups (see chunked_backup)
 """
 
+import asyncio
 import logging
+import shutil
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Protocol
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
 from uuid import UUID, uuid4
 
+if TYPE_CHECKING:
+    from enterprise.reliability.chunked_backup import ChunkedBackupEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,6 +77,9 @@ class BackupConfig:
     backup_bucket: str = "mno-backups"
     backup_region: str = "us-east-1"
 
+    # Local scratch space for chunked backups (exports land here before chunking)
+    staging_dir: str = "/var/tmp/mno-backup-staging"
+
     # Encryption
     encrypt_backups: bool = True
     encryption_key_id: str = ""
@@ -100,6 +110,10 @@ class BackupRecord:
     storage_location: str = ""
     size_bytes: int = 0
 
+    # Chunked backups: data lives in the chunk store, described by a manifest
+    chunked: bool = False
+    stored_bytes: int = 0   # New bytes written after deduplication
+
     # Timing
     started_at: datetime | None = None
     completed_at: datetime | None = None
@@ -258,6 +272,9 @@ class DisasterRecovery:
     db_backup_service: DatabaseBackupService | None = None
     event_log_service: EventLogBackupService | None = None
 
+    # Chunked backup engine; when set, backups are chunked and deduplicated
+    chunked_backup: "ChunkedBackupEngine | None" = None
+
     # Recovery plans
     recovery_plans: dict[str, RecoveryPlan] = field(default_factory=dict)
 
@@ -310,38 +327,14 @@ class DisasterRecovery:
             )
 
         try:
-            # Create storage location
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            record.storage_location = (
-                f"s3://{self.config.backup_bucket}/backups/"
-                f"{backup_type.value}/{timestamp}"
-            )
-
-            total_size = 0
-
-            # Backup database
-            if include_database and self.db_backup_service:
-                db_result = await self.db_backup_service.create_backup(
-                    backup_type,
-                    f"{record.storage_location}/database",
+            if self.chunked_backup:
+                total_size = await self._create_chunked_backup(
+                    record, include_database, include_events
                 )
-                total_size += db_result.get("size_bytes", 0)
-
-            # Backup event log
-            if include_events and self.event_log_service:
-                end_time = datetime.utcnow()
-                if backup_type == BackupType.INCREMENTAL and record.parent_backup_id:
-                    parent = await self.backup_storage.get_backup(record.parent_backup_id)
-                    start_time = parent.completed_at if parent else end_time - timedelta(hours=1)
-                else:
-                    start_time = end_time - timedelta(days=30)
-
-                event_result = await self.event_log_service.export_events(
-                    start_time,
-                    end_time,
-                    f"{record.storage_location}/events",
+            else:
+                total_size = await self._create_direct_backup(
+                    record, include_database, include_events
                 )
-                total_size += event_result.get("size_bytes", 0)
 
             record.size_bytes = total_size
             record.status = BackupStatus.COMPLETED
@@ -374,6 +367,99 @@ class DisasterRecovery:
 
         return record
 
+    async def _create_direct_backup(
+        self,
+        record: BackupRecord,
+        include_database: bool,
+        include_events: bool,
+        location: str | None = None,
+    ) -> int:
+        """Have the backup services write straight to the backup location"""
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        record.storage_location = location or (
+            f"s3://{self.config.backup_bucket}/backups/"
+            f"{record.backup_type.value}/{timestamp}"
+        )
+
+        total_size = 0
+
+        # Backup database
+        if include_database and self.db_backup_service:
+            db_result = await self.db_backup_service.create_backup(
+                record.backup_type,
+                f"{record.storage_location}/database",
+            )
+            total_size += db_result.get("size_bytes", 0)
+
+        # Backup event log
+        if include_events and self.event_log_service:
+            end_time = datetime.utcnow()
+            if record.backup_type == BackupType.INCREMENTAL and record.parent_backup_id:
+                parent = await self.backup_storage.get_backup(record.parent_backup_id)
+                start_time = parent.completed_at if parent else end_time - timedelta(hours=1)
+            else:
+                start_time = end_time - timedelta(days=30)
+
+            event_result = await self.event_log_service.export_events(
+                start_time,
+                end_time,
+                f"{record.storage_location}/events",
+            )
+            total_size += event_result.get("size_bytes", 0)
+
+        return total_size
+
+    async def _create_chunked_backup(
+        self,
+        record: BackupRecord,
+        include_database: bool,
+        include_events: bool,
+    ) -> int:
+        """
+        Export into local staging, then chunk into the chunk store
+
+        Identical bytes across backups are stored once, so even full
+        exports only cost the changed chunks. Every expected export must
+        be present; a missing one fails the backup.
+        """
+        staging = Path(self.config.staging_dir, str(record.id))
+        staging.mkdir(parents=True, exist_ok=True)
+
+        try:
+            await self._create_direct_backup(
+                record, include_database, include_events, location=str(staging)
+            )
+
+            streams = self._expected_streams(record)
+            missing = [name for name in streams if not (staging / name).is_file()]
+            if missing:
+                raise ValueError(f"Backup export missing: {', '.join(missing)}")
+
+            sources = {name: str(staging / name) for name in streams}
+            manifest = await self.chunked_backup.backup(
+                record.id,
+                sources,
+                parent_backup_id=record.parent_backup_id,
+            )
+        finally:
+            await asyncio.to_thread(shutil.rmtree, staging, True)
+
+        record.chunked = True
+        record.storage_location = f"chunks://{record.id}"
+        record.checksum = manifest.checksum
+        record.stored_bytes = manifest.stored_bytes
+
+        return manifest.logical_bytes
+
+    def _expected_streams(self, record: BackupRecord) -> list[str]:
+        """Streams a backup of this record must contain"""
+        streams = []
+        if record.database_included and self.db_backup_service:
+            streams.append("database")
+        if record.event_log_included and self.event_log_service:
+            streams.append("events")
+        return streams
+
     async def _get_last_backup(
         self,
         backup_type: BackupType,
@@ -392,6 +478,9 @@ class DisasterRecovery:
 
     async def _verify_backup(self, record: BackupRecord) -> bool:
         """Verify a backup is valid"""
+        if record.chunked:
+            return await self.chunked_backup.verify(record.id, self._expected_streams(record))
+
         if record.database_included and self.db_backup_service:
             is_valid = await self.db_backup_service.verify_backup(
                 f"{record.storage_location}/database"
@@ -472,6 +561,9 @@ class DisasterRecovery:
         """
         Restore to a recovery point
 
+        An incremental backup holds only the changes since its parent, so
+        its chain is restored in order, starting from the full backup.
+
         Args:
             recovery_point: Point to restore to
             target_environment: Target environment name
@@ -498,29 +590,19 @@ class DisasterRecovery:
                 if backup.status != BackupStatus.COMPLETED:
                     raise ValueError(f"Required backup not completed: {backup_id}")
 
+            # An incremental holds only its own window; restore its chain
+            chain = await self._backup_chain(recovery_point.required_backups[0])
+
             result["steps_completed"].append("validation")
             result["status"] = RecoveryStatus.RESTORING.value
 
-            # Restore database
-            if recovery_point.database_recoverable and self.db_backup_service:
-                backup = await self.backup_storage.get_backup(
-                    recovery_point.required_backups[0]
-                )
-                await self.db_backup_service.restore_backup(
-                    f"{backup.storage_location}/database",
-                    f"{target_environment}_db",
-                )
-                result["steps_completed"].append("database_restore")
-
-            # Restore events
-            if recovery_point.event_log_recoverable and self.event_log_service:
-                backup = await self.backup_storage.get_backup(
-                    recovery_point.required_backups[0]
-                )
-                await self.event_log_service.import_events(
-                    f"{backup.storage_location}/events"
-                )
-                result["steps_completed"].append("event_log_restore")
+            for backup in chain:
+                if backup.chunked:
+                    await self._restore_chunked(backup, recovery_point, target_environment, result)
+                else:
+                    await self._restore_direct(
+                        backup.storage_location, recovery_point, target_environment, result
+                    )
 
             result["status"] = RecoveryStatus.VERIFYING.value
 
@@ -540,6 +622,68 @@ class DisasterRecovery:
 
         return result
 
+    async def _backup_chain(self, backup_id: UUID) -> list[BackupRecord]:
+        """A backup and its parents, oldest (the full backup) first"""
+        chain: list[BackupRecord] = []
+        next_id: UUID | None = backup_id
+        while next_id is not None:
+            if any(b.id == next_id for b in chain):
+                raise ValueError(f"Backup chain loops at: {next_id}")
+            backup = await self.backup_storage.get_backup(next_id)
+            if not backup:
+                raise ValueError(f"Required backup not found: {next_id}")
+            if backup.status != BackupStatus.COMPLETED:
+                raise ValueError(f"Required backup not completed: {next_id}")
+            chain.append(backup)
+            next_id = (
+                backup.parent_backup_id
+                if backup.backup_type == BackupType.INCREMENTAL
+                else None
+            )
+        return chain[::-1]
+
+    async def _restore_direct(
+        self,
+        location: str,
+        recovery_point: RecoveryPoint,
+        target_environment: str,
+        result: dict[str, Any],
+    ) -> None:
+        """Restore from a backup location through the backup services"""
+        # Restore database
+        if recovery_point.database_recoverable and self.db_backup_service:
+            await self.db_backup_service.restore_backup(
+                f"{location}/database",
+                f"{target_environment}_db",
+            )
+            result["steps_completed"].append("database_restore")
+
+        # Restore events
+        if recovery_point.event_log_recoverable and self.event_log_service:
+            await self.event_log_service.import_events(
+                f"{location}/events"
+            )
+            result["steps_completed"].append("event_log_restore")
+
+    async def _restore_chunked(
+        self,
+        backup: BackupRecord,
+        recovery_point: RecoveryPoint,
+        target_environment: str,
+        result: dict[str, Any],
+    ) -> None:
+        """Reassemble chunks into local staging, then restore from there"""
+        if not self.chunked_backup:
+            raise ValueError(f"Backup {backup.id} is chunked but no chunk engine is configured")
+
+        staging = Path(self.config.staging_dir, f"restore-{backup.id}")
+        try:
+            await self.chunked_backup.restore(backup.id, str(staging))
+            result["steps_completed"].append("chunk_restore")
+            await self._restore_direct(str(staging), recovery_point, target_environment, result)
+        finally:
+            await asyncio.to_thread(shutil.rmtree, staging, True)
+
     # ------------------------------------------------------------------
     # Cleanup
     # ------------------------------------------------------------------
@@ -568,8 +712,14 @@ class DisasterRecovery:
             if backup.expires_at and backup.expires_at < now:
                 if not dry_run:
                     await self.backup_storage.delete_backup(backup.id)
+                    if backup.chunked and self.chunked_backup:
+                        await self.chunked_backup.delete_backup(backup.id)
                 count += 1
 
+        # Reclaim chunks no remaining backup references
+        if count and not dry_run and self.chunked_backup:
+            await self.chunked_backup.collect_garbage()
+
         logger.info(f"Backup cleanup: {count} expired (dry_run={dry_run})")
 
         return count
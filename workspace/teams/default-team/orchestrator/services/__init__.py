@@ -1,7 +1,7 @@
 """SuperAgent Services Package."""
 
 from .audit_trail import AuditTrail, AuditEntry, AuditAction
-from .event_store import EventStore, StoredEvent
+from .event_store import AggregateSnapshot, EventStore, GroupCommitWriter, StoredEvent
 from .state_machine import IncidentStateMachine
 from .consensus import ConsensusManager
 from .agent_client import AgentClient, AgentRegistry
@@ -12,6 +12,8 @@ __all__ = [
     "AuditAction",
     "EventStore",
     "StoredEvent",
+    "AggregateSnapshot",
+    "GroupCommitWriter",
     "IncidentStateMachine",
     "ConsensusManager",
     "AgentClient",
@@ -7,17 +7,29 @@ Provides persistent storage for events with:
 - Event sourcing support
 - Snapshot capabilities
 - Query and replay
+
+SQLite writes go through a background writer thread that batches
+concurrent appends into group commits, so the event loop never blocks
+on fsync.
 """
 
 import json
+import logging
+import queue
 import sqlite3
 import asyncio
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from pydantic import BaseModel, Field
 import uuid
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+SnapshotReducer = Callable[[Dict[str, Any], "StoredEvent"], Dict[str, Any]]
+
 
 class StoredEvent(BaseModel):
     """Event stored in the event store."""
@@ -53,6 +65,129 @@ class StoredEvent(BaseModel):
         }
 
 
+class AggregateSnapshot(BaseModel):
+    """Materialized aggregate state as of a sequence number."""
+
+    aggregate_type: str = Field(..., description="Aggregate type")
+    aggregate_id: str = Field(..., description="Aggregate ID")
+    sequence_number: int = Field(..., description="Last event folded into the state")
+    state: Dict[str, Any] = Field(default_factory=dict, description="Aggregate state")
+    created_at: str = Field(
+        default_factory=lambda: datetime.now().isoformat(),
+        description="Snapshot timestamp"
+    )
+
+
+class GroupCommitWriter:
+    """
+    Background SQLite writer with group commit.
+
+    Statements submitted from the event loop are queued to a dedicated
+    thread which owns its own connection. The thread drains everything
+    that is queued (up to ``batch_size``), waits at most ``flush_interval``
+    seconds for more, then writes the whole batch in one transaction.
+    Each statement runs under its own savepoint, so a failing statement
+    fails only its submitter. Each submitter's future resolves once the
+    transaction is durably committed (``synchronous=FULL``), or fails
+    with the commit error.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.002,
+    ):
+        self._db_path = db_path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple, asyncio.Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.commits = 0
+        self.statements = 0
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="event-store-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, sql: str, params: tuple) -> asyncio.Future:
+        """Queue a statement; the returned future resolves after commit."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put((sql, params, future))
+        return future
+
+    def stop(self) -> None:
+        """Flush queued statements and stop the writer thread."""
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        # Autocommit mode: transactions and savepoints are managed explicitly
+        connection = sqlite3.connect(self._db_path, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # NORMAL in WAL mode can lose the last commits on power failure
+        connection.execute("PRAGMA synchronous=FULL")
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self._flush_interval
+                while len(batch) < self._batch_size:
+                    try:
+                        timeout = deadline - time.monotonic()
+                        item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit(connection, batch)
+        finally:
+            connection.close()
+
+    def _commit(self, connection: sqlite3.Connection, batch: list) -> None:
+        results: List[Optional[BaseException]] = [None] * len(batch)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            for index, (sql, params, _) in enumerate(batch):
+                connection.execute("SAVEPOINT entry")
+                try:
+                    connection.execute(sql, params)
+                except sqlite3.Error as e:
+                    connection.execute("ROLLBACK TO entry")
+                    results[index] = e
+                connection.execute("RELEASE entry")
+            connection.execute("COMMIT")
+        except sqlite3.Error as e:
+            # Nothing from this batch is committed; fail every waiter
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            results = [e] * len(batch)
+
+        self.commits += 1
+        self.statements += len(batch)
+        for (_, _, future), error in zip(batch, results):
+            future.get_loop().call_soon_threadsafe(self._resolve, future, error)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, error: Optional[BaseException]) -> None:
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+
 class EventStore:
     """
     Event store with support for memory and SQLite backends.
@@ -64,27 +199,58 @@ class EventStore:
     - Snapshot creation
     """
 
+    _INSERT_EVENT = """
+        INSERT INTO events (
+            event_id, event_type, aggregate_type, aggregate_id,
+            sequence_number, timestamp, trace_id, data, metadata
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    _UPSERT_SNAPSHOT = """
+        INSERT OR REPLACE INTO snapshots (
+            aggregate_type, aggregate_id, sequence_number, state, created_at
+        ) VALUES (?, ?, ?, ?, ?)
+    """
+
     def __init__(
         self,
         store_type: str = "memory",
         db_path: Optional[str] = None,
         max_events: int = 100000,
+        snapshot_interval: int = 100,
+        write_batch_size: int = 500,
+        write_flush_interval: float = 0.002,
     ):
         self._store_type = store_type
         self._db_path = db_path
         self._max_events = max_events
+        self._snapshot_interval = snapshot_interval
+        self._write_batch_size = write_batch_size
+        self._write_flush_interval = write_flush_interval
         self._lock = asyncio.Lock()
 
         # In-memory storage
         self._events: List[StoredEvent] = []
-        self._sequence_numbers: Dict[str, int] = {}  # aggregate_id -> last sequence
+        self._sequence_numbers: Dict[str, int] = {}  # aggregate key -> last sequence
 
-        # SQLite connection (lazy init)
+        # Snapshots
+        self._snapshots: Dict[str, AggregateSnapshot] = {}  # memory backend
+        self._snapshot_sequences: Dict[str, int] = {}  # aggregate key -> last snapshot sequence
+        self._reducers: Dict[str, SnapshotReducer] = {}
+        self._snapshot_tasks: Dict[str, asyncio.Task] = {}
+
+        # SQLite read connection (lazy init) and group-commit writer
         self._connection: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+        self._writer: Optional[GroupCommitWriter] = None
 
         # Event handlers
         self._handlers: Dict[str, List[Callable]] = {}
 
+    @property
+    def _uses_sqlite(self) -> bool:
+        return self._store_type == "sqlite" and self._connection is not None
+
     async def initialize(self) -> None:
         """Initialize the event store."""
         if self._store_type == "sqlite" and self._db_path:
@@ -95,40 +261,54 @@ class EventStore:
         path = Path(self._db_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        self._connection = sqlite3.connect(str(path), check_same_thread=False)
-        cursor = self._connection.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS events (
-                event_id TEXT PRIMARY KEY,
-                event_type TEXT NOT NULL,
-                aggregate_type TEXT NOT NULL,
-                aggregate_id TEXT NOT NULL,
-                sequence_number INTEGER NOT NULL,
-                timestamp TEXT NOT NULL,
-                trace_id TEXT,
-                data TEXT NOT NULL,
-                metadata TEXT NOT NULL,
-                UNIQUE(aggregate_id, sequence_number)
-            )
-        """)
-
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_aggregate
-            ON events(aggregate_type, aggregate_id)
-        """)
-
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_timestamp
-            ON events(timestamp)
-        """)
-
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_trace
-            ON events(trace_id)
-        """)
-
-        self._connection.commit()
+        def create() -> sqlite3.Connection:
+            connection = sqlite3.connect(str(path), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS events (
+                    event_id TEXT PRIMARY KEY,
+                    event_type TEXT NOT NULL,
+                    aggregate_type TEXT NOT NULL,
+                    aggregate_id TEXT NOT NULL,
+                    sequence_number INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    trace_id TEXT,
+                    data TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    UNIQUE(aggregate_id, sequence_number)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_aggregate
+                ON events(aggregate_type, aggregate_id);
+
+                CREATE INDEX IF NOT EXISTS idx_aggregate_sequence
+                ON events(aggregate_type, aggregate_id, sequence_number);
+
+                CREATE INDEX IF NOT EXISTS idx_timestamp
+                ON events(timestamp);
+
+                CREATE INDEX IF NOT EXISTS idx_trace
+                ON events(trace_id);
+
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    aggregate_type TEXT NOT NULL,
+                    aggregate_id TEXT NOT NULL,
+                    sequence_number INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (aggregate_type, aggregate_id)
+                );
+            """)
+            connection.commit()
+            return connection
+
+        self._connection = await asyncio.to_thread(create)
+        self._writer = GroupCommitWriter(
+            str(path),
+            batch_size=self._write_batch_size,
+            flush_interval=self._write_flush_interval,
+        )
+        self._writer.start()
 
     async def append(
         self,
@@ -139,10 +319,24 @@ class EventStore:
         trace_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> StoredEvent:
-        """Append an event to the store."""
+        """
+        Append an event to the store.
+
+        With the SQLite backend the call returns once the event is
+        committed; concurrent appends share a single commit.
+        """
+        committed: Optional[asyncio.Future] = None
+
         async with self._lock:
-            # Get next sequence number
+            # Get next sequence number (recovered from storage after restart)
             key = f"{aggregate_type}:{aggregate_id}"
+            if key not in self._sequence_numbers and self._uses_sqlite:
+                self._sequence_numbers[key] = await self._read(
+                    "SELECT COALESCE(MAX(sequence_number), 0) FROM events "
+                    "WHERE aggregate_type = ? AND aggregate_id = ?",
+                    (aggregate_type, aggregate_id),
+                    lambda rows: rows[0][0],
+                )
             sequence = self._sequence_numbers.get(key, 0) + 1
             self._sequence_numbers[key] = sequence
 
@@ -156,32 +350,29 @@ class EventStore:
                 metadata=metadata or {},
             )
 
-            if self._store_type == "sqlite" and self._connection:
-                await self._append_sqlite(event)
+            if self._uses_sqlite:
+                committed = self._append_sqlite(event)
             else:
                 self._events.append(event)
                 # Enforce max events for memory store
                 if len(self._events) > self._max_events:
                     self._events = self._events[-self._max_events:]
 
+        # Wait for the group commit outside the lock so other appends can join it
+        if committed is not None:
+            await committed
+
+        self._maybe_snapshot(key, aggregate_type, aggregate_id, sequence)
+
         # Trigger handlers
         await self._trigger_handlers(event)
 
         return event
 
-    async def _append_sqlite(self, event: StoredEvent) -> None:
-        """Append event to SQLite."""
-        if not self._connection:
-            return
-
-        cursor = self._connection.cursor()
-        cursor.execute(
-            """
-            INSERT INTO events (
-                event_id, event_type, aggregate_type, aggregate_id,
-                sequence_number, timestamp, trace_id, data, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    def _append_sqlite(self, event: StoredEvent) -> asyncio.Future:
+        """Queue an event insert on the group-commit writer."""
+        return self._writer.submit(
+            self._INSERT_EVENT,
             (
                 event.event_id,
                 event.event_type,
@@ -194,7 +385,6 @@ class EventStore:
                 json.dumps(event.metadata),
             ),
         )
-        self._connection.commit()
 
     async def get_events(
         self,
@@ -209,7 +399,7 @@ class EventStore:
         limit: int = 1000,
     ) -> List[StoredEvent]:
         """Query events with filters."""
-        if self._store_type == "sqlite" and self._connection:
+        if self._uses_sqlite:
             return await self._query_sqlite(
                 aggregate_type, aggregate_id, event_type, trace_id,
                 from_sequence, to_sequence, from_timestamp, to_timestamp, limit
@@ -282,37 +472,53 @@ class EventStore:
             query += " AND timestamp <= ?"
             params.append(to_timestamp)
 
-        query += " ORDER BY timestamp ASC LIMIT ?"
+        # A single aggregate is read in sequence order straight off its index
+        if aggregate_type and aggregate_id:
+            query += " ORDER BY sequence_number ASC LIMIT ?"
+        else:
+            query += " ORDER BY timestamp ASC LIMIT ?"
         params.append(limit)
 
-        cursor = self._connection.cursor()
-        cursor.execute(query, params)
-
-        events = []
-        for row in cursor.fetchall():
-            events.append(StoredEvent(
-                event_id=row[0],
-                event_type=row[1],
-                aggregate_type=row[2],
-                aggregate_id=row[3],
-                sequence_number=row[4],
-                timestamp=row[5],
-                trace_id=row[6],
-                data=json.loads(row[7]),
-                metadata=json.loads(row[8]),
-            ))
-
-        return events
+        def to_events(rows: List[tuple]) -> List[StoredEvent]:
+            return [
+                StoredEvent(
+                    event_id=row[0],
+                    event_type=row[1],
+                    aggregate_type=row[2],
+                    aggregate_id=row[3],
+                    sequence_number=row[4],
+                    timestamp=row[5],
+                    trace_id=row[6],
+                    data=json.loads(row[7]),
+                    metadata=json.loads(row[8]),
+                )
+                for row in rows
+            ]
+
+        return await self._read(query, tuple(params), to_events)
 
     async def get_aggregate_events(
         self,
         aggregate_type: str,
         aggregate_id: str,
+        since_snapshot: bool = False,
     ) -> List[StoredEvent]:
-        """Get all events for an aggregate."""
+        """
+        Get all events for an aggregate.
+
+        With ``since_snapshot=True`` only events after the latest snapshot
+        are returned; combine with ``get_snapshot`` to rebuild state.
+        """
+        from_sequence = None
+        if since_snapshot:
+            snapshot = await self.get_snapshot(aggregate_type, aggregate_id)
+            if snapshot:
+                from_sequence = snapshot.sequence_number + 1
+
         return await self.get_events(
             aggregate_type=aggregate_type,
             aggregate_id=aggregate_id,
+            from_sequence=from_sequence,
             limit=10000,
         )
 
@@ -321,13 +527,138 @@ class EventStore:
         aggregate_type: str,
         aggregate_id: str,
         handler: Callable[[StoredEvent], None],
+        on_snapshot: Optional[Callable[[AggregateSnapshot], None]] = None,
     ) -> int:
-        """Replay events for an aggregate through a handler."""
-        events = await self.get_aggregate_events(aggregate_type, aggregate_id)
+        """
+        Replay events for an aggregate through a handler.
+
+        When ``on_snapshot`` is given, the latest snapshot is passed to it
+        first and only the events after it are replayed.
+        """
+        snapshot = None
+        if on_snapshot is not None:
+            snapshot = await self.get_snapshot(aggregate_type, aggregate_id)
+            if snapshot:
+                on_snapshot(snapshot)
+
+        events = await self.get_aggregate_events(
+            aggregate_type, aggregate_id, since_snapshot=snapshot is not None
+        )
         for event in events:
             handler(event)
         return len(events)
 
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def register_snapshot_reducer(self, aggregate_type: str, reducer: SnapshotReducer) -> None:
+        """
+        Enable periodic snapshots for an aggregate type.
+
+        ``reducer(state, event)`` folds one event into the aggregate state.
+        A snapshot is taken in the background every ``snapshot_interval``
+        events per aggregate.
+        """
+        self._reducers[aggregate_type] = reducer
+
+    async def save_snapshot(
+        self,
+        aggregate_type: str,
+        aggregate_id: str,
+        sequence_number: int,
+        state: Dict[str, Any],
+    ) -> AggregateSnapshot:
+        """Store a snapshot of aggregate state as of a sequence number."""
+        snapshot = AggregateSnapshot(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            sequence_number=sequence_number,
+            state=state,
+        )
+        key = f"{aggregate_type}:{aggregate_id}"
+
+        if self._uses_sqlite:
+            await self._writer.submit(
+                self._UPSERT_SNAPSHOT,
+                (
+                    aggregate_type,
+                    aggregate_id,
+                    sequence_number,
+                    json.dumps(state),
+                    snapshot.created_at,
+                ),
+            )
+        else:
+            self._snapshots[key] = snapshot
+
+        self._snapshot_sequences[key] = sequence_number
+        return snapshot
+
+    async def get_snapshot(
+        self,
+        aggregate_type: str,
+        aggregate_id: str,
+    ) -> Optional[AggregateSnapshot]:
+        """Get the latest snapshot for an aggregate."""
+        if not self._uses_sqlite:
+            return self._snapshots.get(f"{aggregate_type}:{aggregate_id}")
+
+        def to_snapshot(rows: List[tuple]) -> Optional[AggregateSnapshot]:
+            if not rows:
+                return None
+            return AggregateSnapshot(
+                aggregate_type=aggregate_type,
+                aggregate_id=aggregate_id,
+                sequence_number=rows[0][0],
+                state=json.loads(rows[0][1]),
+                created_at=rows[0][2],
+            )
+
+        return await self._read(
+            "SELECT sequence_number, state, created_at FROM snapshots "
+            "WHERE aggregate_type = ? AND aggregate_id = ?",
+            (aggregate_type, aggregate_id),
+            to_snapshot,
+        )
+
+    def _maybe_snapshot(
+        self, key: str, aggregate_type: str, aggregate_id: str, sequence: int
+    ) -> None:
+        """Schedule a background snapshot once enough events accumulated."""
+        if aggregate_type not in self._reducers or self._snapshot_interval <= 0:
+            return
+        if key in self._snapshot_tasks:
+            return
+        if sequence - self._snapshot_sequences.get(key, 0) < self._snapshot_interval:
+            return
+
+        task = asyncio.create_task(self._take_snapshot(aggregate_type, aggregate_id))
+        self._snapshot_tasks[key] = task
+        task.add_done_callback(lambda _: self._snapshot_tasks.pop(key, None))
+
+    async def _take_snapshot(self, aggregate_type: str, aggregate_id: str) -> None:
+        try:
+            snapshot = await self.get_snapshot(aggregate_type, aggregate_id)
+            state = dict(snapshot.state) if snapshot else {}
+            sequence = snapshot.sequence_number if snapshot else 0
+
+            reducer = self._reducers[aggregate_type]
+            for event in await self.get_aggregate_events(
+                aggregate_type, aggregate_id, since_snapshot=True
+            ):
+                state = reducer(state, event)
+                sequence = event.sequence_number
+
+            if sequence > (snapshot.sequence_number if snapshot else 0):
+                await self.save_snapshot(aggregate_type, aggregate_id, sequence, state)
+        except Exception as e:
+            logger.warning(f"Snapshot failed for {aggregate_type}:{aggregate_id}: {e}")
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
     def subscribe(self, event_type: str, handler: Callable) -> None:
         """Subscribe to events of a specific type."""
         if event_type not in self._handlers:
@@ -336,8 +667,8 @@ class EventStore:
 
     async def _trigger_handlers(self, event: StoredEvent) -> None:
         """Trigger handlers for an event."""
-        handlers = self._handlers.get(event.event_type, [])
-        handlers.extend(self._handlers.get("*", []))  # Wildcard handlers
+        # Copy so wildcard handlers are not appended to the type's list
+        handlers = self._handlers.get(event.event_type, []) + self._handlers.get("*", [])
 
         for handler in handlers:
             try:
@@ -350,20 +681,24 @@ class EventStore:
 
     async def get_statistics(self) -> Dict[str, Any]:
         """Get event store statistics."""
-        if self._store_type == "sqlite" and self._connection:
-            cursor = self._connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM events")
-            total = cursor.fetchone()[0]
-
-            cursor.execute(
-                "SELECT event_type, COUNT(*) FROM events GROUP BY event_type"
-            )
-            by_type = dict(cursor.fetchall())
-
-            cursor.execute(
-                "SELECT aggregate_type, COUNT(*) FROM events GROUP BY aggregate_type"
-            )
-            by_aggregate = dict(cursor.fetchall())
+        writer: Dict[str, Any] = {}
+        if self._uses_sqlite:
+            def collect() -> Tuple[int, Dict[str, int], Dict[str, int]]:
+                with self._read_lock:
+                    cursor = self._connection.cursor()
+                    cursor.execute("SELECT COUNT(*) FROM events")
+                    total = cursor.fetchone()[0]
+                    cursor.execute(
+                        "SELECT event_type, COUNT(*) FROM events GROUP BY event_type"
+                    )
+                    by_type = dict(cursor.fetchall())
+                    cursor.execute(
+                        "SELECT aggregate_type, COUNT(*) FROM events GROUP BY aggregate_type"
+                    )
+                    return total, by_type, dict(cursor.fetchall())
+
+            total, by_type, by_aggregate = await asyncio.to_thread(collect)
+            writer = {"commits": self._writer.commits, "statements": self._writer.statements}
         else:
             async with self._lock:
                 total = len(self._events)
@@ -379,18 +714,34 @@ class EventStore:
             "events_by_type": by_type,
             "events_by_aggregate": by_aggregate,
             "aggregates_tracked": len(self._sequence_numbers),
+            "snapshots_taken": len(self._snapshot_sequences),
+            "writer": writer,
         }
 
     async def close(self) -> None:
-        """Close the event store."""
+        """Close the event store, flushing pending writes and snapshots."""
+        if self._snapshot_tasks:
+            await asyncio.gather(*self._snapshot_tasks.values(), return_exceptions=True)
+        if self._writer:
+            await asyncio.to_thread(self._writer.stop)
+            self._writer = None
         if self._connection:
-            self._connection.close()
+            with self._read_lock:
+                self._connection.close()
             self._connection = None
 
+    async def _read(self, sql: str, params: tuple, convert: Callable[[List[tuple]], Any]) -> Any:
+        """Run a read query off the event loop."""
+        def run() -> Any:
+            with self._read_lock:
+                rows = self._connection.execute(sql, params).fetchall()
+                return convert(rows)
+
+        return await asyncio.to_thread(run)
+
     def __len__(self) -> int:
         """Return total event count."""
-        if self._store_type == "sqlite" and self._connection:
-            cursor = self._connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM events")
-            return cursor.fetchone()[0]
+        if self._uses_sqlite:
+            with self._read_lock:
+                return self._connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
         return len(self._events)
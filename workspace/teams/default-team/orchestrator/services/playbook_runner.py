@@ -4,7 +4,8 @@ Playbook Runner Service
 
 Executes team playbooks with:
 - Stage orchestration
-- Parallel execution
+- Parallel execution of independent stages (``depends_on`` DAG)
+- Compiled playbook cache invalidated on file change
 - Evidence collection
 - Quality gates
 - Audit logging
@@ -12,11 +13,12 @@ Executes team playbooks with:
 
 import os
 import asyncio
+import heapq
 import yaml
 import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -70,6 +72,88 @@ class PlaybookResult:
     evidence_bundle: Optional[str] = None
 
 
+@dataclass
+class CompiledPlaybook:
+    """Parsed playbook with its resolved stage dependency graph."""
+    name: str
+    definition: Dict[str, Any]
+    stages: List[Dict[str, Any]]
+    # Stages that must finish first (ordering)
+    dependencies: Dict[str, List[str]]
+    dependents: Dict[str, List[str]]
+    # Explicit depends_on stages that must also succeed
+    requirements: Dict[str, List[str]]
+    mtime_ns: int = 0
+    size: int = 0
+
+    @classmethod
+    def compile(
+        cls,
+        name: str,
+        definition: Dict[str, Any],
+        mtime_ns: int = 0,
+        size: int = 0,
+    ) -> "CompiledPlaybook":
+        """
+        Resolve stage dependencies.
+
+        Stages with an explicit ``depends_on`` (even empty) or ``parallel: true``
+        are scheduled purely by their dependencies. Stages with neither keep
+        the legacy behaviour of running after the previous stage in the list;
+        that ordering edge does not require the previous stage to succeed.
+        Unknown dependency ids are ignored; cycles raise ``ValueError``.
+        """
+        stages = definition.get("stages", [])
+        ids = [stage.get("id") for stage in stages]
+        known = set(ids)
+        if len(known) != len(ids):
+            raise ValueError(f"Duplicate stage ids in playbook: {name}")
+
+        dependencies: Dict[str, List[str]] = {}
+        dependents: Dict[str, List[str]] = {stage_id: [] for stage_id in ids}
+        requirements: Dict[str, List[str]] = {}
+        for index, stage in enumerate(stages):
+            stage_id = ids[index]
+            if "depends_on" in stage:
+                deps = [dep for dep in stage.get("depends_on") or [] if dep in known]
+                requirements[stage_id] = list(dict.fromkeys(deps))
+            elif stage.get("parallel") or index == 0:
+                deps = []
+                requirements[stage_id] = []
+            else:
+                deps = [ids[index - 1]]
+                requirements[stage_id] = []
+            dependencies[stage_id] = list(dict.fromkeys(deps))
+            for dep in dependencies[stage_id]:
+                dependents[dep].append(stage_id)
+
+        # Kahn's algorithm to reject cycles up front
+        remaining = {stage_id: len(deps) for stage_id, deps in dependencies.items()}
+        ready = [stage_id for stage_id, count in remaining.items() if count == 0]
+        visited = 0
+        while ready:
+            stage_id = ready.pop()
+            visited += 1
+            for child in dependents[stage_id]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+        if visited != len(ids):
+            cyclic = sorted(stage_id for stage_id, count in remaining.items() if count)
+            raise ValueError(f"Dependency cycle in playbook {name}: {cyclic}")
+
+        return cls(
+            name=name,
+            definition=definition,
+            stages=stages,
+            dependencies=dependencies,
+            dependents=dependents,
+            requirements=requirements,
+            mtime_ns=mtime_ns,
+            size=size,
+        )
+
+
 class PlaybookRunner:
     """Execute playbooks with full lifecycle management."""
 
@@ -77,11 +161,14 @@ class PlaybookRunner:
         self,
         playbooks_dir: str = "teams/default-team/playbooks",
         artifacts_dir: str = "/tmp/playbook-artifacts",
+        max_parallel_stages: int = 4,
     ):
         self._playbooks_dir = Path(playbooks_dir)
         self._artifacts_dir = Path(artifacts_dir)
         self._artifacts_dir.mkdir(parents=True, exist_ok=True)
+        self._max_parallel_stages = max_parallel_stages
         self._action_handlers: Dict[str, Callable] = {}
+        self._compiled: Dict[str, CompiledPlaybook] = {}
         self._register_default_handlers()
 
     def _register_default_handlers(self) -> None:
@@ -103,13 +190,41 @@ class PlaybookRunner:
 
     async def load_playbook(self, name: str) -> Dict[str, Any]:
         """Load a playbook by name."""
+        compiled = await self.compile_playbook(name)
+        return compiled.definition
+
+    async def compile_playbook(self, name: str) -> CompiledPlaybook:
+        """
+        Load and compile a playbook, reusing the cached copy while the
+        file's mtime and size are unchanged.
+        """
         playbook_path = self._playbooks_dir / f"{name}.yaml"
-        
-        if not playbook_path.exists():
-            raise FileNotFoundError(f"Playbook not found: {playbook_path}")
-        
-        with open(playbook_path) as f:
-            return yaml.safe_load(f)
+
+        try:
+            stat = playbook_path.stat()
+        except FileNotFoundError:
+            self._compiled.pop(name, None)
+            raise FileNotFoundError(f"Playbook not found: {playbook_path}") from None
+
+        cached = self._compiled.get(name)
+        if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached
+
+        def parse() -> Dict[str, Any]:
+            with open(playbook_path) as f:
+                return yaml.safe_load(f) or {}
+
+        definition = await asyncio.to_thread(parse)
+        compiled = CompiledPlaybook.compile(name, definition, stat.st_mtime_ns, stat.st_size)
+        self._compiled[name] = compiled
+        return compiled
+
+    def invalidate_cache(self, name: Optional[str] = None) -> None:
+        """Drop one or all compiled playbooks."""
+        if name is None:
+            self._compiled.clear()
+        else:
+            self._compiled.pop(name, None)
 
     async def execute(
         self,
@@ -124,8 +239,9 @@ class PlaybookRunner:
         logger.info(f"Starting playbook: {playbook_name}")
         
         try:
-            playbook = await self.load_playbook(playbook_name)
-        except FileNotFoundError as e:
+            compiled = await self.compile_playbook(playbook_name)
+        except (FileNotFoundError, ValueError) as e:
+            logger.error(f"Cannot load playbook {playbook_name}: {e}")
             return PlaybookResult(
                 playbook_name=playbook_name,
                 version="unknown",
@@ -135,6 +251,7 @@ class PlaybookRunner:
                 completed_at=datetime.utcnow().isoformat(),
             )
 
+        playbook = compiled.definition
         result = PlaybookResult(
             playbook_name=playbook.get("name", playbook_name),
             version=playbook.get("version", "1.0.0"),
@@ -143,44 +260,13 @@ class PlaybookRunner:
             started_at=start_time.isoformat(),
         )
 
-        stages = playbook.get("stages", [])
-        stage_results: Dict[str, StageResult] = {}
-        
-        for stage in stages:
-            stage_id = stage.get("id")
-            stage_name = stage.get("name", stage_id)
-            
-            depends_on = stage.get("depends_on", [])
-            should_skip = False
-            
-            for dep in depends_on:
-                dep_result = stage_results.get(dep)
-                if dep_result and dep_result.status != StageStatus.SUCCESS:
-                    should_skip = True
-                    break
-            
-            condition = stage.get("condition")
-            if condition and not self._evaluate_condition(condition, stage_results, context):
-                should_skip = True
-            
-            if should_skip:
-                stage_result = StageResult(
-                    stage_id=stage_id,
-                    name=stage_name,
-                    status=StageStatus.SKIPPED,
-                )
-                stage_results[stage_id] = stage_result
-                result.stages.append(stage_result)
-                continue
-            
-            stage_result = await self._execute_stage(stage, context, stage_results)
-            stage_results[stage_id] = stage_result
-            result.stages.append(stage_result)
-            
-            if stage_result.status == StageStatus.FAILURE:
-                run_on = stage.get("run_on", "success")
-                if run_on != "always":
-                    break
+        limit = playbook.get("max_parallel_stages", self._max_parallel_stages)
+        stage_results = await self._run_stages(compiled, context, max(1, int(limit)))
+        result.stages = [
+            stage_results[stage.get("id")]
+            for stage in compiled.stages
+            if stage.get("id") in stage_results
+        ]
 
         end_time = datetime.utcnow()
         result.completed_at = end_time.isoformat()
@@ -203,6 +289,100 @@ class PlaybookRunner:
         
         return result
 
+    async def _run_stages(
+        self,
+        compiled: CompiledPlaybook,
+        context: Dict[str, Any],
+        max_parallel: int,
+    ) -> Dict[str, StageResult]:
+        """
+        Run stages as a DAG with at most ``max_parallel`` running at once.
+
+        A stage becomes ready once all its dependencies have finished. It is
+        skipped when its condition is false or, unless it is marked
+        ``run_on: always``, when an explicit ``depends_on`` stage did not
+        succeed. After a failing stage that is not ``run_on: always``, stages
+        that have not started are cancelled (``run_on: always`` stages still
+        run). A failed ``run_on: always`` stage does not stop the stages
+        listed after it.
+        """
+        stages = {stage.get("id"): stage for stage in compiled.stages}
+        position = {stage_id: index for index, stage_id in enumerate(stages)}
+        waiting = {stage_id: len(deps) for stage_id, deps in compiled.dependencies.items()}
+        stage_results: Dict[str, StageResult] = {}
+
+        ready: List[Tuple[int, str]] = [
+            (position[stage_id], stage_id) for stage_id, count in waiting.items() if count == 0
+        ]
+        heapq.heapify(ready)
+        running: Dict[asyncio.Task, str] = {}
+        halted = False
+
+        def finish(stage_id: str, stage_result: StageResult) -> None:
+            nonlocal halted
+            stage_results[stage_id] = stage_result
+            if (
+                stage_result.status == StageStatus.FAILURE
+                and stages[stage_id].get("run_on", "success") != "always"
+            ):
+                halted = True
+            for child in compiled.dependents[stage_id]:
+                waiting[child] -= 1
+                if waiting[child] == 0:
+                    heapq.heappush(ready, (position[child], child))
+
+        try:
+            while ready or running:
+                while ready and len(running) < max_parallel:
+                    _, stage_id = heapq.heappop(ready)
+                    stage = stages[stage_id]
+                    status = self._resolve_stage_status(
+                        stage, compiled.requirements[stage_id], stage_results, context, halted
+                    )
+                    if status is not None:
+                        finish(stage_id, StageResult(
+                            stage_id=stage_id,
+                            name=stage.get("name", stage_id),
+                            status=status,
+                        ))
+                        continue
+                    task = asyncio.create_task(
+                        self._execute_stage(stage, context, stage_results)
+                    )
+                    running[task] = stage_id
+
+                if not running:
+                    continue
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: position[running[t]]):
+                    finish(running.pop(task), task.result())
+        finally:
+            # Do not leave stages running if the playbook itself is cancelled
+            for task in running:
+                task.cancel()
+
+        return stage_results
+
+    def _resolve_stage_status(
+        self,
+        stage: Dict[str, Any],
+        requirements: List[str],
+        stage_results: Dict[str, StageResult],
+        context: Dict[str, Any],
+        halted: bool,
+    ) -> Optional[StageStatus]:
+        """Return SKIPPED/CANCELLED for a ready stage that must not run, else None."""
+        if stage.get("run_on", "success") != "always":
+            if halted:
+                return StageStatus.CANCELLED
+            if any(stage_results[dep].status != StageStatus.SUCCESS for dep in requirements):
+                return StageStatus.SKIPPED
+        condition = stage.get("condition")
+        if condition and not self._evaluate_condition(condition, stage_results, context):
+            return StageStatus.SKIPPED
+        return None
+
     async def _execute_stage(
         self,
         stage: Dict[str, Any],
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the EventStore SQLite backend.
+
+Tests cover:
+- Group commit of concurrent appends
+- Sequence recovery after reopening the store
+- Periodic aggregate snapshots and replay from a snapshot
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.event_store import EventStore, StoredEvent
+
+
+def count_reducer(state, event: StoredEvent):
+    """Fold an event into a running total."""
+    return {"total": state.get("total", 0) + event.data["amount"]}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "events.db")
+
+
+async def open_store(db_path, **kwargs) -> EventStore:
+    store = EventStore(store_type="sqlite", db_path=db_path, **kwargs)
+    await store.initialize()
+    return store
+
+
+class TestGroupCommit:
+    """Tests for batched SQLite writes."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_share_commits(self, db_path):
+        store = await open_store(db_path, write_flush_interval=0.01)
+
+        events = await asyncio.gather(*(
+            store.append("order.updated", "order", f"o-{i % 5}", {"amount": i})
+            for i in range(200)
+        ))
+        stats = await store.get_statistics()
+        await store.close()
+
+        assert stats["total_events"] == 200
+        assert stats["writer"]["statements"] == 200
+        assert stats["writer"]["commits"] < 20
+        by_aggregate = {}
+        for event in events:
+            by_aggregate.setdefault(event.aggregate_id, []).append(event.sequence_number)
+        assert all(sorted(seq) == list(range(1, 41)) for seq in by_aggregate.values())
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_does_not_fail_batch(self, db_path):
+        store = await open_store(db_path)
+        event = await store.append("order.created", "order", "o-1", {"amount": 1})
+
+        # Re-inserting the same event violates the primary key
+        duplicate = store._append_sqlite(event)
+        ok = await store.append("order.updated", "order", "o-1", {"amount": 2})
+
+        with pytest.raises(sqlite3.IntegrityError):
+            await duplicate
+        assert ok.sequence_number == 2
+        assert len(store) == 2
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_rolls_back_only_itself(self, db_path):
+        store = await open_store(db_path, write_flush_interval=0.05)
+        writer = store._writer
+        commits = writer.commits
+        sql = store._UPSERT_SNAPSHOT.replace("OR REPLACE ", "")
+
+        # Same batch: the third row conflicts with the first
+        results = await asyncio.gather(*(
+            writer.submit(sql, ("order", aggregate_id, 1, "{}", "now"))
+            for aggregate_id in ("o-1", "o-2", "o-1", "o-3")
+        ), return_exceptions=True)
+        rows = await store._read("SELECT aggregate_id FROM snapshots ORDER BY aggregate_id", (), list)
+        await store.close()
+
+        assert writer.commits == commits + 1
+        assert [isinstance(r, sqlite3.IntegrityError) for r in results] == [False, False, True, False]
+        assert [r[0] for r in rows] == ["o-1", "o-2", "o-3"]
+
+    @pytest.mark.asyncio
+    async def test_sequence_recovered_after_reopen(self, db_path):
+        store = await open_store(db_path)
+        for i in range(3):
+            await store.append("order.updated", "order", "o-1", {"amount": i})
+        await store.close()
+
+        reopened = await open_store(db_path)
+        event = await reopened.append("order.updated", "order", "o-1", {"amount": 3})
+        events = await reopened.get_aggregate_events("order", "o-1")
+        await reopened.close()
+
+        assert event.sequence_number == 4
+        assert [e.sequence_number for e in events] == [1, 2, 3, 4]
+
+
+class TestSnapshots:
+    """Tests for aggregate snapshots."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+    async def test_replay_starts_from_snapshot(self, db_path, store_type):
+        store = EventStore(store_type=store_type, db_path=db_path, snapshot_interval=10)
+        await store.initialize()
+        store.register_snapshot_reducer("order", count_reducer)
+
+        for i in range(25):
+            await store.append("order.updated", "order", "o-1", {"amount": 1})
+        await store.close()
+
+        snapshot = await store.get_snapshot("order", "o-1") if store_type == "memory" else None
+        if store_type == "sqlite":
+            store = await open_store(db_path)
+            snapshot = await store.get_snapshot("order", "o-1")
+
+        state = {}
+        replayed = await store.replay(
+            "order", "o-1",
+            handler=lambda e: state.update(count_reducer(state, e)),
+            on_snapshot=lambda s: state.update(s.state),
+        )
+        await store.close()
+
+        # Snapshots run in the background, so the latest one covers at least 10 events
+        assert snapshot.sequence_number >= 10
+        assert snapshot.state == {"total": snapshot.sequence_number}
+        assert replayed == 25 - snapshot.sequence_number
+        assert state == {"total": 25}
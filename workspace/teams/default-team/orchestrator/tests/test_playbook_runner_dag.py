@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for PlaybookRunner stage scheduling.
+
+Tests cover:
+- Concurrent execution of independent stages
+- Concurrency limit
+- Skip / cancel propagation and run_on: always
+- Legacy list-order sequencing after failures
+- Compiled playbook cache invalidation
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.playbook_runner import CompiledPlaybook, PlaybookRunner, StageStatus
+
+
+def stage(stage_id, action="work", **extra):
+    return {"id": stage_id, "steps": [{"action": action}], **extra}
+
+
+@pytest.fixture
+def runner(tmp_path):
+    playbooks = tmp_path / "playbooks"
+    playbooks.mkdir()
+    runner = PlaybookRunner(
+        playbooks_dir=str(playbooks),
+        artifacts_dir=str(tmp_path / "artifacts"),
+        max_parallel_stages=2,
+    )
+    runner.active = 0
+    runner.peak = 0
+
+    async def work(params, context):
+        runner.active += 1
+        runner.peak = max(runner.peak, runner.active)
+        await asyncio.sleep(0.02)
+        runner.active -= 1
+        return {"success": True}
+
+    async def fail(params, context):
+        raise RuntimeError("lint errors")
+
+    runner.register_action("work", work)
+    runner.register_action("fail", fail)
+    return runner
+
+
+def write_playbook(runner, name, stages):
+    path = runner._playbooks_dir / f"{name}.yaml"
+    path.write_text(yaml.safe_dump({"name": name, "version": "1.0.0", "stages": stages}))
+    return path
+
+
+def statuses(result):
+    return {s.stage_id: s.status for s in result.stages}
+
+
+class TestStageScheduling:
+    """Tests for DAG stage execution."""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_run_concurrently_within_limit(self, runner):
+        write_playbook(runner, "pr", [
+            stage("lint", parallel=True),
+            stage("sast", parallel=True),
+            stage("deps", parallel=True),
+            stage("pytest", depends_on=[]),
+            stage("summary", depends_on=["lint", "sast", "deps", "pytest"]),
+        ])
+
+        result = await runner.execute("pr", "pull_request")
+
+        assert result.status.value == "success"
+        assert [s.stage_id for s in result.stages] == ["lint", "sast", "deps", "pytest", "summary"]
+        assert runner.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_stages_without_dependencies_keep_list_order(self, runner):
+        write_playbook(runner, "boot", [stage("a"), stage("b"), stage("c")])
+
+        await runner.execute("boot", "startup")
+
+        assert runner.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_skips_dependents_and_cancels_pending(self, runner):
+        write_playbook(runner, "ci", [
+            stage("lint", action="fail", parallel=True),
+            stage("tests", depends_on=["lint"]),
+            stage("package", depends_on=[]),
+            stage("report", depends_on=["lint", "tests"], run_on="always"),
+        ])
+        runner._max_parallel_stages = 1
+
+        result = await runner.execute("ci", "push")
+
+        assert statuses(result) == {
+            "lint": StageStatus.FAILURE,
+            "tests": StageStatus.CANCELLED,
+            "package": StageStatus.CANCELLED,
+            "report": StageStatus.SUCCESS,
+        }
+        assert result.status.value == "failure"
+
+    @pytest.mark.asyncio
+    async def test_legacy_stage_runs_after_failed_always_stage(self, runner):
+        write_playbook(runner, "legacy", [
+            stage("cleanup", action="fail", run_on="always"),
+            stage("build"),
+            stage("publish"),
+        ])
+
+        result = await runner.execute("legacy", "push")
+
+        assert statuses(result) == {
+            "cleanup": StageStatus.FAILURE,
+            "build": StageStatus.SUCCESS,
+            "publish": StageStatus.SUCCESS,
+        }
+
+    @pytest.mark.asyncio
+    async def test_always_stage_still_honours_condition(self, runner):
+        write_playbook(runner, "notify", [
+            stage("build"),
+            stage("notify", run_on="always", condition="event == 'release'"),
+        ])
+        runner._evaluate_condition = lambda condition, results, context: False
+
+        result = await runner.execute("notify", "push")
+
+        assert statuses(result)["notify"] == StageStatus.SKIPPED
+
+    def test_cycles_are_rejected(self):
+        with pytest.raises(ValueError, match="cycle"):
+            CompiledPlaybook.compile("bad", {"stages": [
+                stage("a", depends_on=["b"]),
+                stage("b", depends_on=["a"]),
+            ]})
+
+
+class TestCompiledCache:
+    """Tests for the compiled playbook cache."""
+
+    @pytest.mark.asyncio
+    async def test_cache_reused_until_file_changes(self, runner):
+        path = write_playbook(runner, "pr", [stage("lint")])
+
+        first = await runner.compile_playbook("pr")
+        assert await runner.compile_playbook("pr") is first
+
+        write_playbook(runner, "pr", [stage("lint"), stage("sast", parallel=True)])
+        os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+        second = await runner.compile_playbook("pr")
+
+        assert second is not first
+        assert [s["id"] for s in second.stages] == ["lint", "sast"]
+
+    @pytest.mark.asyncio
+    async def test_missing_playbook_fails_cleanly(self, runner):
+        result = await runner.execute("missing", "push")
+        assert result.status.value == "failure"
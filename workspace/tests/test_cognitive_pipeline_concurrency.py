@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Tests for the cognitive pipeline - concurrent detectors and evaluators
+with deadlines, per-signal failure isolation, micro-batched signals and
+the throughput report
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from core.integrations.cognitive_processor import (
+    CognitiveLayer,
+    CognitiveSignal,
+    EnhancedCognitiveProcessor,
+    ProcessorConfig,
+    SignalType,
+    benchmark_throughput,
+)
+
+
+def make_signal(i: int, value: float = 0.0) -> CognitiveSignal:
+    return CognitiveSignal(
+        signal_id=f"sig-{i}",
+        signal_type=SignalType.TELEMETRY,
+        layer=CognitiveLayer.L1_PERCEPTION,
+        source="test",
+        payload={"value": value},
+    )
+
+
+def sleeping(result, delay: float = 0.05):
+    async def detector(*args):
+        await asyncio.sleep(delay)
+        return result(*args) if callable(result) else result
+    return detector
+
+
+class TestPerceptionConcurrency:
+    """Detectors run together, each under its own deadline"""
+
+    @pytest.mark.asyncio
+    async def test_detectors_overlap_and_keep_registration_order(self):
+        processor = EnhancedCognitiveProcessor()
+        processor.perception.add_anomaly_detector(sleeping({"type": "first"}))
+        processor.perception.add_anomaly_detector(lambda signal, context: {"type": "second"})
+        processor.perception.add_anomaly_detector(sleeping({"type": "third"}, delay=0.01))
+        processor.perception.add_drift_detector(sleeping({"type": "drift", "magnitude": 2.0}))
+
+        start = time.perf_counter()
+        result = await processor.process_signal(make_signal(0))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.15
+        payloads = [s["payload"] for s in result["signals"][1:4]]
+        assert [p["anomaly_type"] for p in payloads] == ["first", "second", "third"]
+        assert result["signals"][4]["payload"]["drift_type"] == "drift"
+
+    @pytest.mark.asyncio
+    async def test_slow_and_failing_detectors_are_skipped(self):
+        processor = EnhancedCognitiveProcessor(ProcessorConfig(hook_timeout_seconds=0.05))
+
+        def broken(signal, context):
+            raise RuntimeError("boom")
+
+        processor.perception.add_anomaly_detector(sleeping({"type": "late"}, delay=5))
+        processor.perception.add_anomaly_detector(sleeping({"type": "slow-ok"}, delay=0.2), timeout_seconds=1)
+        processor.perception.add_anomaly_detector(broken)
+
+        start = time.perf_counter()
+        outputs = await processor.perception.process(make_signal(0), processor._get_or_create_context("s"))
+
+        assert time.perf_counter() - start < 1
+        assert [s.payload["anomaly_type"] for s in outputs[1:]] == ["slow-ok"]
+        assert processor.perception.get_stats()["detector_timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_detector_sees_whole_batch(self):
+        processor = EnhancedCognitiveProcessor()
+        calls = []
+
+        def vectorised(signals, context):
+            calls.append(len(signals))
+            return [{"type": "high"} if s.payload["value"] > 5 else None for s in signals]
+
+        processor.perception.add_anomaly_detector(vectorised, batch=True)
+        results = await processor.process_batch([make_signal(i, value=i) for i in range(10)])
+
+        assert calls == [10]
+        assert [len(r["decisions"]) for r in results] == [0] * 6 + [1] * 4
+        assert [r["signal_id"] for r in results] == [f"sig-{i}" for i in range(10)]
+        assert processor.get_stats()["processor"]["batches_processed"] == 1
+
+
+    @pytest.mark.asyncio
+    async def test_sync_detectors_do_not_block_the_loop(self):
+        processor = EnhancedCognitiveProcessor(ProcessorConfig(hook_timeout_seconds=0.1))
+
+        def blocking(signal, context):
+            time.sleep(0.5)
+            return {"type": "late"}
+
+        processor.perception.add_anomaly_detector(blocking)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        outputs = await processor.perception.process(make_signal(0), processor._get_or_create_context("s"))
+        elapsed = time.perf_counter() - start
+        ticking.cancel()
+
+        assert elapsed < 0.4
+        assert len(ticks) >= 5
+        assert outputs[1:] == []
+        assert processor.perception.get_stats()["detector_timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drift_detectors_follow_signal_order(self):
+        processor = EnhancedCognitiveProcessor()
+
+        def step(signal, context, baselines):
+            time.sleep(0.001)
+            previous = baselines.get("value")
+            baselines["value"] = signal.payload["value"]
+            return {"type": "step", "baseline": previous, "current": signal.payload["value"]}
+
+        processor.perception.add_drift_detector(step)
+        processor.perception.set_baseline("value", -1)
+        outputs = await processor.perception.process_batch(
+            [make_signal(i, value=i) for i in range(20)], processor._get_or_create_context("s")
+        )
+
+        assert [o[1].payload["baseline"] for o in outputs] == list(range(-1, 19))
+
+    @pytest.mark.asyncio
+    async def test_cancelled_detector_is_skipped(self):
+        processor = EnhancedCognitiveProcessor()
+
+        async def cancelled(signals, context):
+            raise asyncio.CancelledError()
+
+        processor.perception.add_anomaly_detector(cancelled, batch=True)
+        processor.perception.add_anomaly_detector(lambda s, c: {"type": "ok"})
+
+        results = await processor.process_batch([make_signal(i) for i in range(2)])
+
+        assert all(r["success"] for r in results)
+        assert [len(r["decisions"]) for r in results] == [1, 1]
+
+
+class TestFailureIsolation:
+    """One failing signal does not fail the rest of its batch"""
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_signal(self):
+        processor = EnhancedCognitiveProcessor()
+        processor.perception.add_anomaly_detector(lambda s, c: {"type": "spike", "confidence": 1.0})
+        processor.perception.add_anomaly_detector(lambda s, c: "not a dict" if s.payload["value"] == 1 else None)
+
+        def evaluator(signal, risk, context):
+            return {"action": "restart", "score": 0.95}
+
+        processor.reasoning.add_strategy_evaluator(evaluator)
+        original = processor.reasoning._assess_risk
+
+        async def assess(signal, context):
+            if signal.signal_id == "sig-2":
+                raise RuntimeError("risk model unavailable")
+            return await original(signal, context)
+
+        processor.reasoning._assess_risk = assess
+        results = await processor.process_batch([make_signal(i, value=i) for i in range(4)])
+
+        assert [r["success"] for r in results] == [True, True, False, True]
+        assert results[2]["error"] == "risk model unavailable"
+        assert results[2]["layers_processed"] == ["perception"]
+        assert results[1]["layers_processed"] == ["perception", "reasoning", "execution", "proof"]
+        stats = processor.get_stats()["processor"]
+        assert stats["signals_processed"] == 3
+        assert stats["processing_errors"] == 1
+
+
+class TestReasoningAndExecution:
+    """Evaluators and actions run concurrently with unchanged outcomes"""
+
+    @pytest.mark.asyncio
+    async def test_evaluators_fold_in_registration_order(self):
+        processor = EnhancedCognitiveProcessor()
+        processor.perception.add_anomaly_detector(lambda s, c: {"type": "spike"})
+        processor.reasoning.add_strategy_evaluator(sleeping({"action": "restart", "score": 0.8}))
+        processor.reasoning.add_strategy_evaluator(sleeping({"action": "scale_out", "score": 0.95}))
+        processor.reasoning.add_strategy_evaluator(sleeping({"action": "ignore", "score": 0.9}))
+
+        start = time.perf_counter()
+        result = await processor.process_signal(make_signal(0))
+
+        assert time.perf_counter() - start < 0.15
+        decision = result["decisions"][0]
+        assert decision["action"] == "scale_out"
+        assert [a["action"] for a in decision["alternatives"]] == ["monitor", "restart"]
+
+    @pytest.mark.asyncio
+    async def test_timed_out_action_is_rolled_back(self):
+        processor = EnhancedCognitiveProcessor()
+        processor.perception.add_anomaly_detector(lambda s, c: {"type": "spike", "confidence": 1.0})
+        processor.reasoning.add_strategy_evaluator(lambda s, r, c: {"action": "fast", "score": 0.95})
+        rolled_back = []
+        processor.execution.register_action_handler("fast", sleeping({"success": True}, delay=5), timeout_seconds=0.05)
+        processor.execution.register_rollback_handler("fast", lambda point: rolled_back.append(point["id"]))
+
+        start = time.perf_counter()
+        await processor.process_batch([make_signal(i) for i in range(3)])
+
+        assert time.perf_counter() - start < 1
+        stats = processor.execution.get_stats()
+        assert stats["rollback_points_created"] == 3
+        assert stats["action_timeouts"] == stats["rollbacks_performed"] == len(rolled_back) == 3
+
+
+    @pytest.mark.asyncio
+    async def test_sync_action_finishes_before_rollback(self):
+        processor = EnhancedCognitiveProcessor()
+        processor.perception.add_anomaly_detector(lambda s, c: {"type": "spike", "confidence": 1.0})
+        processor.reasoning.add_strategy_evaluator(lambda s, r, c: {"action": "slow", "score": 0.95})
+        events = []
+
+        def slow(decision, context):
+            time.sleep(0.2)
+            events.append("action finished")
+            return {"success": True}
+
+        processor.execution.register_action_handler("slow", slow, timeout_seconds=0.05)
+        processor.execution.register_rollback_handler("slow", lambda point: events.append("rollback ran"))
+
+        await processor.process_signal(make_signal(0))
+
+        assert events == ["action finished", "rollback ran"]
+        assert processor.execution.get_stats()["action_timeouts"] == 1
+
+
+class TestQueuedMicroBatches:
+    """The background loop drains the queue in batches"""
+
+    @pytest.mark.asyncio
+    async def test_queue_is_processed_in_batches(self):
+        processor = EnhancedCognitiveProcessor(ProcessorConfig(max_batch_size=8, batch_linger_ms=20))
+        for i in range(20):
+            await processor.submit_signal(make_signal(i))
+
+        await processor.start()
+        for _ in range(100):
+            if processor.get_stats()["processor"]["signals_processed"] == 20:
+                break
+            await asyncio.sleep(0.01)
+        await processor.stop()
+
+        stats = processor.get_stats()["processor"]
+        assert stats["signals_processed"] == 20
+        assert stats["batches_processed"] == 3
+
+
+class TestThroughputReport:
+
+    @pytest.mark.asyncio
+    async def test_batched_pipeline_outpaces_sequential(self):
+        report = await benchmark_throughput(signals=256, batch_size=32, detector_latency_ms=1)
+
+        assert report["anomalies_detected"] == report["decisions_made"] > 0
+        assert report["speedup"] > 5
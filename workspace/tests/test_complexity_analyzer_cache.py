@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for the code complexity analyzer's per-file result cache and
+parallel analysis - cache hits, invalidation, pruning and determinism
+"""
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("radon")
+pytest.importorskip("lizard")
+pytest.importorskip("numpy")
+
+# The tool lives in a hyphenated directory, so import it by path
+sys.path.insert(
+    0, str(Path(__file__).parent.parent / "src" / "developer-tools" / "code-complexity-analyzer")
+)
+
+import complexity_analyzer
+from complexity_analyzer import CodeComplexityAnalyzer, _file_complexity_to_dict
+
+MODULE = '''
+def route(kind, items):
+    total = 0
+    for item in items:
+        if kind == "a" and item > {n}:
+            total += item
+        elif kind == "b":
+            while item:
+                item -= 1
+    return total
+
+
+class Handler:
+    def handle(self, event, retries=3):
+        try:
+            return route(event, [])
+        except ValueError:
+            return None
+'''
+
+
+def write_project(root: Path, count: int) -> list[Path]:
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = root / f"module_{i}.py"
+        path.write_text(MODULE.format(n=i))
+        paths.append(path)
+    return paths
+
+
+def make_analyzer(tmp_path: Path, **overrides) -> CodeComplexityAnalyzer:
+    analyzer = CodeComplexityAnalyzer(config_path=str(tmp_path / "missing.yaml"))
+    analyzer.config.update({
+        "output_directory": str(tmp_path / "reports"),
+        "enable_historical_tracking": False,
+        "enable_trend_analysis": False,
+        **overrides,
+    })
+    return analyzer
+
+
+def analyze(analyzer: CodeComplexityAnalyzer, root: Path) -> list[dict]:
+    files = analyzer._analyze_files(root, analyzer._collect_python_files(root))
+    return [_file_complexity_to_dict(f) for f in files]
+
+
+def cached_paths(tmp_path: Path) -> set[str]:
+    conn = sqlite3.connect(str(tmp_path / "reports" / "analysis_cache.sqlite"))
+    try:
+        return {row[0] for row in conn.execute("SELECT file_path FROM file_results")}
+    finally:
+        conn.close()
+
+
+class TestAnalysisCache:
+    """Unchanged files are served from the cache"""
+
+    def test_second_run_hits_cache(self, tmp_path):
+        root = tmp_path / "project"
+        write_project(root, 3)
+
+        first = make_analyzer(tmp_path)
+        report = first.analyze_project(str(root))
+        assert first.last_run_stats["analyzed"] == 3
+        assert first.last_run_stats["cache_hits"] == 0
+
+        second = make_analyzer(tmp_path)
+        assert second.analyze_project(str(root)).total_functions == report.total_functions
+        assert second.last_run_stats["analyzed"] == 0
+        assert second.last_run_stats["cache_hits"] == 3
+
+    def test_content_change_invalidates_only_that_file(self, tmp_path):
+        root = tmp_path / "project"
+        paths = write_project(root, 3)
+        analyze(make_analyzer(tmp_path), root)
+
+        paths[0].write_text(MODULE.format(n=0) + "\n\ndef extra():\n    return 1\n")
+        # Same content, new mtime: matched by content hash
+        stat = paths[1].stat()
+        os.utime(paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        analyzer = make_analyzer(tmp_path)
+        results = analyze(analyzer, root)
+
+        assert analyzer.last_run_stats["analyzed"] == 1
+        assert analyzer.last_run_stats["cache_hits"] == 2
+        assert "extra" in [f["name"] for f in results[0]["functions"]]
+
+    def test_analyzer_key_change_invalidates_everything(self, tmp_path, monkeypatch):
+        root = tmp_path / "project"
+        write_project(root, 2)
+        analyze(make_analyzer(tmp_path), root)
+
+        stricter = make_analyzer(tmp_path)
+        stricter.config["thresholds"] = {
+            **stricter.config["thresholds"],
+            "cyclomatic": {"low": 1, "moderate": 2, "high": 3, "very_high": 4},
+        }
+        analyze(stricter, root)
+        assert stricter.last_run_stats["analyzed"] == 2
+
+        monkeypatch.setattr(complexity_analyzer, "ANALYZER_VERSION", "test")
+        upgraded = make_analyzer(tmp_path)
+        analyze(upgraded, root)
+        assert upgraded.last_run_stats["analyzed"] == 2
+
+    def test_deleted_files_are_pruned(self, tmp_path):
+        root = tmp_path / "project"
+        paths = write_project(root, 3)
+        analyze(make_analyzer(tmp_path), root)
+        assert cached_paths(tmp_path) == {str(p) for p in paths}
+
+        paths[2].unlink()
+        analyze(make_analyzer(tmp_path), root)
+
+        assert cached_paths(tmp_path) == {str(p) for p in paths[:2]}
+
+    def test_disabled_cache_always_analyzes(self, tmp_path):
+        root = tmp_path / "project"
+        write_project(root, 2)
+        analyze(make_analyzer(tmp_path), root)
+
+        analyzer = make_analyzer(tmp_path, enable_file_cache=False)
+        analyze(analyzer, root)
+
+        assert analyzer.last_run_stats["analyzed"] == 2
+
+
+class TestParallelAnalysis:
+    """The process pool produces exactly what the sequential path does"""
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        root = tmp_path / "project"
+        write_project(root, 12)
+
+        sequential = make_analyzer(tmp_path, enable_file_cache=False, max_workers=1)
+        parallel = make_analyzer(
+            tmp_path, enable_file_cache=False, max_workers=2, parallel_threshold=1
+        )
+
+        assert analyze(parallel, root) == analyze(sequential, root)
+        assert parallel.last_run_stats["analyzed"] == 12
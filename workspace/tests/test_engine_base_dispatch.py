@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for automation BaseEngine dispatch - priority ordering, concurrency
+slots and atomic off-loop checkpoints
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add tools/automation to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools" / "automation"))
+
+import pytest
+
+from engine_base import BaseEngine, EngineConfig, Priority, ResourceConfig, TaskResult
+
+
+class RecordingEngine(BaseEngine):
+    """Engine that records execution order and peak concurrency"""
+
+    def __init__(self, config: EngineConfig, delay: float = 0.02):
+        super().__init__(config)
+        self.delay = delay
+        self.order = []
+        self.active = 0
+        self.peak = 0
+
+    async def _initialize(self) -> bool:
+        return True
+
+    async def _execute(self, task):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.order.append(task["name"])
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return TaskResult(task_id=task["task_id"], success=True)
+
+    async def _shutdown(self) -> bool:
+        return True
+
+    def _get_capabilities(self):
+        return {}
+
+
+def make_engine(tmp_path, max_concurrent_tasks=2, **kwargs) -> RecordingEngine:
+    config = EngineConfig(
+        engine_id="test-engine",
+        resource=ResourceConfig(max_concurrent_tasks=max_concurrent_tasks),
+    )
+    config.persistence.state_dir = str(tmp_path / "state")
+    config.persistence.checkpoint_interval = 3600
+    config.timeout.heartbeat = 3600
+    return RecordingEngine(config, **kwargs)
+
+
+async def wait_idle(engine: BaseEngine) -> None:
+    while engine._task_queue.qsize() or engine._task_handles:
+        await asyncio.sleep(0.005)
+
+
+class TestDispatch:
+    """Semaphore-gated, priority-aware dispatch"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_priority_order(self, tmp_path):
+        engine = make_engine(tmp_path, max_concurrent_tasks=1)
+        await engine.start()
+        await engine.pause()
+
+        await engine.submit_task({"name": "background", "priority": Priority.BACKGROUND})
+        await engine.submit_task({"name": "normal-1"})
+        await engine.submit_task({"name": "critical", "priority": "critical"})
+        await engine.submit_task({"name": "normal-2", "priority": 2})
+
+        await engine.resume()
+        await wait_idle(engine)
+        await engine.stop()
+
+        assert engine.order == ["critical", "normal-1", "normal-2", "background"]
+        assert engine.peak == 1
+        assert engine.get_health().tasks_completed == 4
+
+    @pytest.mark.asyncio
+    async def test_slots_are_fully_used(self, tmp_path):
+        engine = make_engine(tmp_path, max_concurrent_tasks=4)
+        await engine.start()
+
+        for i in range(12):
+            await engine.submit_task({"name": f"t{i}"})
+        await wait_idle(engine)
+        await engine.stop()
+
+        assert engine.peak == 4
+
+
+class TestCheckpoint:
+    """Atomic checkpoint persistence"""
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_round_trip_without_temp_files(self, tmp_path):
+        engine = make_engine(tmp_path)
+        await engine.start()
+        engine._checkpoint_data["cursor"] = {"offset": 42}
+        await engine.submit_task({"name": "t"})
+        await wait_idle(engine)
+        await engine.stop()
+
+        state_dir = tmp_path / "state"
+        assert [p.name for p in state_dir.iterdir()] == ["test-engine_checkpoint.json"]
+        saved = json.loads((state_dir / "test-engine_checkpoint.json").read_text())
+        assert saved["statistics"]["tasks_completed"] == 1
+
+        restored = make_engine(tmp_path)
+        await restored._load_checkpoint()
+        assert restored._checkpoint_data == {"cursor": {"offset": 42}}
+        assert restored._tasks_completed == 1
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for static engine discovery - AST scanning without imports, manifest
+cache reuse and lazy, single import on engine start
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add tools/automation to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools" / "automation"))
+
+import pytest
+
+from master_orchestrator import EngineRegistry, MasterOrchestrator
+
+BASE_ENGINE = '''
+import sys
+from pathlib import Path
+sys.path.insert(0, {automation!r})
+
+from engine_base import BaseEngine, EngineType, TaskResult
+
+Path({marker!r}).open("a").write("imported\\n")
+
+
+class ReportEngine(BaseEngine):
+    """Builds reports"""
+
+    ENGINE_TYPE = EngineType.GENERATION
+
+    async def _initialize(self):
+        return True
+
+    async def _execute(self, task):
+        return TaskResult(task_id=task["task_id"], success=True)
+
+    async def _shutdown(self):
+        return True
+
+    def _get_capabilities(self):
+        return {{}}
+
+
+class Helper:
+    pass
+'''
+
+CHILD_ENGINE = '''
+from report_engine import ReportEngine
+
+
+class WeeklyReportEngine(ReportEngine):
+    pass
+'''
+
+
+@pytest.fixture
+def engines_dir(tmp_path):
+    root = tmp_path / "engines"
+    root.mkdir()
+    marker = tmp_path / "imports.log"
+    (root / "report_engine.py").write_text(
+        BASE_ENGINE.format(automation=sys.path[0], marker=str(marker))
+    )
+    (root / "weekly.py").write_text(CHILD_ENGINE)
+    (root / "broken.py").write_text("def broken(:\n")
+    return root
+
+
+def class_names(engines):
+    return sorted(e["class_name"] for e in engines)
+
+
+class TestStaticDiscovery:
+    """Discovery without executing modules"""
+
+    def test_finds_engines_across_files_without_importing(self, engines_dir, tmp_path):
+        registry = EngineRegistry(manifest_path=tmp_path / "manifest.json")
+
+        engines = registry.discover_engines([engines_dir])
+
+        assert class_names(engines) == ["ReportEngine", "WeeklyReportEngine"]
+        report = next(e for e in engines if e["class_name"] == "ReportEngine")
+        assert report["engine_type"] == "generation"
+        assert report["description"] == "Builds reports"
+        assert not (tmp_path / "imports.log").exists()
+        assert registry.discovery_stats.parse_errors == 1
+
+    def test_manifest_reused_until_file_changes(self, engines_dir, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        EngineRegistry(manifest_path=manifest).discover_engines([engines_dir])
+
+        warm = EngineRegistry(manifest_path=manifest)
+        warm.discover_engines([engines_dir])
+        assert warm.discovery_stats.files_parsed == 0
+        assert warm.discovery_stats.cache_hits == 3
+
+        # Touch without changing content: hash matches, no reparse
+        weekly = engines_dir / "weekly.py"
+        os.utime(weekly, ns=(weekly.stat().st_mtime_ns + 10**9,) * 2)
+        weekly_touched = EngineRegistry(manifest_path=manifest)
+        weekly_touched.discover_engines([engines_dir])
+        assert weekly_touched.discovery_stats.files_parsed == 0
+
+        weekly.write_text(CHILD_ENGINE.replace("WeeklyReportEngine", "MonthlyReportEngine"))
+        changed = EngineRegistry(manifest_path=manifest)
+        engines = changed.discover_engines([engines_dir])
+        assert changed.discovery_stats.files_parsed == 1
+        assert class_names(engines) == ["MonthlyReportEngine", "ReportEngine"]
+
+
+class TestLazyImport:
+    """Engines are imported once, when started"""
+
+    @pytest.mark.asyncio
+    async def test_engine_module_imported_once_on_start(self, engines_dir, tmp_path):
+        sys.path.insert(0, str(engines_dir))
+        try:
+            orchestrator = MasterOrchestrator()
+            registry = EngineRegistry(manifest_path=tmp_path / "manifest.json")
+            orchestrator.registry = registry
+            for info in registry.discover_engines([engines_dir]):
+                await orchestrator._register_engine_from_info(info)
+
+            regs = registry.get_all_engines()
+            assert all(r.instance is None for r in regs)
+            assert not (tmp_path / "imports.log").exists()
+
+            for reg in regs:
+                reg.config.persistence.enabled = False
+                assert await orchestrator.start_engine(reg.engine_id)
+
+            assert (tmp_path / "imports.log").read_text() == "imported\n"
+            for reg in regs:
+                await reg.instance.stop(force=True)
+        finally:
+            sys.path.remove(str(engines_dir))
+            sys.modules.pop("report_engine", None)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Tests for load-aware engine selection in EngineScheduler and
+PipelineExecutor - spreading work across engines of the same type and
+scoring failed or timed-out work
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add tools/automation to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools" / "automation"))
+
+import pytest
+
+from engine_base import BaseEngine, EngineConfig, EngineType, ResourceConfig, TaskResult
+from master_orchestrator import (
+    EngineRegistration,
+    EngineRegistry,
+    EngineScheduler,
+    EngineSelector,
+    EventBus,
+    PipelineConfig,
+    PipelineExecutor,
+)
+
+
+class SleepEngine(BaseEngine):
+    """Engine that handles one task at a time with a fixed delay"""
+
+    def __init__(self, config: EngineConfig, delay: float = 0.02):
+        super().__init__(config)
+        self.delay = delay
+        self.handled = 0
+
+    async def _initialize(self) -> bool:
+        return True
+
+    async def _execute(self, task):
+        await asyncio.sleep(self.delay)
+        self.handled += 1
+        return TaskResult(task_id=task["task_id"], success=True, result=task.get("input"))
+
+    async def _shutdown(self) -> bool:
+        return True
+
+    def _get_capabilities(self):
+        return {}
+
+
+async def make_cluster(count: int, strategy: str = "power_of_two", delays=None):
+    registry = EngineRegistry()
+    for i in range(count):
+        config = EngineConfig(
+            engine_id=f"engine-{i}",
+            engine_type=EngineType.VALIDATION,
+            resource=ResourceConfig(max_concurrent_tasks=1),
+        )
+        config.persistence.enabled = False
+        config.timeout.heartbeat = 3600
+        engine = SleepEngine(config, delay=delays[i]) if delays else SleepEngine(config)
+        await engine.start()
+        registry.register_engine(EngineRegistration(
+            engine_id=config.engine_id,
+            engine_name=config.engine_id,
+            engine_class="SleepEngine",
+            engine_type=EngineType.VALIDATION,
+            module_path=__file__,
+            config=config,
+            instance=engine,
+            healthy=True,
+        ))
+    scheduler = EngineScheduler(registry, EventBus(), selection_strategy=strategy)
+    return registry, scheduler
+
+
+async def stop_cluster(registry: EngineRegistry):
+    for reg in registry.get_all_engines():
+        await reg.instance.stop(force=True)
+
+
+async def run_tasks(registry, scheduler, count: int) -> float:
+    await scheduler.start()
+    started = time.perf_counter()
+    for i in range(count):
+        await scheduler.schedule_task({"target_engine_type": "validation", "n": i})
+    engines = [r.instance for r in registry.get_all_engines()]
+    while sum(e.handled for e in engines) < count:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - started
+    await scheduler.stop()
+    return elapsed
+
+
+class TestScheduler:
+    """Scheduled tasks are spread by load"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strategy", EngineSelector.STRATEGIES)
+    async def test_tasks_spread_across_engines(self, strategy):
+        registry, scheduler = await make_cluster(4, strategy)
+        await run_tasks(registry, scheduler, 40)
+        handled = [r.instance.handled for r in registry.get_all_engines()]
+        await stop_cluster(registry)
+
+        assert sum(handled) == 40
+        assert min(handled) >= 6
+
+    @pytest.mark.asyncio
+    async def test_bad_task_does_not_drop_its_batch(self):
+        registry, scheduler = await make_cluster(2)
+        await scheduler.schedule_task({"task_id": "bad", "target_engine_type": "no-such-type"})
+        for i in range(5):
+            await scheduler.schedule_task({"target_engine_type": "validation", "n": i})
+
+        await scheduler.start()
+        engines = [r.instance for r in registry.get_all_engines()]
+        for _ in range(200):
+            if sum(e.handled for e in engines) == 5:
+                break
+            await asyncio.sleep(0.005)
+        await scheduler.stop()
+        await stop_cluster(registry)
+
+        assert sum(e.handled for e in engines) == 5
+
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_engines(self):
+        single, single_scheduler = await make_cluster(1)
+        one = await run_tasks(single, single_scheduler, 24)
+        await stop_cluster(single)
+
+        cluster, cluster_scheduler = await make_cluster(4)
+        four = await run_tasks(cluster, cluster_scheduler, 24)
+        await stop_cluster(cluster)
+
+        assert four < one / 2.5
+
+
+class TestLatencyScoring:
+    """Failing engines do not look fast to the selector"""
+
+    @pytest.mark.asyncio
+    async def test_timing_out_engine_loses_selection(self):
+        registry, scheduler = await make_cluster(2, "least_outstanding", delays=[5, 0.01])
+        hanging, healthy = (r.instance for r in registry.get_all_engines())
+        hanging.config.timeout.execution = 0.05
+        hanging.config.retry.max_attempts = 1
+
+        assert not (await hanging.execute_now({"input": 1})).success
+        assert (await healthy.execute_now({"input": 1})).success
+
+        picks = {scheduler.select_engine(engine_type="validation").engine_id for _ in range(10)}
+        await stop_cluster(registry)
+
+        assert hanging.get_load()["latency_ms"] >= 50
+        assert picks == {"engine-1"}
+
+    @pytest.mark.asyncio
+    async def test_new_engine_scored_with_peer_prior(self):
+        registry, scheduler = await make_cluster(3, "least_outstanding", delays=[0.03, 0.03, 0.03])
+        engines = [r.instance for r in registry.get_all_engines()]
+        for engine in engines[:2]:
+            await engine.execute_now({"input": 1})
+        engines[0]._direct_tasks = 1
+
+        selector = EngineSelector("least_outstanding")
+        regs = registry.get_all_engines()
+        prior = selector.latency_prior(regs)
+        scores = [selector.score(reg, prior) for reg in regs]
+        await stop_cluster(registry)
+
+        observed = [engine.get_load()["latency_ms"] for engine in engines[:2]]
+        assert prior == pytest.approx(sum(observed) / 2)
+        assert scores == pytest.approx([2 * observed[0], observed[1], prior])
+
+
+class TestPipelineExecutor:
+    """Pipeline stages pick the least-loaded engine"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_pipelines_use_all_engines(self):
+        registry, scheduler = await make_cluster(4, "least_outstanding")
+        executor = PipelineExecutor(registry, scheduler)
+        executor.register_pipeline(PipelineConfig(
+            pipeline_id="validate",
+            name="validate",
+            stages=[{"engine_type": "validation", "operation": "check"}],
+        ))
+
+        results = await asyncio.gather(
+            *(executor.execute_pipeline("validate", {"n": i}) for i in range(8))
+        )
+        handled = [r.instance.handled for r in registry.get_all_engines()]
+        await stop_cluster(registry)
+
+        assert all(r["success"] for r in results)
+        assert handled == [2, 2, 2, 2]
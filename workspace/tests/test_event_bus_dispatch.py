@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the MasterOrchestrator EventBus - concurrent handler fan-out,
+per-handler timeouts, stable subscriber lists and bounded history
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add tools/automation to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools" / "automation"))
+
+import pytest
+
+from engine_base import EngineEvent
+from master_orchestrator import EventBus
+
+
+def event(event_type: str, n: int = 0) -> EngineEvent:
+    return EngineEvent.create(event_type, "engine-1", {"n": n})
+
+
+class TestDispatch:
+    """Concurrent, isolated handler execution"""
+
+    @pytest.mark.asyncio
+    async def test_handlers_run_concurrently_and_slow_handler_times_out(self):
+        bus = EventBus(handler_timeout=0.1)
+        received = []
+
+        async def handler(e):
+            await asyncio.sleep(0.05)
+            received.append(e.payload["n"])
+
+        async def hung(e):
+            await asyncio.sleep(10)
+
+        def broken(e):
+            raise RuntimeError("boom")
+
+        for h in (handler, hung, broken):
+            bus.subscribe("task.completed", h)
+        bus.subscribe("*", lambda e: received.append("wildcard"))
+
+        started = time.perf_counter()
+        await bus._dispatch(event("task.completed", 1))
+        elapsed = time.perf_counter() - started
+
+        assert sorted(map(str, received)) == ["1", "wildcard"]
+        assert elapsed < 0.5
+        stats = bus.get_stats()
+        assert stats["handler_timeouts"] == 1
+        assert stats["handler_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_wildcard_handlers_do_not_accumulate(self):
+        bus = EventBus()
+        calls = []
+        bus.subscribe("engine.heartbeat", lambda e: calls.append("typed"))
+        bus.subscribe("*", lambda e: calls.append("wildcard"))
+
+        for _ in range(50):
+            await bus._dispatch(event("engine.heartbeat"))
+
+        assert calls.count("wildcard") == 50
+        assert len(bus._subscribers["engine.heartbeat"]) == 1
+        assert bus.get_stats()["subscriptions"] == 2
+
+    def test_unsubscribe_unknown_handler_is_noop(self):
+        bus = EventBus()
+        handler = lambda e: None
+        bus.subscribe("a", handler)
+        bus.subscribe("a", handler)
+        bus.unsubscribe("a", lambda e: None)
+        assert bus._subscribers["a"] == (handler,)
+        bus.unsubscribe("a", handler)
+        assert "a" not in bus._subscribers
+
+
+class TestHistory:
+    """Bounded per-type history"""
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded_per_type(self):
+        bus = EventBus(max_history=50, history_per_type=10, max_history_types=2)
+
+        for i in range(100):
+            await bus.publish(event("task.completed", i))
+        await bus.publish(event("engine.started"))
+        await bus.publish(event("engine.stopped"))
+
+        completed = bus.get_history("task.completed")
+        assert completed == []  # evicted as least recently used type
+        assert len(bus.get_history()) == 50
+        assert [e.event_type for e in bus.get_history(limit=2)] == ["engine.started", "engine.stopped"]
+
+        for i in range(15):
+            await bus.publish(event("engine.started", i))
+        started = bus.get_history("engine.started", limit=5)
+        assert [e.payload["n"] for e in started] == [10, 11, 12, 13, 14]
+        assert len(bus.get_history("engine.started", limit=100)) == 10
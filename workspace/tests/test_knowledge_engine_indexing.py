@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Tests for the KnowledgeEngine incremental indexing pipeline - syntax-aware
+chunking, content-hash change detection, batched embedding and graph edges
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from core.island_ai_runtime.code_chunker import CodeChunker
+from core.island_ai_runtime.knowledge_engine import (
+    EdgeType,
+    EmbeddingProvider,
+    KnowledgeEngine,
+)
+
+HELPERS = '''"""Helpers"""
+import os
+
+LIMIT = 3
+
+
+def helper(value):
+    return value * LIMIT
+
+
+class Greeter:
+    """Says hello"""
+
+    prefix = "hi"
+
+    def greet(self, name):
+        return self.format(name)
+
+    def format(self, name):
+        return f"{self.prefix} {name}"
+'''
+
+SERVICE = '''from pkg.helpers import helper, Greeter
+
+
+def run(values):
+    return [helper(v) for v in values]
+'''
+
+
+class CountingProvider(EmbeddingProvider):
+    """Records batch sizes and peak in-flight embedding calls"""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def embed_matrix(self, texts):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        self.batches.append(len(texts))
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await super().embed_matrix(texts)
+
+
+def make_engine(**config) -> KnowledgeEngine:
+    engine = KnowledgeEngine(config)
+    engine.embedding_provider = CountingProvider()
+    return engine
+
+
+def edge_set(engine: KnowledgeEngine) -> set[tuple[str, str, str]]:
+    nodes = engine.repo_graph.nodes
+    return {
+        (nodes[e.source_id].name, nodes[e.target_id].name, e.edge_type.value)
+        for e in engine.repo_graph.edges
+        if e.edge_type in (EdgeType.IMPORTS, EdgeType.CALLS)
+    }
+
+
+def layered_module(i: int) -> str:
+    """m{i} imports and calls into m{i-1}; every module also defines shared()"""
+    body = f"def f{i}():\n    return shared()\n\n\ndef shared():\n    return {i}\n"
+    if i:
+        body = f"from pkg.m{i - 1} import f{i - 1}\n\n\ndef g{i}():\n    return f{i - 1}()\n\n\n" + body
+    return body
+
+
+def chunk_names(engine: KnowledgeEngine, path: str) -> set[str]:
+    file_id = engine._generate_id(path)
+    return {n.name for n in engine.repo_graph.get_neighbors(file_id, EdgeType.CONTAINS)}
+
+
+class TestCodeChunker:
+    """Syntax-aware chunking"""
+
+    def test_python_chunks_and_references(self):
+        parsed = CodeChunker().parse("pkg/helpers.py", HELPERS)
+        chunks = {c.name: c for c in parsed.chunks}
+
+        assert {"helper", "Greeter", "Greeter.greet", "Greeter.format"} <= set(chunks)
+        assert chunks["Greeter.greet"].calls == ["format"]
+        assert "def greet" not in chunks["Greeter"].content
+        assert any(c.kind == "module" and "LIMIT = 3" in c.content for c in parsed.chunks)
+        assert parsed.imports == [["os"]]
+
+    def test_relative_imports_resolve_against_package(self):
+        parsed = CodeChunker().parse("pkg/sub/mod.py", "from ..helpers import helper\n")
+        assert parsed.imports == [["pkg.helpers.helper", "pkg.helpers"]]
+
+
+class TestIncrementalIndexing:
+    """Only changed chunks are re-embedded"""
+
+    @pytest.mark.asyncio
+    async def test_reindex_touches_only_changed_chunks(self):
+        engine = make_engine()
+        files = {"pkg/helpers.py": HELPERS, "pkg/service.py": SERVICE}
+
+        first = await engine.index_files(files.items())
+        assert first.files_indexed == 2
+        assert first.chunks_embedded == len(engine.vector_store)
+
+        files["pkg/helpers.py"] = HELPERS.replace("value * LIMIT", "value * LIMIT + 1")
+        second = await engine.index_files(files.items())
+
+        assert second.files_unchanged == 1
+        assert second.chunks_embedded == 1
+        assert second.chunks_unchanged == first.chunks_embedded - 3
+        results = await engine.search("def helper(value):\n    return value * LIMIT + 1\n", top_k=1)
+        assert results[0].node.name == "helper"
+
+    @pytest.mark.asyncio
+    async def test_batches_are_bounded(self):
+        engine = make_engine(embedding_batch_size=4, embedding_concurrency=2)
+        files = [(f"m{i}.py", f"def f{i}():\n    return {i}\n") for i in range(40)]
+
+        stats = await engine.index_files(files)
+
+        provider = engine.embedding_provider
+        assert stats.chunks_embedded == 40
+        assert max(provider.batches) == 4
+        assert provider.peak == 2
+
+
+class TestRepoGraphEdges:
+    """Import and call edges extracted with ast"""
+
+    @pytest.mark.asyncio
+    async def test_import_and_call_edges(self):
+        engine = make_engine()
+        await engine.index_files([("pkg/helpers.py", HELPERS), ("pkg/service.py", SERVICE)])
+        graph = engine.repo_graph
+
+        service_id = engine._generate_id("pkg/service.py")
+        run_id = engine._generate_id("pkg/service.py#run")
+        greet_id = engine._generate_id("pkg/helpers.py#Greeter.greet")
+
+        assert [n.path for n in graph.get_neighbors(service_id, EdgeType.IMPORTS)] == [
+            "pkg/helpers.py"
+        ]
+        assert [n.name for n in graph.get_neighbors(run_id, EdgeType.CALLS)] == ["helper"]
+        assert [n.name for n in graph.get_neighbors(greet_id, EdgeType.CALLS)] == [
+            "Greeter.format"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_directory_prune_and_reload(self, tmp_path):
+        repo = tmp_path / "repo"
+        (repo / "pkg").mkdir(parents=True)
+        (repo / "pkg" / "helpers.py").write_text(HELPERS)
+        (repo / "pkg" / "service.py").write_text(SERVICE)
+
+        engine = make_engine()
+        await engine.index_directory(str(repo))
+        engine.save_index(str(tmp_path / "index"))
+
+        reloaded = make_engine()
+        reloaded.load_index(str(tmp_path / "index"))
+        (repo / "pkg" / "service.py").unlink()
+        stats = await reloaded.index_directory(str(repo))
+
+        assert stats.files_unchanged == 1
+        assert stats.files_removed == 1
+        assert stats.chunks_embedded == 0
+        assert chunk_names(reloaded, "pkg/service.py") == set()
+        assert all(m["path"] == "pkg/helpers.py" for m in reloaded.vector_store.metadata.values())
+
+    @pytest.mark.asyncio
+    async def test_per_file_indexing_matches_batched(self):
+        files = {f"pkg/m{i}.py": layered_module(i) for i in range(12)}
+        # The importer is indexed before the module it imports
+        order = ["pkg/m5.py"] + [p for p in files if p != "pkg/m5.py"]
+
+        batched = make_engine()
+        await batched.index_files(files.items())
+        incremental = make_engine()
+        for path in order:
+            await incremental.index_file(path, files[path])
+        assert edge_set(incremental) == edge_set(batched)
+
+        # Move f3 into m9, then drop m4
+        files["pkg/m3.py"] = files["pkg/m3.py"].replace("def f3(", "def h3(")
+        files["pkg/m9.py"] += "\n\ndef f3():\n    return 3\n"
+        del files["pkg/m4.py"]
+        fresh = make_engine()
+        await fresh.index_files(files.items())
+        await incremental.index_file("pkg/m3.py", files["pkg/m3.py"])
+        await incremental.index_file("pkg/m9.py", files["pkg/m9.py"])
+        await incremental.remove_file("pkg/m4.py")
+
+        assert edge_set(incremental) == edge_set(fresh)
+        assert ("g4", "f3", "calls") not in edge_set(incremental)
+        assert ("g10", "f9", "calls") in edge_set(incremental)
+
+    @pytest.mark.asyncio
+    async def test_relinks_only_files_referencing_changed_names(self):
+        engine = make_engine()
+        await engine.index_files((f"pkg/m{i}.py", layered_module(i)) for i in range(20))
+
+        unrelated = await engine.index_files([("pkg/extra.py", "def extra():\n    return 1\n")])
+        assert unrelated.files_linked == 1
+
+        # m8 imports and calls f7, m10 imports m9 and calls f9
+        renamed = await engine.index_files(
+            [("pkg/m7.py", layered_module(7).replace("def f7(", "def h7("))]
+        )
+        assert renamed.files_linked == 2
+
+        removed = await engine.remove_file("pkg/extra.py")
+        assert removed.files_linked == 0
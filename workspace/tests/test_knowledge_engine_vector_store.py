@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the KnowledgeEngine vector store - matrix-backed exact search,
+IVF approximate search and memory-mapped persistence
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pytest
+
+from core.island_ai_runtime.knowledge_engine import (
+    EmbeddingProvider,
+    KnowledgeEngine,
+    VectorStore,
+)
+
+
+def random_vectors(count: int, dimension: int = 32, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+
+
+def brute_force(vectors: np.ndarray, query: np.ndarray, k: int) -> list[int]:
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+class TestExactSearch:
+    """Exact search over the contiguous matrix"""
+
+    def test_matches_brute_force(self):
+        vectors = random_vectors(500)
+        store = VectorStore()
+        store.upsert_batch([f"v{i}" for i in range(500)], vectors)
+
+        results = store.search(vectors[7] * 3.0, top_k=5)
+
+        assert [id for id, _ in results] == [f"v{i}" for i in brute_force(vectors, vectors[7], 5)]
+        assert results[0] == ("v7", pytest.approx(1.0, abs=1e-5))
+
+    def test_delete_and_update_keep_ids_consistent(self):
+        vectors = random_vectors(10)
+        store = VectorStore()
+        for i, vector in enumerate(vectors):
+            store.upsert(f"v{i}", vector.tolist(), {"i": i})
+
+        store.delete("v2")
+        store.upsert("v5", vectors[2].tolist(), {"i": 2})
+
+        assert len(store) == 9
+        assert "v2" not in store
+        assert store.search(vectors[9], top_k=1)[0][0] == "v9"
+        assert store.search(vectors[2], top_k=1)[0][0] == "v5"
+        assert store.metadata["v5"] == {"i": 2}
+
+    def test_dimension_mismatch_rejected(self):
+        store = VectorStore(dimension=4)
+        with pytest.raises(ValueError):
+            store.upsert("a", [1.0, 2.0])
+        assert store.search([1.0, 2.0]) == []
+
+
+class TestApproximateSearch:
+    """IVF index over clustered data"""
+
+    def test_ivf_recall_on_clustered_data(self):
+        rng = np.random.default_rng(1)
+        centers = rng.standard_normal((20, 32))
+        vectors = (
+            centers[rng.integers(0, 20, 4000)] + 0.1 * rng.standard_normal((4000, 32))
+        ).astype(np.float32)
+
+        store = VectorStore(ann_threshold=1000)
+        store.upsert_batch([f"v{i}" for i in range(4000)], vectors)
+        store.build_index(n_lists=20, n_probe=3)
+        store.upsert("late", (centers[0] * 5).tolist())
+
+        hits = 0
+        for q in range(50):
+            expected = {f"v{i}" for i in brute_force(vectors, vectors[q], 10)}
+            hits += len(expected & {id for id, _ in store.search(vectors[q], top_k=10)})
+
+        assert hits / 500 >= 0.9
+        assert store.search(centers[0], top_k=1)[0][0] == "late"
+
+
+class TestPersistence:
+    """save/load round trip through memory-mapped files"""
+
+    def test_round_trip_and_copy_on_write(self, tmp_path):
+        vectors = random_vectors(200)
+        store = VectorStore(ann_threshold=100)
+        store.upsert_batch([f"v{i}" for i in range(200)], vectors, [{"i": i} for i in range(200)])
+        store.build_index(n_lists=8, n_probe=8)
+        store.save(str(tmp_path))
+
+        loaded = VectorStore.load(str(tmp_path))
+        assert isinstance(loaded._matrix, np.memmap)
+        assert loaded.search(vectors[3], top_k=3) == store.search(vectors[3], top_k=3)
+        assert loaded.metadata["v3"] == {"i": 3}
+
+        loaded.delete("v0")
+        loaded.upsert("new", vectors[0].tolist())
+        assert loaded.search(vectors[0], top_k=1)[0][0] == "new"
+        assert VectorStore.load(str(tmp_path)).search(vectors[0], top_k=1)[0][0] == "v0"
+
+
+class TestKnowledgeEngine:
+    """Engine-level batch embedding and index persistence"""
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_matches_embed(self):
+        provider = EmbeddingProvider()
+        texts = ["alpha", "beta", ""]
+
+        batch = await provider.embed_batch(texts)
+
+        assert batch == [await provider.embed(t) for t in texts]
+        assert (await provider.embed_matrix(texts)).shape == (3, provider.dimension)
+
+    @pytest.mark.asyncio
+    async def test_search_after_reload(self, tmp_path):
+        engine = KnowledgeEngine()
+        await engine.index_file("src/a.py", "def a(): pass")
+        await engine.index_file("src/b.py", "def b(): pass")
+        engine.save_index(str(tmp_path))
+
+        reloaded = KnowledgeEngine()
+        reloaded.load_index(str(tmp_path))
+        results = await reloaded.search("def b(): pass", top_k=1)
+
+        assert results[0].node.path == "src/b.py"
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Tests for ModelGateway response caching, request coalescing and
+latency/error-aware routing against local stub clients
+"""
+
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from core.island_ai_runtime.model_gateway import (
+    BaseModelClient,
+    CompletionRequest,
+    CompletionResponse,
+    ModelGateway,
+    ModelProvider,
+)
+
+
+class StubClient(BaseModelClient):
+    """Local model client with configurable latency and failures"""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[CompletionRequest] = []
+
+    async def complete(self, request: CompletionRequest) -> CompletionResponse:
+        self.calls.append(request)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.name} unavailable")
+        return CompletionResponse(
+            content=f"{self.name}:{request.messages[-1]['content']}",
+            model=request.model or self.name,
+            usage={"prompt_tokens": 1, "completion_tokens": 1},
+            finish_reason="stop",
+        )
+
+    async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        if self.fail:
+            raise ConnectionError(f"{self.name} unavailable")
+        yield self.name
+
+
+def make_gateway(clients, **config) -> ModelGateway:
+    return ModelGateway(config, clients=clients)
+
+
+CLASSIFY = [{"role": "user", "content": "Classify: refund request"}]
+
+
+class TestResponseCache:
+    """Deterministic request caching"""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_requests_are_cached(self):
+        openai = StubClient("openai")
+        gateway = make_gateway({ModelProvider.OPENAI: openai})
+
+        first = await gateway.complete(CLASSIFY, temperature=0)
+        second = await gateway.complete(CLASSIFY, temperature=0)
+        await gateway.complete(CLASSIFY, temperature=0.7)
+        await gateway.complete(CLASSIFY, temperature=0.7)
+
+        assert first == second
+        assert len(openai.calls) == 3
+        assert gateway.get_stats()["cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_key_is_the_exact_prompt(self):
+        openai = StubClient("openai")
+        gateway = make_gateway({ModelProvider.OPENAI: openai})
+
+        await gateway.complete(CLASSIFY, temperature=0)
+        padded = await gateway.complete(
+            [{"role": "user", "content": "  Classify: refund request\n"}], temperature=0
+        )
+
+        assert len(openai.calls) == 2
+        assert padded.content == "openai:  Classify: refund request\n"
+
+    @pytest.mark.asyncio
+    async def test_cached_response_is_not_shared(self):
+        gateway = make_gateway({ModelProvider.OPENAI: StubClient("openai")})
+
+        await gateway.complete(CLASSIFY, temperature=0)
+        hit = await gateway.complete(CLASSIFY, temperature=0)
+        hit.usage["prompt_tokens"] = 99
+
+        assert (await gateway.complete(CLASSIFY, temperature=0)).usage["prompt_tokens"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_survives_restart(self, tmp_path):
+        config = {"cache": {"directory": str(tmp_path), "max_entries": 1}}
+        first = StubClient("openai")
+        await make_gateway({ModelProvider.OPENAI: first}, **config).complete(CLASSIFY, temperature=0)
+
+        second = StubClient("openai")
+        response = await make_gateway({ModelProvider.OPENAI: second}, **config).complete(
+            CLASSIFY, temperature=0
+        )
+
+        assert response.content == "openai:Classify: refund request"
+        assert second.calls == []
+
+
+class TestCoalescing:
+    """Single-flight for identical concurrent requests"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        openai = StubClient("openai", delay=0.05)
+        gateway = make_gateway({ModelProvider.OPENAI: openai})
+
+        responses = await asyncio.gather(
+            *(gateway.complete(CLASSIFY, temperature=0) for _ in range(20))
+        )
+
+        assert len(openai.calls) == 1
+        assert len({r.content for r in responses}) == 1
+        assert gateway.get_stats()["coalesced"] == 19
+
+    @pytest.mark.asyncio
+    async def test_each_coalesced_caller_gets_a_copy(self):
+        gateway = make_gateway({ModelProvider.OPENAI: StubClient("openai", delay=0.05)})
+
+        first, second = await asyncio.gather(
+            gateway.complete(CLASSIFY, temperature=0),
+            gateway.complete(CLASSIFY, temperature=0),
+        )
+        first.usage["prompt_tokens"] = 99
+
+        assert gateway.get_stats()["coalesced"] == 1
+        assert first is not second
+        assert second.usage["prompt_tokens"] == 1
+
+
+class TestRouting:
+    """EWMA-based routing and fallback"""
+
+    @pytest.mark.asyncio
+    async def test_fallback_on_failure_and_unhealthy_provider_demoted(self):
+        openai = StubClient("openai", fail=True)
+        anthropic = StubClient("anthropic")
+        gateway = make_gateway(
+            {ModelProvider.OPENAI: openai, ModelProvider.ANTHROPIC: anthropic},
+            routing={"error_threshold": 0.3, "ewma_alpha": 0.5},
+            cache={"enabled": False, "coalesce": False},
+        )
+
+        response = await gateway.complete(CLASSIFY)
+        assert response.content.startswith("anthropic:")
+        assert len(openai.calls) == 1
+
+        # openai is now in cool-down, so the next request goes straight to anthropic
+        await gateway.complete(CLASSIFY)
+        assert len(openai.calls) == 1
+        assert gateway.get_stats()["providers"]["openai"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_performance_strategy_prefers_lower_latency(self):
+        slow = StubClient("openai", delay=0.03)
+        fast = StubClient("anthropic", delay=0.0)
+        gateway = make_gateway(
+            {ModelProvider.OPENAI: slow, ModelProvider.ANTHROPIC: fast},
+            routing={"strategy": "performance"},
+            cache={"enabled": False, "coalesce": False},
+        )
+
+        for i in range(10):
+            await gateway.complete([{"role": "user", "content": str(i)}])
+
+        assert len(slow.calls) == 1
+        assert len(fast.calls) == 9
+
+    @pytest.mark.asyncio
+    async def test_timeout_falls_back(self):
+        hung = StubClient("openai", delay=1.0)
+        backup = StubClient("anthropic")
+        gateway = make_gateway(
+            {ModelProvider.OPENAI: hung, ModelProvider.ANTHROPIC: backup},
+            routing={"timeout_seconds": 0.05},
+        )
+
+        response = await gateway.complete(CLASSIFY, model="gpt-4o", temperature=0)
+
+        assert response.content.startswith("anthropic:")
+        assert backup.calls[0].model is None
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back_before_first_chunk(self):
+        gateway = make_gateway(
+            {
+                ModelProvider.OPENAI: StubClient("openai", fail=True),
+                ModelProvider.ANTHROPIC: StubClient("anthropic"),
+            }
+        )
+
+        chunks = [chunk async for chunk in gateway.stream(CLASSIFY)]
+
+        assert chunks == ["anthropic"]
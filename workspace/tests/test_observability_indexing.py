@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for ObservabilityPlatform indexed retention - time and service
+indexes, incremental service aggregates and trace eviction
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.monitoring.observability_platform import (
+    CorrelationEngine,
+    LogEntry,
+    LogLevel,
+    ObservabilityPlatform,
+    TraceSpan,
+    TraceStatus,
+    benchmark_correlation,
+)
+
+
+def ingest_logs(platform, count, base, services=("api", "db")):
+    entries = []
+    for i in range(count):
+        entry = LogEntry(
+            level=LogLevel.ERROR if i % 3 == 0 else LogLevel.INFO,
+            message=f"log {i}",
+            service=services[i % len(services)],
+            trace_id=f"t{i % 4}",
+            timestamp=base + timedelta(seconds=i),
+        )
+        platform._ingest_log(entry)
+        entries.append(entry)
+    return entries
+
+
+class TestLogIndexes:
+    """Log queries read only the matching index"""
+
+    def test_filters_match_full_scan(self):
+        platform = ObservabilityPlatform()
+        base = datetime.now() - timedelta(hours=1)
+        entries = ingest_logs(platform, 300, base)
+        since = base + timedelta(seconds=120)
+
+        for service in (None, "api", "db", "missing"):
+            for level in (None, LogLevel.ERROR, LogLevel.WARNING):
+                expected = [
+                    e for e in entries
+                    if (not service or e.service == service)
+                    and (not level or e.level == level)
+                    and e.timestamp >= since
+                ]
+                assert platform.get_logs(service=service, level=level, since=since) == expected
+
+    def test_retention_evicts_from_every_index(self):
+        platform = ObservabilityPlatform(max_retention=50)
+        base = datetime.now() - timedelta(hours=1)
+        entries = ingest_logs(platform, 200, base)
+
+        assert platform.get_logs() == entries[-50:]
+        assert platform.get_logs(service="api", level=LogLevel.ERROR) == [
+            e for e in entries[-50:] if e.service == "api" and e.level == LogLevel.ERROR
+        ]
+        assert len(platform._log_indexes[("trace", "t0")]) == 12
+
+    def test_retention_by_age(self):
+        platform = ObservabilityPlatform(retention_seconds=60)
+        platform._ingest_log(LogEntry(message="old", timestamp=datetime.now() - timedelta(minutes=5)))
+        platform.log_info("new", service="api")
+
+        assert [e.message for e in platform.get_logs()] == ["new"]
+
+
+class TestSpanAggregates:
+    """Service health and slow traces are maintained as spans end"""
+
+    def test_health_counts_first_span_per_trace(self):
+        platform = ObservabilityPlatform()
+        for i in range(20):
+            root = platform.start_trace("request", service="api")
+            child = platform.start_span(root.trace_id, root.span_id, "query", service="db")
+            retry = platform.start_span(root.trace_id, root.span_id, "query", service="db")
+            child.end(TraceStatus.ERROR if i < 3 else TraceStatus.OK)
+            retry.end(TraceStatus.ERROR)
+            root.end()
+        for _ in range(11):
+            platform.log_warning("slow query", service="db")
+
+        health = platform.get_service_health("db")
+
+        assert health["total_traces"] == 20
+        assert health["error_traces"] == 3
+        assert health["status"] == "UNHEALTHY"
+        assert platform.get_service_stats("db").error_spans == 23
+        assert platform.get_service_health("api")["status"] == "HEALTHY"
+
+    def test_re_ending_a_span_replaces_its_contribution(self):
+        platform = ObservabilityPlatform()
+        span = platform.start_trace("request", service="api")
+        span.end(TraceStatus.ERROR)
+        span.end(TraceStatus.OK)
+
+        stats = platform.get_service_stats("api")
+        assert (stats.ended_spans, stats.error_spans, stats.error_traces) == (1, 0, 0)
+        assert len(platform._slow_roots) == 1
+
+    def test_slow_traces_in_trace_order(self):
+        platform = ObservabilityPlatform()
+        durations = [5000, 10, 2000, 800, 3000]
+        roots = []
+        for duration in durations:
+            root = platform.start_trace("request", service="api")
+            root.start_time -= timedelta(milliseconds=duration)
+            root.end()
+            roots.append(root)
+        unfinished = platform.start_trace("request", service="api")
+        unfinished.start_time -= timedelta(seconds=10)
+
+        assert platform.get_slow_traces(1000) == [roots[0], roots[2], roots[4]]
+
+    def test_trace_eviction_reverses_aggregates(self):
+        platform = ObservabilityPlatform(max_retention=5)
+        spans = []
+        for i in range(12):
+            root = platform.start_trace("request", service=f"svc-{i % 3}")
+            root.start_time -= timedelta(seconds=2)
+            root.end(TraceStatus.ERROR)
+            spans.append(root)
+        late = platform.start_span(spans[0].trace_id, spans[0].span_id, "late", service="svc-0")
+
+        # The revived trace is new and pushes out the oldest retained one
+        assert len(platform.get_trace(spans[0].trace_id)) == 1
+        late.end(TraceStatus.ERROR)
+        assert platform.get_slow_traces(1000) == spans[-4:]
+
+        total = sum(platform.get_service_stats(f"svc-{i}").traces for i in range(3))
+        errors = sum(platform.get_service_stats(f"svc-{i}").error_traces for i in range(3))
+        assert total == errors == 5
+        assert len(platform.get_spans(datetime.min, datetime.max)) == 5
+
+
+class TestCorrelation:
+    """Correlation reads only the window around the reference time"""
+
+    def test_correlate_by_time_matches_scan(self):
+        platform = ObservabilityPlatform()
+        base = datetime.now() - timedelta(hours=1)
+        entries = ingest_logs(platform, 2000, base)
+        spans = []
+        for i in range(0, 2000, 7):
+            span = TraceSpan(name="request", service="api", start_time=base + timedelta(seconds=i))
+            platform._add_span(span)
+            spans.append(span)
+        reference = base + timedelta(seconds=1000)
+
+        indexed = platform.correlate_by_time(reference, ["cpu"])
+        scanned = CorrelationEngine().correlate_by_time(entries, spans, ["cpu"], reference)
+
+        assert indexed.related_logs == scanned.related_logs
+        assert indexed.related_traces == scanned.related_traces
+        assert len(indexed.related_logs) == 601
+
+    def test_correlate_by_trace(self):
+        platform = ObservabilityPlatform()
+        root = platform.start_trace("request", service="api")
+        child = platform.start_span(root.trace_id, root.span_id, "query", service="db")
+        entry = platform.log_error("timeout", service="db", trace_id=root.trace_id)
+        platform.log_error("unrelated", service="db", trace_id="other")
+
+        event = platform.correlate_by_trace(root.trace_id)
+
+        assert event.related_traces == [root.span_id, child.span_id]
+        assert event.related_logs == [entry.log_id]
+        assert event.related_services == ["api", "db"]
+
+    def test_benchmark_indexed_faster_than_scan(self):
+        report = benchmark_correlation(retained=20000, queries=50)
+
+        assert report["same_result"]
+        assert report["indexed_ms_per_query"] * 10 < report["scan_ms_per_query"]
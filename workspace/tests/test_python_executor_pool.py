@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for PythonExecutor pooled interpreters - real execution, streamed
+output, timeouts, worker recycling and the cold-spawn comparison
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from core.tech_stack.python_bridge import (
+    EnvironmentType,
+    ExecutionMode,
+    PythonEnvironment,
+    PythonEnvironmentConfig,
+    PythonExecutor,
+    PythonPackage,
+    benchmark_execution,
+)
+
+
+class TestPooledExecution:
+    """Code runs in pre-started worker interpreters"""
+
+    @pytest.mark.asyncio
+    async def test_output_errors_and_fresh_globals(self):
+        executor = PythonExecutor(pool_size=1)
+        try:
+            first = await executor.execute_code("value = 41\nprint(value + 1)")
+            second = await executor.execute_code("print(value)")
+        finally:
+            await executor.close()
+
+        assert first.success and first.stdout == "42\n"
+        assert not second.success
+        assert second.error_type == "NameError"
+        assert "Traceback" in second.traceback
+        assert executor.get_execution_stats()["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_output_is_streamed(self):
+        executor = PythonExecutor(pool_size=1)
+        chunks = []
+        try:
+            result = await executor.execute_code(
+                "import sys\nprint('out')\nprint('err', file=sys.stderr)",
+                on_output=lambda stream, data: chunks.append((stream, data)),
+            )
+        finally:
+            await executor.close()
+
+        assert ("stdout", "out") in chunks and ("stderr", "err") in chunks
+        assert result.stdout == "out\n" and result.stderr == "err\n"
+
+    @pytest.mark.asyncio
+    async def test_script_and_module_modes(self, tmp_path):
+        script = tmp_path / "job.py"
+        script.write_text("import sys\nprint(__name__)\nsys.exit(0)\n")
+        executor = PythonExecutor(pool_size=1)
+        try:
+            from_script = await executor.execute_code(str(script), ExecutionMode.SCRIPT)
+            from_module = await executor.execute_code("json.tool", ExecutionMode.MODULE, timeout=5)
+        finally:
+            await executor.close()
+
+        assert from_script.success and from_script.stdout == "__main__\n"
+        # json.tool reads the (empty) stdin and reports invalid JSON
+        assert not from_module.success and from_module.error_type == "SystemExit"
+
+
+class TestWorkerLifecycle:
+    """Timeouts, crashes and recycling replace workers"""
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_worker_and_pool_recovers(self):
+        executor = PythonExecutor(pool_size=1)
+        try:
+            slow = await executor.execute_code("import time\ntime.sleep(10)", timeout=0.2)
+            after = await executor.execute_code("print('ok')")
+            crashed = await executor.execute_code("import os\nos._exit(3)")
+            stats = executor.pool.get_stats()
+        finally:
+            await executor.close()
+
+        assert slow.error_type == "TimeoutError"
+        assert slow.execution_time < 2
+        assert after.success
+        assert crashed.error_type == "ConnectionError"
+        assert stats["timeouts"] == 1 and stats["crashed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_workers_recycled_after_max_runs(self):
+        executor = PythonExecutor(pool_size=1, max_runs_per_worker=3)
+        pids = []
+        try:
+            for _ in range(7):
+                result = await executor.execute_code("import os\nprint(os.getpid())")
+                pids.append(result.stdout)
+            stats = executor.pool.get_stats()
+        finally:
+            await executor.close()
+
+        assert len(set(pids)) == 3
+        assert stats["recycled"] == 2
+
+
+class TestEnvironment:
+    """Real package installation"""
+
+    @pytest.mark.asyncio
+    async def test_failed_install_is_reported(self, tmp_path):
+        env = PythonEnvironment(PythonEnvironmentConfig(environment_type=EnvironmentType.SYSTEM))
+        await env.create()
+
+        package = PythonPackage(name=str(tmp_path / "missing-project"))
+
+        assert await env.install_package(package) is False
+        assert package.installed is False
+
+
+class TestExecutionBenchmark:
+    """Pooled runs avoid interpreter startup"""
+
+    @pytest.mark.asyncio
+    async def test_pooled_faster_than_cold_spawn(self):
+        report = await benchmark_execution(runs=5)
+
+        assert report["all_succeeded"]
+        assert report["speedup"] > 3
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for SessionMemory context packing - token budgets, tiered summaries
+of evicted spans, cached prefixes and keyword retrieval
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.island_ai_runtime.session_memory import (
+    ContextBuilder,
+    Message,
+    MessageRole,
+    SessionMemory,
+    ShortTermMemory,
+    estimate_tokens,
+)
+
+
+def word_tokenizer(text: str) -> int:
+    return len(text.split())
+
+
+def make_memory(**config) -> SessionMemory:
+    defaults = {"max_tokens": 300, "reserve_tokens": 0, "summary_tokens": 60, "summary_span_tokens": 40}
+    return SessionMemory({**defaults, **config}, tokenizer=word_tokenizer)
+
+
+class TestTokenBudget:
+    """Packing into the token budget"""
+
+    def test_context_stays_within_budget_and_keeps_pinned_state(self):
+        memory = make_memory()
+        memory.add_message("system", "Follow the deployment runbook.")
+        memory.create_plan("Ship release", [{"description": "Run migrations"}])
+
+        for i in range(200):
+            memory.add_message("user", f"Step {i} finished without errors. Extra detail {i}.")
+
+        context = memory.get_context()
+        builder = memory.context_builder
+
+        assert builder.total_tokens <= builder.max_tokens
+        assert context[0]["content"] == "Follow the deployment runbook."
+        assert "Run migrations" in context[1]["content"]
+        assert context[2]["content"].startswith(ContextBuilder.SUMMARY_HEADER)
+        assert context[-1]["content"].startswith("Step 199 ")
+        assert builder.evicted_count > 0
+
+    def test_summary_tiers_are_compacted(self):
+        builder = ContextBuilder(max_tokens=200, summary_tokens=30, span_tokens=20, tokenizer=word_tokenizer)
+        for i in range(300):
+            builder.add(Message(role=MessageRole.USER, content=f"note {i} about the incident."))
+
+        assert sum(tokens for _, tokens in builder.summaries) <= 30
+        assert builder.total_tokens <= 200
+
+    def test_default_estimate_counts_cjk_per_character(self):
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("上下文") == 3
+
+
+class TestPrefixCache:
+    """Appending does not rebuild the packed prefix"""
+
+    def test_prefix_reused_until_eviction(self):
+        memory = make_memory(max_tokens=10000)
+        memory.add_message("system", "Be brief.")
+        first = memory.get_context()
+
+        calls = []
+        memory.context_builder.tokenizer = lambda text: calls.append(text) or word_tokenizer(text)
+        memory.add_message("user", "hello there")
+        second = memory.get_context()
+
+        assert second[: len(first)] == first
+        assert calls == ["hello there"]
+
+
+class TestKeywordIndex:
+    """Indexed search and retrieval"""
+
+    def test_search_matches_substring_semantics(self):
+        memory = ShortTermMemory(max_messages=3)
+        for text in ["Refund requested", "shipping delayed", "partial REFUND issued", "refunded"]:
+            memory.add(Message(role=MessageRole.USER, content=text))
+
+        assert [m.content for m in memory.search("fund")] == ["partial REFUND issued", "refunded"]
+        assert [m.content for m in memory.search("refund iss")] == ["partial REFUND issued"]
+        assert memory.search("Refund requested") == []
+
+    def test_recall_ranks_rare_keywords_first(self):
+        memory = make_memory(max_messages=1000)
+        memory.add_message("user", "The database password rotation is scheduled for Friday.")
+        for i in range(100):
+            memory.add_message("assistant", f"Processed batch {i} for the database.")
+
+        results = memory.recall("when is the password rotation", limit=1)
+
+        assert results[0].content.startswith("The database password rotation")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for TaskRouter capability/role indexes - ordering matches a full scan,
+incremental load updates and the routing benchmark
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.tech_stack.multi_agent_coordinator import (
+    AgentCapability,
+    AgentDefinition,
+    AgentRole,
+    TaskRouter,
+    TeamTask,
+    benchmark_routing,
+)
+
+
+def scan(router: TaskRouter, task: TeamTask, max_agents: int) -> list[str]:
+    """Reference full-scan routing"""
+    agents = [
+        a for a in router.agents.values()
+        if a.is_active and a.can_handle_task(task.required_capabilities)
+        and router.agent_load[a.id] < a.max_concurrent_tasks
+    ]
+    agents.sort(key=lambda a: (a.priority, router.agent_load[a.id]))
+    return [a.id for a in agents[:max_agents]]
+
+
+class TestIndexedRouting:
+    """Indexed routing gives the same answer as a full scan"""
+
+    def test_matches_full_scan_under_changing_load(self):
+        rng = random.Random(7)
+        capabilities = list(AgentCapability)
+        router = TaskRouter()
+        for i in range(200):
+            router.register_agent(AgentDefinition(
+                name=f"a{i}",
+                capabilities=rng.sample(capabilities, 3),
+                priority=rng.randint(0, 2),
+                max_concurrent_tasks=rng.randint(1, 3),
+            ))
+
+        in_flight = []
+        for _ in range(2000):
+            task = TeamTask(required_capabilities=rng.sample(capabilities, rng.randint(0, 2)))
+            expected = scan(router, task, 3)
+            assert [a.id for a in router.find_suitable_agents(task, max_agents=3)] == expected
+
+            agent = router.route_task(task)
+            assert (agent.id if agent else None) == (expected[0] if expected else None)
+            if agent:
+                in_flight.append(agent.id)
+            if in_flight and rng.random() < 0.4:
+                router.release_agent(in_flight.pop(rng.randrange(len(in_flight))))
+
+    def test_full_agents_return_after_release(self):
+        router = TaskRouter()
+        agent = AgentDefinition(name="solo", capabilities=[AgentCapability.DEPLOYMENT], max_concurrent_tasks=1)
+        router.register_agent(agent)
+        task = TeamTask(required_capabilities=[AgentCapability.DEPLOYMENT])
+
+        assert router.route_task(task) is agent
+        assert router.route_task(task) is None
+        router.release_agent(agent.id)
+        assert router.route_task(task) is agent
+
+    def test_inactive_and_unregistered_agents_are_skipped(self):
+        router = TaskRouter()
+        first = AgentDefinition(name="first", capabilities=[AgentCapability.CODE_REVIEW])
+        second = AgentDefinition(name="second", capabilities=[AgentCapability.CODE_REVIEW])
+        router.register_agent(first)
+        router.register_agent(second)
+        task = TeamTask(required_capabilities=[AgentCapability.CODE_REVIEW])
+
+        first.is_active = False
+        assert router.find_suitable_agents(task) == [second]
+        router.unregister_agent(second.id)
+        assert router.find_suitable_agents(task) == []
+        first.is_active = True
+        assert router.find_suitable_agents(task) == [first]
+
+    def test_routing_rules_use_role_index(self):
+        router = TaskRouter()
+        coder = AgentDefinition(name="coder", role=AgentRole.CODER, priority=1)
+        reviewer = AgentDefinition(name="reviewer", role=AgentRole.REVIEWER)
+        router.register_agent(coder)
+        router.register_agent(reviewer)
+        router.add_routing_rule(
+            "reviews", lambda t: "review" in t.title, [AgentRole.CODER, AgentRole.REVIEWER]
+        )
+
+        assert router.find_suitable_agents(TeamTask(title="review PR"), max_agents=2) == [reviewer, coder]
+
+
+class TestRoutingBenchmark:
+    """Per-route cost stays flat as agents grow"""
+
+    def test_indexed_routing_is_sublinear(self):
+        small, large = benchmark_routing(agent_counts=(100, 5000), tasks=500)
+
+        assert large["routed"] == 500
+        assert large["indexed_us_per_route"] < large["linear_us_per_route"] / 5
+        assert large["indexed_us_per_route"] < small["indexed_us_per_route"] * 10
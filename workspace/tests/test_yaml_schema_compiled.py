@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled YAML schemas - equivalence with the interpreter,
+per-registry-revision caching, uniqueItems and the throughput report
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from core.yaml_module_system.yaml_schema_validator import (
+    SchemaRegistry,
+    ValidationError,
+    ValidationErrorType,
+    YAMLSchemaValidator,
+    benchmark_validation,
+)
+
+SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["id", "version", "spec"],
+    "additionalProperties": False,
+    "minProperties": 3,
+    "maxProperties": 6,
+    "properties": {
+        "id": {"type": "string", "pattern": "^[a-z][a-z0-9-]+$", "minLength": 3, "maxLength": 12},
+        "version": {"type": "string", "format": "semver"},
+        "kind": {"enum": ["Service", "Job"]},
+        "api": {"const": "v1"},
+        "spec": {
+            "type": "object",
+            "required": ["replicas"],
+            "properties": {
+                "replicas": {"type": "integer", "minimum": 1, "maximum": 10},
+                "ratio": {"type": "number", "minimum": 0, "exclusiveMinimum": True,
+                          "maximum": 1, "exclusiveMaximum": True},
+                "step": {"type": "number", "multipleOf": 5},
+                "enabled": {"type": "boolean"},
+                "owner": {"type": "string", "format": "email"},
+                "tags": {"type": "array", "minItems": 1, "maxItems": 3, "uniqueItems": True,
+                         "items": {"type": "string"}},
+                "ports": {"type": "array", "items": {"type": "object", "required": ["port"],
+                                                     "properties": {"port": {"type": "integer"}}}},
+                "extra": {"type": "any", "x-custom-validator": "no_secrets"},
+                "note": {"type": "null"},
+            },
+        },
+    },
+}
+
+VALUES = [
+    None, True, False, 0, 1, 3, 7, 11, 2.5, 0.5, 1.0, -1, 15, "", "ab", "abc", "svc-1",
+    "Bad_ID", "a" * 20, "1.2.3", "latest", "ops@example.com", "not-an-email", "v1",
+    "Service", [], ["a"], ["a", "a"], [1, 1.0], ["a", "b", "c", "d"], [{"port": 80}],
+    [{"port": "80"}, {}], {}, {"replicas": 2}, {"secret": "x"}, {"a": 1, "b": 2},
+]
+
+FIELDS = ["id", "version", "kind", "api", "spec", "unexpected"]
+SPEC_FIELDS = ["replicas", "ratio", "step", "enabled", "owner", "tags", "ports", "extra", "note"]
+
+
+def no_secrets(data, path, result):
+    if isinstance(data, dict) and "secret" in data:
+        raise ValueError("secrets are not allowed")
+
+
+def random_document(rng):
+    doc = {"id": "svc-1", "version": "1.2.3", "spec": {"replicas": 2, "tags": ["a"], "ports": [{"port": 80}]}}
+    for _ in range(rng.randrange(4)):
+        target, fields = (doc, FIELDS) if rng.random() < 0.4 else (doc.get("spec"), SPEC_FIELDS)
+        if not isinstance(target, dict):
+            continue
+        name = rng.choice(fields)
+        if rng.random() < 0.2:
+            target.pop(name, None)
+        else:
+            target[name] = rng.choice(VALUES)
+    return doc
+
+
+def error_dicts(result):
+    return result.schema_version, result.valid, [e.to_dict() for e in result.errors]
+
+
+class TestCompiledMatchesInterpreter:
+    """Compiled schemas report exactly what validate reports"""
+
+    def test_random_documents(self):
+        validator = YAMLSchemaValidator()
+        validator.register_custom_validator("no_secrets", no_secrets)
+        compiled = validator.compile(SCHEMA)
+        rng = random.Random(7)
+
+        invalid = 0
+        for _ in range(3000):
+            doc = random_document(rng)
+            expected = validator.validate(doc, SCHEMA)
+            assert error_dicts(compiled.validate(doc)) == error_dicts(expected)
+            invalid += not expected.valid
+
+        assert 0 < invalid < 3000
+
+    def test_top_level_values_and_custom_path(self):
+        validator = YAMLSchemaValidator()
+        validator.register_custom_validator("no_secrets", no_secrets)
+        compiled = validator.compile(SCHEMA)
+
+        for value in VALUES:
+            assert error_dicts(compiled.validate(value, "doc")) == error_dicts(
+                validator.validate(value, SCHEMA, "doc")
+            )
+
+        result = compiled.validate({"id": "svc", "version": "1.0.0", "spec": {"replicas": 1, "extra": {"secret": 1}}})
+        assert [(e.path, e.error_type) for e in result.errors] == [
+            ("$.spec.extra", ValidationErrorType.CUSTOM_VALIDATION_FAILED)
+        ]
+
+    def test_custom_validator_registered_after_compile(self):
+        validator = YAMLSchemaValidator()
+        compiled = validator.compile({"x-custom-validator": "late"})
+        assert compiled.validate(1).valid
+
+        def late(data, path, result):
+            result.add_error(ValidationError(path, ValidationErrorType.CUSTOM_VALIDATION_FAILED, "late"))
+
+        validator.register_custom_validator("late", late)
+        assert not compiled.validate(1).valid
+
+    def test_self_referencing_schema(self):
+        tree = {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}
+        tree["properties"]["children"] = {"type": "array", "items": tree}
+        validator = YAMLSchemaValidator()
+        doc = {"name": "root", "children": [{"name": "a", "children": [{"children": []}]}]}
+
+        result = validator.compile(tree).validate(doc)
+
+        assert error_dicts(result) == error_dicts(validator.validate(doc, tree))
+        assert [e.path for e in result.errors] == ["$.children[0].children[0].name"]
+
+    def test_unsupported_type_declaration_fails_the_same_way(self):
+        validator = YAMLSchemaValidator()
+        schema = {"type": "object", "properties": {"note": {"type": ["string", "null"]}}}
+        compiled = validator.compile(schema)
+
+        assert compiled.validate({}).valid
+        with pytest.raises(TypeError):
+            validator.validate({"note": "x"}, schema)
+        with pytest.raises(TypeError):
+            compiled.validate({"note": "x"})
+
+
+class TestRegistryCompilation:
+    """Registered schemas compile once per registry revision"""
+
+    def test_compiled_once_until_registry_changes(self):
+        registry = SchemaRegistry()
+        registry.register("module", {"type": "object", "required": ["id"]})
+        validator = YAMLSchemaValidator(registry)
+
+        first = validator.get_compiled("module")
+        assert validator.get_compiled("module") is first
+        assert not validator.validate_registered({}, "module").valid
+
+        registry.register("module", {"type": "object"}, version="2.0.0")
+
+        assert validator.get_compiled("module") is not first
+        assert validator.validate_registered({}, "module").valid
+        assert not validator.validate_registered({}, "module", version="1.0.0").valid
+
+    def test_unknown_schema(self):
+        validator = YAMLSchemaValidator()
+
+        assert validator.get_compiled("missing") is None
+        with pytest.raises(ValueError, match="missing@1.0.0"):
+            validator.validate_registered({}, "missing", version="1.0.0")
+
+
+class TestUniqueItems:
+    """uniqueItems keeps its equality rules without the quadratic scan"""
+
+    @pytest.mark.parametrize("items, unique", [
+        ([1, 1.0], False),
+        ([1, True], False),
+        ([{"a": 1, "b": 2}, {"b": 2, "a": 1}], False),
+        (["[1]", [1]], False),
+        ([{1}, frozenset({1})], False),
+        ([{1}, {2}], True),
+        ([0, False, "0"], False),
+        ([1, "1", [1], {"1": 1}], True),
+    ])
+    def test_equality_rules(self, items, unique):
+        validator = YAMLSchemaValidator()
+        schema = {"uniqueItems": True}
+
+        assert validator.validate(items, schema).valid is unique
+        assert validator.compile(schema).validate(items).valid is unique
+
+    def test_large_array_is_linear(self):
+        calls = {"eq": 0, "hash": 0}
+
+        class Counted:
+            def __init__(self, value):
+                self.value = value
+
+            def __eq__(self, other):
+                calls["eq"] += 1
+                return isinstance(other, Counted) and self.value == other.value
+
+            def __hash__(self):
+                calls["hash"] += 1
+                return hash(self.value)
+
+        validator = YAMLSchemaValidator()
+        compiled = validator.compile({"uniqueItems": True})
+        items = [Counted(i) for i in range(20000)]
+
+        assert compiled.validate(items).valid
+        assert not validator.validate(items + [Counted(0)], {"uniqueItems": True}).valid
+        # A set lookup and insert per item and run; a pairwise scan would
+        # need ~2 * 10**8 comparisons
+        assert calls["hash"] <= 4 * (len(items) + 1)
+        assert calls["eq"] <= 1
+
+
+class TestThroughputReport:
+
+    def test_compiled_matches_interpreter(self):
+        report = benchmark_validation(documents=300)
+
+        assert report["same_result"]
+        assert 0 < report["invalid_documents"] < report["documents"]
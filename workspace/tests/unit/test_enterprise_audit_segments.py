@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Enterprise Segmented Audit Storage Test Suite
+
+Tests:
+- Entries round-trip through segment files
+- Segments roll and sealed indexes prune queries by org and time
+- Torn tail records are truncated on reopen
+- Appends proceed while an fsync is in flight; background fsync failures surface
+- Streaming JSONL/CSV/JSON exports
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.data.audit import AuditAction, AuditEntry, AuditLogger, AuditQuery
+from enterprise.data.audit_segments import SegmentedAuditStorage, StreamingAuditExporter
+
+BASE_TIME = datetime(2026, 1, 1)
+
+
+def make_entry(org_id, hours: int, action=AuditAction.API_CALL) -> AuditEntry:
+    return AuditEntry(
+        action=action,
+        org_id=org_id,
+        resource_type="api",
+        resource_id=f"/r/{hours}",
+        description=f"call {hours}",
+        timestamp=BASE_TIME + timedelta(hours=hours),
+    )
+
+
+class TestSegmentedAuditStorage:
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_segment_roll(self, tmp_path):
+        storage = SegmentedAuditStorage(str(tmp_path), segment_max_bytes=4096)
+        org_a, org_b = uuid4(), uuid4()
+
+        await asyncio.gather(*(
+            storage.store(make_entry(org_a if i % 2 else org_b, i))
+            for i in range(200)
+        ))
+
+        assert storage.get_stats()["segments"] > 1
+        assert await storage.count(AuditQuery()) == 200
+        assert await storage.count(AuditQuery(org_id=org_a)) == 100
+
+        window = await storage.query(
+            AuditQuery(
+                org_id=org_a,
+                start_time=BASE_TIME + timedelta(hours=10),
+                end_time=BASE_TIME + timedelta(hours=19),
+            ),
+            limit=100,
+        )
+        assert [e.resource_id for e in window] == [f"/r/{h}" for h in range(11, 20, 2)]
+        assert all(isinstance(e, AuditEntry) for e in window)
+
+        entry = window[0]
+        assert (await storage.get_by_id(entry.id)).to_dict() == entry.to_dict()
+
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_reopen_truncates_torn_record(self, tmp_path):
+        storage = SegmentedAuditStorage(str(tmp_path))
+        org_id = uuid4()
+        for i in range(3):
+            await storage.store(make_entry(org_id, i))
+        await storage.close()
+
+        segment = next(tmp_path.glob("segment-*.log"))
+        with open(segment, "ab") as f:
+            f.write(b"\x00\x00\x01\x00garbage")
+
+        reopened = SegmentedAuditStorage(str(tmp_path))
+        await reopened.store(make_entry(org_id, 3))
+
+        assert await reopened.count(AuditQuery()) == 4
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_append_does_not_wait_for_fsync(self, tmp_path, monkeypatch):
+        storage = SegmentedAuditStorage(str(tmp_path), durable=False)
+        org_id = uuid4()
+        await storage.store(make_entry(org_id, 0))
+
+        release = threading.Event()
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: (release.wait(5), real_fsync(fd)))
+
+        flushing = asyncio.ensure_future(storage.flush())
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(storage.store(make_entry(org_id, 1)), timeout=1)
+        assert not flushing.done()
+
+        release.set()
+        await flushing
+        assert await storage.count(AuditQuery()) == 2
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_background_fsync_failure_surfaces_on_next_store(self, tmp_path, monkeypatch):
+        storage = SegmentedAuditStorage(str(tmp_path), durable=False)
+        org_id = uuid4()
+        real_fsync = os.fsync
+
+        def failing_fsync(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "fsync", failing_fsync)
+        await storage.store(make_entry(org_id, 0))
+        await asyncio.sleep(storage.fsync_interval_seconds + 0.05)
+
+        with pytest.raises(OSError, match="disk full"):
+            await storage.store(make_entry(org_id, 1))
+
+        monkeypatch.setattr(os, "fsync", real_fsync)
+        await storage.store(make_entry(org_id, 2))
+        assert await storage.count(AuditQuery()) == 2
+        await storage.close()
+
+
+async def make_audit_logger(directory) -> tuple[AuditLogger, object]:
+    """Audit logger over a segmented store holding 25 entries"""
+    storage = SegmentedAuditStorage(str(directory), durable=False)
+    org_id = uuid4()
+    for i in range(25):
+        await storage.store(make_entry(org_id, i))
+    exporter = StreamingAuditExporter(storage, chunk_size=10)
+    return AuditLogger(storage=storage, exporter=exporter), org_id
+
+
+class TestStreamingAuditExporter:
+
+    @pytest.mark.asyncio
+    async def test_stream_jsonl_in_chunks(self, tmp_path):
+        audit, org_id = await make_audit_logger(tmp_path)
+
+        chunks = [
+            chunk async for chunk in audit.stream_audit_log(
+                org_id, BASE_TIME, BASE_TIME + timedelta(days=1), format="jsonl"
+            )
+        ]
+
+        lines = b"".join(chunks).decode().splitlines()
+        assert len(chunks) == 3
+        assert len(lines) == 25
+        assert json.loads(lines[0])["org_id"] == str(org_id)
+
+    @pytest.mark.asyncio
+    async def test_export_csv_and_json(self, tmp_path):
+        audit, org_id = await make_audit_logger(tmp_path)
+        end = BASE_TIME + timedelta(days=1)
+
+        rows = list(csv.DictReader(io.StringIO(
+            (await audit.export_audit_log(org_id, BASE_TIME, end, format="csv")).decode()
+        )))
+        data = json.loads(await audit.export_audit_log(org_id, BASE_TIME, end, format="json"))
+
+        assert len(rows) == 25
+        assert rows[0]["action"] == "api.call"
+        assert len(data) == 25
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Enterprise Chunked Backup Test Suite
+
+Tests the incremental, deduplicating backup pipeline of DisasterRecovery:
+- Content-defined chunk boundaries survive insertions
+- A second backup of mostly identical data stores only changed chunks
+- Restore reassembles byte-identical exports, full backup first for incrementals
+- A missing export fails the backup and its verification
+- Expired backups release their chunks
+- Garbage collection never deletes chunks an in-flight backup relies on
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.reliability.chunked_backup import (
+    ChunkedBackupEngine,
+    LocalChunkStore,
+    find_chunk_boundaries,
+)
+from enterprise.reliability.disaster_recovery import (
+    BackupStatus,
+    BackupType,
+    DisasterRecovery,
+    BackupConfig,
+    RecoveryPoint,
+)
+
+
+class InMemoryBackupStorage:
+    def __init__(self):
+        self.records = {}
+
+    async def save_backup(self, record):
+        self.records[record.id] = record
+        return record
+
+    async def get_backup(self, backup_id):
+        return self.records.get(backup_id)
+
+    async def list_backups(self, backup_type=None, status=None, limit=100):
+        return [
+            r for r in self.records.values()
+            if (backup_type is None or r.backup_type == backup_type)
+            and (status is None or r.status == status)
+        ][:limit]
+
+    async def delete_backup(self, backup_id):
+        return self.records.pop(backup_id, None) is not None
+
+
+class FileEventLogService:
+    """Exports a mutable byte buffer as the event log"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.imported = None
+
+    async def export_events(self, start_time, end_time, destination):
+        Path(destination).write_bytes(self.data)
+        return {"size_bytes": len(self.data)}
+
+    async def import_events(self, source):
+        self.imported = Path(source).read_bytes()
+        return 1
+
+
+class WindowedEventLogService:
+    """Exports only the events inside the requested time window"""
+
+    def __init__(self):
+        self.events: list[tuple[datetime, str]] = []
+        self.imported: list[str] = []
+
+    def record(self, event: str) -> None:
+        self.events.append((datetime.utcnow(), event))
+
+    async def export_events(self, start_time, end_time, destination):
+        data = "".join(
+            f"{event}\n" for ts, event in self.events if start_time < ts <= end_time
+        ).encode()
+        Path(destination).write_bytes(data)
+        return {"size_bytes": len(data)}
+
+    async def import_events(self, source):
+        events = Path(source).read_text().splitlines()
+        self.imported.extend(events)
+        return len(events)
+
+
+class MissingExportDatabaseService:
+    """Reports a database export but writes nothing"""
+
+    async def create_backup(self, backup_type, destination):
+        return {"size_bytes": 0}
+
+    async def verify_backup(self, source):
+        return True
+
+
+def random_bytes(size: int, seed: int) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+class SlowChunkStore(LocalChunkStore):
+    """Chunk store whose lookups are slow enough to interleave with GC"""
+
+    def has_chunk(self, digest: str) -> bool:
+        time.sleep(0.005)
+        return super().has_chunk(digest)
+
+
+class TestContentDefinedChunking:
+
+    def test_boundaries_resynchronize_after_insertion(self):
+        data = random_bytes(512 * 1024, seed=1)
+        edited = data[:1000] + b"inserted" + data[1000:]
+
+        before = find_chunk_boundaries(data, 2048, 8192, 32768)
+        after = find_chunk_boundaries(edited, 2048, 8192, 32768)
+
+        assert before[-1] == len(data)
+        shifted = {b + 8 for b in before if b > 1000}
+        assert len(shifted & set(after)) >= len(shifted) - 2
+
+
+class TestChunkedDisasterRecovery:
+
+    @pytest.fixture
+    def recovery(self, tmp_path):
+        engine = ChunkedBackupEngine(
+            store=LocalChunkStore(str(tmp_path / "store")),
+            min_chunk_size=2048,
+            avg_chunk_size=8192,
+            max_chunk_size=32768,
+            block_size=256 * 1024,
+            max_workers=2,
+        )
+        return DisasterRecovery(
+            config=BackupConfig(staging_dir=str(tmp_path / "staging")),
+            backup_storage=InMemoryBackupStorage(),
+            event_log_service=FileEventLogService(random_bytes(1024 * 1024, seed=2)),
+            chunked_backup=engine,
+        )
+
+    @pytest.mark.asyncio
+    async def test_incremental_backup_deduplicates_and_restores(self, recovery):
+        full = await recovery.create_backup(BackupType.FULL)
+        assert full.status == BackupStatus.COMPLETED
+        assert full.chunked and full.verified
+        assert full.stored_bytes > 0
+
+        data = recovery.event_log_service.data
+        recovery.event_log_service.data = data[:5000] + b"new webhook" + data[5000:]
+
+        incremental = await recovery.create_backup(BackupType.INCREMENTAL)
+        assert incremental.parent_backup_id == full.id
+        assert incremental.size_bytes == len(data) + 11
+        assert incremental.stored_bytes < full.stored_bytes / 10
+
+        result = await recovery.restore_to_point(
+            RecoveryPoint(database_recoverable=False, required_backups=[incremental.id])
+        )
+        assert result["status"] == "completed"
+        assert recovery.event_log_service.imported == recovery.event_log_service.data
+        assert not os.listdir(recovery.config.staging_dir)
+
+    @pytest.mark.asyncio
+    async def test_incremental_restore_applies_the_whole_chain(self, recovery):
+        events = WindowedEventLogService()
+        recovery.event_log_service = events
+        for i in range(3):
+            events.record(f"before-full-{i}")
+        full = await recovery.create_backup(BackupType.FULL)
+
+        await asyncio.sleep(0.01)
+        events.record("after-full")
+        incremental = await recovery.create_backup(BackupType.INCREMENTAL)
+        assert incremental.parent_backup_id == full.id
+
+        result = await recovery.restore_to_point(
+            RecoveryPoint(database_recoverable=False, required_backups=[incremental.id])
+        )
+
+        assert result["status"] == "completed"
+        assert events.imported == [event for _, event in events.events]
+
+    @pytest.mark.asyncio
+    async def test_missing_export_fails_backup(self, recovery):
+        recovery.db_backup_service = MissingExportDatabaseService()
+
+        record = await recovery.create_backup(BackupType.FULL)
+
+        assert record.status == BackupStatus.FAILED
+        assert "database" in record.error
+
+    @pytest.mark.asyncio
+    async def test_verify_rejects_manifest_without_expected_stream(self, recovery):
+        record = await recovery.create_backup(BackupType.FULL)
+
+        assert await recovery.chunked_backup.verify(record.id, ["events"])
+        assert not await recovery.chunked_backup.verify(record.id, ["database", "events"])
+
+    @pytest.mark.asyncio
+    async def test_cleanup_collects_unreferenced_chunks(self, recovery):
+        first = await recovery.create_backup(BackupType.FULL)
+        recovery.event_log_service.data = random_bytes(256 * 1024, seed=3)
+        await recovery.create_backup(BackupType.FULL)
+
+        store = recovery.chunked_backup.store
+        chunks_before = len(store.list_chunks())
+
+        first.expires_at = datetime.utcnow() - timedelta(days=1)
+        assert await recovery.cleanup_expired_backups(dry_run=False) == 1
+        assert len(store.list_chunks()) < chunks_before
+        assert store.load_manifest(first.id) is None
+
+
+class TestGarbageCollection:
+
+    @pytest.mark.asyncio
+    async def test_gc_waits_for_in_flight_backup(self, tmp_path):
+        source = tmp_path / "events.bin"
+        source.write_bytes(random_bytes(512 * 1024, seed=4))
+        engine = ChunkedBackupEngine(
+            store=SlowChunkStore(str(tmp_path / "store")),
+            min_chunk_size=2048,
+            avg_chunk_size=8192,
+            max_chunk_size=32768,
+            block_size=64 * 1024,
+            executor=ThreadPoolExecutor(max_workers=2),
+        )
+
+        # Orphan every chunk, then re-use them from a new backup while GC runs
+        orphaned = uuid4()
+        await engine.backup(orphaned, {"events": str(source)})
+        await engine.delete_backup(orphaned)
+
+        backup_id = uuid4()
+        backup = asyncio.create_task(engine.backup(backup_id, {"events": str(source)}))
+        await asyncio.sleep(0.05)
+        assert not backup.done()
+
+        deleted = await engine.collect_garbage()
+        manifest = await backup
+
+        assert deleted == 0
+        assert manifest.stored_bytes == 0
+        assert await engine.verify(backup_id)
+        engine.executor.shutdown()
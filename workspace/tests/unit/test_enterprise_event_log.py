@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Enterprise Event Log Bulk Ingestion and Streaming Replay Test Suite
+
+Tests:
+- store_events persists a batch in one write and publishes it in one call
+- stream_events walks every event exactly once via keyset pagination
+- replay_events respects the in-flight limit
+- A crashed replay resumes from its checkpoint
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.events.event_log import (
+    EventCursor,
+    EventFilter,
+    EventLog,
+    EventStatus,
+    ReplayCheckpoint,
+    StoredEvent,
+)
+
+
+class InMemoryEventStorage:
+    """Event storage keeping events sorted by (received_at, id)"""
+
+    def __init__(self):
+        self.events: dict = {}
+        self.batch_writes = 0
+        self.fail_updates_after: int | None = None
+        self.updates = 0
+
+    async def save(self, event):
+        self.events[event.id] = event
+        return event
+
+    async def save_batch(self, events):
+        self.batch_writes += 1
+        for event in events:
+            self.events[event.id] = event
+        return events
+
+    async def get(self, event_id):
+        return self.events.get(event_id)
+
+    async def update(self, event):
+        if self.fail_updates_after is not None and self.updates >= self.fail_updates_after:
+            raise RuntimeError("storage crashed")
+        self.updates += 1
+        await asyncio.sleep(0)
+        self.events[event.id] = event
+        return event
+
+    def _matches(self, event, filter):
+        return (
+            (filter.org_id is None or event.org_id == filter.org_id)
+            and (filter.status is None or event.status == filter.status)
+        )
+
+    async def query(self, filter, offset=0, limit=100):
+        matched = [e for e in self.events.values() if self._matches(e, filter)]
+        return matched[offset:offset + limit]
+
+    async def query_page(self, filter, after=None, limit=100):
+        ordered = sorted(self.events.values(), key=lambda e: (e.received_at, e.id))
+        if after:
+            ordered = [
+                e for e in ordered
+                if (e.received_at, e.id) > (after.received_at, after.event_id)
+            ]
+        return [e for e in ordered if self._matches(e, filter)][:limit]
+
+    async def count(self, filter):
+        return len(await self.query(filter, limit=len(self.events)))
+
+
+class RecordingPublisher:
+    """Publisher tracking calls and peak concurrency"""
+
+    def __init__(self):
+        self.published = []
+        self.batches = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def publish(self, event):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.published.append(event.id)
+        self.in_flight -= 1
+
+    async def publish_batch(self, events):
+        self.batches += 1
+        self.published.extend(e.id for e in events)
+
+
+class InMemoryCheckpointStore:
+    """Checkpoint store"""
+
+    def __init__(self):
+        self.checkpoints: dict[str, ReplayCheckpoint] = {}
+
+    async def load(self, replay_id):
+        return self.checkpoints.get(replay_id)
+
+    async def save(self, checkpoint):
+        self.checkpoints[checkpoint.replay_id] = checkpoint
+
+
+def seed(storage, org_id, count, status=EventStatus.PROCESSED):
+    """Insert events with distinct, increasing received_at"""
+    base = datetime(2026, 1, 1)
+    for i in range(count):
+        event = StoredEvent(
+            org_id=org_id,
+            event_type="push",
+            status=status,
+            received_at=base + timedelta(seconds=i),
+        )
+        storage.events[event.id] = event
+
+
+class TestBulkIngestion:
+
+    @pytest.mark.asyncio
+    async def test_store_events_single_write_and_publish(self):
+        storage = InMemoryEventStorage()
+        publisher = RecordingPublisher()
+        log = EventLog(storage=storage, publisher=publisher)
+        org_id = uuid4()
+
+        events = await log.store_events([
+            {"org_id": org_id, "event_type": "push", "source": "github",
+             "source_id": f"d-{i}", "payload": {"i": i}}
+            for i in range(50)
+        ])
+
+        assert len(events) == 50
+        assert storage.batch_writes == 1
+        assert publisher.batches == 1
+        assert [e.source_id for e in events] == [f"d-{i}" for i in range(50)]
+
+
+class TestStreamingReplay:
+
+    @pytest.mark.asyncio
+    async def test_stream_events_visits_each_event_once(self):
+        storage = InMemoryEventStorage()
+        org_id = uuid4()
+        seed(storage, org_id, 1001)
+        log = EventLog(storage=storage, page_size=100)
+
+        seen = [e.id async for e in log.stream_events(EventFilter(org_id=org_id))]
+
+        assert len(seen) == 1001
+        assert len(set(seen)) == 1001
+
+    @pytest.mark.asyncio
+    async def test_replay_respects_in_flight_limit(self):
+        storage = InMemoryEventStorage()
+        publisher = RecordingPublisher()
+        org_id = uuid4()
+        seed(storage, org_id, 200, status=EventStatus.FAILED)
+        log = EventLog(storage=storage, publisher=publisher, page_size=50)
+
+        count = await log.replay_failed(org_id, max_in_flight=4)
+
+        assert count == 200
+        assert 1 < publisher.peak <= 4
+        assert all(e.status == EventStatus.RECEIVED for e in storage.events.values())
+
+    @pytest.mark.asyncio
+    async def test_replay_resumes_from_checkpoint(self):
+        storage = InMemoryEventStorage()
+        publisher = RecordingPublisher()
+        checkpoints = InMemoryCheckpointStore()
+        org_id = uuid4()
+        seed(storage, org_id, 100)
+        log = EventLog(
+            storage=storage,
+            publisher=publisher,
+            checkpoint_store=checkpoints,
+            page_size=10,
+        )
+        filter = EventFilter(org_id=org_id)
+
+        storage.fail_updates_after = 35
+        with pytest.raises(RuntimeError):
+            await log.replay_events(filter, limit=None, replay_id="outage")
+
+        checkpoint = checkpoints.checkpoints["outage"]
+        assert checkpoint.replayed == 30
+        assert not checkpoint.completed
+
+        storage.fail_updates_after = None
+        resumed = await log.replay_events(filter, limit=None, replay_id="outage")
+
+        assert resumed == 70
+        assert checkpoints.checkpoints["outage"].completed
+        assert isinstance(checkpoints.checkpoints["outage"].cursor, EventCursor)
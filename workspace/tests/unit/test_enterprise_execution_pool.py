@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Enterprise Execution Environment Pool Test Suite
+
+Tests warm environment reuse in ExecutionIsolator using the local
+subprocess runtime:
+- Environments are reused across executions
+- Environments are reset between executions
+- Max-reuse retirement
+- Failed/unhealthy environments are never handed out again
+- Acquire timeout when the pool is exhausted
+- Separate pools per org and isolation policy
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.execution.isolator import ExecutionIsolator, ExecutionSpec, IsolationPolicy
+from enterprise.execution.local_runtime import LocalProcessRuntime
+from enterprise.execution.pool import (
+    EnvironmentPool,
+    EnvironmentPoolConfig,
+    PoolExhaustedError,
+)
+
+
+ORG_ID = uuid4()
+
+
+def make_spec(*command: str, timeout: int = 10, org_id=ORG_ID) -> ExecutionSpec:
+    """Build a spec running a shell snippet"""
+    return ExecutionSpec(
+        org_id=org_id,
+        image="local",
+        command=list(command),
+        isolation_policy=IsolationPolicy(execution_timeout_seconds=timeout),
+    )
+
+
+@pytest.fixture
+def runtime(tmp_path):
+    """Local runtime rooted in a temp dir"""
+    return LocalProcessRuntime(base_dir=str(tmp_path))
+
+
+class TestEnvironmentPool:
+    """Warm pool behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_environment_reused_and_reset(self, runtime):
+        """Second execution runs in the same environment with a clean root"""
+        pool = EnvironmentPool(runtime=runtime, config=EnvironmentPoolConfig(min_size=1))
+        isolator = ExecutionIsolator(environment_pool=pool)
+
+        first = await isolator.execute(make_spec("sh", "-c", "echo hi > marker; echo ok"))
+        second = await isolator.execute(make_spec("sh", "-c", "ls"))
+
+        assert first.success and first.stdout.strip() == "ok"
+        assert second.success
+        assert second.container_id == first.container_id
+        assert "marker" not in second.stdout
+        assert pool.get_stats()["created"] == 1
+        assert pool.get_stats()["reused"] == 1
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_max_reuse_retires_environment(self, runtime):
+        """Environment is destroyed once it reaches max_reuse"""
+        pool = EnvironmentPool(
+            runtime=runtime,
+            config=EnvironmentPoolConfig(min_size=0, max_reuse=2),
+        )
+        isolator = ExecutionIsolator(environment_pool=pool)
+
+        ids = [
+            (await isolator.execute(make_spec("true"))).container_id
+            for _ in range(3)
+        ]
+
+        assert ids[0] == ids[1]
+        assert ids[2] != ids[0]
+        assert pool.get_stats()["retired"] == 1
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_timed_out_environment_not_reused(self, runtime):
+        """A timed-out execution retires its environment"""
+        pool = EnvironmentPool(runtime=runtime, config=EnvironmentPoolConfig(min_size=0))
+        isolator = ExecutionIsolator(environment_pool=pool)
+
+        timed_out = await isolator.execute(make_spec("sleep", "5", timeout=1))
+        after = await isolator.execute(make_spec("true"))
+
+        assert timed_out.exit_code == 124
+        assert after.success
+        assert after.container_id != timed_out.container_id
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_environment_replaced(self, runtime):
+        """Idle environments failing health checks are discarded on acquire"""
+        pool = EnvironmentPool(
+            runtime=runtime,
+            config=EnvironmentPoolConfig(min_size=0, health_check_interval_seconds=0),
+        )
+        spec = make_spec("true")
+        assert await pool.warm(count=1, spec=spec) == 1
+
+        stale = pool._slots[pool.key_for(spec)].idle[0]
+        await runtime.destroy_container(stale.container_id)
+
+        env = await pool.acquire(spec)
+        assert env.container_id != stale.container_id
+
+        await pool.release(env)
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire_times_out_when_exhausted(self, runtime):
+        """acquire() raises once max_size environments are all busy"""
+        pool = EnvironmentPool(
+            runtime=runtime,
+            config=EnvironmentPoolConfig(min_size=0, max_size=1, acquire_timeout_seconds=0.1),
+        )
+        held = await pool.acquire(make_spec("true"))
+
+        with pytest.raises(PoolExhaustedError):
+            await pool.acquire(make_spec("true"))
+
+        waiter = asyncio.create_task(pool.acquire(make_spec("true")))
+        await pool.release(held)
+        assert (await waiter).container_id == held.container_id
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_orgs_and_policies_get_separate_environments(self, runtime):
+        """Environments are never shared across orgs or isolation policies"""
+        pool = EnvironmentPool(runtime=runtime, config=EnvironmentPoolConfig(min_size=0))
+        isolator = ExecutionIsolator(environment_pool=pool)
+
+        org_a = make_spec("true")
+        org_b = make_spec("true", org_id=uuid4())
+        org_a_strict = make_spec("true", timeout=20)
+        org_a_again = make_spec("true")
+
+        ids = [
+            (await isolator.execute(spec)).container_id
+            for spec in (org_a, org_b, org_a_strict, org_a_again)
+        ]
+
+        assert len(set(ids[:3])) == 3
+        assert ids[3] == ids[0]
+        assert len(pool.get_stats()["pools"]) == 3
+
+        await pool.close()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Enterprise Idempotency Fast Path Test Suite
+
+Tests the local layer IdempotencyManager puts in front of storage:
+- Never-seen keys skip the lookup read when storage inserts atomically
+- A restarted process still sees completed keys
+- Completed responses are served from the local cache
+- Concurrent checks of one key share a lookup and run the work once
+- Failures and releases still allow retries
+- The bundled SQLite storage provides the atomic insert
+"""
+
+import asyncio
+import copy
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.events.idempotency import (
+    AtomicIdempotencyStorage,
+    IdempotencyKey,
+    IdempotencyManager,
+    IdempotencyRecord,
+    IdempotencyStatus,
+)
+from enterprise.events.idempotency_cache import BloomFilter, LocalIdempotencyCache
+from enterprise.events.idempotency_store import SQLiteIdempotencyStorage
+
+
+class MemoryStorage:
+    """IdempotencyStorage that counts round-trips"""
+
+    def __init__(self, latency: float = 0.0):
+        self.records = {}
+        self.latency = latency
+        self.calls = {"get": 0, "save": 0, "update": 0, "delete": 0}
+
+    async def _round_trip(self, op):
+        self.calls[op] += 1
+        await asyncio.sleep(self.latency)
+
+    async def get_by_key(self, key_hash):
+        await self._round_trip("get")
+        record = self.records.get(key_hash)
+        return copy.deepcopy(record) if record else None
+
+    async def save(self, record):
+        await self._round_trip("save")
+        self.records[record.key_hash] = copy.deepcopy(record)
+        return record
+
+    async def update(self, record):
+        await self._round_trip("update")
+        self.records[record.key_hash] = copy.deepcopy(record)
+        return record
+
+    async def delete(self, key_hash):
+        await self._round_trip("delete")
+        return self.records.pop(key_hash, None) is not None
+
+    async def cleanup_expired(self):
+        return 0
+
+
+class AtomicStorage(MemoryStorage):
+    """Storage with an atomic conditional insert"""
+
+    async def save_if_absent(self, record):
+        await self._round_trip("save")
+        if record.key_hash in self.records:
+            return None
+        self.records[record.key_hash] = copy.deepcopy(record)
+        return record
+
+
+def make_key(discriminator: str = "") -> IdempotencyKey:
+    return IdempotencyKey(
+        org_id=uuid4(),
+        operation_type="pr_analysis",
+        repo_full_name="acme/api",
+        head_sha="abc123",
+        discriminator=discriminator,
+    )
+
+
+class TestBloomFilter:
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [make_key(str(i)).hash for i in range(1000)]
+        for key_hash in keys:
+            bloom.add(key_hash)
+
+        assert all(key_hash in bloom for key_hash in keys)
+        false_positives = sum(make_key(f"other-{i}").hash in bloom for i in range(2000))
+        assert false_positives < 100
+
+
+class TestFastPath:
+
+    @pytest.mark.asyncio
+    async def test_new_key_skips_the_lookup(self):
+        storage = AtomicStorage()
+        manager = IdempotencyManager(storage=storage)
+        key = make_key()
+
+        async with manager.guard(key) as guard:
+            assert not guard.is_duplicate
+            await guard.complete({"run_id": "r1"})
+
+        assert storage.calls == {"get": 1, "save": 1, "update": 1, "delete": 0}
+        assert storage.records[key.hash].status == IdempotencyStatus.COMPLETED
+
+        async with manager.guard(key) as guard:
+            assert guard.is_duplicate
+            assert guard.cached_result == {"run_id": "r1"}
+        assert storage.calls["get"] == 1
+        assert manager.get_stats()["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_storage_without_atomic_insert_still_reads(self):
+        storage = MemoryStorage()
+        manager = IdempotencyManager(storage=storage)
+        await manager.check(make_key())
+
+        assert storage.calls["get"] == 1
+        assert manager.get_stats()["filter_skips"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("storage_class", [MemoryStorage, AtomicStorage])
+    async def test_completed_key_survives_restart(self, storage_class):
+        storage = storage_class()
+        key = make_key()
+        before = IdempotencyManager(storage=storage)
+        await before.check(key)
+        await before.complete(key, {"run_id": "r1"})
+
+        restarted = IdempotencyManager(storage=storage)
+        result = await restarted.check(key)
+
+        assert result.is_duplicate
+        assert result.cached_result == {"run_id": "r1"}
+        assert storage.records[key.hash].status == IdempotencyStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_complete_refuses_record_taken_over(self):
+        storage = AtomicStorage()
+        manager = IdempotencyManager(storage=storage)
+        key = make_key()
+        await manager.check(key)
+
+        # The record expired and another process started its own attempt
+        await storage.delete(key.hash)
+        await IdempotencyManager(storage=storage).check(key)
+
+        with pytest.raises(ValueError, match="taken over"):
+            await manager.complete(key, {"run_id": "stale"})
+        assert storage.records[key.hash].status == IdempotencyStatus.IN_PROGRESS
+
+    @pytest.mark.asyncio
+    async def test_abandoned_owned_records_are_bounded(self):
+        cache = LocalIdempotencyCache(max_owned=3)
+        manager = IdempotencyManager(storage=AtomicStorage(), local_cache=cache)
+        for i in range(10):
+            await manager.check(make_key(str(i)))
+
+        assert manager.get_stats()["owned"] == 3
+
+    @pytest.mark.asyncio
+    async def test_key_written_by_another_process_is_a_duplicate(self):
+        storage = AtomicStorage()
+        other = IdempotencyManager(storage=storage)
+        key = make_key()
+        await other.check(key)
+        await other.complete(key, {"run_id": "r1"})
+
+        manager = IdempotencyManager(storage=storage)
+        result = await manager.check(key)
+
+        assert result.is_duplicate
+        assert result.cached_result == {"run_id": "r1"}
+
+    @pytest.mark.asyncio
+    async def test_failure_and_release_allow_retry(self):
+        storage = AtomicStorage()
+        manager = IdempotencyManager(storage=storage)
+        key = make_key()
+
+        with pytest.raises(RuntimeError):
+            async with manager.guard(key):
+                raise RuntimeError("provider down")
+        assert storage.records[key.hash].status == IdempotencyStatus.FAILED
+
+        async with manager.guard(key) as guard:
+            assert not guard.is_duplicate
+        assert key.hash not in storage.records
+
+        assert not (await manager.check(key)).is_duplicate
+
+    @pytest.mark.asyncio
+    async def test_completed_cache_is_bounded_and_expires(self):
+        now = [0.0]
+        cache = LocalIdempotencyCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+        manager = IdempotencyManager(storage=AtomicStorage(), local_cache=cache)
+        keys = [make_key(str(i)) for i in range(3)]
+        for key in keys:
+            await manager.check(key)
+            await manager.complete(key, {"n": 1})
+
+        assert cache.get_completed(keys[0].hash) is None
+        assert cache.get_completed(keys[2].hash) is not None
+
+        now[0] = 11
+        assert cache.get_completed(keys[2].hash) is None
+        assert (await manager.check(keys[2])).cached_result == {"n": 1}
+
+    @pytest.mark.asyncio
+    async def test_without_local_cache_matches_storage_path(self):
+        storage = MemoryStorage()
+        manager = IdempotencyManager(storage=storage, local_cache=None)
+        key = make_key()
+        await manager.check(key)
+        await manager.complete(key, {"ok": True})
+
+        assert storage.calls == {"get": 2, "save": 1, "update": 1, "delete": 0}
+        assert (await manager.check(key)).cached_result == {"ok": True}
+
+
+class TestCoalescing:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_run_work_once(self):
+        storage = AtomicStorage(latency=0.01)
+        manager = IdempotencyManager(storage=storage)
+        key = make_key()
+        executions = []
+
+        async def handle():
+            async with manager.guard(key) as guard:
+                if guard.is_duplicate:
+                    return "duplicate"
+                executions.append(1)
+                await guard.complete({"ok": True})
+                return "executed"
+
+        results = await asyncio.gather(*(handle() for _ in range(20)))
+
+        assert executions == [1]
+        assert results.count("executed") == 1
+        assert storage.calls["save"] == 1
+        assert manager.get_stats()["coalesced"] == 19
+
+    @pytest.mark.asyncio
+    async def test_followers_retry_when_leader_fails(self):
+        class FlakyStorage(AtomicStorage):
+            failures = 1
+
+            async def save_if_absent(self, record):
+                if self.failures:
+                    self.failures -= 1
+                    await asyncio.sleep(0.01)
+                    raise ConnectionError("storage unavailable")
+                return await super().save_if_absent(record)
+
+        manager = IdempotencyManager(storage=FlakyStorage())
+        key = make_key()
+
+        results = await asyncio.gather(
+            manager.check(key), manager.check(key), return_exceptions=True
+        )
+
+        assert isinstance(results[0], ConnectionError)
+        assert results[1].is_duplicate is False
+
+
+class TestSQLiteStorage:
+
+    def test_is_atomic_storage(self):
+        assert isinstance(AtomicStorage(), AtomicIdempotencyStorage)
+        assert not isinstance(MemoryStorage(), AtomicIdempotencyStorage)
+        assert isinstance(SQLiteIdempotencyStorage(), AtomicIdempotencyStorage)
+
+    @pytest.mark.asyncio
+    async def test_new_key_takes_the_insert_path(self):
+        storage = SQLiteIdempotencyStorage()
+        manager = IdempotencyManager(storage=storage)
+        key = make_key()
+
+        async with manager.guard(key) as guard:
+            assert not guard.is_duplicate
+            await guard.complete({"run_id": "r1"})
+
+        stats = manager.get_stats()
+        assert stats["filter_skips"] == 1
+        record = await storage.get_by_key(key.hash)
+        assert record.status == IdempotencyStatus.COMPLETED
+        assert record.result == {"run_id": "r1"}
+        assert record.org_id == key.org_id
+
+    @pytest.mark.asyncio
+    async def test_save_if_absent_refuses_taken_key(self):
+        storage = SQLiteIdempotencyStorage()
+        record = IdempotencyRecord(key_hash=make_key().hash)
+
+        assert await storage.save_if_absent(record) is record
+        assert await storage.save_if_absent(record) is None
+
+    @pytest.mark.asyncio
+    async def test_completed_key_survives_restart(self, tmp_path):
+        path = str(tmp_path / "idempotency.db")
+        key = make_key()
+
+        storage = SQLiteIdempotencyStorage(path=path)
+        async with IdempotencyManager(storage=storage).guard(key) as guard:
+            await guard.complete({"run_id": "r1"})
+        storage.close()
+
+        storage = SQLiteIdempotencyStorage(path=path)
+        manager = IdempotencyManager(storage=storage)
+        async with manager.guard(key) as guard:
+            assert guard.is_duplicate
+            assert guard.cached_result == {"run_id": "r1"}
+        # The filter missed, the insert was refused, the lookup found it
+        assert manager.get_stats()["filter_skips"] == 1
+        assert manager.get_stats()["storage_reads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_only_expired(self):
+        storage = SQLiteIdempotencyStorage()
+        manager = IdempotencyManager(storage=storage)
+        expired = await manager.check(make_key("old"), ttl_seconds=-1)
+        live = await manager.check(make_key("new"))
+
+        assert await storage.cleanup_expired() == 1
+        assert await storage.get_by_key(expired.record.key_hash) is None
+        assert await storage.get_by_key(live.record.key_hash) is not None
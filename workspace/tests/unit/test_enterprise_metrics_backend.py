@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Enterprise In-Process Metrics Backend Test Suite
+
+Tests MetricsCollector on the bundled InProcessMetricsBackend:
+- Label sets bind once to cached series handles
+- Histograms aggregate into their configured buckets
+- Concurrent writers lose no updates
+- Prometheus text exposition
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.data.metrics import Counter, MetricLabels, MetricsCollector, MetricType
+from enterprise.data.metrics_backend import InProcessMetricsBackend, benchmark_observations
+
+
+class RecordingBackend:
+    """Plain MetricsBackend without bind_series"""
+
+    def __init__(self):
+        self.calls = []
+
+    def counter_inc(self, name, value=1.0, labels=None):
+        self.calls.append(("counter", name, value, labels))
+
+    def gauge_set(self, name, value, labels=None):
+        self.calls.append(("gauge", name, value, labels))
+
+    def histogram_observe(self, name, value, labels=None):
+        self.calls.append(("histogram", name, value, labels))
+
+
+class TestSeriesBinding:
+
+    def test_series_handles_are_cached(self):
+        collector = MetricsCollector(backend=InProcessMetricsBackend())
+
+        first = collector.webhooks_received_total.series("github", "push")
+        assert collector.webhooks_received_total.series("github", "push") is first
+        assert collector.runs_total.bind(MetricLabels(org_id="o1")) is \
+            collector.runs_total.bind(MetricLabels(org_id="o1"))
+
+        with pytest.raises(ValueError):
+            collector.webhooks_received_total.series("github")
+
+    def test_plain_backend_receives_prebuilt_labels(self):
+        backend = RecordingBackend()
+        collector = MetricsCollector(backend=backend)
+
+        collector.record_run_started("o1", "acme/api", "gate")
+        collector.record_run_completed("o1", "acme/api", "gate", "success", 12.0)
+
+        assert ("gauge", "mno_runs_in_progress", 1.0, {"org_id": "o1", "run_type": "gate"}) in backend.calls
+        assert ("gauge", "mno_runs_in_progress", 0.0, {"org_id": "o1", "run_type": "gate"}) in backend.calls
+        assert ("histogram", "mno_runs_duration_seconds", 12.0, {"org_id": "o1", "run_type": "gate"}) in backend.calls
+
+    def test_no_backend_is_a_no_op(self):
+        Counter(name="orphan_total").inc(5)
+
+
+class TestAggregation:
+
+    def test_histogram_buckets_and_gauges(self):
+        backend = InProcessMetricsBackend()
+        collector = MetricsCollector(backend=backend)
+
+        for duration in (0.5, 7, 45, 45, 5000):
+            collector.record_run_completed("o1", "acme/api", "gate", "success", duration)
+        collector.record_run_started("o1", "acme/api", "gate")
+
+        snapshot = backend.snapshot()
+        histogram = snapshot["mno_runs_duration_seconds"]["samples"][0]["value"]
+        assert histogram["count"] == 5
+        assert histogram["sum"] == 5097.5
+        assert histogram["buckets"][1] == 1
+        assert histogram["buckets"][10] == 2
+        assert histogram["buckets"][60] == 4
+        assert histogram["buckets"][float("inf")] == 5
+        assert snapshot["mno_runs_in_progress"]["samples"][0]["value"] == -4
+
+    def test_type_conflict_rejected(self):
+        backend = InProcessMetricsBackend()
+        backend.counter_inc("jobs_total")
+
+        with pytest.raises(ValueError):
+            backend.gauge_set("jobs_total", 1)
+
+    def test_concurrent_writers_lose_no_updates(self):
+        backend = InProcessMetricsBackend()
+        collector = MetricsCollector(backend=backend)
+
+        def write():
+            for _ in range(20000):
+                collector.record_webhook_received("github", "push")
+
+        threads = [threading.Thread(target=write) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert collector.webhooks_received_total.series("github", "push").value == 80000
+
+    def test_benchmark_reports_lossless_sub_microsecond_writes(self):
+        report = benchmark_observations(observations=40000, threads=4)
+
+        assert report["lossless"]
+        assert report["single_ns_per_op"] < 5000
+
+
+class TestPrometheusExposition:
+
+    def test_render_text_format(self):
+        backend = InProcessMetricsBackend()
+        collector = MetricsCollector(backend=backend)
+        collector.update_queue_depth('gate "hi"', 3)
+        collector.record_gate_result("o1", "acme/api", passed=True, duration_seconds=2)
+
+        text = backend.render_prometheus()
+
+        assert "# HELP mno_queue_depth Current queue depth\n# TYPE mno_queue_depth gauge\n" in text
+        assert 'mno_queue_depth{queue="gate \\"hi\\""} 3\n' in text
+        assert 'mno_gate_passed_total{org_id="o1",repo="acme/api"} 1\n' in text
+        assert 'mno_gate_duration_seconds_bucket{org_id="o1",le="5"} 1\n' in text
+        assert 'mno_gate_duration_seconds_bucket{org_id="o1",le="+Inf"} 1\n' in text
+        assert 'mno_gate_duration_seconds_count{org_id="o1"} 1\n' in text
+        assert "mno_gate_failed_total" not in text
+        assert backend.snapshot()["mno_gate_checks_total"]["type"] == MetricType.COUNTER.value
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Enterprise Run Storage and Timeout Sweep Test Suite
+
+Tests RunStateMachine on the bundled SQLite RunStorage:
+- Keyset-paginated list_runs / iter_runs
+- Deadline-heap timeout sweeps only time out due RUNNING runs
+- Deadlines are recovered from storage by a fresh state machine
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.events.run_store import SQLiteRunStorage
+from enterprise.events.state_machine import RunCursor, RunState, RunStateMachine
+
+
+async def create_runs(machine, org_id, count, timeout_seconds=600):
+    return [
+        await machine.create_run(
+            org_id=org_id,
+            repo_id=uuid4(),
+            repo_full_name="acme/api",
+            head_sha=f"{i:040x}",
+            run_type="gate",
+            timeout_seconds=timeout_seconds,
+        )
+        for i in range(count)
+    ]
+
+
+class TestKeysetListing:
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_every_run_newest_first(self):
+        machine = RunStateMachine(storage=SQLiteRunStorage())
+        org_id = uuid4()
+        created = await create_runs(machine, org_id, 25)
+        await create_runs(machine, uuid4(), 5)
+
+        first = await machine.list_runs(org_id, limit=10)
+        second = await machine.list_runs(org_id, limit=10, after=RunCursor.after(first[-1]))
+        streamed = [run.id async for run in machine.iter_runs(org_id, page_size=7)]
+
+        assert [r.id for r in first] == [r.id for r in reversed(created)][:10]
+        assert [r.id for r in second] == [r.id for r in reversed(created)][10:20]
+        assert streamed == [r.id for r in reversed(created)]
+
+
+class TestTimeoutSweep:
+
+    @pytest.mark.asyncio
+    async def test_only_due_running_runs_time_out(self):
+        storage = SQLiteRunStorage()
+        machine = RunStateMachine(storage=storage)
+        org_id = uuid4()
+
+        due = await create_runs(machine, org_id, 3, timeout_seconds=0)
+        later = await create_runs(machine, org_id, 2, timeout_seconds=3600)
+        queued = await create_runs(machine, org_id, 1, timeout_seconds=0)
+
+        for run in due + later:
+            await machine.start_run(run.id, worker_id="w1")
+
+        assert await machine.check_timeouts() == 3
+        assert await machine.check_timeouts() == 0
+
+        for run in due:
+            assert (await machine.get_run(run.id)).state == RunState.TIMED_OUT
+        for run in later:
+            assert (await machine.get_run(run.id)).state == RunState.RUNNING
+        assert (await machine.get_run(queued[0].id)).state == RunState.QUEUED
+        assert machine.next_deadline() > datetime.utcnow()
+
+    @pytest.mark.asyncio
+    async def test_fresh_machine_recovers_deadlines(self, tmp_path):
+        path = str(tmp_path / "runs.db")
+        first = RunStateMachine(storage=SQLiteRunStorage(path))
+        org_id = uuid4()
+
+        runs = await create_runs(first, org_id, 2, timeout_seconds=3600)
+        for run in runs:
+            await first.start_run(run.id, worker_id="w1")
+
+        # Expire one run's deadline directly in storage
+        expired = await first.storage.get(runs[0].id)
+        expired.deadline = datetime.utcnow() - timedelta(seconds=1)
+        await first.storage.update(expired)
+
+        restarted = RunStateMachine(storage=SQLiteRunStorage(path))
+        assert await restarted.check_timeouts() == 1
+        assert (await restarted.get_run(runs[0].id)).state == RunState.TIMED_OUT
+        assert (await restarted.get_run(runs[1].id)).state == RunState.RUNNING
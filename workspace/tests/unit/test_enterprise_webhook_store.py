@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Enterprise Webhook Store Test Suite
+
+Tests the bundled NonceStore and RateLimiter backends:
+- Bucketed nonce expiry only touches expired buckets
+- GCRA limiting with burst and steady-rate refill
+- SQLite persistence across restarts, flushed by a timer when idle
+- WebhookReceiver replay and rate-limit rejection
+"""
+
+import asyncio
+import hashlib
+import hmac
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.integrations.webhook import (
+    WebhookReceiver,
+    WebhookValidationError,
+    benchmark_receive,
+)
+from enterprise.integrations.webhook_store import GCRARateLimiter, ShardedNonceStore
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestShardedNonceStore:
+
+    @pytest.mark.asyncio
+    async def test_replays_rejected_until_expiry(self):
+        clock = FakeClock()
+        store = ShardedNonceStore(bucket_seconds=10, clock=clock)
+
+        assert await store.check_and_store("a", ttl_seconds=60)
+        assert not await store.check_and_store("a", ttl_seconds=60)
+
+        clock.now += 61
+        assert await store.check_and_store("a", ttl_seconds=60)
+        assert store.get_stats()["replays"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_only_removes_expired_buckets(self):
+        clock = FakeClock()
+        store = ShardedNonceStore(bucket_seconds=10, clock=clock)
+        for i in range(100):
+            await store.check_and_store(f"short-{i}", ttl_seconds=30)
+        for i in range(50):
+            await store.check_and_store(f"long-{i}", ttl_seconds=600)
+
+        clock.now += 45
+        assert await store.cleanup_expired() == 100
+        assert await store.cleanup_expired() == 0
+        assert len(store) == 50
+        assert store.get_stats()["buckets"] == 1
+
+    @pytest.mark.asyncio
+    async def test_nonces_survive_restart(self, tmp_path):
+        path = str(tmp_path / "webhooks.db")
+        clock = FakeClock()
+        first = ShardedNonceStore(path=path, clock=clock)
+        await first.check_and_store("delivery-1", ttl_seconds=300)
+        await first.check_and_store("delivery-2", ttl_seconds=5)
+        first.close()
+
+        clock.now += 10
+        restarted = ShardedNonceStore(path=path, clock=clock)
+
+        assert not await restarted.check_and_store("delivery-1", ttl_seconds=300)
+        assert await restarted.check_and_store("delivery-2", ttl_seconds=300)
+        restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_store_flushes_on_timer(self, tmp_path):
+        path = str(tmp_path / "webhooks.db")
+        clock = FakeClock()
+        store = ShardedNonceStore(path=path, clock=clock)
+        store._persistence.flush_interval = 0.01
+        await store.check_and_store("delivery-1", ttl_seconds=300)
+
+        # No later put() and no close(): the timer writes it
+        await asyncio.sleep(0.1)
+        other = ShardedNonceStore(path=path, clock=clock)
+
+        assert not await other.check_and_store("delivery-1", ttl_seconds=300)
+        other.close()
+        store.close()
+
+
+class TestGCRARateLimiter:
+
+    @pytest.mark.asyncio
+    async def test_burst_then_steady_rate(self):
+        clock = FakeClock()
+        limiter = GCRARateLimiter(clock=clock)
+
+        results = [await limiter.check_rate_limit("k", 3, 60) for _ in range(4)]
+        assert results == [(True, 2), (True, 1), (True, 0), (False, 0)]
+
+        # One request is earned back every 20 seconds
+        clock.now += 20
+        assert await limiter.check_rate_limit("k", 3, 60) == (True, 0)
+        assert await limiter.check_rate_limit("other", 3, 60) == (True, 2)
+
+    @pytest.mark.asyncio
+    async def test_limits_survive_restart(self, tmp_path):
+        path = str(tmp_path / "webhooks.db")
+        clock = FakeClock()
+        first = GCRARateLimiter(path=path, clock=clock)
+        for _ in range(3):
+            await first.check_rate_limit("k", 3, 60)
+        first.close()
+
+        restarted = GCRARateLimiter(path=path, clock=clock)
+        assert await restarted.check_rate_limit("k", 3, 60) == (False, 0)
+        restarted.close()
+
+
+class TestWebhookReceiver:
+
+    @staticmethod
+    def delivery(delivery_id: str, secret: str = "s3cret") -> tuple[dict[str, str], bytes]:
+        body = b'{"ref": "refs/heads/main", "repository": {"full_name": "acme/api"}}'
+        signature = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return {
+            "X-Hub-Signature-256": signature,
+            "X-GitHub-Event": "push",
+            "X-GitHub-Delivery": delivery_id,
+        }, body
+
+    @pytest.mark.asyncio
+    async def test_replay_and_rate_limit_rejected(self):
+        receiver = WebhookReceiver(rate_limiter=GCRARateLimiter(), rate_limit_per_minute=2)
+
+        headers, body = self.delivery("d1")
+        await receiver.receive("github", headers, body, "s3cret")
+        with pytest.raises(WebhookValidationError, match="Replay"):
+            await receiver.receive("github", headers, body, "s3cret")
+
+        headers, body = self.delivery("d2")
+        await receiver.receive("github", headers, body, "s3cret")
+        headers, body = self.delivery("d3")
+        with pytest.raises(WebhookValidationError, match="Rate limit"):
+            await receiver.receive("github", headers, body, "s3cret")
+
+    @pytest.mark.asyncio
+    async def test_receive_benchmark(self, tmp_path):
+        report = await benchmark_receive(deliveries=5000, path=str(tmp_path / "bench.db"))
+
+        assert report["persistent"]
+        assert report["deliveries_per_second"] > 1000
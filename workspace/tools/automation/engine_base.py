@@ -17,8 +17,12 @@ Version: 1.0.0
 """
 
 import asyncio
+import copy
+import itertools
 import json
 import hashlib
+import os
+import tempfile
 import traceback
 from abc import ABC, abstractmethod
 from enum import Enum, auto
@@ -218,6 +222,9 @@ class BaseEngine(ABC):
     提供完整的生命週期管理和自動化執行能力。
     """
 
+    # 超時的嘗試按執行超時的此倍數計入耗時
+    TIMEOUT_LATENCY_PENALTY = 2.0
+
     def __init__(self, config: Optional[EngineConfig] = None):
         self.config = config or EngineConfig()
         self._state = EngineState.UNINITIALIZED
@@ -228,13 +235,20 @@ class BaseEngine(ABC):
         self._tasks_completed = 0
         self._tasks_failed = 0
         self._total_execution_time = 0.0
+        self._latency_ewma_ms = 0.0         # 最近任務耗時 (指數加權平均)
+        self._latency_samples = 0           # 已計入平均的嘗試次數
+        self._direct_tasks = 0              # execute_now 進行中的任務數
 
         # 事件處理
         self._event_handlers: Dict[str, List[Callable]] = {}
 
-        # 任務隊列
-        self._task_queue: asyncio.Queue = None
+        # 任務隊列 (按優先級出隊，同優先級先進先出)
+        self._task_queue: asyncio.PriorityQueue = None
+        self._task_sequence = itertools.count()
         self._active_tasks: Set[str] = set()
+        self._task_handles: Set[asyncio.Task] = set()
+        self._slots: asyncio.Semaphore = None
+        self._resumed: asyncio.Event = None
 
         # 控制標誌
         self._running = False
@@ -334,7 +348,10 @@ class BaseEngine(ABC):
 
         try:
             # 初始化組件
-            self._task_queue = asyncio.Queue(maxsize=self.config.resource.max_queue_size)
+            self._task_queue = asyncio.PriorityQueue(maxsize=self.config.resource.max_queue_size)
+            self._slots = asyncio.Semaphore(self.config.resource.max_concurrent_tasks)
+            self._resumed = asyncio.Event()
+            self._resumed.set()
             self._shutdown_event = asyncio.Event()
 
             # 載入檢查點
@@ -391,10 +408,16 @@ class BaseEngine(ABC):
             if self._shutdown_event:
                 self._shutdown_event.set()
 
+            # 喚醒暫停中的主循環以便退出
+            if self._resumed:
+                self._resumed.set()
+
             # 等待活動任務完成
-            if not force and self._active_tasks:
+            if not force and self._task_handles:
                 self._logger.info(f"等待 {len(self._active_tasks)} 個任務完成...")
-                await asyncio.sleep(2)
+                await asyncio.wait(
+                    set(self._task_handles), timeout=self.config.timeout.shutdown
+                )
 
             # 保存檢查點
             if self.config.persistence.enabled:
@@ -432,6 +455,7 @@ class BaseEngine(ABC):
         if self._state != EngineState.RUNNING:
             return False
         self._state = EngineState.PAUSED
+        self._resumed.clear()
         await self._emit_event("engine.paused", {})
         return True
 
@@ -440,6 +464,7 @@ class BaseEngine(ABC):
         if self._state != EngineState.PAUSED:
             return False
         self._state = EngineState.RUNNING
+        self._resumed.set()
         await self._emit_event("engine.resumed", {})
         return True
 
@@ -448,12 +473,18 @@ class BaseEngine(ABC):
     # ========================================================================
 
     async def submit_task(self, task: Dict[str, Any]) -> str:
-        """提交任務"""
+        """
+        提交任務
+
+        task["priority"] 可為 Priority、其名稱 (如 "high") 或數值，
+        數值越小越先執行；未指定時使用引擎配置的優先級。
+        """
         task_id = task.get("task_id") or str(uuid.uuid4())
         task["task_id"] = task_id
         task["submitted_at"] = datetime.now().isoformat()
 
-        await self._task_queue.put(task)
+        priority = self._task_priority(task)
+        await self._task_queue.put((priority, next(self._task_sequence), task))
         self._logger.debug(f"任務已提交: {task_id}")
 
         return task_id
@@ -463,39 +494,85 @@ class BaseEngine(ABC):
         task_id = task.get("task_id") or str(uuid.uuid4())
         task["task_id"] = task_id
 
-        return await self._execute_with_retry(task)
+        self._direct_tasks += 1
+        try:
+            return await self._execute_with_retry(task)
+        finally:
+            self._direct_tasks -= 1
+
+    @property
+    def outstanding_tasks(self) -> int:
+        """未完成任務數 (執行中 + 排隊 + 直接執行)"""
+        queued = self._task_queue.qsize() if self._task_queue else 0
+        return len(self._active_tasks) + queued + self._direct_tasks
+
+    def get_load(self) -> Dict[str, Any]:
+        """獲取負載資訊，供調度器選擇引擎"""
+        return {
+            "outstanding": self.outstanding_tasks,
+            "active": len(self._active_tasks) + self._direct_tasks,
+            "queued": self._task_queue.qsize() if self._task_queue else 0,
+            "latency_ms": self._latency_ewma_ms,
+            "latency_samples": self._latency_samples,
+        }
+
+    def _task_priority(self, task: Dict[str, Any]) -> int:
+        """解析任務優先級"""
+        priority = task.get("priority", self.config.priority)
+        if isinstance(priority, Priority):
+            return priority.value
+        if isinstance(priority, str):
+            try:
+                return Priority[priority.upper()].value
+            except KeyError:
+                return self.config.priority.value
+        try:
+            return int(priority)
+        except (TypeError, ValueError):
+            return self.config.priority.value
 
     async def _main_loop(self):
-        """主執行循環"""
+        """
+        主執行循環
+
+        先取得並發槽位再出隊，因此槽位釋放前不會佔用 CPU，
+        高優先級任務在槽位釋放時才參與排序。
+        """
         while self._running:
             try:
-                # 檢查狀態
-                if self._state == EngineState.PAUSED:
-                    await asyncio.sleep(0.5)
+                # 暫停時等待恢復
+                if not self._resumed.is_set():
+                    await self._resumed.wait()
                     continue
 
-                # 獲取任務
+                # 等待並發槽位
+                await self._slots.acquire()
+                dispatched = False
                 try:
-                    task = await asyncio.wait_for(
-                        self._task_queue.get(),
-                        timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    continue
-
-                # 檢查並發限制
-                while len(self._active_tasks) >= self.config.resource.max_concurrent_tasks:
-                    await asyncio.sleep(0.1)
-
-                # 執行任務
-                asyncio.create_task(self._process_task(task))
+                    # 獲取任務
+                    try:
+                        _, _, task = await asyncio.wait_for(
+                            self._task_queue.get(),
+                            timeout=1.0
+                        )
+                    except asyncio.TimeoutError:
+                        continue
+
+                    # 執行任務
+                    handle = asyncio.create_task(self._process_task(task))
+                    self._task_handles.add(handle)
+                    handle.add_done_callback(self._task_handles.discard)
+                    dispatched = True
+                finally:
+                    if not dispatched:
+                        self._slots.release()
 
             except Exception as e:
                 self._logger.error(f"主循環錯誤: {e}")
                 await asyncio.sleep(1)
 
     async def _process_task(self, task: Dict[str, Any]):
-        """處理單一任務"""
+        """處理單一任務 (持有一個並發槽位，結束時釋放)"""
         task_id = task["task_id"]
         self._active_tasks.add(task_id)
 
@@ -527,6 +604,7 @@ class BaseEngine(ABC):
 
         finally:
             self._active_tasks.discard(task_id)
+            self._slots.release()
 
     async def _execute_with_retry(self, task: Dict[str, Any]) -> TaskResult:
         """帶重試的執行"""
@@ -546,10 +624,12 @@ class BaseEngine(ABC):
                 )
 
                 result.duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+                self._record_latency(result.duration_ms)
                 return result
 
             except tuple(retry_config.retry_on) as e:
                 last_error = e
+                self._record_attempt_latency(start_time, e)
                 self._logger.warning(
                     f"任務 {task_id} 第 {attempt + 1} 次嘗試失敗: {e}"
                 )
@@ -565,17 +645,38 @@ class BaseEngine(ABC):
                     delay = min(delay, retry_config.max_delay)
                     await asyncio.sleep(delay)
 
-            except asyncio.TimeoutError:
+            except asyncio.TimeoutError as e:
                 last_error = TimeoutError("執行超時")
+                self._record_attempt_latency(start_time, e)
                 self._logger.warning(f"任務 {task_id} 執行超時")
                 break
 
+            except Exception as e:
+                self._record_attempt_latency(start_time, e)
+                raise
+
         return TaskResult(
             task_id=task_id,
             success=False,
             error=str(last_error),
         )
 
+    def _record_latency(self, duration_ms: float, alpha: float = 0.2):
+        """更新耗時的指數加權平均"""
+        if self._latency_samples == 0:
+            self._latency_ewma_ms = duration_ms
+        else:
+            self._latency_ewma_ms += alpha * (duration_ms - self._latency_ewma_ms)
+        self._latency_samples += 1
+
+    def _record_attempt_latency(self, start_time: datetime, error: BaseException):
+        """失敗的嘗試也計入耗時；超時按執行超時的倍數懲罰，避免失敗的引擎顯得最快"""
+        if isinstance(error, asyncio.TimeoutError):
+            duration_ms = self.config.timeout.execution * 1000 * self.TIMEOUT_LATENCY_PENALTY
+        else:
+            duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+        self._record_latency(duration_ms)
+
     # ========================================================================
     # 事件系統
     # ========================================================================
@@ -590,8 +691,8 @@ class BaseEngine(ABC):
         """發送事件"""
         event = EngineEvent.create(event_type, self.engine_id, payload)
 
-        handlers = self._event_handlers.get(event_type, [])
-        handlers.extend(self._event_handlers.get("*", []))  # 全局處理器
+        # 複製列表，避免全局處理器被累加進特定事件的處理器列表
+        handlers = self._event_handlers.get(event_type, []) + self._event_handlers.get("*", [])  # 全局處理器
 
         for handler in handlers:
             try:
@@ -656,10 +757,12 @@ class BaseEngine(ABC):
                 self._logger.error(f"檢查點錯誤: {e}")
 
     async def _save_checkpoint(self):
-        """保存檢查點"""
-        state_dir = Path(self.config.persistence.state_dir)
-        state_dir.mkdir(parents=True, exist_ok=True)
+        """
+        保存檢查點
 
+        在事件循環上生成快照，序列化與寫入放到執行緒中完成；
+        先寫臨時文件再原子替換，崩潰時不會留下半寫的檢查點。
+        """
         checkpoint = {
             "engine_id": self.engine_id,
             "timestamp": datetime.now().isoformat(),
@@ -669,30 +772,54 @@ class BaseEngine(ABC):
                 "tasks_failed": self._tasks_failed,
                 "total_execution_time": self._total_execution_time,
             },
-            "custom_data": self._checkpoint_data,
+            # 深拷貝，避免寫入執行緒序列化時資料被事件循環修改
+            "custom_data": copy.deepcopy(self._checkpoint_data),
         }
 
-        checkpoint_file = state_dir / f"{self.engine_id}_checkpoint.json"
-        with open(checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+        checkpoint_file = Path(self.config.persistence.state_dir) / f"{self.engine_id}_checkpoint.json"
+        await asyncio.to_thread(self._write_checkpoint, checkpoint_file, checkpoint)
+
+    @staticmethod
+    def _write_checkpoint(checkpoint_file: Path, checkpoint: Dict[str, Any]):
+        """原子寫入檢查點 (在執行緒中執行)"""
+        checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{checkpoint_file.name}.", dir=checkpoint_file.parent
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, checkpoint_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _read_checkpoint(checkpoint_file: Path) -> Optional[Dict[str, Any]]:
+        if not checkpoint_file.exists():
+            return None
+        with open(checkpoint_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
 
     async def _load_checkpoint(self):
         """載入檢查點"""
         state_dir = Path(self.config.persistence.state_dir)
         checkpoint_file = state_dir / f"{self.engine_id}_checkpoint.json"
 
-        if checkpoint_file.exists():
-            try:
-                with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                    checkpoint = json.load(f)
+        try:
+            checkpoint = await asyncio.to_thread(self._read_checkpoint, checkpoint_file)
+        except Exception as e:
+            self._logger.warning(f"載入檢查點失敗: {e}")
+            return
 
-                self._tasks_completed = checkpoint.get("statistics", {}).get("tasks_completed", 0)
-                self._tasks_failed = checkpoint.get("statistics", {}).get("tasks_failed", 0)
-                self._checkpoint_data = checkpoint.get("custom_data", {})
+        if checkpoint is not None:
+            self._tasks_completed = checkpoint.get("statistics", {}).get("tasks_completed", 0)
+            self._tasks_failed = checkpoint.get("statistics", {}).get("tasks_failed", 0)
+            self._checkpoint_data = checkpoint.get("custom_data", {})
 
-                self._logger.info(f"已載入檢查點: {checkpoint_file}")
-            except Exception as e:
-                self._logger.warning(f"載入檢查點失敗: {e}")
+            self._logger.info(f"已載入檢查點: {checkpoint_file}")
 
     # ========================================================================
     # 自我修復
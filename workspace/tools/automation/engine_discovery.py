@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Engine Discovery - 引擎靜態發現
+
+以 AST 靜態分析找出 BaseEngine 子類及其元數據，不執行任何模組代碼。
+解析結果按文件寫入清單快取 (manifest)，以 mtime/size 判斷是否變更，
+mtime 變化但內容雜湊相同時直接沿用舊結果。
+
+特性：
+- 零副作用 (No Import Side Effects)
+- 跨文件繼承解析 (Cross-file Inheritance)
+- 增量快取 (Incremental Manifest Cache)
+- 可量測 (Discovery Statistics)
+
+Version: 1.0.0
+"""
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Set
+
+from engine_base import EngineType
+
+# ============================================================================
+# 常數定義
+# ============================================================================
+
+MANIFEST_VERSION = 1
+
+# 定義於 engine_base.py 的抽象基類，本身不是可啟動的引擎
+BASE_ENGINE_CLASSES = frozenset({
+    "BaseEngine",
+    "CognitiveEngineBase",
+    "ExecutionEngineBase",
+    "ValidationEngineBase",
+    "TransformEngineBase",
+})
+
+# ============================================================================
+# 資料結構
+# ============================================================================
+
+@dataclass
+class ClassRecord:
+    """模組中的類定義"""
+    name: str
+    bases: List[str]
+    lineno: int
+    engine_type: Optional[str] = None
+    description: str = ""
+
+@dataclass
+class ModuleRecord:
+    """單一文件的解析結果"""
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    classes: List[ClassRecord] = field(default_factory=list)
+    error: Optional[str] = None
+
+@dataclass
+class DiscoveryStats:
+    """發現統計"""
+    files_scanned: int = 0
+    cache_hits: int = 0
+    files_parsed: int = 0
+    parse_errors: int = 0
+    engines_found: int = 0
+    duration_ms: float = 0.0
+
+# ============================================================================
+# 靜態分析
+# ============================================================================
+
+def _base_name(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _engine_type(node: ast.ClassDef) -> Optional[str]:
+    """讀取類體中的 ENGINE_TYPE = EngineType.XXX"""
+    for stmt in node.body:
+        if isinstance(stmt, ast.Assign):
+            targets, value = stmt.targets, stmt.value
+        elif isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+            targets, value = [stmt.target], stmt.value
+        else:
+            continue
+        if not any(isinstance(t, ast.Name) and t.id == "ENGINE_TYPE" for t in targets):
+            continue
+        if isinstance(value, ast.Attribute) and value.attr in EngineType.__members__:
+            return EngineType[value.attr].value
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return value.value
+    return None
+
+
+def parse_module(source: str) -> List[ClassRecord]:
+    """解析模組頂層類定義"""
+    tree = ast.parse(source)
+    classes = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        doc = ast.get_docstring(node) or ""
+        classes.append(ClassRecord(
+            name=node.name,
+            bases=[b for b in (_base_name(base) for base in node.bases) if b],
+            lineno=node.lineno,
+            engine_type=_engine_type(node),
+            description=doc.strip().splitlines()[0] if doc.strip() else "",
+        ))
+    return classes
+
+# ============================================================================
+# 清單快取
+# ============================================================================
+
+class EngineManifest:
+    """
+    引擎清單快取
+
+    記錄每個文件的 mtime、大小、內容雜湊與類定義。
+    未指定 path 時僅在記憶體中快取。
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._modules: Dict[str, ModuleRecord] = {}
+        self._dirty = False
+        self.stats = DiscoveryStats()
+        self._load()
+
+    def _load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        for path, record in data.get("modules", {}).items():
+            record["classes"] = [ClassRecord(**c) for c in record.get("classes", [])]
+            self._modules[path] = ModuleRecord(**record)
+
+    def save(self):
+        """原子寫入清單 (僅在有變更時)"""
+        if not self.path or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "modules": {path: asdict(record) for path, record in self._modules.items()},
+        }
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._dirty = False
+
+    def module(self, py_file: Path) -> ModuleRecord:
+        """取得文件的解析結果，未變更時直接使用快取"""
+        key = str(py_file)
+        stat = py_file.stat()
+        cached = self._modules.get(key)
+        self.stats.files_scanned += 1
+
+        if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            self.stats.cache_hits += 1
+            return cached
+
+        content = py_file.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        if cached and cached.sha256 == digest:
+            # 僅 mtime 變化 (如 checkout)，內容相同
+            cached.mtime_ns, cached.size = stat.st_mtime_ns, stat.st_size
+            self._dirty = True
+            self.stats.cache_hits += 1
+            return cached
+
+        record = ModuleRecord(
+            path=key, mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=digest
+        )
+        try:
+            record.classes = parse_module(content.decode("utf-8"))
+        except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+            record.error = f"{type(e).__name__}: {e}"
+            self.stats.parse_errors += 1
+        self.stats.files_parsed += 1
+
+        self._modules[key] = record
+        self._dirty = True
+        return record
+
+    def failed_modules(self) -> List[ModuleRecord]:
+        """解析失敗的文件"""
+        return [r for r in self._modules.values() if r.error]
+
+    def prune(self, seen: Set[str]):
+        """移除已刪除文件的記錄"""
+        for key in [k for k in self._modules if k not in seen]:
+            del self._modules[key]
+            self._dirty = True
+
+# ============================================================================
+# 發現
+# ============================================================================
+
+def find_engine_classes(records: Iterable[ModuleRecord]) -> List[Dict[str, Any]]:
+    """
+    從解析結果中找出 BaseEngine 子類
+
+    繼承關係按類名跨文件解析至不動點；engine_base.py 中的抽象基類
+    與底線開頭的類不視為引擎。
+    """
+    records = list(records)
+    engine_names: Set[str] = set(BASE_ENGINE_CLASSES)
+    changed = True
+    while changed:
+        changed = False
+        for record in records:
+            for cls in record.classes:
+                if cls.name not in engine_names and any(b in engine_names for b in cls.bases):
+                    engine_names.add(cls.name)
+                    changed = True
+
+    engines = []
+    for record in records:
+        for cls in record.classes:
+            if (cls.name in engine_names and
+                cls.name not in BASE_ENGINE_CLASSES and
+                not cls.name.startswith('_')):
+                engines.append({
+                    "class_name": cls.name,
+                    "module_path": record.path,
+                    "engine_type": cls.engine_type or EngineType.EXECUTION.value,
+                    "description": cls.description,
+                    "lineno": cls.lineno,
+                })
+    return engines
+
+
+def scan_engines(search_paths: List[Path], manifest: EngineManifest) -> List[Dict[str, Any]]:
+    """掃描搜尋路徑中的 Python 文件並返回引擎元數據"""
+    start = time.perf_counter()
+    manifest.stats = DiscoveryStats()
+    records = []
+    seen: Set[str] = set()
+
+    for search_path in search_paths:
+        if not search_path.exists():
+            continue
+        for py_file in sorted(search_path.rglob("*.py")):
+            if py_file.name.startswith('_'):
+                continue
+            try:
+                record = manifest.module(py_file)
+            except OSError:
+                continue
+            seen.add(record.path)
+            records.append(record)
+
+    manifest.prune(seen)
+    manifest.save()
+
+    engines = find_engine_classes(records)
+    manifest.stats.engines_found = len(engines)
+    manifest.stats.duration_ms = (time.perf_counter() - start) * 1000
+    return engines
@@ -77,20 +77,25 @@ import json
 import yaml
 import sys
 import signal
+import time
+import itertools
+import random
 import importlib
 import importlib.util
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Type, Set, Callable, Union
+from typing import Dict, List, Optional, Any, Type, Set, Callable, Union, Tuple, Deque
 from dataclasses import dataclass, field, asdict
 from enum import Enum, auto
 import logging
 import argparse
+from collections import OrderedDict, deque
 
 from engine_base import (
     BaseEngine, EngineConfig, EngineState, EngineType,
     ExecutionMode, Priority, EngineEvent, TaskResult, HealthStatus
 )
+from engine_discovery import DiscoveryStats, EngineManifest, scan_engines
 
 # ============================================================================
 # 常數定義
@@ -113,12 +118,14 @@ class OrchestratorConfig:
 
     # 自動化設定
     auto_discover: bool = True              # 自動發現引擎
+    static_discovery: bool = True           # AST 靜態發現 (不執行模組)，引擎於啟動時才載入
     auto_start_engines: bool = True         # 自動啟動引擎
     auto_recover: bool = True               # 自動恢復
     auto_scale: bool = False                # 自動擴縮
 
     # 執行設定
     max_concurrent_engines: int = 50        # 最大並行引擎數
+    engine_selection: str = "power_of_two"  # 引擎選擇策略: power_of_two / least_outstanding
     health_check_interval: float = 30.0     # 健康檢查間隔
     garbage_collect_interval: float = 300.0 # 垃圾回收間隔
 
@@ -133,6 +140,8 @@ class OrchestratorConfig:
     # 事件設定
     event_queue_size: int = 10000
     event_retention_hours: int = 24
+    event_handler_timeout: float = 5.0      # 單一事件處理器超時
+    event_history_per_type: int = 100       # 每種事件類型保留的歷史數
 
 @dataclass
 class PipelineConfig:
@@ -154,6 +163,7 @@ class EngineRegistration:
     module_path: str
     config: EngineConfig
     instance: Optional[BaseEngine] = None
+    description: str = ""
     registered_at: str = ""
     last_health_check: str = ""
     healthy: bool = False
@@ -165,13 +175,34 @@ class EngineRegistration:
 class EventBus:
     """
     事件總線 - 引擎間通信中心
+
+    同一事件的處理器並行執行，每個處理器有獨立超時，慢或失敗的處理器
+    不影響其他處理器。訂閱者列表為不可變元組 (寫時複製)，分發時取快照。
+    事件歷史按類型保存在有界隊列中。
     """
 
-    def __init__(self, max_size: int = 10000):
+    def __init__(
+        self,
+        max_size: int = 10000,
+        handler_timeout: float = 5.0,
+        max_history: int = 1000,
+        history_per_type: int = 100,
+        max_history_types: int = 256,
+    ):
         self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
-        self._subscribers: Dict[str, List[Callable]] = {}
-        self._history: List[EngineEvent] = []
-        self._max_history = 1000
+        self._subscribers: Dict[str, Tuple[Callable, ...]] = {}
+        self._handler_timeout = handler_timeout
+        self._max_history = max_history
+        self._history_per_type = history_per_type
+        self._max_history_types = max_history_types
+        self._history: Deque[EngineEvent] = deque(maxlen=max_history)
+        self._history_by_type: "OrderedDict[str, Deque[EngineEvent]]" = OrderedDict()
+        self._stats = {
+            "published": 0,
+            "dispatched": 0,
+            "handler_errors": 0,
+            "handler_timeouts": 0,
+        }
         self._running = False
         self._logger = logging.getLogger("event_bus")
 
@@ -188,22 +219,34 @@ class EventBus:
     async def publish(self, event: EngineEvent):
         """發布事件"""
         await self._queue.put(event)
+        self._stats["published"] += 1
 
         # 記錄歷史
         self._history.append(event)
-        if len(self._history) > self._max_history:
-            self._history = self._history[-self._max_history:]
+        by_type = self._history_by_type.get(event.event_type)
+        if by_type is None:
+            by_type = deque(maxlen=self._history_per_type)
+            self._history_by_type[event.event_type] = by_type
+            if len(self._history_by_type) > self._max_history_types:
+                self._history_by_type.popitem(last=False)
+        else:
+            self._history_by_type.move_to_end(event.event_type)
+        by_type.append(event)
 
     def subscribe(self, event_type: str, handler: Callable):
         """訂閱事件"""
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
-        self._subscribers[event_type].append(handler)
+        handlers = self._subscribers.get(event_type, ())
+        if handler not in handlers:
+            self._subscribers[event_type] = handlers + (handler,)
 
     def unsubscribe(self, event_type: str, handler: Callable):
         """取消訂閱"""
-        if event_type in self._subscribers:
-            self._subscribers[event_type].remove(handler)
+        handlers = self._subscribers.get(event_type, ())
+        remaining = tuple(h for h in handlers if h != handler)
+        if remaining:
+            self._subscribers[event_type] = remaining
+        else:
+            self._subscribers.pop(event_type, None)
 
     async def _dispatch_loop(self):
         """事件分發循環"""
@@ -217,25 +260,56 @@ class EventBus:
                 self._logger.error(f"事件分發錯誤: {e}")
 
     async def _dispatch(self, event: EngineEvent):
-        """分發單一事件"""
-        handlers = self._subscribers.get(event.event_type, [])
-        handlers.extend(self._subscribers.get("*", []))  # 全局訂閱者
-
-        for handler in handlers:
-            try:
-                if asyncio.iscoroutinefunction(handler):
-                    await handler(event)
-                else:
-                    handler(event)
-            except Exception as e:
-                self._logger.error(f"事件處理錯誤: {e}")
+        """分發單一事件 (處理器並行執行)"""
+        # 拼接產生新元組，不修改訂閱者列表
+        handlers = self._subscribers.get(event.event_type, ()) + self._subscribers.get("*", ())  # 全局訂閱者
+        self._stats["dispatched"] += 1
+
+        if len(handlers) == 1:
+            await self._run_handler(handlers[0], event)
+        elif handlers:
+            await asyncio.gather(*(self._run_handler(h, event) for h in handlers))
+
+    async def _run_handler(self, handler: Callable, event: EngineEvent):
+        """執行單一處理器，隔離異常與超時"""
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                await asyncio.wait_for(handler(event), timeout=self._handler_timeout)
+            else:
+                handler(event)
+        except asyncio.TimeoutError:
+            self._stats["handler_timeouts"] += 1
+            self._logger.warning(
+                f"事件處理超時 ({self._handler_timeout}s): "
+                f"{getattr(handler, '__qualname__', handler)} <- {event.event_type}"
+            )
+        except Exception as e:
+            self._stats["handler_errors"] += 1
+            self._logger.error(f"事件處理錯誤: {e}")
 
     def get_history(self, event_type: str = None, limit: int = 100) -> List[EngineEvent]:
-        """獲取事件歷史"""
-        events = self._history
+        """
+        獲取事件歷史
+
+        指定 event_type 時返回該類型最近的事件 (每類型最多 history_per_type 條)。
+        """
         if event_type:
-            events = [e for e in events if e.event_type == event_type]
-        return events[-limit:]
+            events = self._history_by_type.get(event_type, ())
+        else:
+            events = self._history
+        if limit <= 0:
+            return []
+        return list(events)[-limit:]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """獲取總線統計"""
+        return {
+            **self._stats,
+            "queue_size": self._queue.qsize(),
+            "subscriptions": sum(len(h) for h in self._subscribers.values()),
+            "history_size": len(self._history),
+            "history_types": len(self._history_by_type),
+        }
 
 # ============================================================================
 # 引擎註冊中心
@@ -335,9 +409,13 @@ class EngineRegistry:
     - `config/system-manifest.yaml` - Module registration schema
     """
 
-    def __init__(self):
+    def __init__(self, manifest_path: Optional[Path] = None):
         self._engines: Dict[str, EngineRegistration] = {}
         self._engine_classes: Dict[str, Type[BaseEngine]] = {}
+        self._modules: Dict[str, Any] = {}   # module_path -> 已載入模組
+        self._loaded_classes: Dict[str, Type[BaseEngine]] = {}
+        self._manifest = EngineManifest(manifest_path)
+        self.discovery_stats = DiscoveryStats()
         self._logger = logging.getLogger("engine_registry")
 
     def register_class(self, name: str, engine_class: Type[BaseEngine]):
@@ -377,7 +455,54 @@ class EngineRegistry:
         """獲取引擎類"""
         return self._engine_classes.get(name)
 
-    def discover_engines(self, search_paths: List[Path]) -> List[Dict[str, Any]]:
+    def load_engine_class(self, module_path: str, class_name: str) -> Type[BaseEngine]:
+        """
+        載入引擎類
+
+        每個模組只執行一次；載入失敗時拋出異常，由呼叫者記錄。
+        """
+        key = f"{module_path}:{class_name}"
+        if key in self._loaded_classes:
+            return self._loaded_classes[key]
+
+        module = self._modules.get(module_path) or self._imported_module(module_path)
+        if module is None:
+            # 以文件名註冊，其他引擎以同名導入時重用同一模組
+            module_name = Path(module_path).stem
+            if module_name in sys.modules:
+                module_name = f"_engine_{module_name}_{len(self._modules)}"
+            spec = importlib.util.spec_from_file_location(module_name, module_path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"無法載入模組: {module_path}")
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[module_name]
+                raise
+        self._modules[module_path] = module
+
+        engine_class = getattr(module, class_name)
+        if not (isinstance(engine_class, type) and issubclass(engine_class, BaseEngine)):
+            raise TypeError(f"{class_name} 不是 BaseEngine 子類")
+        self._loaded_classes[key] = engine_class
+        return engine_class
+
+    @staticmethod
+    def _imported_module(module_path: str) -> Optional[Any]:
+        """已經以文件名導入的模組 (例如被另一個引擎導入)"""
+        module = sys.modules.get(Path(module_path).stem)
+        module_file = getattr(module, "__file__", None)
+        if module_file and Path(module_file).resolve() == Path(module_path).resolve():
+            return module
+        return None
+
+    def discover_engines(
+        self,
+        search_paths: List[Path],
+        static: bool = True,
+    ) -> List[Dict[str, Any]]:
         """
         Automatically discover and collect engine metadata from specified directories.
 
@@ -390,7 +515,13 @@ class EngineRegistry:
         1. **Python Module Introspection**:
            - Recursively scans for all `*.py` files in search paths
            - Excludes files starting with underscore (private modules)
-           - Dynamically loads modules and inspects for BaseEngine subclasses
+           - With ``static=True`` (default), parses modules with ``ast`` and
+             resolves BaseEngine subclasses by name across files, without
+             executing any module code. Results are cached per file in the
+             registry's manifest and reused while mtime/size (or content
+             hash) are unchanged.
+           - With ``static=False``, imports each module and inspects it at
+             runtime (legacy path, kept for comparison)
            - Extracts engine metadata (class name, module path, engine type)
 
         2. **YAML Configuration Discovery**:
@@ -404,6 +535,9 @@ class EngineRegistry:
         search_paths : List[Path]
             List of directory paths to search for engines. Non-existent paths
             are silently skipped without raising errors.
+        static : bool
+            Use AST-based discovery with the manifest cache (default) instead
+            of importing every module.
 
         Returns:
         --------
@@ -423,9 +557,9 @@ class EngineRegistry:
 
         Behavior:
         ---------
-        - **Non-blocking**: Discovery failures are logged at DEBUG level and
-          do not halt the overall discovery process.
-          Note: Because failures are logged at DEBUG level, they may not be visible in production environments unless debug logging is enabled. This can make troubleshooting discovery issues more difficult.
+        - **Non-blocking**: Discovery failures do not halt the overall
+          discovery process. Files that fail to parse are logged at WARNING
+          level in static mode; the legacy import path logs at DEBUG level.
         - **Recursive**: Searches entire directory trees using rglob patterns
         - **Safe**: Catches and handles module loading exceptions gracefully
         - **Deduplication**: Caller is responsible for handling duplicate
@@ -438,8 +572,9 @@ class EngineRegistry:
 
         Module Loading:
         ---------------
-        - Uses `importlib.util.spec_from_file_location` for dynamic loading
-        - Modules are loaded in isolated namespace to prevent conflicts
+        - Static mode never imports modules; engine modules are imported once,
+          on first start, via `load_engine_class()`
+        - Legacy mode uses `importlib.util.spec_from_file_location`
         - Only inspects module-level class definitions
         - Does not instantiate engines during discovery phase
 
@@ -467,10 +602,9 @@ class EngineRegistry:
 
         Performance Considerations:
         ---------------------------
-        - Discovery time scales with number of files in search paths
-        - Module loading incurs one-time import cost per Python file
-        - Recommended to cache results and re-discover only on file changes
-        - Consider using file system watchers for production deployments
+        - Warm discovery costs one `stat()` per file; only changed files are
+          parsed. Timings and cache hits are recorded in `discovery_stats`
+        - Legacy mode incurs the full import cost of every Python file
 
         Thread Safety:
         --------------
@@ -484,13 +618,21 @@ class EngineRegistry:
         - `EngineConfig`: Expected configuration structure for engines
         """
         discovered = []
+        start = time.perf_counter()
+
+        if static:
+            # 靜態分析 (不執行模組)
+            discovered.extend(scan_engines(search_paths, self._manifest))
+            self.discovery_stats = self._manifest.stats
+            for record in self._manifest.failed_modules():
+                self._logger.warning(f"解析模組失敗 {record.path}: {record.error}")
 
         for search_path in search_paths:
             if not search_path.exists():
                 continue
 
-            # 搜尋 Python 模組
-            for py_file in search_path.rglob("*.py"):
+            # 搜尋 Python 模組 (舊路徑：逐一導入)
+            for py_file in ([] if static else search_path.rglob("*.py")):
                 if py_file.name.startswith('_'):
                     continue
 
@@ -512,12 +654,18 @@ class EngineRegistry:
                 except Exception as e:
                     self._logger.debug(f"讀取配置失敗 {config_file}: {e}")
 
+        if not static:
+            self.discovery_stats = DiscoveryStats(
+                engines_found=sum(1 for d in discovered if "class_name" in d),
+            )
+        self.discovery_stats.duration_ms = (time.perf_counter() - start) * 1000
         return discovered
 
     def _inspect_module(self, module_path: Path) -> List[Dict[str, Any]]:
         """
         INTERNAL: Inspect a Python module file to discover BaseEngine subclasses.
 
+        Used only by the legacy ``discover_engines(static=False)`` path.
         This is a private/internal method. It dynamically loads a Python module and uses
         runtime introspection to identify all classes that inherit from BaseEngine, extracting
         metadata for registration.
@@ -646,40 +794,124 @@ class EngineRegistry:
 # 引擎調度器
 # ============================================================================
 
+class EngineSelector:
+    """
+    負載感知的引擎選擇
+
+    以預估完成時間 (未完成任務數 + 1) × 近期平均耗時 評分：
+    - least_outstanding: 選擇評分最低的引擎
+    - power_of_two: 隨機取兩個候選，選擇評分較低者 (候選多時避免羊群效應)
+
+    尚無耗時樣本的引擎以候選引擎的平均耗時作為先驗，而不是視為最快。
+    """
+
+    STRATEGIES = ("least_outstanding", "power_of_two")
+
+    def __init__(self, strategy: str = "power_of_two", seed: Optional[int] = None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"未知的選擇策略: {strategy}")
+        self.strategy = strategy
+        self._random = random.Random(seed)
+
+    @staticmethod
+    def score(reg: EngineRegistration, prior_latency_ms: float = 1.0) -> float:
+        """評分越低越優先"""
+        load = reg.instance.get_load()
+        latency = load["latency_ms"] if load.get("latency_samples") else prior_latency_ms
+        return (load["outstanding"] + 1) * max(latency, 1.0)
+
+    @staticmethod
+    def latency_prior(candidates: List[EngineRegistration]) -> float:
+        """有樣本的候選引擎的平均耗時"""
+        observed = [
+            load["latency_ms"]
+            for load in (reg.instance.get_load() for reg in candidates)
+            if load.get("latency_samples")
+        ]
+        return sum(observed) / len(observed) if observed else 1.0
+
+    def select(self, candidates: List[EngineRegistration]) -> Optional[EngineRegistration]:
+        """從健康的候選引擎中選擇一個"""
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        prior = self.latency_prior(candidates)
+        if self.strategy == "power_of_two" and len(candidates) > 2:
+            candidates = self._random.sample(candidates, 2)
+        return min(candidates, key=lambda reg: self.score(reg, prior))
+
+
 class EngineScheduler:
     """
     引擎調度器 - 任務調度與分發
     """
 
-    def __init__(self, registry: EngineRegistry, event_bus: EventBus):
+    def __init__(
+        self,
+        registry: EngineRegistry,
+        event_bus: EventBus,
+        selection_strategy: str = "power_of_two",
+        batch_size: int = 100,
+    ):
         self._registry = registry
         self._event_bus = event_bus
         self._task_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._task_sequence = itertools.count()
+        self._selector = EngineSelector(selection_strategy)
+        self._batch_size = batch_size
         self._running = False
+        self._loop_task: Optional[asyncio.Task] = None
         self._logger = logging.getLogger("engine_scheduler")
 
     async def start(self):
         """啟動調度器"""
         self._running = True
-        asyncio.create_task(self._schedule_loop())
+        self._loop_task = asyncio.create_task(self._schedule_loop())
         self._logger.info("調度器已啟動")
 
     async def stop(self):
         """停止調度器"""
         self._running = False
+        if self._loop_task:
+            self._loop_task.cancel()
+            self._loop_task = None
 
     async def schedule_task(self, task: Dict[str, Any], priority: Priority = Priority.NORMAL):
         """調度任務"""
-        await self._task_queue.put((priority.value, task))
+        # 序號保證同優先級先進先出，且不比較任務字典
+        await self._task_queue.put((priority.value, next(self._task_sequence), task))
+
+    def select_engine(
+        self,
+        engine_id: Optional[str] = None,
+        engine_type: Optional[str] = None,
+    ) -> Optional[EngineRegistration]:
+        """按 ID 或類型選擇引擎；按類型時依負載選擇"""
+        if engine_id:
+            reg = self._registry.get_engine(engine_id)
+            return reg if reg and reg.instance and reg.healthy else None
+        if engine_type:
+            engines = self._registry.get_engines_by_type(EngineType(engine_type))
+            return self._selector.select([e for e in engines if e.healthy and e.instance])
+        return None
 
     async def _schedule_loop(self):
-        """調度循環"""
+        """調度循環 (阻塞等待任務，每次取出已排隊的一批)"""
         while self._running:
             try:
-                _, task = await asyncio.wait_for(self._task_queue.get(), timeout=1.0)
-                await self._dispatch_task(task)
-            except asyncio.TimeoutError:
-                continue
+                batch = [await self._task_queue.get()]
+                while len(batch) < self._batch_size and not self._task_queue.empty():
+                    batch.append(self._task_queue.get_nowait())
+
+                for _, _, task in batch:
+                    # 單個任務失敗不影響同批次的其他任務
+                    try:
+                        await self._dispatch_task(task)
+                    except Exception as e:
+                        self._logger.error(f"任務分發失敗: {task.get('task_id')}: {e!r}")
+            except asyncio.CancelledError:
+                break
             except Exception as e:
                 self._logger.error(f"調度錯誤: {e}")
 
@@ -688,21 +920,11 @@ class EngineScheduler:
         target_engine_id = task.get("target_engine_id")
         target_engine_type = task.get("target_engine_type")
 
-        # 找到合適的引擎
-        if target_engine_id:
-            reg = self._registry.get_engine(target_engine_id)
-            if reg and reg.instance and reg.healthy:
-                await reg.instance.submit_task(task)
-                return
-
-        elif target_engine_type:
-            engines = self._registry.get_engines_by_type(EngineType(target_engine_type))
-            healthy_engines = [e for e in engines if e.healthy and e.instance]
-            if healthy_engines:
-                # 負載均衡 (簡單輪詢)
-                engine = healthy_engines[0]
-                await engine.instance.submit_task(task)
-                return
+        # 找到合適的引擎 (按類型時依負載選擇)
+        reg = self.select_engine(target_engine_id, target_engine_type)
+        if reg:
+            await reg.instance.submit_task(task)
+            return
 
         self._logger.warning(f"找不到合適的引擎執行任務: {task.get('task_id')}")
 
@@ -793,10 +1015,9 @@ class PipelineExecutor:
             if reg and reg.instance:
                 engine = reg.instance
         elif engine_type:
-            engines = self._registry.get_engines_by_type(EngineType(engine_type))
-            healthy = [e for e in engines if e.healthy and e.instance]
-            if healthy:
-                engine = healthy[0].instance
+            reg = self._scheduler.select_engine(engine_type=engine_type)
+            if reg:
+                engine = reg.instance
 
         if not engine:
             return {"success": False, "error": "找不到引擎"}
@@ -927,9 +1148,17 @@ class MasterOrchestrator:
         self.config = config or OrchestratorConfig()
 
         # 核心組件
-        self.event_bus = EventBus(max_size=self.config.event_queue_size)
-        self.registry = EngineRegistry()
-        self.scheduler = EngineScheduler(self.registry, self.event_bus)
+        self.event_bus = EventBus(
+            max_size=self.config.event_queue_size,
+            handler_timeout=self.config.event_handler_timeout,
+            history_per_type=self.config.event_history_per_type,
+        )
+        self.registry = EngineRegistry(
+            manifest_path=BASE_PATH / self.config.state_path / "engine_manifest.json"
+        )
+        self.scheduler = EngineScheduler(
+            self.registry, self.event_bus, selection_strategy=self.config.engine_selection
+        )
         self.pipeline_executor = PipelineExecutor(self.registry, self.scheduler)
         self.health_monitor = HealthMonitor(self.registry, self.event_bus)
 
@@ -1038,9 +1267,15 @@ class MasterOrchestrator:
         self._logger.info("發現引擎中...")
 
         search_paths = [BASE_PATH / p for p in self.config.engines_paths]
-        discovered = self.registry.discover_engines(search_paths)
+        discovered = self.registry.discover_engines(
+            search_paths, static=self.config.static_discovery
+        )
 
-        self._logger.info(f"發現 {len(discovered)} 個引擎")
+        stats = self.registry.discovery_stats
+        self._logger.info(
+            f"發現 {len(discovered)} 個引擎 "
+            f"({stats.duration_ms:.1f}ms, 快取命中 {stats.cache_hits}/{stats.files_scanned})"
+        )
 
         for engine_info in discovered:
             try:
@@ -1049,56 +1284,56 @@ class MasterOrchestrator:
                 self._logger.error(f"註冊引擎失敗: {e}")
 
     async def _register_engine_from_info(self, info: Dict[str, Any]):
-        """從資訊註冊引擎"""
+        """
+        從資訊註冊引擎
+
+        僅建立註冊記錄，模組在引擎啟動時才載入 (見 `_ensure_instance`)。
+        """
         module_path = info.get("module_path")
         class_name = info.get("class_name")
 
         if not module_path or not class_name:
             return
 
-        try:
-            # 動態載入模組
-            spec = importlib.util.spec_from_file_location(
-                Path(module_path).stem, module_path
-            )
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-
-            # 獲取引擎類
-            engine_class = getattr(module, class_name)
+        # 建立配置
+        config = EngineConfig(
+            engine_name=class_name,
+            engine_type=EngineType(info.get("engine_type", "execution")),
+            execution_mode=ExecutionMode.AUTONOMOUS,
+        )
 
-            # 建立配置
-            config = EngineConfig(
-                engine_name=class_name,
-                engine_type=EngineType(info.get("engine_type", "execution")),
-                execution_mode=ExecutionMode.AUTONOMOUS,
-            )
+        # 註冊
+        registration = EngineRegistration(
+            engine_id=config.engine_id,
+            engine_name=class_name,
+            engine_class=class_name,
+            engine_type=config.engine_type,
+            module_path=module_path,
+            config=config,
+            description=info.get("description", ""),
+        )
 
-            # 建立實例
-            instance = engine_class(config)
-
-            # 註冊
-            registration = EngineRegistration(
-                engine_id=config.engine_id,
-                engine_name=class_name,
-                engine_class=class_name,
-                engine_type=config.engine_type,
-                module_path=module_path,
-                config=config,
-                instance=instance,
-            )
+        self.registry.register_engine(registration)
 
-            self.registry.register_engine(registration)
+    def _ensure_instance(self, reg: EngineRegistration) -> bool:
+        """載入引擎模組並建立實例 (每個模組只載入一次)"""
+        if reg.instance:
+            return True
 
+        try:
+            engine_class = self.registry.load_engine_class(reg.module_path, reg.engine_class)
+            reg.instance = engine_class(reg.config)
+            return True
         except Exception as e:
-            self._logger.error(f"載入引擎 {class_name} 失敗: {e}")
+            self._logger.error(f"載入引擎 {reg.engine_class} 失敗: {e}", exc_info=True)
+            return False
 
     async def _start_all_engines(self):
         """啟動所有引擎"""
         self._logger.info("啟動所有引擎...")
 
         for reg in self.registry.get_all_engines():
-            if reg.instance:
+            if self._ensure_instance(reg):
                 try:
                     success = await reg.instance.start()
                     if success:
@@ -1124,7 +1359,7 @@ class MasterOrchestrator:
     async def start_engine(self, engine_id: str) -> bool:
         """啟動指定引擎"""
         reg = self.registry.get_engine(engine_id)
-        if not reg or not reg.instance:
+        if not reg or not self._ensure_instance(reg):
             return False
         return await reg.instance.start()
 
@@ -1213,8 +1448,44 @@ class MasterOrchestrator:
                 for e in self.registry.get_all_engines()
             ],
             "pipelines": list(self.pipeline_executor._pipelines.keys()),
+            "discovery": asdict(self.registry.discovery_stats),
+            "event_bus": self.event_bus.get_stats(),
         }
 
+# ============================================================================
+# 發現基準測試
+# ============================================================================
+
+def benchmark_discovery(
+    search_paths: Optional[List[Path]] = None,
+    manifest_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    量測引擎發現耗時
+
+    - import: 舊路徑，逐一導入模組
+    - static_cold: 靜態分析，無清單快取
+    - static_warm: 靜態分析，使用上一輪寫入的清單快取
+    """
+    if search_paths is None:
+        search_paths = [BASE_PATH / p for p in OrchestratorConfig().engines_paths]
+    if manifest_path is None:
+        manifest_path = BASE_PATH / OrchestratorConfig().state_path / "engine_manifest.bench.json"
+    manifest_path.unlink(missing_ok=True)
+
+    results = {}
+    for name, static in (("import", False), ("static_cold", True), ("static_warm", True)):
+        registry = EngineRegistry(manifest_path=manifest_path if static else None)
+        engines = registry.discover_engines(search_paths, static=static)
+        results[name] = {
+            "duration_ms": round(registry.discovery_stats.duration_ms, 2),
+            "engines": sorted(e["class_name"] for e in engines if "class_name" in e),
+            "cache_hits": registry.discovery_stats.cache_hits,
+        }
+
+    manifest_path.unlink(missing_ok=True)
+    return results
+
 # ============================================================================
 # CLI 入口
 # ============================================================================
@@ -1247,12 +1518,19 @@ async def main():
     execute_parser.add_argument("--pipeline", "-p", required=True, help="管道 ID")
     execute_parser.add_argument("--input", "-i", help="輸入數據 (JSON)")
 
+    # benchmark-discovery 命令
+    subparsers.add_parser("benchmark-discovery", help="比較引擎發現耗時 (導入 / 靜態冷啟動 / 靜態熱啟動)")
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return
 
+    if args.command == "benchmark-discovery":
+        print(yaml.dump(benchmark_discovery(), allow_unicode=True, default_flow_style=False))
+        return
+
     orchestrator = MasterOrchestrator()
 
     if args.command == "start":